@@ -0,0 +1,55 @@
+"""Add email_outbox (transactional emails delivered by the worker)
+
+Revision ID: a1d3f5b7c9e0
+Revises: f0c2e4a6b8d9
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a1d3f5b7c9e0'
+down_revision: Union[str, None] = 'f0c2e4a6b8d9'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('email_outbox',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('organization_id', sa.UUID(), nullable=True),
+    sa.Column('kind', sa.String(), nullable=False),
+    sa.Column('to_addresses', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('subject', sa.String(), nullable=False),
+    sa.Column('html_body', sa.TEXT(), nullable=False),
+    sa.Column('attachments', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'[]'::jsonb"), nullable=False),
+    sa.Column('status', sa.String(), server_default='queued', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('next_attempt_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('locked_until', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('last_error', sa.TEXT(), nullable=True),
+    sa.Column('provider_message_id', sa.String(), nullable=True),
+    sa.Column('dedupe_key', sa.String(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('sent_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('dedupe_key')
+    )
+    op.create_index(
+        'ix_email_outbox_pending',
+        'email_outbox',
+        ['next_attempt_at'],
+        unique=False,
+        postgresql_where=sa.text("status IN ('queued', 'sending')"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_email_outbox_pending', table_name='email_outbox')
+    op.drop_table('email_outbox')
@@ -0,0 +1,69 @@
+"""Add bank account balance ledger and checkpoints
+
+Revision ID: a5d7f9b1c3e4
+Revises: f4c6d8e0a2b3
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a5d7f9b1c3e4'
+down_revision: Union[str, None] = 'f4c6d8e0a2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('bank_account_ledger',
+    sa.Column('id', sa.BIGINT(), sa.Identity(always=False), nullable=False),
+    sa.Column('organization_id', sa.UUID(), nullable=False),
+    sa.Column('bank_account_id', sa.UUID(), nullable=False),
+    sa.Column('transaction_id', sa.UUID(), nullable=True),
+    sa.Column('reason', sa.String(), nullable=False),
+    sa.Column('delta_cents', sa.BIGINT(), nullable=False),
+    sa.Column('balance_after_cents', sa.BIGINT(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+    sa.ForeignKeyConstraint(['bank_account_id'], ['bank_accounts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index('ix_bank_account_ledger_account_id', 'bank_account_ledger', ['bank_account_id', 'id'], unique=False)
+
+    op.create_table('bank_account_balance_checkpoints',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('organization_id', sa.UUID(), nullable=False),
+    sa.Column('bank_account_id', sa.UUID(), nullable=False),
+    sa.Column('ledger_entry_id', sa.BIGINT(), nullable=False),
+    sa.Column('balance_cents', sa.BIGINT(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ),
+    sa.ForeignKeyConstraint(['bank_account_id'], ['bank_accounts.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'ix_bank_account_balance_checkpoints_account',
+        'bank_account_balance_checkpoints',
+        ['bank_account_id', 'ledger_entry_id'],
+        unique=False,
+    )
+
+    # Opening checkpoint: existing balances become the baseline the ledger builds on.
+    op.execute(
+        """
+        INSERT INTO bank_account_balance_checkpoints (id, organization_id, bank_account_id, ledger_entry_id, balance_cents)
+        SELECT gen_random_uuid(), organization_id, id, 0, COALESCE(balance_cents, 0)
+        FROM bank_accounts
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_bank_account_balance_checkpoints_account', table_name='bank_account_balance_checkpoints')
+    op.drop_table('bank_account_balance_checkpoints')
+    op.drop_index('ix_bank_account_ledger_account_id', table_name='bank_account_ledger')
+    op.drop_table('bank_account_ledger')
@@ -0,0 +1,31 @@
+"""Add last_used_at to generated_documents
+
+Revision ID: a7c9e1b3d5f7
+Revises: f6c8e0a2b4d5
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'a7c9e1b3d5f7'
+down_revision: Union[str, None] = 'f6c8e0a2b4d5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('generated_documents', sa.Column('last_used_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False))
+    op.execute("UPDATE generated_documents SET last_used_at = created_at")
+    op.drop_index('ix_generated_documents_entity_created', table_name='generated_documents')
+    op.create_index('ix_generated_documents_entity_last_used', 'generated_documents', ['organization_id', 'entity_type', 'entity_id', 'last_used_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_generated_documents_entity_last_used', table_name='generated_documents')
+    op.create_index('ix_generated_documents_entity_created', 'generated_documents', ['organization_id', 'entity_type', 'entity_id', 'created_at'], unique=False)
+    op.drop_column('generated_documents', 'last_used_at')
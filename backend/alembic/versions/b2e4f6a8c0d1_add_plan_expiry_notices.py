@@ -0,0 +1,41 @@
+"""Add plan_expiry_notices ledger and paid-org access_ends_at index
+
+Revision ID: b2e4f6a8c0d1
+Revises: a1d3f5b7c9e0
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b2e4f6a8c0d1'
+down_revision: Union[str, None] = 'a1d3f5b7c9e0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('plan_expiry_notices',
+    sa.Column('organization_id', sa.UUID(), nullable=False),
+    sa.Column('notice', sa.String(), nullable=False),
+    sa.Column('access_ends_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('notified_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('organization_id', 'notice', 'access_ends_at')
+    )
+    op.create_index(
+        'ix_organizations_paid_access_ends_at',
+        'organizations',
+        ['access_ends_at'],
+        unique=False,
+        postgresql_where=sa.text("billing_status = 'active' AND plan_id IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_organizations_paid_access_ends_at', table_name='organizations')
+    op.drop_table('plan_expiry_notices')
@@ -0,0 +1,46 @@
+"""Add invoice_number_sequences (per-org, per-year invoice counters)
+
+Revision ID: b6e8a0c2d4f5
+Revises: a5d7f9b1c3e4
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b6e8a0c2d4f5'
+down_revision: Union[str, None] = 'a5d7f9b1c3e4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('invoice_number_sequences',
+    sa.Column('organization_id', sa.UUID(), nullable=False),
+    sa.Column('year', sa.Integer(), nullable=False),
+    sa.Column('last_value', sa.BIGINT(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('organization_id', 'year')
+    )
+
+    # Backfill counters from issued numbers (INV-{year}-{org_prefix}-{seq}).
+    op.execute(
+        r"""
+        INSERT INTO invoice_number_sequences (organization_id, year, last_value)
+        SELECT organization_id,
+               substring(invoice_number from '^INV-(\d{4})-')::int,
+               max(substring(invoice_number from '-(\d+)$')::bigint)
+        FROM invoices
+        WHERE invoice_number ~ '^INV-\d{4}-[0-9A-Fa-f]{8}-\d+$'
+        GROUP BY 1, 2
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('invoice_number_sequences')
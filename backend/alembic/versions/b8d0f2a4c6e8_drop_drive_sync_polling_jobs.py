@@ -0,0 +1,28 @@
+"""Drop polling jobs for Drive sync (now a worker drain loop)
+
+Revision ID: b8d0f2a4c6e8
+Revises: a7c9e1b3d5f7
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'b8d0f2a4c6e8'
+down_revision: Union[str, None] = 'a7c9e1b3d5f7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The handler is gone, so queued rows could only fail; finished ones are noise.
+    op.execute("DELETE FROM jobs WHERE name = 'cloud.drive_sync'")
+    op.execute("DELETE FROM job_schedules WHERE name = 'drive-sync'")
+
+
+def downgrade() -> None:
+    # The worker recreates schedules from code on start.
+    pass
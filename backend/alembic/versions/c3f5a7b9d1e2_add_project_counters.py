@@ -0,0 +1,57 @@
+"""Add project_counters (per-project scene/character/shooting-day/team counts)
+
+Revision ID: c3f5a7b9d1e2
+Revises: b2e4f6a8c0d1
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c3f5a7b9d1e2'
+down_revision: Union[str, None] = 'b2e4f6a8c0d1'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('project_counters',
+    sa.Column('project_id', sa.UUID(), nullable=False),
+    sa.Column('organization_id', sa.UUID(), nullable=False),
+    sa.Column('scenes_count', sa.Integer(), nullable=False),
+    sa.Column('characters_count', sa.Integer(), nullable=False),
+    sa.Column('shooting_days_count', sa.Integer(), nullable=False),
+    sa.Column('confirmed_shooting_days_count', sa.Integer(), nullable=False),
+    sa.Column('team_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.ForeignKeyConstraint(['project_id'], ['projects.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('project_id')
+    )
+
+    # Backfill from the existing production and team records.
+    op.execute(
+        """
+        INSERT INTO project_counters (
+            project_id, organization_id, scenes_count, characters_count,
+            shooting_days_count, confirmed_shooting_days_count, team_count
+        )
+        SELECT p.id,
+               p.organization_id,
+               (SELECT COUNT(*) FROM scenes WHERE scenes.project_id = p.id),
+               (SELECT COUNT(*) FROM characters WHERE characters.project_id = p.id),
+               (SELECT COUNT(*) FROM shooting_days WHERE shooting_days.project_id = p.id),
+               (SELECT COUNT(*) FROM shooting_days
+                 WHERE shooting_days.project_id = p.id AND shooting_days.status = 'confirmed'),
+               (SELECT COUNT(*) FROM stakeholders WHERE stakeholders.project_id = p.id)
+        FROM projects p
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('project_counters')
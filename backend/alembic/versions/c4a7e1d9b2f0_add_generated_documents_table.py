@@ -0,0 +1,42 @@
+"""Add generated_documents table (content-addressed PDF cache)
+
+Revision ID: c4a7e1d9b2f0
+Revises: 35f7d5868797
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4a7e1d9b2f0'
+down_revision: Union[str, None] = '35f7d5868797'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('generated_documents',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('organization_id', sa.UUID(), nullable=False),
+    sa.Column('entity_type', sa.String(), nullable=False),
+    sa.Column('entity_id', sa.UUID(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('bucket', sa.String(), nullable=False),
+    sa.Column('file_path', sa.String(), nullable=False),
+    sa.Column('filename', sa.String(), nullable=False),
+    sa.Column('size_bytes', sa.BIGINT(), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('organization_id', 'entity_type', 'entity_id', 'content_hash', name='uq_generated_documents_entity_hash')
+    )
+    op.create_index('ix_generated_documents_entity_created', 'generated_documents', ['organization_id', 'entity_type', 'entity_id', 'created_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_generated_documents_entity_created', table_name='generated_documents')
+    op.drop_table('generated_documents')
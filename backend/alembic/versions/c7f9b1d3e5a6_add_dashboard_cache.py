@@ -0,0 +1,39 @@
+"""Add dashboard_cache (UNLOGGED shared executive dashboard cache)
+
+Revision ID: c7f9b1d3e5a6
+Revises: b6e8a0c2d4f5
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c7f9b1d3e5a6'
+down_revision: Union[str, None] = 'b6e8a0c2d4f5'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('dashboard_cache',
+    sa.Column('organization_id', sa.UUID(), nullable=False),
+    sa.Column('section', sa.String(), nullable=False),
+    sa.Column('variant', sa.String(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expires_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('organization_id', 'section', 'variant'),
+    prefixes=['UNLOGGED'],
+    )
+    op.create_index('ix_dashboard_cache_expires_at', 'dashboard_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_dashboard_cache_expires_at', table_name='dashboard_cache')
+    op.drop_table('dashboard_cache')
@@ -0,0 +1,26 @@
+"""Add batch_key to email_outbox
+
+Revision ID: c9e1a3b5d7f9
+Revises: b8d0f2a4c6e8
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c9e1a3b5d7f9'
+down_revision: Union[str, None] = 'b8d0f2a4c6e8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('email_outbox', sa.Column('batch_key', sa.String(), nullable=True))
+
+
+def downgrade() -> None:
+    op.drop_column('email_outbox', 'batch_key')
@@ -0,0 +1,35 @@
+"""Add dashboard_cache_generations (shared invalidation counters for dashboard_cache)
+
+Revision ID: d4a6c8e0f2b3
+Revises: c3f5a7b9d1e2
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd4a6c8e0f2b3'
+down_revision: Union[str, None] = 'c3f5a7b9d1e2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('dashboard_cache_generations',
+    sa.Column('organization_id', sa.UUID(), nullable=False),
+    sa.Column('section', sa.String(), nullable=False),
+    sa.Column('generation', sa.BigInteger(), server_default='0', nullable=False),
+    sa.Column('invalidated_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('organization_id', 'section'),
+    )
+    # Entries cached before this table existed carry no generation; start clean.
+    op.execute('TRUNCATE dashboard_cache')
+
+
+def downgrade() -> None:
+    op.drop_table('dashboard_cache_generations')
@@ -0,0 +1,53 @@
+"""Add org_monthly_financials (monthly rollup of applied transactions)
+
+Revision ID: d8a0c2e4f6b7
+Revises: c7f9b1d3e5a6
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8a0c2e4f6b7'
+down_revision: Union[str, None] = 'c7f9b1d3e5a6'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('org_monthly_financials',
+    sa.Column('organization_id', sa.UUID(), nullable=False),
+    sa.Column('month', sa.DATE(), nullable=False),
+    sa.Column('type', sa.String(), nullable=False),
+    sa.Column('category', sa.String(), nullable=False),
+    sa.Column('amount_cents', sa.BIGINT(), nullable=False),
+    sa.Column('transaction_count', sa.Integer(), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('organization_id', 'month', 'type', 'category')
+    )
+
+    # Backfill from the transactions already applied to bank balances.
+    op.execute(
+        """
+        INSERT INTO org_monthly_financials (organization_id, month, type, category, amount_cents, transaction_count)
+        SELECT organization_id,
+               date_trunc('month', transaction_date)::date,
+               type,
+               category,
+               SUM(amount_cents),
+               COUNT(*)
+        FROM transactions
+        WHERE payment_status IN ('approved', 'paid')
+          AND transaction_date IS NOT NULL
+        GROUP BY organization_id, date_trunc('month', transaction_date)::date, type, category
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('org_monthly_financials')
@@ -0,0 +1,35 @@
+"""Add Drive changes sync state to project_drive_folders
+
+Revision ID: d8e2f4a6b1c3
+Revises: c4a7e1d9b2f0
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'd8e2f4a6b1c3'
+down_revision: Union[str, None] = 'c4a7e1d9b2f0'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('project_drive_folders', sa.Column('changes_page_token', sa.String(), nullable=True))
+    op.add_column('project_drive_folders', sa.Column('last_synced_at', sa.TIMESTAMP(timezone=True), nullable=True))
+    op.create_index(
+        'ix_cloud_file_references_project_external',
+        'cloud_file_references',
+        ['project_id', 'external_id'],
+        unique=False,
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_cloud_file_references_project_external', table_name='cloud_file_references')
+    op.drop_column('project_drive_folders', 'last_synced_at')
+    op.drop_column('project_drive_folders', 'changes_page_token')
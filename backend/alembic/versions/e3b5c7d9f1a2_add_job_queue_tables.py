@@ -0,0 +1,72 @@
+"""Add jobs and job_schedules tables (Postgres job queue)
+
+Revision ID: e3b5c7d9f1a2
+Revises: d8e2f4a6b1c3
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e3b5c7d9f1a2'
+down_revision: Union[str, None] = 'd8e2f4a6b1c3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('jobs',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('queue', sa.String(), server_default='default', nullable=False),
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+    sa.Column('organization_id', sa.UUID(), nullable=True),
+    sa.Column('status', sa.String(), server_default='queued', nullable=False),
+    sa.Column('priority', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('attempts', sa.Integer(), server_default='0', nullable=False),
+    sa.Column('max_attempts', sa.Integer(), server_default='5', nullable=False),
+    sa.Column('run_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('locked_by', sa.String(), nullable=True),
+    sa.Column('locked_until', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('cancel_requested', sa.Boolean(), server_default='false', nullable=False),
+    sa.Column('dedupe_key', sa.String(), nullable=True),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=True),
+    sa.Column('last_error', sa.TEXT(), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('started_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('finished_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id'),
+    sa.UniqueConstraint('dedupe_key')
+    )
+    op.create_index('ix_jobs_ready', 'jobs', ['queue', 'priority', 'run_at'], unique=False, postgresql_where=sa.text("status = 'queued'"))
+    op.create_index('ix_jobs_running_locked_until', 'jobs', ['locked_until'], unique=False, postgresql_where=sa.text("status = 'running'"))
+    op.create_index('ix_jobs_organization_status', 'jobs', ['organization_id', 'status'], unique=False)
+
+    op.create_table('job_schedules',
+    sa.Column('name', sa.String(), nullable=False),
+    sa.Column('schedule', sa.String(), nullable=False),
+    sa.Column('job_name', sa.String(), nullable=False),
+    sa.Column('queue', sa.String(), server_default='default', nullable=False),
+    sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), server_default=sa.text("'{}'::jsonb"), nullable=False),
+    sa.Column('enabled', sa.Boolean(), server_default='true', nullable=False),
+    sa.Column('next_run_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.Column('last_run_at', sa.TIMESTAMP(timezone=True), nullable=True),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('updated_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.PrimaryKeyConstraint('name')
+    )
+
+
+def downgrade() -> None:
+    op.drop_table('job_schedules')
+    op.drop_index('ix_jobs_organization_status', table_name='jobs')
+    op.drop_index('ix_jobs_running_locked_until', table_name='jobs')
+    op.drop_index('ix_jobs_ready', table_name='jobs')
+    op.drop_table('jobs')
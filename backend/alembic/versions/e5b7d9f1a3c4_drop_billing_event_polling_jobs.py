@@ -0,0 +1,28 @@
+"""Drop polling jobs for the webhook inbox (now a worker drain loop)
+
+Revision ID: e5b7d9f1a3c4
+Revises: d4a6c8e0f2b3
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e5b7d9f1a3c4'
+down_revision: Union[str, None] = 'd4a6c8e0f2b3'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The handler is gone, so queued rows could only fail; finished ones are noise.
+    op.execute("DELETE FROM jobs WHERE name = 'billing.process_webhook_events'")
+    op.execute("DELETE FROM job_schedules WHERE name = 'billing-webhook-events'")
+
+
+def downgrade() -> None:
+    # The worker recreates schedules from code on start.
+    pass
@@ -0,0 +1,73 @@
+"""Add org-scoped composite/partial indexes on transactions
+
+The earlier dashboard indexes (8681bffd095e, 5bd342bc298d) were not declared on
+the model and an autogenerated migration (c9a002b46e8b) dropped them again.
+These are declared in Transaction.__table_args__.
+
+Revision ID: e9b1d3f5a7c8
+Revises: d8a0c2e4f6b7
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9b1d3f5a7c8'
+down_revision: Union[str, None] = 'd8a0c2e4f6b7'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+INDEXES = (
+    (
+        "ix_transactions_org_date_created_id",
+        "ON transactions (organization_id, transaction_date, created_at, id)",
+    ),
+    (
+        "ix_transactions_org_pending",
+        "ON transactions (organization_id, transaction_date, created_at, id) "
+        "WHERE payment_status = 'pending'",
+    ),
+    (
+        "ix_transactions_org_applied_date",
+        "ON transactions (organization_id, transaction_date) "
+        "INCLUDE (type, category, amount_cents) "
+        "WHERE payment_status IN ('approved', 'paid') AND category <> 'internal_transfer'",
+    ),
+    (
+        "ix_transactions_org_project",
+        "ON transactions (organization_id, project_id) "
+        "INCLUDE (type, category, payment_status, budget_line_id, amount_cents) "
+        "WHERE project_id IS NOT NULL",
+    ),
+    (
+        "ix_transactions_org_budget_line",
+        "ON transactions (organization_id, budget_line_id) "
+        "INCLUDE (type, category, payment_status, amount_cents) "
+        "WHERE budget_line_id IS NOT NULL",
+    ),
+    (
+        "ix_transactions_org_supplier",
+        "ON transactions (organization_id, supplier_id) "
+        "INCLUDE (type, transaction_date, amount_cents) "
+        "WHERE supplier_id IS NOT NULL",
+    ),
+)
+
+
+def upgrade() -> None:
+    # CREATE INDEX CONCURRENTLY must run outside a transaction.
+    with op.get_context().autocommit_block():
+        for name, definition in INDEXES:
+            op.execute(f"CREATE INDEX CONCURRENTLY IF NOT EXISTS {name} {definition}")
+        op.execute("ANALYZE transactions")
+
+
+def downgrade() -> None:
+    # DROP INDEX CONCURRENTLY must run outside a transaction.
+    with op.get_context().autocommit_block():
+        for name, _ in reversed(INDEXES):
+            op.execute(f"DROP INDEX CONCURRENTLY IF EXISTS {name}")
@@ -0,0 +1,50 @@
+"""Turn billing_events into a Stripe webhook inbox
+
+Webhooks are persisted with their payload and acknowledged; a worker job
+processes them later (app/services/billing_events.py).
+
+Revision ID: f0c2e4a6b8d9
+Revises: e9b1d3f5a7c8
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f0c2e4a6b8d9'
+down_revision: Union[str, None] = 'e9b1d3f5a7c8'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column('billing_events', sa.Column('source', sa.String(), nullable=True))
+    op.add_column('billing_events', sa.Column('ordering_key', sa.String(), nullable=True))
+    op.add_column('billing_events', sa.Column('payload', postgresql.JSONB(astext_type=sa.Text()), nullable=True))
+    op.add_column('billing_events', sa.Column('event_created_at', sa.TIMESTAMP(timezone=True), nullable=True))
+    op.add_column('billing_events', sa.Column('attempts', sa.Integer(), server_default='0', nullable=False))
+    op.add_column('billing_events', sa.Column('next_attempt_at', sa.TIMESTAMP(timezone=True), nullable=True))
+    op.add_column('billing_events', sa.Column('last_error', sa.TEXT(), nullable=True))
+    op.create_index(
+        'ix_billing_events_inbox',
+        'billing_events',
+        ['ordering_key', 'event_created_at', 'received_at'],
+        unique=False,
+        postgresql_where=sa.text("status = 'received' AND payload IS NOT NULL"),
+    )
+
+
+def downgrade() -> None:
+    op.drop_index('ix_billing_events_inbox', table_name='billing_events')
+    op.drop_column('billing_events', 'last_error')
+    op.drop_column('billing_events', 'next_attempt_at')
+    op.drop_column('billing_events', 'attempts')
+    op.drop_column('billing_events', 'event_created_at')
+    op.drop_column('billing_events', 'payload')
+    op.drop_column('billing_events', 'ordering_key')
+    op.drop_column('billing_events', 'source')
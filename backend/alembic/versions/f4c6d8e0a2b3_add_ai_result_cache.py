@@ -0,0 +1,49 @@
+"""Add ai_result_cache table (persistent AI result cache)
+
+Revision ID: f4c6d8e0a2b3
+Revises: e3b5c7d9f1a2
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f4c6d8e0a2b3'
+down_revision: Union[str, None] = 'e3b5c7d9f1a2'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_table('ai_result_cache',
+    sa.Column('id', sa.UUID(), nullable=False),
+    sa.Column('organization_id', sa.UUID(), nullable=False),
+    sa.Column('operation', sa.String(), nullable=False),
+    sa.Column('content_hash', sa.String(length=64), nullable=False),
+    sa.Column('analysis_type', sa.String(), nullable=False),
+    sa.Column('response_language', sa.String(), nullable=False),
+    sa.Column('prompt_version', sa.String(), nullable=False),
+    sa.Column('result', postgresql.JSONB(astext_type=sa.Text()), nullable=False),
+    sa.Column('created_at', sa.TIMESTAMP(timezone=True), server_default=sa.text('now()'), nullable=False),
+    sa.Column('expires_at', sa.TIMESTAMP(timezone=True), nullable=False),
+    sa.ForeignKeyConstraint(['organization_id'], ['organizations.id'], ondelete='CASCADE'),
+    sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(
+        'uq_ai_result_cache_key',
+        'ai_result_cache',
+        ['organization_id', 'operation', 'content_hash', 'analysis_type', 'response_language', 'prompt_version'],
+        unique=True,
+    )
+    op.create_index('ix_ai_result_cache_expires_at', 'ai_result_cache', ['expires_at'], unique=False)
+
+
+def downgrade() -> None:
+    op.drop_index('ix_ai_result_cache_expires_at', table_name='ai_result_cache')
+    op.drop_index('uq_ai_result_cache_key', table_name='ai_result_cache')
+    op.drop_table('ai_result_cache')
@@ -0,0 +1,28 @@
+"""Drop polling jobs for the email outbox (now a worker drain loop)
+
+Revision ID: f6c8e0a2b4d5
+Revises: e5b7d9f1a3c4
+Create Date: 2026-10-16
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f6c8e0a2b4d5'
+down_revision: Union[str, None] = 'e5b7d9f1a3c4'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    # The handler is gone, so queued rows could only fail; finished ones are noise.
+    op.execute("DELETE FROM jobs WHERE name = 'email.deliver_outbox'")
+    op.execute("DELETE FROM job_schedules WHERE name = 'email-outbox'")
+
+
+def downgrade() -> None:
+    # The worker recreates schedules from code on start.
+    pass
@@ -1,3 +1,4 @@
+from dataclasses import dataclass
 from typing import Optional
 from uuid import UUID
 from datetime import datetime, timezone
@@ -8,6 +9,7 @@ from sqlalchemy import select, text
 from jose import jwt, JWTError
 
 import logging
+from app.core.auth_cache import auth_cache
 from app.core.config import settings
 from app.db.session import get_db
 from app.models.profiles import Profile
@@ -20,6 +22,24 @@ logger = logging.getLogger(__name__)
 security = HTTPBearer()
 
 
+def decode_access_token(token: str) -> dict:
+    """
+    Decode a Supabase access token.
+
+    Verifies the HS256 signature when SUPABASE_JWT_SECRET is configured;
+    otherwise falls back to reading the claims unverified.
+    Raises JWTError on invalid tokens.
+    """
+    if settings.SUPABASE_JWT_SECRET:
+        return jwt.decode(
+            token,
+            settings.SUPABASE_JWT_SECRET,
+            algorithms=["HS256"],
+            options={"verify_aud": False},
+        )
+    return jwt.get_unverified_claims(token)
+
+
 async def get_current_user_id(
     request: Request,
     credentials: Optional[HTTPAuthorizationCredentials] = Depends(HTTPBearer(auto_error=False))
@@ -45,9 +65,7 @@ async def get_current_user_id(
 
     try:
         token = credentials.credentials
-        # Decode JWT without verification for user info (Supabase handles verification)
-        # In production, you might want to verify the token signature
-        payload = jwt.get_unverified_claims(token)
+        payload = decode_access_token(token)
         
         # logger.info(f"Token payload sub: {payload.get('sub')}")
 
@@ -74,10 +92,25 @@ async def get_current_profile(
 ) -> Profile:
     """
     Get the current user's profile.
+
+    Served from the process-wide auth cache when possible; on a miss the
+    profile and its organization are loaded together and cached.
     """
-    query = select(Profile).where(Profile.id == user_id)
+    cached = auth_cache.get(user_id)
+    if cached is not None:
+        return await db.merge(cached.profile, load=False)
+
+    generation = auth_cache.generation
+    query = (
+        select(Profile, Organization)
+        .outerjoin(Organization, Organization.id == Profile.organization_id)
+        .where(Profile.id == user_id)
+    )
     result = await db.execute(query)
-    profile = result.scalar_one_or_none()
+    row = result.first()
+    profile = row[0] if row else None
+    if profile is not None:
+        auth_cache.set(profile, row[1], generation=generation)
 
     if not profile:
         if not credentials:
@@ -88,7 +121,7 @@ async def get_current_profile(
             )
 
         try:
-            payload = jwt.get_unverified_claims(credentials.credentials)
+            payload = decode_access_token(credentials.credentials)
         except JWTError as e:
             logger.error(f"Failed to decode token for profile creation: {e}")
             raise HTTPException(
@@ -259,6 +292,56 @@ async def enforce_project_assignment(
         )
 
 
+@dataclass
+class AuthContext:
+    """
+    Request-scoped view of the caller: profile, organization, effective role
+    and billing status, resolved once per request (FastAPI caches
+    dependencies per request) and shared by every permission/billing check.
+    """
+    profile: Profile
+    organization: Optional[Organization]
+    effective_role: str
+    billing_status: Optional[str]
+
+    @property
+    def user_id(self) -> UUID:
+        return self.profile.id
+
+    @property
+    def organization_id(self) -> Optional[UUID]:
+        return self.profile.organization_id
+
+    def require_billing_status(self) -> str:
+        if self.organization is None or self.billing_status is None:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail="Organization not found"
+            )
+        return self.billing_status
+
+
+async def get_auth_context(
+    profile: Profile = Depends(get_current_profile),
+    db: AsyncSession = Depends(get_db),
+) -> AuthContext:
+    """
+    Resolve the AuthContext for the current request.
+    """
+    organization = None
+    billing_status = None
+    if profile.organization_id:
+        organization = await get_organization_record(profile, db)
+        billing_status = await _enforce_realtime_billing_state(organization, db)
+
+    return AuthContext(
+        profile=profile,
+        organization=organization,
+        effective_role=get_effective_role(profile),
+        billing_status=billing_status,
+    )
+
+
 def check_permissions_v2(required_roles: list[str]):
     """
     Dependency factory for v2 role-based permissions.
@@ -266,29 +349,20 @@ def check_permissions_v2(required_roles: list[str]):
     Owner is treated as superuser.
     """
     async def permission_checker(
-        profile: Profile = Depends(get_current_profile),
-        db: AsyncSession = Depends(get_db)
+        context: AuthContext = Depends(get_auth_context),
     ) -> Profile:
-        effective_role = get_effective_role(profile)
-
-        if effective_role == "owner":
-            # Even owners are blocked if org is canceled/blocked
-            organization = await get_organization_record(profile, db)
-            status_value = await _enforce_realtime_billing_state(organization, db)
-            _raise_if_platform_blocked_by_billing(status_value)
-            return profile
+        effective_role = context.effective_role
 
-        if effective_role not in required_roles:
+        if effective_role != "owner" and effective_role not in required_roles:
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail=f"Insufficient permissions for this operation. Required roles: {', '.join(required_roles)}. Your role: {effective_role}"
             )
 
-        organization = await get_organization_record(profile, db)
-        status_value = await _enforce_realtime_billing_state(organization, db)
-        _raise_if_platform_blocked_by_billing(status_value)
+        # Even owners are blocked if org is canceled/blocked
+        _raise_if_platform_blocked_by_billing(context.require_billing_status())
 
-        return profile
+        return context.profile
 
     return permission_checker
 
@@ -297,6 +371,15 @@ async def get_organization_record(
     profile: Profile,
     db: AsyncSession
 ) -> Organization:
+    cached = auth_cache.get(profile.id)
+    if (
+        cached is not None
+        and cached.organization is not None
+        and cached.organization.id == profile.organization_id
+    ):
+        return await db.merge(cached.organization, load=False)
+
+    generation = auth_cache.generation
     query = select(Organization).where(Organization.id == profile.organization_id)
     result = await db.execute(query)
     organization = result.scalar_one_or_none()
@@ -305,6 +388,7 @@ async def get_organization_record(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Organization not found"
         )
+    auth_cache.set(profile, organization, generation=generation)
     return organization
 
 
@@ -381,17 +465,14 @@ def require_billing_active():
     canceled/blocked => deny (403)
     """
     async def billing_checker(
-        profile: Profile = Depends(get_current_profile),
-        db: AsyncSession = Depends(get_db)
+        context: AuthContext = Depends(get_auth_context),
     ) -> Profile:
-        if not profile.organization_id:
-            return profile
+        if not context.organization_id:
+            return context.profile
 
-        organization = await get_organization_record(profile, db)
-        status_value = await _enforce_realtime_billing_state(organization, db)
-        _raise_if_platform_blocked_by_billing(status_value)
+        _raise_if_platform_blocked_by_billing(context.billing_status)
 
-        return profile
+        return context.profile
 
     return billing_checker
 
@@ -401,17 +482,14 @@ def require_billing_read():
     Block all regular platform access for non-active billing states.
     """
     async def billing_checker(
-        profile: Profile = Depends(get_current_profile),
-        db: AsyncSession = Depends(get_db)
+        context: AuthContext = Depends(get_auth_context),
     ) -> Profile:
-        if not profile.organization_id:
-            return profile
+        if not context.organization_id:
+            return context.profile
 
-        organization = await get_organization_record(profile, db)
-        status_value = await _enforce_realtime_billing_state(organization, db)
-        _raise_if_platform_blocked_by_billing(status_value)
+        _raise_if_platform_blocked_by_billing(context.billing_status)
 
-        return profile
+        return context.profile
 
     return billing_checker
 
@@ -428,22 +506,18 @@ def require_billing_checkout():
     - canceled
     """
     async def billing_checker(
-        profile: Profile = Depends(get_current_profile),
-        db: AsyncSession = Depends(get_db)
+        context: AuthContext = Depends(get_auth_context),
     ) -> Profile:
-        if not profile.organization_id:
-            return profile
-
-        organization = await get_organization_record(profile, db)
-        status_value = await _enforce_realtime_billing_state(organization, db)
+        if not context.organization_id:
+            return context.profile
 
-        if status_value == "canceled":
+        if context.billing_status == "canceled":
             raise HTTPException(
                 status_code=status.HTTP_403_FORBIDDEN,
                 detail="Billing is canceled. Access denied."
             )
 
-        return profile
+        return context.profile
 
     return billing_checker
 
@@ -1,12 +1,11 @@
-from typing import Dict, Any, List, Optional
+from typing import Dict, Any, List
 from uuid import UUID
 from datetime import timedelta
-from fastapi import APIRouter, Depends, HTTPException, status, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, delete
 import hashlib
 import time
-import json
 import unicodedata
 
 from app.api.deps import (
@@ -17,8 +16,15 @@ from app.api.deps import (
     require_billing_active,
     get_organization_record,
 )
+from app.core.config import settings
 from app.db.session import get_db
 from app.services.ai_engine import ai_engine_service
+from app.services.job_queue import job_queue
+from app.services.script_analysis import (
+    SCRIPT_ANALYSIS_JOB,
+    SCRIPT_ANALYSIS_QUEUE,
+    resolve_response_language,
+)
 from app.services.notifications import notification_service
 from app.services.storage import storage_service
 from app.services.entitlements import ensure_and_reserve_ai_credits
@@ -60,39 +66,31 @@ def _raise_for_ai_error(error_message: str) -> None:
     raise HTTPException(status_code=http_status, detail=detail)
 
 
-def _resolve_response_language(
-    *,
-    script_content: Optional[str] = None,
-    analysis_result: Optional[Dict[str, Any]] = None,
-) -> str:
+async def _analysis_and_suggestions_cached(
+    organization_id: UUID,
+    project_id: UUID,
+    script_content: str,
+) -> bool:
     """
-    Resolve response language for downstream AI or server-generated text.
-    Priority:
-    1) analysis metadata.response_language
-    2) language detected from script content
-    3) language detected from analysis payload text
-    4) English fallback
+    Whether both the script analysis and the production suggestions derived
+    from it are already in the AI result cache (no provider call needed).
     """
-    if isinstance(analysis_result, dict):
-        metadata = analysis_result.get("metadata")
-        if isinstance(metadata, dict):
-            metadata_language = metadata.get("response_language")
-            if isinstance(metadata_language, str) and metadata_language.strip():
-                normalized = metadata_language.strip().lower()
-                if normalized.startswith("pt"):
-                    return "pt-BR"
-                if normalized.startswith("en"):
-                    return "en"
-
-    if script_content and script_content.strip():
-        return ai_engine_service.detect_content_language(script_content)
-
-    if isinstance(analysis_result, dict):
-        payload_text = json.dumps(analysis_result, ensure_ascii=False)
-        if payload_text.strip():
-            return ai_engine_service.detect_content_language(payload_text)
-
-    return "en"
+    analysis = await ai_engine_service.get_cached_script_analysis(
+        organization_id=organization_id,
+        script_content=script_content,
+    )
+    if analysis is None:
+        return False
+    suggestions = await ai_engine_service.get_cached_production_suggestions(
+        organization_id=organization_id,
+        script_analysis=analysis,
+        project_context={"project_id": str(project_id)},
+        response_language=resolve_response_language(
+            script_content=script_content,
+            analysis_result=analysis,
+        ),
+    )
+    return suggestions is not None
 
 
 def _is_pt_br(language: str) -> bool:
@@ -435,144 +433,20 @@ def infer_suggestion_priority_confidence(text: str, suggestion_type: str) -> tup
     return "medium", 0.78
 
 
-async def process_script_analysis(
-    organization_id: UUID,
-    project_id: UUID,
-    script_content: str,
-    profile_id: UUID,
-    db: AsyncSession,
-    analysis_type: str = "full"
-):
-    """
-    Background task to process script analysis and send notifications.
-    Now saves results to database for persistence.
-    """
-    start_time = time.time()
-    try:
-        # Analyze the script with AI
-        analysis_result = await ai_engine_service.analyze_script_content(
-            organization_id=organization_id,
-            script_content=script_content,
-            project_id=project_id
-        )
-        if isinstance(analysis_result, dict) and analysis_result.get("error"):
-            _raise_for_ai_error(str(analysis_result["error"]))
-        response_language = _resolve_response_language(
-            script_content=script_content,
-            analysis_result=analysis_result,
-        )
-
-        # Generate production suggestions
-        suggestions = await ai_engine_service.suggest_production_elements(
-            organization_id=organization_id,
-            script_analysis=analysis_result,
-            project_context={"project_id": str(project_id)},
-            response_language=response_language,
-        )
-        if isinstance(suggestions, dict) and suggestions.get("error"):
-            _raise_for_ai_error(str(suggestions["error"]))
-
-        # Save script analysis to database
-        saved_analysis = await script_analysis_service.create_from_ai_result(
-            db=db,
-            organization_id=organization_id,
-            project_id=project_id,
-            script_text=script_content[:5000],  # Limit stored text
-            analysis_result=analysis_result,
-            analysis_type=analysis_type,
-            confidence=analysis_result.get('confidence', 0.85),
-            token_count=len(script_content.split()) * 2,  # Rough estimate
-            cost_cents=int(len(script_content.split()) * 0.0005)  # Rough cost estimate
-        )
-
-        # Save suggestions to database if any
-        if suggestions and isinstance(suggestions, list):
-            for suggestion in suggestions[:10]:  # Limit to 10 suggestions
-                await ai_suggestion_service.create_from_ai_result(
-                    db=db,
-                    organization_id=organization_id,
-                    project_id=project_id,
-                    suggestion_type=suggestion.get('type', 'other'),
-                    suggestion_text=suggestion.get('text', ''),
-                    confidence=suggestion.get('confidence', 0.75),
-                    priority=suggestion.get('priority', 'medium'),
-                    related_scenes=suggestion.get('related_scenes', []),
-                    estimated_savings_cents=suggestion.get('estimated_savings_cents'),
-                    estimated_time_saved_minutes=suggestion.get('estimated_time_saved_minutes')
-                )
-
-        # Log successful usage
-        processing_time_ms = int((time.time() - start_time) * 1000)
-        await ai_usage_log_service.log_request(
-            db=db,
-            organization_id=organization_id,
-            project_id=project_id,
-            request_type="script_analysis",
-            endpoint="/api/v1/ai/projects/{project_id}/analyze-script",
-            token_count=len(script_content.split()) * 2,
-            cost_cents=int(len(script_content.split()) * 0.0005),
-            processing_time_ms=processing_time_ms,
-            success=True
-        )
-
-        # Create notification for the user
-        await notification_service.create_for_user(
-            db=db,
-            organization_id=organization_id,
-            profile_id=profile_id,
-            title="script_analysis_complete_title",
-            message="script_analysis_complete_message",
-            type="success",
-            metadata={
-                "analysis_id": str(saved_analysis.id),
-                "characters": len(analysis_result.get("characters", [])),
-                "scenes": len(analysis_result.get("scenes", [])),
-                "analysis_result": analysis_result,
-                "suggestions": suggestions,
-                "project_id": str(project_id)
-            }
-        )
-
-    except Exception as e:
-        # Log failed usage
-        processing_time_ms = int((time.time() - start_time) * 1000)
-        await ai_usage_log_service.log_request(
-            db=db,
-            organization_id=organization_id,
-            project_id=project_id,
-            request_type="script_analysis",
-            endpoint="/api/v1/ai/projects/{project_id}/analyze-script",
-            processing_time_ms=processing_time_ms,
-            success=False,
-            error_message=str(e)
-        )
-        
-        # Create error notification
-        await notification_service.create_for_user(
-            db=db,
-            organization_id=organization_id,
-            profile_id=profile_id,
-            title="script_analysis_failed_title",
-            message="script_analysis_failed_message",
-            type="error",
-            metadata={"error": str(e), "project_id": str(project_id)}
-        )
-
-
 @router.post(
     "/projects/{project_id}/analyze-script",
     dependencies=[Depends(require_owner_admin_or_producer), Depends(require_billing_active)]
 )
 async def analyze_script(
     project_id: UUID,
-    background_tasks: BackgroundTasks,
     organization_id: UUID = Depends(get_current_organization),
     profile = Depends(get_current_profile),
     db: AsyncSession = Depends(get_db),
 ) -> Dict[str, Any]:
     """
     Start AI analysis of a project's script.
-    This runs in the background and sends a notification when complete.
+    This runs as a background job and sends a notification when complete;
+    poll /analysis/status/{request_id} for progress.
     """
     try:
         # Validate project ownership
@@ -605,17 +479,34 @@ async def analyze_script(
         FADE OUT.
         """
 
-        organization = await get_organization_record(profile, db)
-        await ensure_and_reserve_ai_credits(db, organization, credits_to_add=1)
-
-        # Start background processing
-        background_tasks.add_task(
-            process_script_analysis,
-            organization_id,
-            project_id,
-            script_content,
-            profile.id,
-            db
+        # Locked until the request commits, so concurrent requests cannot both pass the check.
+        active = await job_queue.count_active(
+            db, organization_id=organization_id, name=SCRIPT_ANALYSIS_JOB, lock=True
+        )
+        if active >= settings.AI_MAX_ACTIVE_ANALYSES_PER_ORG:
+            raise HTTPException(
+                status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+                detail="Too many script analyses in progress. Wait for one to finish and try again."
+            )
+
+        # Identical re-runs are served from the AI result cache and cost no credits
+        if not await _analysis_and_suggestions_cached(organization_id, project_id, script_content):
+            organization = await get_organization_record(profile, db)
+            await ensure_and_reserve_ai_credits(db, organization, credits_to_add=1)
+
+        # Queue the analysis; the worker runs it with its own session
+        job = await job_queue.enqueue(
+            db,
+            SCRIPT_ANALYSIS_JOB,
+            {
+                "project_id": str(project_id),
+                "profile_id": str(profile.id),
+                "script_content": script_content,
+                "analysis_type": "full",
+            },
+            organization_id=organization_id,
+            queue=SCRIPT_ANALYSIS_QUEUE,
+            max_attempts=1,  # credits are reserved once; the AI engine retries provider errors itself
         )
 
         # Create initial notification
@@ -626,7 +517,7 @@ async def analyze_script(
             title="script_analysis_started_title",
             message="script_analysis_started_message",
             type="info",
-            metadata={"project_id": str(project_id), "status": "processing"}
+            metadata={"project_id": str(project_id), "status": "processing", "request_id": str(job.id)}
         )
 
         return {
@@ -636,9 +527,12 @@ async def analyze_script(
                 en="Script analysis started. Check notifications for results.",
             ),
             "project_id": str(project_id),
+            "request_id": str(job.id),
             "status": "processing"
         }
 
+    except HTTPException:
+        raise
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
@@ -657,17 +551,42 @@ async def get_analysis_status(
     """
     try:
         status_info = await ai_engine_service.get_processing_status(
+            db=db,
             organization_id=organization_id,
             request_id=request_id
         )
-        return status_info
-
     except Exception as e:
         raise HTTPException(
             status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
             detail=f"Failed to get analysis status: {str(e)}"
         )
 
+    if status_info is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Analysis request not found")
+    return status_info
+
+
+@router.post("/analysis/status/{request_id}/cancel", dependencies=[Depends(require_owner_admin_or_producer)])
+async def cancel_analysis(
+    request_id: UUID,
+    organization_id: UUID = Depends(get_current_organization),
+    db: AsyncSession = Depends(get_db),
+) -> Dict[str, Any]:
+    """
+    Cancel a queued or running AI analysis request.
+    Queued requests stop immediately; running ones are stopped by their worker shortly after.
+    """
+    job = await job_queue.get(db, request_id, organization_id)
+    if job is None or job.name != SCRIPT_ANALYSIS_JOB:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Analysis request not found")
+
+    await job_queue.cancel(db, request_id, organization_id)
+    return await ai_engine_service.get_processing_status(
+        db=db,
+        organization_id=organization_id,
+        request_id=str(request_id)
+    )
+
 
 @router.get("/analysis/", dependencies=[Depends(require_owner_admin_or_producer)])
 async def get_ai_analysis(
@@ -928,21 +847,29 @@ async def estimate_budget(
                 detail="Project not found"
             )
 
-        organization = await get_organization_record(profile, db)
-        await ensure_and_reserve_ai_credits(db, organization, credits_to_add=1)
+        project_context = {"project_id": str(request.project_id)}
+        cached = await ai_engine_service.get_cached_budget_estimation(
+            organization_id=organization_id,
+            script_content=request.script_content,
+            estimation_type=request.estimation_type,
+            project_context=project_context,
+        )
+        if cached is None:
+            organization = await get_organization_record(profile, db)
+            await ensure_and_reserve_ai_credits(db, organization, credits_to_add=1)
 
-        # Generate real budget estimation
+        # Generate real budget estimation (served from the result cache when identical)
         result = await ai_engine_service.estimate_project_budget(
             organization_id=organization_id,
             script_content=request.script_content,
             estimation_type=request.estimation_type,
-            project_context={"project_id": str(request.project_id)}
+            project_context=project_context
         )
 
         # ai_engine_service returns {"error": "..."} on failures/timeouts.
         if isinstance(result, dict) and result.get("error"):
             _raise_for_ai_error(str(result["error"]))
-        response_language = _resolve_response_language(
+        response_language = resolve_response_language(
             script_content=request.script_content,
             analysis_result=result,
         )
@@ -1029,54 +956,68 @@ async def generate_shooting_day_suggestions(
                 detail="Project not found"
             )
 
-        organization = await get_organization_record(profile, db)
-        await ensure_and_reserve_ai_credits(db, organization, credits_to_add=1)
-
-        # Generate real shooting day suggestions
-        
         # Determine source data for suggestions
         analysis_data = {}
         response_language = "en"
-        
-        # 1. If script content is provided in request, analyze it on the fly
-        if request.script_content and len(request.script_content.strip()) > 0:
-            analysis_result = await ai_engine_service.analyze_script_content(
-                organization_id=organization_id,
-                script_content=request.script_content,
-                project_id=request.project_id
-            )
-            if isinstance(analysis_result, dict) and analysis_result.get("error"):
-                _raise_for_ai_error(str(analysis_result["error"]))
-            analysis_data = analysis_result
-            response_language = _resolve_response_language(
-                script_content=request.script_content,
-                analysis_result=analysis_result,
-            )
-        else:
-            # 2. Fallback: look for existing analysis in DB
+        project_context = {"project_id": str(request.project_id)}
+        has_script_content = bool(request.script_content and len(request.script_content.strip()) > 0)
+
+        if not has_script_content:
+            # Use the latest existing analysis from the DB
             query = select(ScriptAnalysis).where(
                 ScriptAnalysis.project_id == request.project_id
             ).order_by(ScriptAnalysis.created_at.desc()).limit(1)
             result = await db.execute(query)
             latest_analysis = result.scalar_one_or_none()
-            
+
             if latest_analysis and latest_analysis.analysis_result:
                 analysis_data = latest_analysis.analysis_result
-                response_language = _resolve_response_language(
+                response_language = resolve_response_language(
                     analysis_result=analysis_data,
                 )
 
-        if not analysis_data:
-            raise HTTPException(
-                status_code=status.HTTP_400_BAD_REQUEST,
-                detail="No script analysis available. Provide script_content or run script analysis first.",
+            if not analysis_data:
+                raise HTTPException(
+                    status_code=status.HTTP_400_BAD_REQUEST,
+                    detail="No script analysis available. Provide script_content or run script analysis first.",
+                )
+
+        # Identical requests are served from the AI result cache and cost no credits
+        if has_script_content:
+            fully_cached = await _analysis_and_suggestions_cached(
+                organization_id, request.project_id, request.script_content
+            )
+        else:
+            fully_cached = await ai_engine_service.get_cached_production_suggestions(
+                organization_id=organization_id,
+                script_analysis=analysis_data,
+                project_context=project_context,
+                response_language=response_language,
+            ) is not None
+        if not fully_cached:
+            organization = await get_organization_record(profile, db)
+            await ensure_and_reserve_ai_credits(db, organization, credits_to_add=1)
+
+        # If script content is provided in request, analyze it on the fly
+        if has_script_content:
+            analysis_result = await ai_engine_service.analyze_script_content(
+                organization_id=organization_id,
+                script_content=request.script_content,
+                project_id=request.project_id
+            )
+            if isinstance(analysis_result, dict) and analysis_result.get("error"):
+                _raise_for_ai_error(str(analysis_result["error"]))
+            analysis_data = analysis_result
+            response_language = resolve_response_language(
+                script_content=request.script_content,
+                analysis_result=analysis_result,
             )
 
         # Generate suggestions based on the analysis data (new or existing)
         suggestions = await ai_engine_service.suggest_production_elements(
             organization_id=organization_id,
             script_analysis=analysis_data,
-            project_context={"project_id": str(request.project_id)},
+            project_context=project_context,
             response_language=response_language,
         )
         if isinstance(suggestions, dict) and suggestions.get("error"):
@@ -1196,7 +1137,7 @@ async def analyze_script_content(
             duplicate_result = await db.execute(duplicate_query)
             duplicate_analysis = duplicate_result.scalar_one_or_none()
             if duplicate_analysis:
-                duplicate_language = _resolve_response_language(
+                duplicate_language = resolve_response_language(
                     script_content=request.script_content,
                     analysis_result=duplicate_analysis.analysis_result,
                 )
@@ -1213,8 +1154,18 @@ async def analyze_script_content(
                     "deduplicated": True,
                 }
 
-        organization = await get_organization_record(profile, db)
-        await ensure_and_reserve_ai_credits(db, organization, credits_to_add=1)
+        # Identical content analyzed before (e.g. in another project) is served
+        # from the AI result cache and costs no credits; force_new bypasses it.
+        cached = None
+        if not request.force_new:
+            cached = await ai_engine_service.get_cached_script_analysis(
+                organization_id=organization_id,
+                script_content=request.script_content,
+                analysis_type=request.analysis_type,
+            )
+        if cached is None:
+            organization = await get_organization_record(profile, db)
+            await ensure_and_reserve_ai_credits(db, organization, credits_to_add=1)
 
         # Analyze the script with AI
         analysis_result = await ai_engine_service.analyze_script_content(
@@ -1222,12 +1173,13 @@ async def analyze_script_content(
             script_content=request.script_content,
             project_id=request.project_id,
             analysis_type=request.analysis_type,
+            use_cache=not request.force_new,
         )
 
         # ai_engine_service returns a structured dict with "error" on failures/timeouts.
         if isinstance(analysis_result, dict) and analysis_result.get("error"):
             _raise_for_ai_error(str(analysis_result["error"]))
-        response_language = _resolve_response_language(
+        response_language = resolve_response_language(
             script_content=request.script_content,
             analysis_result=analysis_result,
         )
@@ -1437,8 +1389,13 @@ async def analyze_text_content(
                 detail="Text too long for synchronous analysis. Use project script analysis instead."
             )
 
-        organization = await get_organization_record(profile, db)
-        await ensure_and_reserve_ai_credits(db, organization, credits_to_add=1)
+        cached = await ai_engine_service.get_cached_script_analysis(
+            organization_id=organization_id,
+            script_content=request.text,
+        )
+        if cached is None:
+            organization = await get_organization_record(profile, db)
+            await ensure_and_reserve_ai_credits(db, organization, credits_to_add=1)
 
         result = await ai_engine_service.analyze_script_content(
             organization_id=organization_id,
@@ -1,4 +1,5 @@
 """Billing and Stripe webhook endpoints."""
+import json
 import logging
 from datetime import datetime, timezone
 from typing import Optional
@@ -22,6 +23,7 @@ from app.schemas.billing import (
     BillingPurchaseResponse,
 )
 from app.services import billing as billing_service
+from app.services.billing_events import SOURCE_BILLING, billing_event_service
 from app.api.deps import get_organization_record
 
 logger = logging.getLogger(__name__)
@@ -46,7 +48,10 @@ async def stripe_webhook(
     db: AsyncSession = Depends(get_db)
 ) -> dict[str, str]:
     """
-    Handle Stripe webhook events.
+    Receive Stripe webhook events.
+
+    The verified event is stored in the billing_events inbox and acknowledged;
+    app/services/billing_events.py processes it asynchronously.
     """
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
@@ -81,42 +86,15 @@ async def stripe_webhook(
             detail="Invalid signature"
         )
 
-    event_id = event["id"]
-    event_type = event["type"]
-    event_data = event["data"]
-
-    logger.info(f"Received webhook event: {event_type} ({event_id})")
-
-    if await billing_service.is_event_processed(db, event_id):
-        logger.info(f"Event {event_id} already processed, skipping")
-        return {"status": "success", "message": "Event already processed"}
-
-    billing_event = await billing_service.record_billing_event(
-        db, event_id, event_type, "received"
-    )
-
-    try:
-        handler = billing_service.EVENT_HANDLERS.get(event_type)
-        if handler:
-            await handler(db, event_data)
-            await billing_service.mark_event_processed(db, billing_event)
-            await db.commit()
-            logger.info(f"Successfully processed event {event_id}")
-        else:
-            logger.info(f"No handler for event type: {event_type}")
-            await billing_service.mark_event_processed(db, billing_event)
-            await db.commit()
-
-        return {"status": "success"}
+    # Handlers run in the worker's billing-webhook-events drain loop; acknowledging
+    # here is a single insert whatever the event type.
+    inserted = await billing_event_service.ingest(db, json.loads(payload), source=SOURCE_BILLING)
+    await db.commit()
 
-    except Exception as e:
-        logger.error(f"Failed to process event {event_id}: {e}", exc_info=True)
-        await billing_service.mark_event_failed(db, billing_event)
-        await db.commit()
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail="Webhook processing failed"
-        )
+    logger.info(f"Received webhook event: {event['type']} ({event['id']})")
+    if not inserted:
+        return {"status": "success", "message": "Event already received"}
+    return {"status": "success"}
 
 
 @router.post("/create-checkout-session", response_model=CheckoutSessionResponse, dependencies=[Depends(require_billing_checkout())])
@@ -61,12 +61,10 @@ async def get_financial_dashboard(
 
     Returns current month and year-to-date financial performance.
     """
-    # This would call a specific financial analytics method
-    # For now, return a subset of the full dashboard
-    full_dashboard = await analytics_service.get_executive_dashboard(
+    section_data = await analytics_service.get_dashboard_section(
         organization_id=profile.organization_id,
+        section="financial",
         db=db,
-        months_back=1
     )
 
     if settings.ENABLE_SERVER_TIMING:
@@ -74,7 +72,7 @@ async def get_financial_dashboard(
         if cache_status:
             response.headers["X-Dashboard-Cache"] = cache_status
 
-    return full_dashboard["financial"]
+    return section_data
 
 
 @router.get("/executive/production", response_model=Dict[str, Any], dependencies=[Depends(require_admin_producer_or_finance)])
@@ -88,12 +86,10 @@ async def get_production_dashboard(
 
     Returns project status, active productions, and efficiency metrics.
     """
-    # This would call a specific production analytics method
-    # For now, return a subset of the full dashboard
-    full_dashboard = await analytics_service.get_executive_dashboard(
+    section_data = await analytics_service.get_dashboard_section(
         organization_id=profile.organization_id,
+        section="production",
         db=db,
-        months_back=1
     )
 
     if settings.ENABLE_SERVER_TIMING:
@@ -101,7 +97,7 @@ async def get_production_dashboard(
         if cache_status:
             response.headers["X-Dashboard-Cache"] = cache_status
 
-    return full_dashboard["production"]
+    return section_data
 
 
 @router.get("/executive/inventory", response_model=Dict[str, Any], dependencies=[Depends(require_admin_producer_or_finance)])
@@ -115,12 +111,10 @@ async def get_inventory_dashboard(
 
     Returns equipment health, maintenance status, and utilization rates.
     """
-    # This would call a specific inventory analytics method
-    # For now, return a subset of the full dashboard
-    full_dashboard = await analytics_service.get_executive_dashboard(
+    section_data = await analytics_service.get_dashboard_section(
         organization_id=profile.organization_id,
+        section="inventory",
         db=db,
-        months_back=1
     )
 
     if settings.ENABLE_SERVER_TIMING:
@@ -128,7 +122,7 @@ async def get_inventory_dashboard(
         if cache_status:
             response.headers["X-Dashboard-Cache"] = cache_status
 
-    return full_dashboard["inventory"]
+    return section_data
 
 
 @router.get("/executive/cloud", response_model=Dict[str, Any], dependencies=[Depends(require_admin_producer_or_finance)])
@@ -142,12 +136,10 @@ async def get_cloud_dashboard(
 
     Returns sync success rates, storage usage, and cloud health status.
     """
-    # This would call a specific cloud analytics method
-    # For now, return a subset of the full dashboard
-    full_dashboard = await analytics_service.get_executive_dashboard(
+    section_data = await analytics_service.get_dashboard_section(
         organization_id=profile.organization_id,
+        section="cloud",
         db=db,
-        months_back=1
     )
 
     if settings.ENABLE_SERVER_TIMING:
@@ -155,4 +147,4 @@ async def get_cloud_dashboard(
         if cache_status:
             response.headers["X-Dashboard-Cache"] = cache_status
 
-    return full_dashboard["cloud"]
+    return section_data
@@ -14,6 +14,7 @@ from app.services.financial_advanced import (
     tax_table_service, invoice_service, financial_report_service
 )
 from app.services.financial import transaction_service
+from app.services.pdf_renderer import PDFRenderError
 from app.schemas.financial import (
     TaxTable, TaxTableCreate, TaxTableUpdate,
     Invoice, InvoiceCreate, InvoiceUpdate, InvoiceWithItems,
@@ -853,7 +854,8 @@ async def generate_invoice_pdf(
     if not regenerate:
         existing = await invoice_pdf_service.get_existing_pdf_url(
             organization_id=str(organization_id),
-            invoice_id=str(invoice_id)
+            invoice_id=str(invoice_id),
+            db=db
         )
         if existing:
             return {
@@ -892,7 +894,14 @@ async def generate_invoice_pdf(
             "pdf_path": pdf_result["pdf_path"],
             "size_bytes": pdf_result["size_bytes"],
             "filename": pdf_result["filename"],
+            "cached": pdf_result["cached"],
         }
+    except PDFRenderError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except RuntimeError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -939,7 +948,8 @@ async def get_invoice_pdf(
     existing = await invoice_pdf_service.get_existing_pdf_url(
         organization_id=str(organization_id),
         invoice_id=str(invoice_id),
-        expires_in=60 if download else 3600
+        expires_in=60 if download else 3600,
+        db=db
     )
 
     if not existing:
@@ -1046,24 +1056,13 @@ async def send_invoice_email(
     """
     Send an invoice to the recipient via email with PDF attached.
     If the invoice is in 'draft' status, it will be updated to 'sent'.
+
+    The email is queued in the outbox with the status change and delivered
+    (PDF rendering included) by the background worker.
     """
-    from app.services.invoice_pdf import invoice_pdf_service
     from app.services.email_service import send_invoice_email as _send_email
-    from sqlalchemy.orm import selectinload
-    from app.models.financial import Invoice as InvoiceModel
-    from sqlalchemy import select as sa_select
-    from app.models.organizations import Organization
 
-    # Get invoice with items and client
-    invoice = await invoice_service.get(
-        db=db,
-        organization_id=organization_id,
-        id=invoice_id,
-        options=[
-            selectinload(InvoiceModel.items),
-            selectinload(InvoiceModel.client),
-        ]
-    )
+    invoice = await invoice_service.get(db=db, organization_id=organization_id, id=invoice_id)
 
     if not invoice:
         raise HTTPException(
@@ -1071,71 +1070,44 @@ async def send_invoice_email(
             detail="Invoice not found"
         )
 
-    # Get organization for PDF generation
-    org_result = await db.execute(
-        sa_select(Organization).where(Organization.id == organization_id)
-    )
-    organization = org_result.scalar_one_or_none()
-
-    if not organization:
-        raise HTTPException(
-            status_code=status.HTTP_404_NOT_FOUND,
-            detail="Organization not found"
-        )
+    # Build email HTML body
+    html_body = f"""
+    <div style="font-family: sans-serif; max-width: 600px; margin: 0 auto;">
+        <p>{body.message.replace(chr(10), '<br>')}</p>
+        <hr style="border: none; border-top: 1px solid #eee; margin: 24px 0;" />
+        <p style="color: #888; font-size: 12px;">
+            This email was sent via Produzo. The invoice PDF is attached.
+        </p>
+    </div>
+    """
 
     try:
-        # Generate PDF bytes
-        pdf_bytes = await invoice_pdf_service.generate_pdf(
-            invoice=invoice,
-            organization=organization,
-            client=invoice.client,
-            items=list(invoice.items) if invoice.items else [],
-            locale="pt-BR"
-        )
-
-        pdf_filename = f"invoice_{invoice.invoice_number}.pdf"
-
-        # Build email HTML body
-        html_body = f"""
-        <div style="font-family: sans-serif; max-width: 600px; margin: 0 auto;">
-            <p>{body.message.replace(chr(10), '<br>')}</p>
-            <hr style="border: none; border-top: 1px solid #eee; margin: 24px 0;" />
-            <p style="color: #888; font-size: 12px;">
-                This email was sent via Produzo. The invoice PDF is attached.
-            </p>
-        </div>
-        """
-
-        # Send via Resend
-        _send_email(
+        email_id = await _send_email(
+            db,
+            organization_id=organization_id,
+            invoice_id=invoice_id,
+            invoice_number=invoice.invoice_number,
             to=body.recipient_email,
             subject=body.subject,
             html_body=html_body,
-            pdf_bytes=pdf_bytes,
-            pdf_filename=pdf_filename,
         )
-
-        # Update status to "sent" if currently "draft"
-        if invoice.status == "draft":
-            await invoice_service.update(
-                db=db,
-                organization_id=organization_id,
-                id=invoice_id,
-                obj_in={"status": "sent"},
-            )
-
-        return {
-            "status": "sent",
-            "recipient_email": body.recipient_email,
-        }
-
     except RuntimeError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
             detail=str(e)
         )
-    except Exception as e:
-        raise HTTPException(
-            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
-            detail=f"Failed to send invoice email: {str(e)}"
+
+    # Update status to "sent" if currently "draft"
+    if invoice.status == "draft":
+        await invoice_service.update(
+            db=db,
+            organization_id=organization_id,
+            id=invoice_id,
+            obj_in={"status": "sent"},
         )
+
+    return {
+        "status": "queued",
+        "recipient_email": body.recipient_email,
+        "email_id": str(email_id),
+    }
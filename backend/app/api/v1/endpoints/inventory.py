@@ -1,10 +1,11 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, status, Query, BackgroundTasks, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import get_current_profile, require_owner_admin_or_producer, require_read_only, require_billing_active
 from app.db.session import get_db
+from app.services.base import NEXT_CURSOR_HEADER
 from app.services.maintenance import (
     kit_item_service, maintenance_service, inventory_health_service
 )
@@ -20,8 +21,10 @@ router = APIRouter()
 
 @router.get("/items/", response_model=List[KitItem], dependencies=[Depends(require_read_only)])
 async def get_kit_items(
+    response: Response,
     profile=Depends(get_current_profile),
     db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description=f"Next page cursor (from the {NEXT_CURSOR_HEADER} header)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     kit_id: UUID = None,
@@ -40,13 +43,20 @@ async def get_kit_items(
     if health_status:
         filters["health_status"] = health_status
 
-    kit_items = await kit_item_service.get_multi(
-        db=db,
-        organization_id=organization_id,
-        skip=skip,
-        limit=limit,
-        filters=filters
-    )
+    try:
+        kit_items, next_cursor = await kit_item_service.get_page(
+            db=db,
+            organization_id=organization_id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            filters=filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return kit_items
 
 
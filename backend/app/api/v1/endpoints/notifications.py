@@ -71,6 +71,27 @@ async def get_notification_stats(
     )
 
 
+@router.get("/{notification_id}", response_model=Notification, dependencies=[Depends(require_billing_read())])
+async def get_notification(
+    notification_id: UUID,
+    profile = Depends(get_current_profile),
+    db: AsyncSession = Depends(get_db),
+) -> Notification:
+    """
+    Get one notification of the current user (e.g. when a WebSocket
+    message arrived with metadata_truncated).
+    """
+    notification = await notification_service.get(
+        db=db, organization_id=profile.organization_id, id=notification_id
+    )
+    if not notification or notification.profile_id != profile.id:
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail="Notification not found or does not belong to you"
+        )
+    return notification
+
+
 @router.patch("/{notification_id}/read", dependencies=[Depends(require_billing_active())])
 async def mark_notification_as_read(
     notification_id: UUID,
@@ -1,6 +1,6 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy import delete, select, update
 from sqlalchemy.exc import IntegrityError
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -31,43 +31,52 @@ from app.models.projects import project_services
 from app.models.scheduling import ShootingDay as ShootingDayModel
 from app.models.transactions import Transaction as TransactionModel
 from app.modules.commercial.service import project_service, client_service
+from app.services.base import NEXT_CURSOR_HEADER
 from app.services.entitlements import ensure_and_reserve_resource_limit, increment_usage_count
-from app.schemas.projects import Project, ProjectCreate, ProjectUpdate, ProjectWithClient, ProjectStats
+from app.services.project_stats import project_stats_service
+from app.schemas.projects import Project, ProjectCreate, ProjectUpdate, ProjectWithClient, ProjectStats, ProjectStatsEntry
 
 router = APIRouter()
 
+# Most project ids accepted by GET /projects/stats in one call
+MAX_STATS_BATCH = 200
+
 
 @router.get("/", response_model=List[ProjectWithClient], dependencies=[Depends(require_read_only)])
 async def get_projects(
+    response: Response,
     organization_id: UUID = Depends(get_current_organization),
     profile=Depends(get_current_profile),
     db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description=f"Next page cursor (from the {NEXT_CURSOR_HEADER} header)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
 ) -> List[ProjectWithClient]:
     """
     Get all projects for the current user's organization with client data.
     """
+    filters = None
     if get_effective_role(profile) == "freelancer":
         assigned_project_ids = await get_assigned_project_ids(db, profile)
         if not assigned_project_ids:
             return []
-        projects = await project_service.get_multi(
+        filters = {"id": assigned_project_ids}
+
+    try:
+        projects, next_cursor = await project_service.get_page(
             db=db,
             organization_id=organization_id,
+            cursor=cursor,
             skip=skip,
             limit=limit,
             options=[selectinload(ProjectModel.client)],
-            filters={"id": assigned_project_ids}
-        )
-    else:
-        projects = await project_service.get_multi(
-            db=db,
-            organization_id=organization_id,
-            skip=skip,
-            limit=limit,
-            options=[selectinload(ProjectModel.client)]
+            filters=filters
         )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return projects
 
 
@@ -148,6 +157,38 @@ async def get_pending_budget_projects(
 
 
 
+@router.get("/stats", response_model=List[ProjectStatsEntry], dependencies=[Depends(require_read_only)])
+async def get_projects_stats(
+    project_ids: List[UUID] = Query(..., description="Projects to report on (repeat the parameter)"),
+    organization_id: UUID = Depends(get_current_organization),
+    profile=Depends(get_current_profile),
+    db: AsyncSession = Depends(get_db),
+) -> List[ProjectStatsEntry]:
+    """
+    Get statistics for several projects in one call (e.g. the project list).
+
+    Unknown projects, and projects a freelancer is not assigned to, are left out.
+    """
+    if len(project_ids) > MAX_STATS_BATCH:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=f"At most {MAX_STATS_BATCH} project ids per request"
+        )
+
+    if get_effective_role(profile) == "freelancer":
+        assigned_project_ids = set(await get_assigned_project_ids(db, profile))
+        project_ids = [project_id for project_id in project_ids if project_id in assigned_project_ids]
+
+    stats = await project_stats_service.get_many(
+        db, organization_id=organization_id, project_ids=project_ids
+    )
+    return [
+        ProjectStatsEntry(project_id=project_id, **stats[project_id])
+        for project_id in dict.fromkeys(project_ids)
+        if project_id in stats
+    ]
+
+
 @router.get("/{project_id}", response_model=ProjectWithClient, dependencies=[Depends(require_read_only)])
 async def get_project(
     project_id: UUID,
@@ -356,64 +397,15 @@ async def get_project_stats(
     """
     Get statistics for a project (scenes, characters, shooting days, etc.).
     """
-    from sqlalchemy import func
-    from app.schemas.projects import ProjectStats
-    
-    # Check if project exists and belongs to organization
-    validation = await db.execute(
-        select(ProjectModel.id)
-        .where(ProjectModel.id == project_id)
-        .where(ProjectModel.organization_id == organization_id)
+    stats = await project_stats_service.get_many(
+        db, organization_id=organization_id, project_ids=[project_id]
     )
-    if not validation.scalar_one_or_none():
+    if project_id not in stats:
         raise HTTPException(
             status_code=status.HTTP_404_NOT_FOUND,
             detail="Project not found"
         )
-
-    # 1. Scenes Count
-    scenes_result = await db.execute(
-        select(func.count(SceneModel.id))
-        .where(SceneModel.project_id == project_id)
-    )
-    scenes_count = scenes_result.scalar() or 0
-
-    # 2. Characters Count
-    chars_result = await db.execute(
-        select(func.count(CharacterModel.id))
-        .where(CharacterModel.project_id == project_id)
-    )
-    chars_count = chars_result.scalar() or 0
-
-    # 3. Shooting Days (Total)
-    days_result = await db.execute(
-        select(func.count(ShootingDayModel.id))
-        .where(ShootingDayModel.project_id == project_id)
-    )
-    days_count = days_result.scalar() or 0
-
-    # 4. Confirmed Shooting Days
-    confirmed_days_result = await db.execute(
-        select(func.count(ShootingDayModel.id))
-        .where(ShootingDayModel.project_id == project_id)
-        .where(ShootingDayModel.status == 'confirmed')
-    )
-    confirmed_days_count = confirmed_days_result.scalar() or 0
-
-    # 5. Team Count (Stakeholders)
-    team_result = await db.execute(
-        select(func.count(StakeholderModel.id))
-        .where(StakeholderModel.project_id == project_id)
-    )
-    team_count = team_result.scalar() or 0
-
-    return ProjectStats(
-        scenes_count=scenes_count,
-        characters_count=chars_count,
-        shooting_days_count=days_count,
-        confirmed_shooting_days_count=confirmed_days_count,
-        team_count=team_count
-    )
+    return ProjectStats(**stats[project_id])
 
 # =============================================================================
 # Budget Approval Endpoints
@@ -21,6 +21,7 @@ from app.schemas.proposals import (
     ProposalWithClient, ProposalApproval
 )
 from app.services.entitlements import ensure_and_reserve_resource_limit, increment_usage_count
+from app.services.pdf_renderer import PDFRenderError
 
 router = APIRouter()
 
@@ -306,8 +307,15 @@ async def generate_proposal_pdf(
             "signed_url": result["signed_url"],
             "pdf_path": result["pdf_path"],
             "version": result["version"],
-            "size_bytes": result["size_bytes"]
+            "size_bytes": result["size_bytes"],
+            "cached": result["cached"]
         }
+    except PDFRenderError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except RuntimeError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -16,6 +16,7 @@ from app.api.deps import (
 )
 from app.db.session import get_db
 from app.services.production import shooting_day_service, production_service
+from app.services.pdf_renderer import PDFRenderError
 from app.schemas.production import (
     ShootingDay,
     ShootingDayCreate,
@@ -558,7 +559,8 @@ async def generate_shooting_day_pdf(
     if not regenerate:
         existing = await shooting_day_pdf_service.get_existing_pdf_url(
             organization_id=str(organization_id),
-            shooting_day_id=str(shooting_day_id)
+            shooting_day_id=str(shooting_day_id),
+            db=db
         )
         if existing:
             return {
@@ -613,7 +615,14 @@ async def generate_shooting_day_pdf(
             "pdf_path": pdf_result["pdf_path"],
             "size_bytes": pdf_result["size_bytes"],
             "filename": pdf_result["filename"],
+            "cached": pdf_result["cached"],
         }
+    except PDFRenderError as e:
+        raise HTTPException(
+            status_code=e.status_code,
+            detail=str(e),
+            headers={"Retry-After": str(e.retry_after)},
+        )
     except RuntimeError as e:
         raise HTTPException(
             status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
@@ -660,7 +669,8 @@ async def get_shooting_day_pdf(
     existing = await shooting_day_pdf_service.get_existing_pdf_url(
         organization_id=str(organization_id),
         shooting_day_id=str(shooting_day_id),
-        expires_in=60 if download else 3600
+        expires_in=60 if download else 3600,
+        db=db
     )
 
     if not existing:
@@ -1,6 +1,5 @@
 from typing import Optional
-from uuid import UUID, uuid4
-from datetime import datetime, timezone
+from uuid import UUID
 from fastapi import APIRouter, Depends, HTTPException, status, UploadFile, File, Form
 from sqlalchemy.ext.asyncio import AsyncSession
 
@@ -14,9 +13,11 @@ from app.api.deps import (
 )
 from app.db.session import get_db
 from app.services.storage import storage_service
+from app.services.pdf_cache import pdf_cache_service
 from app.services.entitlements import ensure_and_reserve_storage_capacity, decrement_storage_usage
 from app.schemas.storage import (
     FileUploadResponse, SignedUrlRequest, SignedUrlResponse,
+    SignedUrlBatchRequest, SignedUrlBatchResponse,
 )
 
 router = APIRouter()
@@ -36,15 +37,15 @@ async def upload_file(
     db: AsyncSession = Depends(get_db),
 ) -> FileUploadResponse:
     """
-    Upload a file to Supabase Storage with multi-tenant path.
+    Upload a file to storage with multi-tenant path.
     Automatically determines bucket based on file type.
+    The file is streamed to storage in chunks rather than read into memory.
     """
     try:
-        # Read file content
-        file_content = await file.read()
+        file_size = await storage_service.get_upload_size(file)
 
         organization = await get_organization_record(profile, db)
-        await ensure_and_reserve_storage_capacity(db, organization, bytes_to_add=len(file_content))
+        await ensure_and_reserve_storage_capacity(db, organization, bytes_to_add=file_size)
 
         # Determine bucket based on module/file type
         if module == "kits":
@@ -53,13 +54,13 @@ async def upload_file(
             bucket = "production-files"  # Scripts, PDFs, etc. are private
 
         # Upload file
-        result = await storage_service.upload_file(
+        result = await storage_service.upload_stream(
             organization_id=str(organization_id),
             module=module,
-            filename=file.filename,
-            file_content=file_content,
+            upload=file,
             bucket=bucket,
-            entity_id=entity_id
+            entity_id=entity_id,
+            size_bytes=file_size,
         )
 
         return FileUploadResponse(**result)
@@ -94,7 +95,7 @@ async def generate_signed_url(
                 detail="Access denied: file does not belong to your organization"
             )
 
-        signed_url = await storage_service.generate_signed_url(
+        signed_url, expires_in = await storage_service.generate_signed_url_with_expiry(
             bucket=request.bucket,
             file_path=request.file_path,
             expires_in=request.expires_in
@@ -102,7 +103,7 @@ async def generate_signed_url(
 
         return SignedUrlResponse(
             signed_url=signed_url,
-            expires_in=request.expires_in,
+            expires_in=expires_in,
             file_path=request.file_path,
             bucket=request.bucket
         )
@@ -119,6 +120,45 @@ async def generate_signed_url(
         )
 
 
+@router.post("/sign-urls", response_model=SignedUrlBatchResponse, dependencies=[Depends(require_read_only)])
+async def generate_signed_urls(
+    request: SignedUrlBatchRequest,
+    organization_id: UUID = Depends(get_organization_from_profile),
+) -> SignedUrlBatchResponse:
+    """
+    Generate temporary signed URLs for several private files in one call.
+    Validates that every file belongs to the requesting organization.
+    """
+    if any(not path.startswith(str(organization_id)) for path in request.file_paths):
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Access denied: file does not belong to your organization"
+        )
+
+    try:
+        signed_urls, expires_in = await storage_service.generate_signed_urls_with_expiry(
+            bucket=request.bucket,
+            file_paths=request.file_paths,
+            expires_in=request.expires_in
+        )
+    except ValueError as e:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail=str(e)
+        )
+    except Exception as e:
+        raise HTTPException(
+            status_code=status.HTTP_500_INTERNAL_SERVER_ERROR,
+            detail=f"Signed URL generation failed: {str(e)}"
+        )
+
+    return SignedUrlBatchResponse(
+        signed_urls=signed_urls,
+        expires_in=expires_in,
+        bucket=request.bucket
+    )
+
+
 @router.get("/list/{module}", dependencies=[Depends(require_read_only)])
 async def list_files(
     module: str,
@@ -165,97 +205,21 @@ async def list_files(
             # Fallback if Supabase fails (or folder doesn't exist)
             pass
 
-    # 2. Fetch from Google Drive (CloudFileReference) & Sync
-        from sqlalchemy import select
-        from app.models.cloud import CloudFileReference, ProjectDriveFolder
-        from app.services.google_drive import google_drive_service
-        
-        # Determine if we can sync from a Drive folder
-        drive_folder_id = None
-        if entity_id:
+        # Sign every listed file in one round-trip (cached URLs are reused).
+        if enriched_files:
             try:
-                project_id = UUID(entity_id)
-                project_folder_query = select(ProjectDriveFolder).where(
-                    ProjectDriveFolder.project_id == project_id,
-                    ProjectDriveFolder.organization_id == organization_id
+                access_urls = await storage_service.get_access_urls(
+                    bucket, [f["path"] for f in enriched_files]
                 )
-                pf_result = await db.execute(project_folder_query)
-                pf = pf_result.scalar_one_or_none()
-                
-                if pf:
-                    # Map module to folder column
-                    # Frontend parses 'shooting-days' -> DB 'shooting_days_folder_id'
-                    module_key = module.replace("-", "_")
-                    drive_folder_id = getattr(pf, f"{module_key}_folder_id", None)
-            except (ValueError, AttributeError):
-                pass
+            except Exception:
+                access_urls = {}
+            for enriched in enriched_files:
+                enriched["access_url"] = access_urls.get(enriched["path"])
 
-        # 2a. Sync: List files from Drive API and create missing DB records
-        active_drive_ids = set()
-        sync_successful = False
-
-        if drive_folder_id:
-            try:
-                drive_api_files = await google_drive_service.list_folder_files(
-                    organization_id=organization_id,
-                    folder_id=drive_folder_id,
-                    db=db
-                )
-                
-                if drive_api_files is not None:
-                    sync_successful = True
-                    # Get existing refs to compare
-                    existing_refs_query = select(CloudFileReference).where(
-                        CloudFileReference.organization_id == organization_id,
-                        CloudFileReference.module == module,
-                        CloudFileReference.project_id == project_id  # We know project_id is valid here
-                    )
-                    existing_result = await db.execute(existing_refs_query)
-                    existing_refs = existing_result.scalars().all()
-                    existing_map = {ref.external_id: ref for ref in existing_refs if ref.external_id}
-                    
-                    # Identify new files
-                    new_refs = []
-                    for f in drive_api_files:
-                        f_id = f.get("id")
-                        if not f_id:
-                            continue
-                        active_drive_ids.add(f_id)
-                        
-                        if f_id not in existing_map:
-                            # Create new reference
-                            size_str = f.get("size", "0")
-                            try:
-                                # Convert timestamp (e.g. 2023-10-25T12:00:00.000Z)
-                                created_time = datetime.fromisoformat(f.get("createdTime", "").replace("Z", "+00:00"))
-                            except Exception:
-                                created_time = datetime.now(timezone.utc)
-
-                            new_ref = CloudFileReference(
-                                id=uuid4(),
-                                organization_id=organization_id,
-                                project_id=project_id,
-                                module=module,
-                                file_name=f.get("name", "Untitled"),
-                                file_size=size_str,
-                                mime_type=f.get("mimeType", "application/octet-stream"),
-                                storage_provider="google_drive",
-                                external_id=f_id,
-                                external_url=f.get("webViewLink"),
-                                thumbnail_path=None, # generic icon
-                                created_at=created_time,
-                                updated_at=datetime.now(timezone.utc)
-                            )
-                            new_refs.append(new_ref)
-                            db.add(new_ref)
-                    
-                    if new_refs:
-                        await db.commit()
-            except Exception as e:
-                # Log usage but don't fail the whole list request
-                pass
+        # 2. Google Drive files, kept up to date by the background Drive sync
+        from sqlalchemy import select
+        from app.models.cloud import CloudFileReference
 
-        # 2b. Fetch final list from DB (now including synced files)
         query = select(CloudFileReference).where(
             CloudFileReference.organization_id == organization_id,
             CloudFileReference.module == module
@@ -272,11 +236,6 @@ async def list_files(
         drive_files = result.scalars().all()
 
         for df in drive_files:
-            # Filter Orphans: If sync was successful (we listed folder) and file has external_id
-            # but is missing from active_drive_ids, it was deleted from Drive. Hide it.
-            if sync_successful and df.external_id and df.external_id not in active_drive_ids:
-                 continue
-
             enriched_files.append({
                  "name": df.file_name,
                  "path": str(df.id), # Use Reference ID as path
@@ -371,6 +330,12 @@ async def delete_file(
         if success:
             if file_size:
                 await decrement_storage_usage(db, organization_id, bytes_removed=file_size)
+            await pdf_cache_service.forget_path(
+                db,
+                organization_id=organization_id,
+                bucket=bucket,
+                file_path=file_path,
+            )
             return {"message": "File deleted successfully", "file_path": file_path}
         else:
             raise HTTPException(
@@ -6,6 +6,7 @@ Provides:
 - Payment status checking
 - Webhook handler for connected account events
 """
+import json
 import logging
 from uuid import UUID
 
@@ -27,7 +28,7 @@ from app.core.config import settings
 from app.models.financial import Invoice
 from app.models.profiles import Profile
 from app.services import stripe_connect as connect_service
-from app.services.billing import is_event_processed, record_billing_event, mark_event_processed, mark_event_failed
+from app.services.billing_events import SOURCE_CONNECT, billing_event_service
 
 logger = logging.getLogger(__name__)
 router = APIRouter()
@@ -311,7 +312,8 @@ async def stripe_connect_webhook(
     endpoint. It handles events from connected accounts (e.g., payment completion).
 
     Security: Verifies webhook signature using STRIPE_CONNECT_WEBHOOK_SECRET.
-    Idempotency: Checks BillingEvent table to prevent duplicate processing.
+    Processing: The event is stored in the billing_events inbox and handled
+    asynchronously (app/services/billing_events.py); redeliveries are no-ops.
     """
     payload = await request.body()
     sig_header = request.headers.get("stripe-signature")
@@ -348,39 +350,11 @@ async def stripe_connect_webhook(
             detail="Invalid signature"
         )
 
-    event_id = event["id"]
-    event_type = event["type"]
-    event_data = event["data"]
-
-    logger.info(f"Received Connect webhook event: {event_type} ({event_id})")
-
-    # Check idempotency
-    if await is_event_processed(db, event_id):
-        logger.info(f"Connect event {event_id} already processed, skipping")
-        return {"status": "success", "message": "Event already processed"}
-
-    # Record event
-    billing_event = await record_billing_event(
-        db, event_id, event_type, "received"
-    )
-
-    try:
-        handler = connect_service.CONNECT_EVENT_HANDLERS.get(event_type)
-        if handler:
-            await handler(db, event_data)
-            await mark_event_processed(db, billing_event)
-            await db.commit()
-            logger.info(f"Successfully processed Connect event {event_id}")
-        else:
-            logger.info(f"No handler for Connect event type: {event_type}")
-            await mark_event_processed(db, billing_event)
-            await db.commit()
-
-        return {"status": "success"}
+    # Queued for the worker, which runs CONNECT_EVENT_HANDLERS in per-account order.
+    inserted = await billing_event_service.ingest(db, json.loads(payload), source=SOURCE_CONNECT)
+    await db.commit()
 
-    except Exception as e:
-        logger.error(f"Failed to process Connect event {event_id}: {e}", exc_info=True)
-        await mark_event_failed(db, billing_event)
-        await db.commit()
-        # Return 200 so Stripe doesn't retry
-        return {"status": "error", "message": str(e)}
+    logger.info(f"Received Connect webhook event: {event['type']} ({event['id']})")
+    if not inserted:
+        return {"status": "success", "message": "Event already received"}
+    return {"status": "success"}
@@ -1,7 +1,7 @@
-from typing import List
+from typing import List, Optional
 from uuid import UUID
 from datetime import date
-from fastapi import APIRouter, Depends, HTTPException, status, Query
+from fastapi import APIRouter, Depends, HTTPException, status, Query, Response
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.api.deps import (
@@ -12,6 +12,7 @@ from app.api.deps import (
     get_current_user_id
 )
 from app.db.session import get_db
+from app.services.base import NEXT_CURSOR_HEADER
 from app.services.financial import transaction_service
 from app.schemas.transactions import (
     TransactionCreate,
@@ -27,8 +28,10 @@ router = APIRouter()
 
 @router.get("/", response_model=List[TransactionWithRelations], dependencies=[Depends(require_admin_producer_or_finance)])
 async def get_transactions(
+    response: Response,
     organization_id: UUID = Depends(get_current_organization),
     db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description=f"Next page cursor (from the {NEXT_CURSOR_HEADER} header)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
     bank_account_id: UUID = None,
@@ -49,20 +52,29 @@ async def get_transactions(
     if category:
         filters["category"] = category
 
-    transactions = await transaction_service.get_multi_with_relations(
-        db=db,
-        organization_id=organization_id,
-        skip=skip,
-        limit=limit,
-        filters=filters
-    )
+    try:
+        transactions, next_cursor = await transaction_service.get_page_with_relations(
+            db=db,
+            organization_id=organization_id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            filters=filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return transactions
 
 
 @router.get("/pending", response_model=List[TransactionWithRelations], dependencies=[Depends(require_finance_or_admin)])
 async def get_pending_transactions(
+    response: Response,
     organization_id: UUID = Depends(get_current_organization),
     db: AsyncSession = Depends(get_db),
+    cursor: Optional[str] = Query(None, description=f"Next page cursor (from the {NEXT_CURSOR_HEADER} header)"),
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1, le=1000),
 ) -> List[TransactionWithRelations]:
@@ -70,13 +82,20 @@ async def get_pending_transactions(
     Get all pending transactions for approval.
     """
     filters = {"payment_status": "pending"}
-    transactions = await transaction_service.get_multi_with_relations(
-        db=db,
-        organization_id=organization_id,
-        skip=skip,
-        limit=limit,
-        filters=filters
-    )
+    try:
+        transactions, next_cursor = await transaction_service.get_page_with_relations(
+            db=db,
+            organization_id=organization_id,
+            cursor=cursor,
+            skip=skip,
+            limit=limit,
+            filters=filters
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=status.HTTP_400_BAD_REQUEST, detail=str(e))
+
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
     return transactions
 
 
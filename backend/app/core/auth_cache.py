@@ -0,0 +1,280 @@
+"""
+Process-wide cache for the authenticated user's Profile and Organization.
+
+Every authenticated request needs the caller's profile, organization and
+billing state before any business logic runs. The rows change rarely, so we
+keep a bounded TTL cache keyed by user id and hand out *detached copies*
+that are merged into the request session with ``merge(load=False)`` (no SQL).
+
+Invalidation is driven by SQLAlchemy session events: any flush that touches a
+Profile or Organization row marks the affected keys, and they are dropped once
+the transaction commits. Billing state lives on the organization row, so
+billing writes are covered by the organization hook.
+
+Every process also publishes its invalidations on the AUTH_CACHE_TOPIC
+pub/sub topic (the app.core.pubsub broker, WS_PUBSUB_BACKEND), and API
+processes apply the ones published elsewhere - e.g. billing changes made by
+the job worker. Messages lost while a listener reconnects are covered by
+the TTL.
+"""
+
+import asyncio
+import logging
+import threading
+import uuid
+from dataclasses import dataclass
+from typing import Any, Dict, Iterable, Optional, Set
+from uuid import UUID
+
+from cachetools import TTLCache
+from sqlalchemy import event, inspect as sa_inspect
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core.config import settings
+from app.core.pubsub import PayloadTooLarge, PubSubBroker, build_broker
+from app.models.organizations import Organization
+from app.models.profiles import Profile
+
+logger = logging.getLogger(__name__)
+
+_PENDING_KEY = "_auth_cache_pending"
+_CLEAR_ALL = "*"
+
+AUTH_CACHE_TOPIC = "auth_cache_invalidations"
+
+
+@dataclass(frozen=True)
+class AuthCacheEntry:
+    """Detached snapshots of a user's profile and (optional) organization."""
+    profile: Profile
+    organization: Optional[Organization]
+
+
+def detached_copy(instance):
+    """
+    Build a detached copy of a loaded ORM instance from its column values.
+
+    Returns None when the instance has unflushed changes or any column is
+    unloaded/expired (e.g. server-side ``updated_at`` after a flush); such
+    instances are simply not cached.
+    """
+    state = sa_inspect(instance)
+    if state.modified:
+        return None
+    loaded = state.dict
+    values = {}
+    for attr in state.mapper.column_attrs:
+        if attr.key not in loaded:
+            return None
+        values[attr.key] = loaded[attr.key]
+
+    copy = state.mapper.class_(**values)
+    make_transient_to_detached(copy)
+    return copy
+
+
+class AuthCache:
+    """
+    Bounded TTL cache of AuthCacheEntry keyed by user id.
+
+    A secondary org -> users index lets organization writes invalidate every
+    cached member. A generation counter prevents a reader that started before
+    an invalidation from re-populating the cache with the old rows.
+    """
+
+    def __init__(self, maxsize: int, ttl: int):
+        self.enabled = maxsize > 0 and ttl > 0
+        self._entries: Optional[TTLCache] = TTLCache(maxsize=maxsize, ttl=ttl) if self.enabled else None
+        self._maxsize = maxsize
+        self._org_members: Dict[UUID, Set[UUID]] = {}
+        self._generation = 0
+        self._lock = threading.Lock()
+
+    @property
+    def generation(self) -> int:
+        return self._generation
+
+    def get(self, user_id: UUID) -> Optional[AuthCacheEntry]:
+        if not self.enabled:
+            return None
+        with self._lock:
+            return self._entries.get(user_id)
+
+    def set(
+        self,
+        profile: Profile,
+        organization: Optional[Organization],
+        *,
+        generation: int,
+    ) -> None:
+        """
+        Store snapshots for ``profile``. ``generation`` must be read before
+        the rows were loaded; stale readers are ignored.
+        """
+        if not self.enabled:
+            return
+
+        profile_copy = detached_copy(profile)
+        organization_copy = detached_copy(organization) if organization is not None else None
+        if profile_copy is None or (organization is not None and organization_copy is None):
+            return
+
+        with self._lock:
+            if generation != self._generation:
+                return
+            self._entries[profile_copy.id] = AuthCacheEntry(profile_copy, organization_copy)
+            if profile_copy.organization_id:
+                self._org_members.setdefault(profile_copy.organization_id, set()).add(profile_copy.id)
+            if len(self._org_members) > self._maxsize:
+                self._rebuild_org_index()
+
+    def invalidate_user(self, user_id: UUID) -> None:
+        with self._lock:
+            self._generation += 1
+            if self._entries is not None:
+                self._entries.pop(user_id, None)
+
+    def invalidate_organization(self, organization_id: UUID) -> None:
+        with self._lock:
+            self._generation += 1
+            members = self._org_members.pop(organization_id, set())
+            if self._entries is not None:
+                for user_id in members:
+                    self._entries.pop(user_id, None)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._generation += 1
+            self._org_members.clear()
+            if self._entries is not None:
+                self._entries.clear()
+
+    def _rebuild_org_index(self) -> None:
+        # Expired/evicted users leave stale ids behind; rebuild from live entries.
+        index: Dict[UUID, Set[UUID]] = {}
+        for user_id, entry in list(self._entries.items()):
+            if entry.profile.organization_id:
+                index.setdefault(entry.profile.organization_id, set()).add(user_id)
+        self._org_members = index
+
+
+auth_cache = AuthCache(
+    maxsize=int(getattr(settings, "AUTH_CACHE_MAXSIZE", 0) or 0),
+    ttl=int(getattr(settings, "AUTH_CACHE_TTL_SECONDS", 0) or 0),
+)
+
+
+def _apply(pending: Iterable[Any]) -> None:
+    pending = set(pending)
+    if _CLEAR_ALL in pending:
+        auth_cache.clear()
+        return
+    for kind, key in pending:
+        if kind == "user":
+            auth_cache.invalidate_user(key)
+        else:
+            auth_cache.invalidate_organization(key)
+
+
+class AuthCacheInvalidationRelay:
+    """
+    Carries committed invalidations between processes.
+
+    Every process publishes; only processes that called start() (the API)
+    listen. A process ignores its own messages, which it applied already.
+    """
+
+    def __init__(self, broker: Optional[PubSubBroker] = None):
+        self._broker = broker
+        self._origin = uuid.uuid4().hex
+        self._tasks: Set[asyncio.Task] = set()
+
+    @property
+    def broker(self) -> PubSubBroker:
+        if self._broker is None:
+            self._broker = build_broker()
+        return self._broker
+
+    async def start(self) -> None:
+        self.broker.subscribe(AUTH_CACHE_TOPIC)
+        await self.broker.start(self._on_message)
+
+    async def close(self) -> None:
+        if self._broker is not None:
+            await self._broker.close()
+
+    def publish(self, pending: Iterable[Any]) -> None:
+        """Publish in the background (called from synchronous session events)."""
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self._publish(set(pending)))
+        self._tasks.add(task)
+        task.add_done_callback(self._tasks.discard)
+
+    async def _publish(self, pending: Set[Any]) -> None:
+        if _CLEAR_ALL in pending:
+            message = {"origin": self._origin, "clear": True}
+        else:
+            message = {
+                "origin": self._origin,
+                "users": [str(key) for kind, key in pending if kind == "user"],
+                "orgs": [str(key) for kind, key in pending if kind == "org"],
+            }
+        try:
+            try:
+                await self.broker.publish(AUTH_CACHE_TOPIC, message)
+            except PayloadTooLarge:
+                await self.broker.publish(AUTH_CACHE_TOPIC, {"origin": self._origin, "clear": True})
+        except Exception as e:
+            logger.warning(f"Auth cache invalidation publish failed: {e}")
+
+    async def _on_message(self, topic: str, message: Dict[str, Any]) -> None:
+        if message.get("origin") == self._origin:
+            return
+        if message.get("clear"):
+            _apply({_CLEAR_ALL})
+            return
+        _apply(
+            {("user", UUID(key)) for key in message.get("users", [])}
+            | {("org", UUID(key)) for key in message.get("orgs", [])}
+        )
+
+
+auth_cache_relay = AuthCacheInvalidationRelay()
+
+
+# --- Invalidation hooks -------------------------------------------------------
+
+def _pending(session: Session) -> set:
+    return session.info.setdefault(_PENDING_KEY, set())
+
+
+@event.listens_for(Session, "after_flush")
+def _collect_auth_writes(session: Session, flush_context) -> None:
+    for obj in list(session.new) + list(session.dirty) + list(session.deleted):
+        if isinstance(obj, Profile):
+            _pending(session).add(("user", obj.id))
+        elif isinstance(obj, Organization):
+            _pending(session).add(("org", obj.id))
+
+
+@event.listens_for(Session, "do_orm_execute")
+def _collect_bulk_auth_writes(orm_execute_state) -> None:
+    if not (orm_execute_state.is_update or orm_execute_state.is_delete):
+        return
+    mapper = orm_execute_state.bind_mapper
+    if mapper is not None and mapper.class_ in (Profile, Organization):
+        # Bulk statements don't tell us which rows changed.
+        _pending(orm_execute_state.session).add(_CLEAR_ALL)
+
+
+@event.listens_for(Session, "after_commit")
+def _apply_auth_invalidations(session: Session) -> None:
+    pending = session.info.pop(_PENDING_KEY, None)
+    if not pending:
+        return
+    _apply(pending)
+    auth_cache_relay.publish(pending)
+
@@ -24,6 +24,9 @@ class Settings(BaseSettings):
     ENABLE_SERVER_TIMING: bool = False
     # Log SQL statements slower than this threshold (in ms). 0 disables.
     LOG_SLOW_QUERIES_MS: int = 0
+    # Also append slow statements (SQL text only, no parameters) as JSON lines to this
+    # file, for scripts/index_advisor.py.
+    SLOW_QUERY_CAPTURE_PATH: Optional[str] = None
     
     # CORS
     BACKEND_CORS_ORIGINS: Union[List[AnyHttpUrl], str] = []
@@ -67,9 +70,42 @@ class Settings(BaseSettings):
     # When set, passed through to asyncpg's `ssl` parameter (e.g. false for railway.internal).
     DB_SSL: Optional[bool] = None
 
-    # Executive dashboard cache (in-process)
+    # WebSocket notification fan-out across processes: "memory" (single
+    # process) or "postgres" (LISTEN/NOTIFY). LISTEN needs a direct or
+    # session-mode connection: set WS_PUBSUB_DATABASE_URL when DATABASE_URL
+    # points at a transaction pooler.
+    WS_PUBSUB_BACKEND: str = "memory"
+    WS_PUBSUB_DATABASE_URL: Optional[str] = None
+    WS_PUBSUB_RECONNECT_SECONDS: float = 5.0
+    # Per-connection outbound queue; a client that falls this far behind is disconnected.
+    WS_SEND_QUEUE_SIZE: int = 100
+    WS_SEND_TIMEOUT_SECONDS: float = 10.0
+    # Server heartbeat; sockets silent for WS_IDLE_TIMEOUT_SECONDS are closed
+    # (the browser client pings every 25s, less often in background tabs).
+    WS_HEARTBEAT_INTERVAL_SECONDS: float = 30.0
+    WS_IDLE_TIMEOUT_SECONDS: float = 150.0
+
+    # Auth context cache (in-process, keyed by user id)
+    AUTH_CACHE_TTL_SECONDS: int = 30
+    AUTH_CACHE_MAXSIZE: int = 4096
+
+    # PDF rendering (WeasyPrint in a process pool; 0 workers renders in a thread)
+    PDF_RENDER_WORKERS: int = 2
+    PDF_RENDER_QUEUE_SIZE: int = 32
+    PDF_RENDER_MAX_PENDING_PER_ORG: int = 4
+    PDF_RENDER_TIMEOUT_SECONDS: int = 60
+
+    # Executive dashboard cache, per section ("memory" = per process, "postgres" = shared UNLOGGED table).
+    # Writes invalidate the affected sections; the TTL only bounds staleness from writes outside the app.
+    DASHBOARD_CACHE_BACKEND: str = "memory"
     DASHBOARD_CACHE_TTL_SECONDS: int = 60
     DASHBOARD_CACHE_MAXSIZE: int = 512
+    # Dashboard sections built at the same time per request, each on its own pooled
+    # connection (one reuses the request session). 1 builds them one by one.
+    DASHBOARD_SECTION_CONCURRENCY: int = 2
+    # Extra section sessions open at once across all dashboard requests in a process;
+    # when they are taken, a request builds its remaining sections on its own session.
+    DASHBOARD_SECTION_SESSIONS_MAX: int = 2
 
     @classmethod
     def _normalize_async_db_url(cls, url: str) -> str:
@@ -111,6 +147,12 @@ class Settings(BaseSettings):
     AI_MODEL: str = "gemini-pro"
     AI_MAX_TOKENS: int = 4000
     AI_TEMPERATURE: float = 0.7
+    AI_MAX_CONCURRENT_CALLS_PER_ORG: int = 1  # share of the provider call slots one org may hold
+    AI_MAX_ACTIVE_ANALYSES_PER_ORG: int = 3  # queued + running script analysis jobs
+    AI_ANALYSIS_TIMEOUT_SECONDS: int = 900
+    AI_RESULT_CACHE_MAXSIZE: int = 512  # in-process entries; 0 disables the cache
+    AI_RESULT_CACHE_MEMORY_TTL_SECONDS: int = 3600
+    AI_RESULT_CACHE_TTL_DAYS: int = 30  # ai_result_cache table
     
     # Financial automation
     FINANCIAL_AUTOMATION_ENABLED: bool = True
@@ -120,6 +162,18 @@ class Settings(BaseSettings):
     # Supabase
     SUPABASE_URL: Optional[str] = None
     SUPABASE_KEY: Optional[str] = None
+    # When set, access tokens are signature-verified (HS256) instead of trusted as-is.
+    SUPABASE_JWT_SECRET: Optional[str] = None
+
+    # File storage backend: "supabase" (Storage REST API) or "local" (disk, for tests/offline dev)
+    STORAGE_BACKEND: str = "supabase"
+    STORAGE_LOCAL_ROOT: str = ".storage"
+    STORAGE_HTTP_TIMEOUT_SECONDS: float = 60.0
+    STORAGE_HTTP_MAX_CONNECTIONS: int = 20
+    STORAGE_UPLOAD_CHUNK_SIZE: int = 1024 * 1024
+    # Signed URLs are reused until this many seconds before they expire
+    SIGNED_URL_CACHE_MARGIN_SECONDS: int = 60
+    SIGNED_URL_CACHE_MAXSIZE: int = 10000
     
     # Google Drive (Prevenindo o próximo erro)
     GOOGLE_CLIENT_ID: Optional[str] = None
@@ -130,11 +184,47 @@ class Settings(BaseSettings):
     # Google Service Account (Production support via Env Var)
     GOOGLE_CREDENTIALS_JSON: Optional[str] = None
 
+    # Shared HTTP/2 connection pool for Google APIs
+    GOOGLE_HTTP_TIMEOUT_SECONDS: float = 30.0
+    GOOGLE_HTTP_MAX_CONNECTIONS: int = 20
+
+    # Background Drive → cloud_file_references sync (worker daemon)
+    DRIVE_SYNC_INTERVAL_SECONDS: int = 120
+    DRIVE_SYNC_CONCURRENCY: int = 4
+
+    # Postgres job queue / worker pool (python -m app.worker_daemon)
+    JOB_WORKER_CONCURRENCY: int = 4
+    JOB_WORKER_PROCESSES: int = 1
+    JOB_WORKER_QUEUES: str = "default,ai"  # comma-separated
+    JOB_POLL_INTERVAL_SECONDS: float = 1.0
+    JOB_VISIBILITY_TIMEOUT_SECONDS: int = 300
+    JOB_SHUTDOWN_GRACE_SECONDS: int = 30
+    JOB_MAX_ATTEMPTS: int = 5
+    JOB_RETRY_BASE_SECONDS: int = 10
+    JOB_RETRY_MAX_SECONDS: int = 3600
+    JOB_RETENTION_DAYS: int = 14
+    PLAN_EXPIRY_CHECK_SCHEDULE: str = "0 * * * *"  # hourly; notices are de-duplicated by a ledger
+    PLAN_EXPIRY_BATCH_SIZE: int = 500
+
     # Stripe
     STRIPE_SECRET_KEY: Optional[str] = None
     STRIPE_PUBLISHABLE_KEY: Optional[str] = None
     STRIPE_WEBHOOK_SECRET: Optional[str] = None
 
+    # Stripe SDK gateway: thread pool, timeout, circuit breaker, status cache
+    STRIPE_GATEWAY_MAX_WORKERS: int = 8
+    STRIPE_GATEWAY_TIMEOUT_SECONDS: float = 20.0
+    STRIPE_CIRCUIT_FAILURE_THRESHOLD: int = 5
+    STRIPE_CIRCUIT_RESET_SECONDS: int = 30
+    STRIPE_STATUS_CACHE_TTL_SECONDS: int = 60
+    STRIPE_STATUS_CACHE_MAXSIZE: int = 2048
+
+    # Stripe webhook inbox, drained by the worker (app/services/billing_events.py)
+    BILLING_EVENT_POLL_INTERVAL_SECONDS: int = 10
+    BILLING_EVENT_BATCH_SIZE: int = 500
+    BILLING_EVENT_CONCURRENCY: int = 4
+    BILLING_EVENT_MAX_ATTEMPTS: int = 8
+
     # Stripe Connect (for receiving payments from clients)
     STRIPE_CONNECT_CLIENT_ID: Optional[str] = None          # Stripe Connect OAuth client ID (ca_xxx)
     STRIPE_CONNECT_WEBHOOK_SECRET: Optional[str] = None      # Separate webhook secret for Connect events
@@ -147,6 +237,17 @@ class Settings(BaseSettings):
     RESEND_API_KEY: Optional[str] = None
     RESEND_FROM_EMAIL: Optional[str] = None
 
+    # Transactional email outbox, drained by the worker (app/services/email_outbox.py)
+    EMAIL_TRANSPORT: str = "resend"  # resend | file | smtp (file/smtp: local capture)
+    EMAIL_CAPTURE_DIR: str = "logs/emails"
+    EMAIL_SMTP_HOST: str = "localhost"
+    EMAIL_SMTP_PORT: int = 1025
+    EMAIL_OUTBOX_POLL_INTERVAL_SECONDS: int = 5
+    EMAIL_OUTBOX_BATCH_SIZE: int = 500
+    EMAIL_RATE_LIMIT_PER_SECOND: float = 2.0  # Resend API requests, per worker process
+    EMAIL_SEND_LEASE_SECONDS: int = 300
+    EMAIL_MAX_ATTEMPTS: int = 6
+
     # WhatsApp (Evolution API) - Optional, for future integration
     WHATSAPP_API_URL: Optional[str] = None
     WHATSAPP_API_KEY: Optional[str] = None
@@ -0,0 +1,132 @@
+"""
+Minimal schedule expressions for recurring jobs.
+
+Supported forms:
+- five-field cron: "minute hour day-of-month month day-of-week" with *, */n,
+  a-b, a-b/n and comma lists (day-of-week 0-7, 0 and 7 = Sunday). As in cron,
+  when both day fields are restricted a day matching either one qualifies.
+- "@every <n>s|m|h" for fixed intervals.
+- "@hourly", "@daily", "@weekly", "@monthly".
+
+All times are evaluated in UTC.
+"""
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import FrozenSet, Optional
+
+ALIASES = {
+    "@hourly": "0 * * * *",
+    "@daily": "0 0 * * *",
+    "@weekly": "0 0 * * 0",
+    "@monthly": "0 0 1 * *",
+}
+
+_FIELD_RANGES = [(0, 59), (0, 23), (1, 31), (1, 12), (0, 7)]
+_INTERVAL_UNITS = {"s": 1, "m": 60, "h": 3600}
+
+
+def _parse_field(field: str, low: int, high: int) -> FrozenSet[int]:
+    values: set[int] = set()
+    for part in field.split(","):
+        step = 1
+        if "/" in part:
+            part, step_str = part.split("/", 1)
+            step = int(step_str)
+            if step <= 0:
+                raise ValueError(f"Invalid step in cron field: {field}")
+        if part == "*":
+            start, end = low, high
+        elif "-" in part:
+            start_str, end_str = part.split("-", 1)
+            start, end = int(start_str), int(end_str)
+        else:
+            start = int(part)
+            end = high if step > 1 else start
+        if start < low or end > high or start > end:
+            raise ValueError(f"Cron field out of range: {field}")
+        values.update(range(start, end + 1, step))
+    return frozenset(values)
+
+
+@dataclass(frozen=True)
+class Schedule:
+    """A parsed schedule expression. Use next_after() to compute run times."""
+    expression: str
+    interval: Optional[timedelta] = None
+    minutes: FrozenSet[int] = frozenset()
+    hours: FrozenSet[int] = frozenset()
+    days: FrozenSet[int] = frozenset()
+    months: FrozenSet[int] = frozenset()
+    weekdays: FrozenSet[int] = frozenset()  # 0 = Sunday
+    day_restricted: bool = False
+    weekday_restricted: bool = False
+
+    def _day_matches(self, moment: datetime) -> bool:
+        weekday = (moment.weekday() + 1) % 7  # Python: Monday = 0
+        day_ok = moment.day in self.days
+        weekday_ok = weekday in self.weekdays
+        if self.day_restricted and self.weekday_restricted:
+            return day_ok or weekday_ok
+        return day_ok and weekday_ok
+
+    def next_after(self, moment: datetime) -> datetime:
+        """First run time strictly after `moment` (UTC)."""
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=timezone.utc)
+        moment = moment.astimezone(timezone.utc)
+
+        if self.interval is not None:
+            return moment + self.interval
+
+        candidate = moment.replace(second=0, microsecond=0) + timedelta(minutes=1)
+        limit = candidate + timedelta(days=366 * 5)
+        while candidate < limit:
+            if candidate.month not in self.months:
+                year = candidate.year + (candidate.month == 12)
+                month = candidate.month % 12 + 1
+                candidate = candidate.replace(year=year, month=month, day=1, hour=0, minute=0)
+                continue
+            if not self._day_matches(candidate):
+                candidate = (candidate + timedelta(days=1)).replace(hour=0, minute=0)
+                continue
+            if candidate.hour not in self.hours:
+                candidate = (candidate + timedelta(hours=1)).replace(minute=0)
+                continue
+            if candidate.minute not in self.minutes:
+                candidate += timedelta(minutes=1)
+                continue
+            return candidate
+        raise ValueError(f"Schedule never fires: {self.expression}")
+
+
+def parse_schedule(expression: str) -> Schedule:
+    """Parse a cron expression, alias or "@every" interval."""
+    expr = expression.strip()
+
+    if expr.startswith("@every "):
+        value = expr[len("@every "):].strip()
+        unit = value[-1:]
+        if unit not in _INTERVAL_UNITS or not value[:-1].isdigit() or int(value[:-1]) <= 0:
+            raise ValueError(f"Invalid interval: {expression}")
+        return Schedule(expression=expr, interval=timedelta(seconds=int(value[:-1]) * _INTERVAL_UNITS[unit]))
+
+    fields = ALIASES.get(expr, expr).split()
+    if len(fields) != 5:
+        raise ValueError(f"Cron expression must have 5 fields: {expression}")
+
+    minutes, hours, days, months, weekdays = (
+        _parse_field(field, low, high) for field, (low, high) in zip(fields, _FIELD_RANGES)
+    )
+    if 7 in weekdays:
+        weekdays = (weekdays - {7}) | {0}
+
+    return Schedule(
+        expression=expr,
+        minutes=minutes,
+        hours=hours,
+        days=days,
+        months=months,
+        weekdays=weekdays,
+        day_restricted=fields[2] != "*",
+        weekday_restricted=fields[4] != "*",
+    )
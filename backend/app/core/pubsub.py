@@ -0,0 +1,203 @@
+"""
+Publish/subscribe brokers for cross-process WebSocket fan-out.
+
+Each API process holds its own WebSocket connections, so an event raised in
+one process (or in the job worker) must reach every other process. Topics
+are per organization; a process subscribes to an org's topic only while it
+has sockets for that org.
+
+- InMemoryBroker: delivers within the current process (single worker, tests).
+- PostgresBroker: NOTIFY to publish, a dedicated LISTEN connection to
+  receive. Postgres caps payloads at 8000 bytes; larger messages raise
+  PayloadTooLarge so the caller can send a slimmer event.
+
+Messages are JSON objects. The handler runs in the receiving process's event
+loop for every message on a subscribed topic, including its own.
+"""
+import asyncio
+import json
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Awaitable, Callable, Dict, Optional, Set
+from uuid import UUID
+
+from sqlalchemy import text
+from sqlalchemy.engine import make_url
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+MessageHandler = Callable[[str, Dict[str, Any]], Awaitable[None]]
+
+PG_NOTIFY_MAX_BYTES = 7999
+
+
+class PayloadTooLarge(ValueError):
+    pass
+
+
+def org_topic(organization_id: UUID) -> str:
+    """Topic (and Postgres channel) name for an organization."""
+    return f"ws_org_{UUID(str(organization_id)).hex}"
+
+
+class PubSubBroker(ABC):
+    """Topic-based broker. subscribe()/unsubscribe() only record intent; the
+    broker reconciles its listeners in the background."""
+
+    def __init__(self):
+        self._handler: Optional[MessageHandler] = None
+        self._topics: Set[str] = set()
+
+    @property
+    def topics(self) -> Set[str]:
+        return set(self._topics)
+
+    async def start(self, handler: MessageHandler) -> None:
+        self._handler = handler
+
+    def subscribe(self, topic: str) -> None:
+        self._topics.add(topic)
+
+    def unsubscribe(self, topic: str) -> None:
+        self._topics.discard(topic)
+
+    @abstractmethod
+    async def publish(self, topic: str, message: Dict[str, Any]) -> None:
+        ...
+
+    async def close(self) -> None:
+        self._handler = None
+
+    async def _dispatch(self, topic: str, message: Dict[str, Any]) -> None:
+        if self._handler is None or topic not in self._topics:
+            return
+        try:
+            await self._handler(topic, message)
+        except Exception as e:
+            logger.error(f"Pub/sub handler failed for {topic}: {e}")
+
+
+class InMemoryBroker(PubSubBroker):
+    """Delivers to the current process only."""
+
+    async def publish(self, topic: str, message: Dict[str, Any]) -> None:
+        # Round-trip through JSON so behaviour matches the Postgres broker.
+        await self._dispatch(topic, json.loads(json.dumps(message, default=str)))
+
+
+class PostgresBroker(PubSubBroker):
+    """
+    LISTEN/NOTIFY broker. Publishing goes through the regular engine pool
+    (pg_notify works through PgBouncer); listening holds one dedicated
+    asyncpg connection, which must not go through a transaction pooler.
+    """
+
+    def __init__(self, dsn: str, *, reconnect_interval: float = 5.0, ssl: Optional[bool] = None):
+        super().__init__()
+        self.dsn = dsn
+        self.ssl = ssl
+        self.reconnect_interval = reconnect_interval
+        self._changed = asyncio.Event()
+        self._runner: Optional[asyncio.Task] = None
+        self._pending: Set[asyncio.Task] = set()
+
+    async def start(self, handler: MessageHandler) -> None:
+        await super().start(handler)
+        if self._runner is None or self._runner.done():
+            self._runner = asyncio.create_task(self._run())
+
+    def subscribe(self, topic: str) -> None:
+        super().subscribe(topic)
+        self._changed.set()
+
+    def unsubscribe(self, topic: str) -> None:
+        super().unsubscribe(topic)
+        self._changed.set()
+
+    async def publish(self, topic: str, message: Dict[str, Any]) -> None:
+        payload = json.dumps(message, default=str)
+        if len(payload.encode()) > PG_NOTIFY_MAX_BYTES:
+            raise PayloadTooLarge(f"Message for {topic} exceeds {PG_NOTIFY_MAX_BYTES} bytes")
+
+        from app.db.session import engine
+
+        async with engine.connect() as conn:
+            await conn.execute(text("SELECT pg_notify(:channel, :payload)"), {"channel": topic, "payload": payload})
+            await conn.commit()
+
+    async def close(self) -> None:
+        await super().close()
+        if self._runner is not None:
+            self._runner.cancel()
+            await asyncio.gather(self._runner, return_exceptions=True)
+            self._runner = None
+
+    def _on_notify(self, connection, pid, channel, payload) -> None:  # noqa: ARG002
+        try:
+            message = json.loads(payload)
+        except ValueError:
+            logger.warning(f"Ignoring malformed pub/sub payload on {channel}")
+            return
+        task = asyncio.create_task(self._dispatch(channel, message))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+    async def _run(self) -> None:
+        """Keep a LISTEN connection open and its channels in step with the topic set."""
+        import asyncpg
+
+        while True:
+            conn = None
+            try:
+                connect_kwargs: Dict[str, Any] = {}
+                if self.ssl is not None:
+                    connect_kwargs["ssl"] = self.ssl
+                conn = await asyncpg.connect(self.dsn, **connect_kwargs)
+                listening: Set[str] = set()
+                logger.info("Pub/sub listener connected")
+
+                while not conn.is_closed():
+                    self._changed.clear()
+                    wanted = set(self._topics)
+                    for topic in wanted - listening:
+                        await conn.add_listener(topic, self._on_notify)
+                        listening.add(topic)
+                    for topic in listening - wanted:
+                        await conn.remove_listener(topic, self._on_notify)
+                        listening.discard(topic)
+                    try:
+                        await asyncio.wait_for(self._changed.wait(), timeout=self.reconnect_interval)
+                    except asyncio.TimeoutError:
+                        pass
+
+                logger.warning("Pub/sub listener connection closed; reconnecting")
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                # Events published while disconnected are lost; clients refresh on reconnect.
+                logger.error(f"Pub/sub listener failed: {e}")
+                await asyncio.sleep(self.reconnect_interval)
+            finally:
+                if conn is not None and not conn.is_closed():
+                    await conn.close()
+
+
+def _listen_dsn() -> str:
+    url = make_url(settings.WS_PUBSUB_DATABASE_URL or settings.SQLALCHEMY_DATABASE_URI)
+    # asyncpg takes a plain libpq URL; pooler hints such as ?pgbouncer=true are not valid there.
+    return url.set(drivername="postgresql", query={}).render_as_string(hide_password=False)
+
+
+def build_broker() -> PubSubBroker:
+    backend = (settings.WS_PUBSUB_BACKEND or "memory").lower()
+    if backend == "postgres":
+        return PostgresBroker(
+            _listen_dsn(),
+            reconnect_interval=settings.WS_PUBSUB_RECONNECT_SECONDS,
+            ssl=settings.DB_SSL,
+        )
+    if backend != "memory":
+        raise ValueError(f"Unknown WS_PUBSUB_BACKEND: {settings.WS_PUBSUB_BACKEND}")
+    return InMemoryBroker()
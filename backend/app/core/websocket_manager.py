@@ -2,42 +2,73 @@
 WebSocket Connection Manager for real-time notifications.
 
 Manages WebSocket connections per user, allowing targeted message delivery
-when notifications are created.
+when notifications are created. Broadcasts go through a pub/sub broker
+(app.core.pubsub) on a per-organization topic, so every API process - and
+the job worker - reaches sockets held by any other process.
+
+Delivery is non-blocking: each message is serialized once and put on every
+target connection's bounded outbound queue; a writer task per connection
+drains it. A connection whose queue overflows, whose send times out, or
+that stays silent past the idle timeout is evicted (closed with 1013 so
+the client reconnects), so one slow client never delays the others.
 """
 
+import asyncio
 import json
 import logging
-from typing import Dict, List, Optional, Any
+import time
+from typing import Dict, Iterable, List, Optional, Tuple, Any
 from uuid import UUID
 from fastapi import WebSocket
 from dataclasses import dataclass, field
 from datetime import datetime
 
+from app.core.config import settings
+from app.core.pubsub import PayloadTooLarge, PubSubBroker, build_broker, org_topic
+
 logger = logging.getLogger(__name__)
 
+TRY_AGAIN_LATER = 1013  # WebSocket close code: server overloaded / client too slow
+HEARTBEAT_MESSAGE = json.dumps({"type": "heartbeat"})
+
 
-@dataclass
+@dataclass(eq=False)
 class ConnectionInfo:
     """Information about a WebSocket connection."""
     websocket: WebSocket
     organization_id: UUID
     profile_id: UUID
     connected_at: datetime = field(default_factory=datetime.utcnow)
+    queue: asyncio.Queue = field(default_factory=lambda: asyncio.Queue(maxsize=max(1, settings.WS_SEND_QUEUE_SIZE)))
+    last_seen: float = field(default_factory=time.monotonic)
+    writer: Optional[asyncio.Task] = None
 
 
 class NotificationConnectionManager:
     """
     Manages WebSocket connections for real-time notifications.
-    
+
     Connections are tracked by (organization_id, profile_id) tuple,
     allowing multiple connections per user (e.g., multiple browser tabs).
+    The process subscribes to an organization's topic while it holds at
+    least one socket for that organization.
     """
-    
-    def __init__(self):
-        # Map of (org_id, profile_id) -> list of connections
-        self._connections: Dict[tuple, List[ConnectionInfo]] = {}
+
+    def __init__(self, broker: Optional[PubSubBroker] = None):
+        # Map of (org_id, profile_id) -> {id(websocket): connection}
+        self._connections: Dict[tuple, Dict[int, ConnectionInfo]] = {}
+        # org_id -> profile_ids with local connections (org broadcast, topic subscriptions)
+        self._org_members: Dict[str, set] = {}
         self._active_count = 0
-    
+        self._broker = broker or build_broker()
+        self._broker_started = False
+        self._heartbeat: Optional[asyncio.Task] = None
+
+    async def _ensure_broker_started(self) -> None:
+        if not self._broker_started:
+            self._broker_started = True
+            await self._broker.start(self._on_broker_message)
+
     async def connect(
         self,
         websocket: WebSocket,
@@ -46,50 +77,142 @@ class NotificationConnectionManager:
     ) -> None:
         """Accept and register a new WebSocket connection."""
         await websocket.accept()
-        
-        key = (str(organization_id), str(profile_id))
+
+        org_key, profile_key = str(organization_id), str(profile_id)
         connection = ConnectionInfo(
             websocket=websocket,
             organization_id=organization_id,
             profile_id=profile_id
         )
-        
-        if key not in self._connections:
-            self._connections[key] = []
-        
-        self._connections[key].append(connection)
+        connection.writer = asyncio.create_task(self._writer(connection))
+
+        self._connections.setdefault((org_key, profile_key), {})[id(websocket)] = connection
         self._active_count += 1
-        
+
+        members = self._org_members.setdefault(org_key, set())
+        if not members:
+            self._broker.subscribe(org_topic(organization_id))
+        members.add(profile_key)
+
+        await self._ensure_broker_started()
+        if settings.WS_HEARTBEAT_INTERVAL_SECONDS > 0 and (self._heartbeat is None or self._heartbeat.done()):
+            self._heartbeat = asyncio.create_task(self._heartbeat_loop())
+
         logger.info(
             f"WebSocket connected: user={profile_id}, org={organization_id}. "
             f"Total connections: {self._active_count}"
         )
-    
+
     def disconnect(
         self,
         websocket: WebSocket,
         organization_id: UUID,
         profile_id: UUID
     ) -> None:
-        """Remove a WebSocket connection."""
-        key = (str(organization_id), str(profile_id))
-        
-        if key in self._connections:
-            self._connections[key] = [
-                conn for conn in self._connections[key] 
-                if conn.websocket != websocket
-            ]
-            self._active_count -= 1
-            
-            # Clean up empty lists
-            if not self._connections[key]:
-                del self._connections[key]
-        
+        """Remove a WebSocket connection (safe to call more than once)."""
+        org_key, profile_key = str(organization_id), str(profile_id)
+        key = (org_key, profile_key)
+
+        connections = self._connections.get(key)
+        connection = connections.pop(id(websocket), None) if connections is not None else None
+        if connection is None:
+            return
+
+        self._active_count -= 1
+        if connection.writer is not None and connection.writer is not asyncio.current_task():
+            connection.writer.cancel()
+
+        # Clean up empty entries
+        if not connections:
+            del self._connections[key]
+            members = self._org_members.get(org_key)
+            if members is not None:
+                members.discard(profile_key)
+                if not members:
+                    del self._org_members[org_key]
+                    self._broker.unsubscribe(org_topic(organization_id))
+
         logger.info(
             f"WebSocket disconnected: user={profile_id}, org={organization_id}. "
             f"Total connections: {self._active_count}"
         )
-    
+
+    def touch(self, websocket: WebSocket, organization_id: UUID, profile_id: UUID) -> None:
+        """Record client activity (any inbound message) for idle detection."""
+        connection = self._connections.get((str(organization_id), str(profile_id)), {}).get(id(websocket))
+        if connection is not None:
+            connection.last_seen = time.monotonic()
+
+    # ── Outbound ─────────────────────────────────────────────
+
+    def _enqueue(self, connections: Iterable[ConnectionInfo], text: str) -> int:
+        """Queue a serialized message on each connection; evict those that are full."""
+        queued = 0
+        for connection in list(connections):
+            try:
+                connection.queue.put_nowait(text)
+                queued += 1
+            except asyncio.QueueFull:
+                self._evict(connection, "outbound queue full")
+        return queued
+
+    def _evict(self, connection: ConnectionInfo, reason: str) -> None:
+        logger.warning(
+            f"Evicting WebSocket for user={connection.profile_id}, org={connection.organization_id}: {reason}"
+        )
+        self.disconnect(connection.websocket, connection.organization_id, connection.profile_id)
+        asyncio.create_task(self._close_quietly(connection.websocket))
+
+    @staticmethod
+    async def _close_quietly(websocket: WebSocket) -> None:
+        try:
+            await websocket.close(code=TRY_AGAIN_LATER)
+        except Exception:
+            pass
+
+    async def _writer(self, connection: ConnectionInfo) -> None:
+        """Drain one connection's queue; a failed or slow send evicts it."""
+        while True:
+            text = await connection.queue.get()
+            try:
+                await asyncio.wait_for(
+                    connection.websocket.send_text(text),
+                    timeout=settings.WS_SEND_TIMEOUT_SECONDS,
+                )
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                self._evict(connection, f"send failed: {type(e).__name__}: {e}")
+                return
+
+    async def _heartbeat_loop(self) -> None:
+        """Ping every connection and reap the ones that have gone silent."""
+        interval = settings.WS_HEARTBEAT_INTERVAL_SECONDS
+        while self._active_count:
+            await asyncio.sleep(interval)
+            deadline = time.monotonic() - settings.WS_IDLE_TIMEOUT_SECONDS
+            alive = []
+            for connections in list(self._connections.values()):
+                for connection in list(connections.values()):
+                    if settings.WS_IDLE_TIMEOUT_SECONDS > 0 and connection.last_seen < deadline:
+                        self._evict(connection, "idle timeout")
+                    else:
+                        alive.append(connection)
+            self._enqueue(alive, HEARTBEAT_MESSAGE)
+
+    def send_to_connection(
+        self,
+        websocket: WebSocket,
+        organization_id: UUID,
+        profile_id: UUID,
+        message: Dict[str, Any]
+    ) -> bool:
+        """Queue a message for one connection (e.g. replies to that client)."""
+        connection = self._connections.get((str(organization_id), str(profile_id)), {}).get(id(websocket))
+        if connection is None:
+            return False
+        return self._enqueue([connection], json.dumps(message, default=str)) == 1
+
     async def send_to_user(
         self,
         organization_id: UUID,
@@ -97,84 +220,160 @@ class NotificationConnectionManager:
         message: Dict[str, Any]
     ) -> int:
         """
-        Send a message to all connections for a specific user.
-        Returns the number of connections that received the message.
+        Send a message to all local connections for a specific user.
+        Returns the number of connections it was queued for.
         """
-        key = (str(organization_id), str(profile_id))
-        
-        if key not in self._connections:
+        connections = self._connections.get((str(organization_id), str(profile_id)))
+        if not connections:
             return 0
-        
-        sent_count = 0
-        dead_connections = []
-        
-        for conn in self._connections[key]:
-            try:
-                await conn.websocket.send_json(message)
-                sent_count += 1
-            except Exception as e:
-                logger.warning(f"Failed to send WebSocket message: {e}")
-                dead_connections.append(conn)
-        
-        # Clean up dead connections
-        for conn in dead_connections:
-            self.disconnect(conn.websocket, organization_id, profile_id)
-        
-        return sent_count
-    
+        return self._enqueue(connections.values(), json.dumps(message, default=str))
+
+    async def send_to_org(self, organization_id: UUID, message: Dict[str, Any]) -> int:
+        """Send a message to every local connection of an organization."""
+        org_key = str(organization_id)
+        profile_keys = self._org_members.get(org_key)
+        if not profile_keys:
+            return 0
+        text = json.dumps(message, default=str)
+        connections = [
+            connection
+            for profile_key in list(profile_keys)
+            for connection in self._connections.get((org_key, profile_key), {}).values()
+        ]
+        return self._enqueue(connections, text)
+
+    async def publish(
+        self,
+        organization_id: UUID,
+        message: Dict[str, Any],
+        profile_id: Optional[UUID] = None,
+    ) -> None:
+        """
+        Deliver a message to a user's (or, without profile_id, the whole
+        organization's) connections in every process. Falls back to local
+        delivery when the broker is unavailable.
+        """
+        await self._publish_envelope({
+            "organization_id": str(organization_id),
+            "profile_id": str(profile_id) if profile_id else None,
+            "message": message,
+        })
+
+    async def _publish_envelope(self, envelope: Dict[str, Any]) -> None:
+        try:
+            await self._broker.publish(org_topic(envelope["organization_id"]), envelope)
+        except PayloadTooLarge:
+            raise
+        except Exception as e:
+            logger.warning(f"Pub/sub publish failed, delivering locally only: {e}")
+            await self._deliver(envelope)
+
+    async def _on_broker_message(self, topic: str, envelope: Dict[str, Any]) -> None:
+        await self._deliver(envelope)
+
+    async def _deliver(self, envelope: Dict[str, Any]) -> int:
+        organization_id = UUID(envelope["organization_id"])
+        if "deliveries" in envelope:
+            sent = 0
+            for delivery in envelope["deliveries"]:
+                sent += await self.send_to_user(organization_id, UUID(delivery["profile_id"]), delivery["message"])
+            return sent
+        message = envelope["message"]
+        if envelope.get("profile_id"):
+            return await self.send_to_user(organization_id, UUID(envelope["profile_id"]), message)
+        return await self.send_to_org(organization_id, message)
+
     async def broadcast_notification(
         self,
         organization_id: UUID,
         profile_id: UUID,
         notification_data: Dict[str, Any]
-    ) -> int:
+    ) -> None:
         """
-        Broadcast a new notification to a user's connections.
-        
+        Broadcast a new notification to a user's connections in every process.
+
         Args:
             organization_id: The organization ID
             profile_id: The user's profile ID
             notification_data: The notification data to send
-            
-        Returns:
-            Number of connections that received the notification
         """
         message = {
             "type": "notification",
             "action": "new",
             "data": notification_data
         }
-        
-        return await self.send_to_user(organization_id, profile_id, message)
-    
+
+        try:
+            await self.publish(organization_id, message, profile_id)
+        except PayloadTooLarge:
+            # Large metadata (e.g. AI results) does not fit a NOTIFY payload;
+            # clients fetch the full notification by id.
+            slim_data = {k: v for k, v in notification_data.items() if k != "metadata"}
+            slim_data["metadata_truncated"] = True
+            await self.publish(organization_id, {**message, "data": slim_data}, profile_id)
+
+    async def broadcast_notifications(
+        self,
+        notifications: Iterable[Tuple[UUID, UUID, Dict[str, Any]]]
+    ) -> None:
+        """
+        Broadcast a batch of new notifications with one pub/sub message per
+        organization instead of one per recipient.
+
+        Args:
+            notifications: (organization_id, profile_id, notification_data) tuples
+        """
+        by_org: Dict[str, List[Dict[str, Any]]] = {}
+        for organization_id, profile_id, notification_data in notifications:
+            by_org.setdefault(str(organization_id), []).append({
+                "profile_id": str(profile_id),
+                "message": {"type": "notification", "action": "new", "data": notification_data},
+            })
+
+        for org_key, deliveries in by_org.items():
+            try:
+                await self._publish_envelope({"organization_id": org_key, "deliveries": deliveries})
+            except PayloadTooLarge:
+                # Batch does not fit one NOTIFY payload; send per recipient,
+                # which in turn drops metadata if a single one is still too big.
+                for delivery in deliveries:
+                    await self.broadcast_notification(
+                        UUID(org_key), UUID(delivery["profile_id"]), delivery["message"]["data"]
+                    )
+
     async def broadcast_notification_update(
         self,
         organization_id: UUID,
         profile_id: UUID,
         action: str = "refresh"
-    ) -> int:
+    ) -> None:
         """
         Broadcast a notification update signal (e.g., after delete or mark as read).
-        
+
         Args:
             organization_id: The organization ID
             profile_id: The user's profile ID
             action: The action type (refresh, deleted, read, etc.)
-            
-        Returns:
-            Number of connections that received the update
         """
         message = {
             "type": "notification",
             "action": action
         }
-        
-        return await self.send_to_user(organization_id, profile_id, message)
-    
+
+        await self.publish(organization_id, message, profile_id)
+
+    async def broadcast_to_organization(
+        self,
+        organization_id: UUID,
+        message: Dict[str, Any]
+    ) -> None:
+        """Broadcast a message to every connected member of an organization, in every process."""
+        await self.publish(organization_id, message)
+
     def get_connection_count(self) -> int:
         """Get the total number of active connections."""
         return self._active_count
-    
+
     def get_user_connection_count(
         self,
         organization_id: UUID,
@@ -182,7 +381,24 @@ class NotificationConnectionManager:
     ) -> int:
         """Get the number of connections for a specific user."""
         key = (str(organization_id), str(profile_id))
-        return len(self._connections.get(key, []))
+        return len(self._connections.get(key, {}))
+
+    async def close(self) -> None:
+        """Stop the heartbeat, connection writers and pub/sub listener (application shutdown)."""
+        tasks = [
+            connection.writer
+            for connections in self._connections.values()
+            for connection in connections.values()
+            if connection.writer is not None
+        ]
+        if self._heartbeat is not None:
+            tasks.append(self._heartbeat)
+            self._heartbeat = None
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        await self._broker.close()
+        self._broker_started = False
 
 
 # Global connection manager instance
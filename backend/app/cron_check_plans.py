@@ -1,93 +1,232 @@
+"""
+Plan-expiry sweep: warn paid organizations 5 days and 1 day before their
+access ends, send an expired notice, and block access once it has ended.
+
+The sweep is a few set-based statements run in bounded batches:
+
+1. Repair paid orgs missing access_ends_at (legacy rows; usually none).
+2. Select the 5-day, 1-day and expired cohorts together with their billing
+   contact in one joined query, skipping notices already in the
+   plan_expiry_notices ledger.
+3. Record the batch in the ledger and queue its emails with two multi-row
+   INSERTs, then commit.
+4. Block every paid org whose access has ended with one UPDATE.
+
+The ledger makes the sweep safe to run hourly (PLAN_EXPIRY_CHECK_SCHEDULE).
+"""
 import asyncio
 import logging
 import sys
+import time
 from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, List, Optional, Sequence, Set, Tuple
+from uuid import UUID
 
 # Add backend directory to python path
 import os
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from sqlalchemy import select
+from sqlalchemy import and_, case, exists, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.db.session import SessionLocal
+from app.models.billing import PlanExpiryNotice
 from app.models.organizations import Organization
 from app.models.profiles import Profile
-from app.services.email_service import send_plan_expiry_warning, send_plan_expired_notice
 from app.services.billing import ensure_access_end_for_paid_org
+from app.services.email_outbox import email_outbox
+from app.services.email_service import plan_expired_email, plan_expiry_warning_email
 from app.core.config import settings
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def check_expiring_plans():
-    logger.info("Starting daily plan expiration check...")
-    
+NOTICE_WARNING_5D = "warning_5d"
+NOTICE_WARNING_1D = "warning_1d"
+NOTICE_EXPIRED = "expired"
+
+# access_ends_at windows, relative to the start of the sweep. They match the
+# previous `(access_ends_at - now).days` checks: 5, 1 and -1 days left.
+NOTICE_WINDOWS = {
+    NOTICE_WARNING_5D: (timedelta(days=5), timedelta(days=6)),
+    NOTICE_WARNING_1D: (timedelta(days=1), timedelta(days=2)),
+    NOTICE_EXPIRED: (timedelta(days=-1), timedelta(0)),
+}
+WARNING_DAYS_LEFT = {NOTICE_WARNING_5D: 5, NOTICE_WARNING_1D: 1}
+
+
+def _paid_active():
+    return and_(Organization.plan_id.isnot(None), Organization.billing_status == "active")
+
+
+def _in_window(now: datetime, notice: str):
+    start, end = NOTICE_WINDOWS[notice]
+    return and_(Organization.access_ends_at >= now + start, Organization.access_ends_at < now + end)
+
+
+def _cohort_query(now: datetime, after: Optional[UUID], limit: int):
+    """One batch of orgs due a notice, with their billing contact's email."""
+    notice = case(*[(_in_window(now, name), name) for name in NOTICE_WINDOWS])
+    contact_id = func.coalesce(Organization.billing_contact_user_id, Organization.owner_profile_id)
+    already_notified = exists().where(
+        PlanExpiryNotice.organization_id == Organization.id,
+        PlanExpiryNotice.notice == notice,
+        PlanExpiryNotice.access_ends_at == Organization.access_ends_at,
+    )
+    filters = [
+        _paid_active(),
+        or_(*[_in_window(now, name) for name in NOTICE_WINDOWS]),
+        ~already_notified,
+    ]
+    if after is not None:
+        filters.append(Organization.id > after)
+    return (
+        select(
+            Organization.id,
+            Organization.name,
+            Organization.access_ends_at,
+            notice.label("notice"),
+            Profile.email,
+        )
+        .outerjoin(Profile, Profile.id == contact_id)
+        .where(*filters)
+        .order_by(Organization.id)
+        .limit(limit)
+    )
+
+
+async def _repair_missing_access_ends(db: AsyncSession, limit: int) -> int:
+    result = await db.execute(
+        select(Organization).where(_paid_active(), Organization.access_ends_at.is_(None)).limit(limit)
+    )
+    repaired = 0
+    for org in result.scalars().all():
+        repaired += await ensure_access_end_for_paid_org(db, org) is not None
+    return repaired
+
+
+async def _record_notices(db: AsyncSession, rows: Sequence[Any]) -> Set[Tuple[UUID, str]]:
+    """Add rows to the ledger; returns the (org, notice) pairs not already there."""
+    if not rows:
+        return set()
+    stmt = (
+        pg_insert(PlanExpiryNotice)
+        .values([
+            {"organization_id": row.id, "notice": row.notice, "access_ends_at": row.access_ends_at}
+            for row in rows
+        ])
+        .on_conflict_do_nothing()
+        .returning(PlanExpiryNotice.organization_id, PlanExpiryNotice.notice)
+    )
+    result = await db.execute(stmt)
+    return {(organization_id, notice) for organization_id, notice in result.all()}
+
+
+def _render_notice(row: Any, renew_link: str) -> Dict[str, Any]:
+    if row.notice == NOTICE_EXPIRED:
+        return plan_expired_email(
+            organization_id=row.id, access_ends_at=row.access_ends_at,
+            to_email=row.email, org_name=row.name, renew_link=renew_link,
+        )
+    return plan_expiry_warning_email(
+        organization_id=row.id, access_ends_at=row.access_ends_at,
+        to_email=row.email, org_name=row.name, days_left=WARNING_DAYS_LEFT[row.notice],
+        renew_link=renew_link,
+    )
+
+
+async def _block_expired(db: AsyncSession, now: datetime) -> List[UUID]:
+    result = await db.execute(
+        update(Organization)
+        .where(_paid_active(), Organization.access_ends_at < now)
+        .values(billing_status="blocked", subscription_status="past_due")
+        .returning(Organization.id)
+        .execution_options(synchronize_session=False)
+    )
+    return list(result.scalars().all())
+
+
+def _ms_since(started: float) -> float:
+    return round((time.perf_counter() - started) * 1000.0, 1)
+
+
+async def check_expiring_plans() -> Dict[str, Any]:
+    """
+    Run the sweep once.
+
+    Returns:
+        Counts per notice, orgs repaired/skipped/blocked, and phase timings in ms
+    """
+    logger.info("Starting plan expiration check...")
+    started = time.perf_counter()
+    now = datetime.now(timezone.utc)
+    batch_size = settings.PLAN_EXPIRY_BATCH_SIZE
+    renew_link = f"{settings.FRONTEND_URL}/settings/billing"
+    stats: Dict[str, Any] = {
+        "repaired": 0,
+        NOTICE_WARNING_5D: 0,
+        NOTICE_WARNING_1D: 0,
+        NOTICE_EXPIRED: 0,
+        "no_contact": 0,
+        "blocked": 0,
+        "batches": 0,
+    }
+    timings: Dict[str, float] = {}
+
+    phase = time.perf_counter()
+    async with SessionLocal() as db:
+        stats["repaired"] = await _repair_missing_access_ends(db, batch_size)
+        await db.commit()
+    timings["repair_ms"] = _ms_since(phase)
+
+    phase = time.perf_counter()
+    if not email_outbox.is_configured():
+        logger.warning("Email delivery not configured. Skipping plan expiry notices.")
+    else:
+        after: Optional[UUID] = None
+        while True:
+            async with SessionLocal() as db:
+                rows = (await db.execute(_cohort_query(now, after, batch_size))).all()
+                if not rows:
+                    break
+                stats["batches"] += 1
+                after = rows[-1].id
+
+                deliverable = []
+                for row in rows:
+                    if row.email:
+                        deliverable.append(row)
+                    else:
+                        stats["no_contact"] += 1
+                        logger.warning(f"Org {row.id} has no billing contact email. Skipping.")
+
+                recorded = await _record_notices(db, deliverable)
+                due = [row for row in deliverable if (row.id, row.notice) in recorded]
+                await email_outbox.enqueue_many(db, [_render_notice(row, renew_link) for row in due])
+                await db.commit()
+
+            for row in due:
+                stats[row.notice] += 1
+            if len(rows) < batch_size:
+                break
+    timings["notify_ms"] = _ms_since(phase)
+
+    # After the notices: the expired cohort is selected among still-active orgs.
+    phase = time.perf_counter()
     async with SessionLocal() as db:
-        now = datetime.now(timezone.utc)
-        
-        # 1. Warning: 5 days left
-        target_date_Start = now + timedelta(days=5)
-        target_date_End = target_date_Start + timedelta(hours=24) # Broad window for safer match? 
-        # Actually safer to check range: access_ends_at BETWEEN now+5days and now+6days
-        # But for simplicity let's query all active paid orgs and check logic in python to be precise
-        
-        # Fetch active organizations with a plan_id (paid)
-        query = select(Organization).where(Organization.plan_id.isnot(None), Organization.billing_status == 'active')
-        result = await db.execute(query)
-        organizations = result.scalars().all()
-        
-        for org in organizations:
-            if not org.access_ends_at:
-                await ensure_access_end_for_paid_org(db, org)
-                if not org.access_ends_at:
-                    continue
-                
-            days_left = (org.access_ends_at - now).days
-            
-            # Fetch Billing Contact
-            contact_id = org.billing_contact_user_id or org.owner_profile_id
-            if not contact_id:
-                logger.warning(f"Org {org.id} has no billing contact. Skipping.")
-                continue
-                
-            query_profile = select(Profile).where(Profile.id == contact_id)
-            res_profile = await db.execute(query_profile)
-            profile = res_profile.scalar_one_or_none()
-            
-            if not profile or not profile.email:
-                logger.warning(f"Profile {contact_id} not found or has no email.")
-                continue
-
-            renew_link = f"{settings.FRONTEND_URL}/settings/billing"
-            user_email = profile.email
-
-            # ALERT LOGIC
-            if days_left == 5:
-                logger.info(f"Sending 5-day warning to {user_email} for org {org.name}")
-                send_plan_expiry_warning(user_email, org.name, 5, renew_link)
-                
-            elif days_left == 1:
-                logger.info(f"Sending 1-day warning to {user_email} for org {org.name}")
-                send_plan_expiry_warning(user_email, org.name, 1, renew_link)
-                
-            elif days_left < 0:
-                # Send expired notice only for very recent expiration window to avoid
-                # repetitive notification spam in long-expired organizations.
-                if days_left > -2:
-                    logger.info(f"Sending EXPIRED notice to {user_email} for org {org.name}")
-                    send_plan_expired_notice(user_email, org.name, renew_link)
-                
-                # Block access for any expired organization.
-                if org.billing_status != 'blocked':
-                    org.billing_status = 'blocked'
-                    org.subscription_status = 'past_due'
-                    db.add(org)
-                    logger.info(f"Blocked access for expired org {org.id} ({org.name})")
-
-        # Commit any status changes
+        blocked = await _block_expired(db, now)
         await db.commit()
+    stats["blocked"] = len(blocked)
+    for organization_id in blocked:
+        logger.info(f"Blocked access for expired org {organization_id}")
+    timings["block_ms"] = _ms_since(phase)
 
-    logger.info("Plan expiration check complete.")
+    timings["total_ms"] = _ms_since(started)
+    stats["timings_ms"] = timings
+    logger.info(f"Plan expiration check complete: {stats}")
+    return stats
 
 if __name__ == "__main__":
     asyncio.run(check_expiring_plans())
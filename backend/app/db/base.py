@@ -8,11 +8,16 @@ from app.models import (
     Profile,
     Client,
     Project,
+    ProjectCounters,
     BankAccount,
+    BankAccountLedgerEntry,
+    BankAccountBalanceCheckpoint,
     Transaction,
+    OrgMonthlyFinancial,
     Kit,
     Proposal,
     StoredFile,
+    GeneratedDocument,
     Notification,
     GoogleDriveCredentials,
     ProjectDriveFolder,
@@ -21,6 +26,7 @@ from app.models import (
     Entitlement,
     OrganizationUsage,
     BillingEvent,
+    PlanExpiryNotice,
     ProjectAssignment,
     Supplier,
     Scene,
@@ -31,7 +37,13 @@ from app.models import (
     KitItemUsageLog,
     TaxTable,
     Invoice,
+    InvoiceNumberSequence,
     OrganizationInvite,
     BillingPurchase,
     PlatformAdminUser,
+    Job,
+    JobSchedule,
+    AiResultCache,
+    DashboardCacheEntry,
+    EmailOutboxMessage,
 )
@@ -0,0 +1,133 @@
+"""
+Index advisor for slow queries captured by the slow-query hook (app/db/session.py).
+
+Captured statements (SLOW_QUERY_CAPTURE_PATH, one JSON object per line) are
+grouped by normalized SQL, planned with EXPLAIN against the live database and
+reported when the plan sequentially scans a large table. Parameters are never
+captured, so statements are planned as generic plans (PREPARE + EXPLAIN
+EXECUTE with NULL arguments under plan_cache_mode = force_generic_plan),
+which is also how a prepared statement would be planned after a few runs.
+
+EXPLAIN without ANALYZE does not run the statement, so DML is safe to plan.
+"""
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, Iterable, List, Optional
+
+_WHITESPACE = re.compile(r"\s+")
+_EXPLAINABLE = ("select", "with", "update", "delete", "insert")
+_PREPARED_NAME = "index_advisor_stmt"
+
+
+@dataclass
+class CapturedQuery:
+    sql: str
+    count: int = 0
+    total_ms: float = 0.0
+    max_ms: float = 0.0
+
+    @property
+    def avg_ms(self) -> float:
+        return self.total_ms / self.count if self.count else 0.0
+
+
+@dataclass
+class SeqScan:
+    relation: str
+    estimated_rows: float
+    table_rows: float
+    filter: Optional[str] = None
+
+
+@dataclass
+class Advice:
+    query: CapturedQuery
+    seq_scans: List[SeqScan] = field(default_factory=list)
+    error: Optional[str] = None
+
+
+def normalize_sql(sql: str) -> str:
+    return _WHITESPACE.sub(" ", sql).strip()
+
+
+def load_captured_queries(lines: Iterable[str]) -> List[CapturedQuery]:
+    """Group capture lines by statement, most total time first. Malformed lines are skipped."""
+    queries: Dict[str, CapturedQuery] = {}
+    for line in lines:
+        try:
+            entry = json.loads(line)
+            sql = normalize_sql(entry["sql"])
+            elapsed_ms = float(entry.get("elapsed_ms") or 0.0)
+        except (ValueError, KeyError, TypeError):
+            continue
+        if not sql.lower().startswith(_EXPLAINABLE):
+            continue
+        query = queries.setdefault(sql, CapturedQuery(sql=sql))
+        query.count += 1
+        query.total_ms += elapsed_ms
+        query.max_ms = max(query.max_ms, elapsed_ms)
+    return sorted(queries.values(), key=lambda q: q.total_ms, reverse=True)
+
+
+def find_seq_scans(plan: Any) -> List[Dict[str, Any]]:
+    """Seq Scan nodes of an EXPLAIN (FORMAT JSON) plan, depth first."""
+    if isinstance(plan, list):
+        return [scan for item in plan for scan in find_seq_scans(item)]
+    if not isinstance(plan, dict):
+        return []
+    node = plan.get("Plan", plan)
+    scans = [node] if node.get("Node Type") == "Seq Scan" else []
+    for child in node.get("Plans", []):
+        scans.extend(find_seq_scans(child))
+    return scans
+
+
+async def explain_generic(connection, sql: str) -> Any:
+    """EXPLAIN (FORMAT JSON) the generic plan of `sql` on an asyncpg connection."""
+    async with connection.transaction():
+        await connection.execute("SET LOCAL plan_cache_mode = force_generic_plan")
+        await connection.execute(f"PREPARE {_PREPARED_NAME} AS {sql}")
+        try:
+            param_count = await connection.fetchval(
+                "SELECT cardinality(parameter_types) FROM pg_prepared_statements WHERE name = $1",
+                _PREPARED_NAME,
+            )
+            args = f"({', '.join(['NULL'] * param_count)})" if param_count else ""
+            plan = await connection.fetchval(f"EXPLAIN (FORMAT JSON) EXECUTE {_PREPARED_NAME}{args}")
+        finally:
+            await connection.execute(f"DEALLOCATE {_PREPARED_NAME}")
+    return json.loads(plan) if isinstance(plan, str) else plan
+
+
+async def advise(connection, queries: Iterable[CapturedQuery], *, min_table_rows: int = 1000) -> List[Advice]:
+    """Plan each query and keep those that sequentially scan a table of at least `min_table_rows`."""
+    table_rows = {
+        row["relname"]: float(row["reltuples"])
+        for row in await connection.fetch(
+            "SELECT relname, reltuples FROM pg_class WHERE relkind IN ('r', 'p', 'm')"
+        )
+    }
+
+    report = []
+    for query in queries:
+        try:
+            plan = await explain_generic(connection, query.sql)
+        except Exception as e:
+            report.append(Advice(query=query, error=str(e).splitlines()[0] if str(e) else type(e).__name__))
+            continue
+
+        scans = []
+        for node in find_seq_scans(plan):
+            relation = node.get("Relation Name", "?")
+            rows = table_rows.get(relation, 0.0)
+            if rows >= min_table_rows:
+                scans.append(SeqScan(
+                    relation=relation,
+                    estimated_rows=float(node.get("Plan Rows", 0)),
+                    table_rows=rows,
+                    filter=node.get("Filter"),
+                ))
+        if scans:
+            report.append(Advice(query=query, seq_scans=scans))
+    return report
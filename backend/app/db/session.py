@@ -1,10 +1,13 @@
 import contextvars
+import json
 import logging
 import time
+from datetime import datetime, timezone
+from typing import Awaitable, Callable
 
 from sqlalchemy import event
 from sqlalchemy.ext.asyncio import AsyncSession, create_async_engine
-from sqlalchemy.orm import sessionmaker
+from sqlalchemy.orm import Session, sessionmaker
 
 from app.core.config import settings
 from uuid import uuid4
@@ -94,6 +97,22 @@ def _after_cursor_execute(conn, cursor, statement, parameters, context, executem
     if threshold_ms and elapsed_ms >= threshold_ms:
         # Log SQL only (no params) to reduce risk of leaking secrets/PII.
         logger.warning("Slow SQL query (%.1f ms): %s", elapsed_ms, statement)
+        if settings.SLOW_QUERY_CAPTURE_PATH:
+            _capture_slow_query(statement, elapsed_ms)
+
+
+def _capture_slow_query(statement: str, elapsed_ms: float) -> None:
+    """Append a slow statement to SLOW_QUERY_CAPTURE_PATH (read by scripts/index_advisor.py)."""
+    line = json.dumps({
+        "captured_at": datetime.now(timezone.utc).isoformat(),
+        "elapsed_ms": round(elapsed_ms, 1),
+        "sql": statement,
+    })
+    try:
+        with open(settings.SLOW_QUERY_CAPTURE_PATH, "a", encoding="utf-8") as capture_file:
+            capture_file.write(line + "\n")
+    except OSError as e:
+        logger.warning("Could not capture slow query: %s", e)
 
 # Cria a fábrica de sessões (Essa é a variável que o script estava procurando com o nome errado)
 SessionLocal = sessionmaker(
@@ -104,13 +123,46 @@ SessionLocal = sessionmaker(
 )
 
 
+# session.info key holding async work that get_db awaits after the request commits.
+_POST_COMMIT_CALLBACKS = "post_commit_callbacks"
+
+
+def add_post_commit_callback(session: Session, callback: Callable[[], Awaitable[None]]) -> bool:
+    """
+    Have get_db await `callback` once the request's transaction has committed,
+    before the response is sent. Meant for after_commit hooks, which cannot
+    await. Returns False when `session` did not come from get_db (workers,
+    scripts); the caller then has to run the work some other way.
+    """
+    callbacks = session.info.get(_POST_COMMIT_CALLBACKS)
+    if callbacks is None:
+        return False
+    callbacks.append(callback)
+    return True
+
+
+async def _run_post_commit_callbacks(session: AsyncSession) -> None:
+    callbacks = session.info.get(_POST_COMMIT_CALLBACKS) or []
+    while callbacks:
+        callback = callbacks.pop(0)
+        try:
+            await callback()
+        except Exception as e:
+            logger.warning("Post-commit callback failed: %s", e)
+
+
 async def get_db() -> AsyncSession:
     """
     Dependency to get database session.
     Use with FastAPI's dependency injection:
         async def endpoint(db: AsyncSession = Depends(get_db)):
+
+    Work queued with add_post_commit_callback by any commit in the request
+    (including explicit ones in the endpoint) is awaited here, before the
+    response goes out.
     """
     async with SessionLocal() as session:
+        session.info[_POST_COMMIT_CALLBACKS] = []
         try:
             yield session
             await session.commit()
@@ -118,4 +170,5 @@ async def get_db() -> AsyncSession:
             await session.rollback()
             raise
         finally:
+            await _run_post_commit_callbacks(session)
             await session.close()
@@ -13,6 +13,7 @@ from slowapi.middleware import SlowAPIMiddleware
 from app.core.config import settings
 from app.api.v1.api import api_router
 from app.db.session import get_db_metrics, reset_db_metrics, restore_db_metrics
+from app.services.base import NEXT_CURSOR_HEADER
 
 # Configure logging
 logging.basicConfig(
@@ -148,6 +149,7 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=[NEXT_CURSOR_HEADER],
 )
 
 
@@ -160,6 +162,30 @@ async def unhandled_exception_handler(request: Request, exc: Exception):
 app.include_router(api_router, prefix=api_v1_str)
 
 
+@app.on_event("startup")
+async def start_background_listeners():
+    from app.core.auth_cache import auth_cache_relay
+
+    await auth_cache_relay.start()
+
+
+@app.on_event("shutdown")
+async def shutdown_background_resources():
+    from app.core.auth_cache import auth_cache_relay
+    from app.core.websocket_manager import notification_ws_manager
+    from app.services.google_http import google_http_client
+    from app.services.pdf_renderer import pdf_render_engine
+    from app.services.storage import storage_service
+    from app.services.stripe_gateway import stripe_gateway
+
+    pdf_render_engine.shutdown()
+    stripe_gateway.shutdown()
+    await storage_service.close()
+    await google_http_client.aclose()
+    await notification_ws_manager.close()
+    await auth_cache_relay.close()
+
+
 @app.get("/health")
 async def health_check():
     """Health check endpoint"""
@@ -168,8 +194,10 @@ async def health_check():
 
 # === WebSocket for Real-Time Notifications ===
 from fastapi import WebSocket, WebSocketDisconnect, Query
-from jose import jwt, JWTError
+from jose import JWTError
 from sqlalchemy import select
+from app.api.deps import decode_access_token
+from app.core.auth_cache import auth_cache
 from app.core.websocket_manager import notification_ws_manager
 from app.db.session import SessionLocal
 from app.models.profiles import Profile
@@ -181,21 +209,26 @@ async def get_user_from_token(token: str) -> tuple:
     Returns (user_id, org_id) or (None, None) if invalid.
     """
     try:
-        payload = jwt.get_unverified_claims(token)
+        payload = decode_access_token(token)
         user_id = payload.get("sub")
         if not user_id:
             return None, None
-        
-        # Get org_id from database
-        async with SessionLocal() as db:
-            from uuid import UUID
-            query = select(Profile).where(Profile.id == UUID(user_id))
-            result = await db.execute(query)
-            profile = result.scalar_one_or_none()
-            
-            if profile and profile.organization_id:
-                return UUID(user_id), profile.organization_id
-        
+
+        from uuid import UUID
+        user_id = UUID(user_id)
+        cached = auth_cache.get(user_id)
+        if cached is not None:
+            profile = cached.profile
+        else:
+            # Get org_id from database
+            async with SessionLocal() as db:
+                query = select(Profile).where(Profile.id == user_id)
+                result = await db.execute(query)
+                profile = result.scalar_one_or_none()
+
+        if profile and profile.organization_id:
+            return user_id, profile.organization_id
+
         return None, None
     except (JWTError, Exception) as e:
         logger.warning(f"WebSocket auth failed: {e}")
@@ -215,6 +248,7 @@ async def notifications_websocket(
     Messages sent:
     - {"type": "notification", "action": "new", "data": {...}}
     - {"type": "notification", "action": "refresh"}
+    - {"type": "heartbeat"} (server keep-alive; clients that stop sending are closed with 1013)
     """
     # Validate token
     if not token:
@@ -230,8 +264,8 @@ async def notifications_websocket(
     await notification_ws_manager.connect(websocket, org_id, user_id)
     
     try:
-        # Send connection confirmation
-        await websocket.send_json({
+        # Send connection confirmation (outbound messages go through the connection's queue)
+        notification_ws_manager.send_to_connection(websocket, org_id, user_id, {
             "type": "connected",
             "message": "WebSocket connected for notifications"
         })
@@ -241,10 +275,11 @@ async def notifications_websocket(
             try:
                 # Wait for messages (ping/pong or client commands)
                 data = await websocket.receive_text()
+                notification_ws_manager.touch(websocket, org_id, user_id)
                 
                 # Handle ping
                 if data == "ping":
-                    await websocket.send_json({"type": "pong"})
+                    notification_ws_manager.send_to_connection(websocket, org_id, user_id, {"type": "pong"})
                     
             except WebSocketDisconnect:
                 break
@@ -1,32 +1,37 @@
 # Import all models automatically detected
-from .bank_accounts import BankAccount
+from .bank_accounts import BankAccount, BankAccountLedgerEntry, BankAccountBalanceCheckpoint
 from .clients import Client
 from .cloud import GoogleDriveCredentials, ProjectDriveFolder, CloudFileReference
 from .commercial import Supplier
 from .invites import OrganizationInvite
-from .financial import TaxTypeEnum, InvoiceStatusEnum, InvoicePaymentMethodEnum, TaxTable, Invoice, InvoiceItem
+from .financial import TaxTypeEnum, InvoiceStatusEnum, InvoicePaymentMethodEnum, TaxTable, Invoice, InvoiceItem, InvoiceNumberSequence
 from .inventory import MaintenanceTypeEnum, HealthStatusEnum, KitItem, MaintenanceLog, KitItemUsageLog
 from .kits import Kit
 from .notifications import Notification
 from .organizations import Organization
 from .production import DayNightEnum, InternalExternalEnum, Scene, Character, SceneCharacter
 from .profiles import Profile
-from .projects import Project
+from .projects import Project, ProjectCounters
 from .proposals import Proposal
 from .scheduling import ShootingDay, ShootingDayCrewAssignment
-from .storage import StoredFile
-from .transactions import Transaction
+from .storage import StoredFile, GeneratedDocument
+from .transactions import Transaction, OrgMonthlyFinancial
 from .services import Service
-from .ai import ScriptAnalysis, AiSuggestion, AiRecommendation, AiUsageLog
-from .billing import Plan, Entitlement, OrganizationUsage, BillingEvent
+from .ai import ScriptAnalysis, AiSuggestion, AiRecommendation, AiUsageLog, AiResultCache
+from .billing import Plan, Entitlement, OrganizationUsage, BillingEvent, PlanExpiryNotice
 from .access import ProjectAssignment
 
 from .refunds import BillingPurchase
 from .platform import PlatformAdminUser
 from .bug_reports import BugReport
+from .jobs import Job, JobSchedule
+from .dashboard import DashboardCacheEntry, DashboardCacheGeneration
+from .emails import EmailOutboxMessage
 
 __all__ = [
     "BankAccount",
+    "BankAccountLedgerEntry",
+    "BankAccountBalanceCheckpoint",
     "Client",
     "GoogleDriveCredentials",
     "ProjectDriveFolder",
@@ -38,6 +43,7 @@ __all__ = [
     "TaxTable",
     "Invoice",
     "InvoiceItem",
+    "InvoiceNumberSequence",
     "MaintenanceTypeEnum",
     "HealthStatusEnum",
     "KitItem",
@@ -53,23 +59,33 @@ __all__ = [
     "SceneCharacter",
     "Profile",
     "Project",
+    "ProjectCounters",
     "Proposal",
     "ShootingDay",
     "ShootingDayCrewAssignment",
     "StoredFile",
+    "GeneratedDocument",
     "Transaction",
+    "OrgMonthlyFinancial",
     "Service",
     "ScriptAnalysis",
     "AiSuggestion",
     "AiRecommendation",
     "AiUsageLog",
+    "AiResultCache",
     "Plan",
     "Entitlement",
     "OrganizationUsage",
     "BillingEvent",
+    "PlanExpiryNotice",
     "ProjectAssignment",
     "OrganizationInvite",
     "BillingPurchase",
     "PlatformAdminUser",
     "BugReport",
+    "Job",
+    "JobSchedule",
+    "DashboardCacheEntry",
+    "DashboardCacheGeneration",
+    "EmailOutboxMessage",
 ]
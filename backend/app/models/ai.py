@@ -3,7 +3,7 @@ AI Features Database Models
 
 Models for storing AI analysis results, suggestions, recommendations, and usage tracking.
 """
-from sqlalchemy import Column, String, TIMESTAMP, Boolean, BIGINT, Integer, Float, Text, func, ForeignKey, CheckConstraint, JSON
+from sqlalchemy import Column, String, TIMESTAMP, Boolean, BIGINT, Integer, Float, Text, func, ForeignKey, CheckConstraint, JSON, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 from sqlalchemy.orm import relationship
 import uuid
@@ -160,3 +160,39 @@ class AiUsageLog(Base):
     __table_args__ = (
         CheckConstraint("request_type IN ('script_analysis', 'budget_estimation', 'shooting_day_suggestion', 'text_analysis', 'other')"),
     )
+
+
+class AiResultCache(Base):
+    """
+    Cached AI Provider Results
+
+    Second tier of the AI result cache (the first is an in-process LRU).
+    Keyed by operation, content hash, analysis type, response language and
+    prompt version so identical requests are served without a provider call.
+    """
+    __tablename__ = "ai_result_cache"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+
+    # Cache key
+    operation = Column(String, nullable=False)  # script_analysis, production_suggestions, budget_estimation
+    content_hash = Column(String(64), nullable=False)  # SHA-256 of the prompt inputs
+    analysis_type = Column(String, nullable=False)
+    response_language = Column(String, nullable=False)
+    prompt_version = Column(String, nullable=False)
+
+    result = Column(JSONB, nullable=False)
+
+    # Audit
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index(
+            "uq_ai_result_cache_key",
+            "organization_id", "operation", "content_hash", "analysis_type", "response_language", "prompt_version",
+            unique=True,
+        ),
+        Index("ix_ai_result_cache_expires_at", "expires_at"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, BIGINT, TIMESTAMP, func, ForeignKey
+from sqlalchemy import Column, String, BIGINT, TIMESTAMP, func, ForeignKey, Index, Identity
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -17,3 +17,49 @@ class BankAccount(Base):
 
     # Relationships
     transactions = relationship("Transaction", back_populates="bank_account")
+
+
+class BankAccountLedgerEntry(Base):
+    """
+    Append-only record of every change to a bank account balance.
+
+    Written in the same transaction as the atomic balance UPDATE; the id is
+    a monotonically increasing identity so checkpoints can say "everything up
+    to entry N".
+    """
+    __tablename__ = "bank_account_ledger"
+
+    id = Column(BIGINT, Identity(always=False), primary_key=True)
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
+    bank_account_id = Column(UUID(as_uuid=True), ForeignKey("bank_accounts.id", ondelete="CASCADE"), nullable=False)
+    # No foreign key: reversal entries outlive the deleted transaction they undo
+    transaction_id = Column(UUID(as_uuid=True), nullable=True)
+    reason = Column(String, nullable=False)  # transaction_applied, transaction_reversed, adjustment
+    delta_cents = Column(BIGINT, nullable=False)
+    balance_after_cents = Column(BIGINT, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_bank_account_ledger_account_id", "bank_account_id", "id"),
+    )
+
+
+class BankAccountBalanceCheckpoint(Base):
+    """
+    Balance of an account as of a ledger entry (inclusive).
+
+    A balance is recomputed as the latest checkpoint plus the ledger deltas
+    after it, so verification never rescans the full history.
+    """
+    __tablename__ = "bank_account_balance_checkpoints"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=False)
+    bank_account_id = Column(UUID(as_uuid=True), ForeignKey("bank_accounts.id", ondelete="CASCADE"), nullable=False)
+    ledger_entry_id = Column(BIGINT, nullable=False)  # 0 = opening balance, before any ledger entry
+    balance_cents = Column(BIGINT, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        Index("ix_bank_account_balance_checkpoints_account", "bank_account_id", "ledger_entry_id"),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, TIMESTAMP, Boolean, Integer, BIGINT, ForeignKey, UniqueConstraint, func  # noqa: F811
+from sqlalchemy import Column, String, TEXT, TIMESTAMP, Boolean, Integer, BIGINT, ForeignKey, Index, UniqueConstraint, func, text  # noqa: F811
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from app.core.base import Base
@@ -58,7 +58,8 @@ class BillingEvent(Base):
     organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id"), nullable=True)
     
     event_type = Column(String, nullable=False)
-    status = Column(String, nullable=False)  # received, processed, failed, succeeded
+    # received (inbox, pending), processed, failed (dead-lettered), succeeded (ledger)
+    status = Column(String, nullable=False)
     provider = Column(String, default="stripe", nullable=False) # e.g. stripe
     
     amount_cents = Column(BIGINT, nullable=True)
@@ -72,6 +73,36 @@ class BillingEvent(Base):
     received_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
     processed_at = Column(TIMESTAMP(timezone=True), nullable=True)
 
+    # Webhook inbox (app/services/billing_events.py)
+    source = Column(String, nullable=True)  # billing | connect
+    ordering_key = Column(String, nullable=True)  # Stripe customer or connected account
+    payload = Column(JSONB, nullable=True)  # the event's "data" object
+    event_created_at = Column(TIMESTAMP(timezone=True), nullable=True)  # Stripe "created"
+    attempts = Column(Integer, nullable=False, server_default="0")
+    next_attempt_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    last_error = Column(TEXT, nullable=True)
+
     __table_args__ = (
         UniqueConstraint("external_id", name="uq_billing_events_external_id"),
+        Index(
+            "ix_billing_events_inbox",
+            "ordering_key", "event_created_at", "received_at",
+            postgresql_where=text("status = 'received' AND payload IS NOT NULL"),
+        ),
     )
+
+
+class PlanExpiryNotice(Base):
+    """
+    Ledger of plan-expiry notifications already sent (app/cron_check_plans.py).
+
+    One row per organization, notice and access period, so the sweep can run
+    often without repeating itself; renewing moves access_ends_at and
+    re-arms every notice.
+    """
+    __tablename__ = "plan_expiry_notices"
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    notice = Column(String, primary_key=True)  # warning_5d, warning_1d, expired
+    access_ends_at = Column(TIMESTAMP(timezone=True), primary_key=True)
+    notified_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
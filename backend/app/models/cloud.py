@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, TIMESTAMP, func, ForeignKey, TEXT
+from sqlalchemy import Column, String, TIMESTAMP, func, ForeignKey, TEXT, Index
 from sqlalchemy.dialects.postgresql import UUID
 from app.core.base import Base
 import uuid
@@ -57,6 +57,7 @@ class CloudFileReference(Base):
     updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
 
     __table_args__ = (
+        Index('ix_cloud_file_references_project_external', 'project_id', 'external_id'),
         {'schema': None}
     )
 
@@ -78,6 +79,10 @@ class ProjectDriveFolder(Base):
     media_folder_id = Column(String, nullable=True)
     media_folder_url = Column(String, nullable=True)
 
+    # Incremental sync state (Drive changes API), maintained by DriveSyncEngine
+    changes_page_token = Column(String, nullable=True)
+    last_synced_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
 
@@ -0,0 +1,41 @@
+from sqlalchemy import BigInteger, Column, String, TIMESTAMP, func, ForeignKey, Index
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+from app.core.base import Base
+
+
+class DashboardCacheEntry(Base):
+    """
+    Shared executive dashboard cache, one row per organization/section/variant.
+
+    UNLOGGED: writes skip the WAL and the table is emptied after a crash,
+    which is fine for data that is recomputed on a miss.
+    """
+    __tablename__ = "dashboard_cache"
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    section = Column(String, primary_key=True)  # financial, production, inventory, cloud, trends
+    variant = Column(String, primary_key=True)  # build parameters, e.g. months_back for trends
+    payload = Column(JSONB, nullable=False)
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    expires_at = Column(TIMESTAMP(timezone=True), nullable=False)
+
+    __table_args__ = (
+        Index("ix_dashboard_cache_expires_at", "expires_at"),
+        {"prefixes": ["UNLOGGED"]},
+    )
+
+
+class DashboardCacheGeneration(Base):
+    """
+    Invalidation counter per organization/section, shared by every process.
+
+    A section built under one generation is only stored while the counter
+    still holds that value, so a build that raced an invalidation is dropped.
+    Kept LOGGED: losing it on a crash could let a counter repeat a value.
+    """
+    __tablename__ = "dashboard_cache_generations"
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    section = Column(String, primary_key=True)
+    generation = Column(BigInteger, nullable=False, server_default="0")
+    invalidated_at = Column(TIMESTAMP(timezone=True), nullable=True)
@@ -0,0 +1,51 @@
+from sqlalchemy import Column, String, Integer, TEXT, TIMESTAMP, ForeignKey, Index, func, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+from app.core.base import Base
+
+
+class EmailOutboxMessage(Base):
+    """
+    A transactional email waiting for (or done with) delivery.
+
+    Rows are written in the same transaction as the change that triggers the
+    email and delivered by the worker (app/services/email_outbox.py), so an
+    email is sent if and only if that change commits. Attachments are stored
+    as specs (e.g. {"type": "invoice_pdf", "invoice_id": ...}) and rendered
+    at delivery time.
+    """
+    __tablename__ = "email_outbox"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=True)
+    kind = Column(String, nullable=False)  # invoice, plan_expiry_warning, plan_expired, ...
+
+    to_addresses = Column(JSONB, nullable=False)
+    subject = Column(String, nullable=False)
+    html_body = Column(TEXT, nullable=False)
+    attachments = Column(JSONB, nullable=False, server_default=text("'[]'::jsonb"))
+
+    # queued, sending, sent, failed
+    status = Column(String, nullable=False, server_default="queued")
+    attempts = Column(Integer, nullable=False, server_default="0")
+    next_attempt_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    locked_until = Column(TIMESTAMP(timezone=True), nullable=True)  # while status = 'sending'
+    # Shared by the emails of one claim while status = 'sending'; a claim that takes
+    # over an expired lease resends the same batch under the same idempotency key.
+    batch_key = Column(String, nullable=True)
+    last_error = Column(TEXT, nullable=True)
+    provider_message_id = Column(String, nullable=True)
+
+    # Optional idempotency key: a second enqueue with the same key is a no-op.
+    dedupe_key = Column(String, nullable=True, unique=True)
+
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    sent_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_email_outbox_pending",
+            "next_attempt_at",
+            postgresql_where=text("status IN ('queued', 'sending')"),
+        ),
+    )
@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, TEXT, TIMESTAMP, Boolean, func, ForeignKey, BIGINT, DECIMAL, Date, Enum
+from sqlalchemy import Column, String, TEXT, TIMESTAMP, Boolean, func, ForeignKey, BIGINT, DECIMAL, Date, Enum, Integer
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 from app.core.base import Base
@@ -147,6 +147,22 @@ class Invoice(Base):
     )
 
 
+class InvoiceNumberSequence(Base):
+    """
+    Per-organization, per-year invoice number counter.
+
+    Incremented with a single upsert ... RETURNING inside the transaction that
+    creates the invoice, so allocation is O(1), only this row is locked, and a
+    rolled-back invoice gives its number back (no gaps).
+    """
+    __tablename__ = "invoice_number_sequences"
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    year = Column(Integer, primary_key=True)
+    last_value = Column(BIGINT, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
 class InvoiceItem(Base):
     """
     Line items for invoices.
@@ -0,0 +1,76 @@
+from sqlalchemy import Column, String, Integer, TEXT, TIMESTAMP, Boolean, ForeignKey, Index, func, text
+from sqlalchemy.dialects.postgresql import UUID, JSONB
+import uuid
+from app.core.base import Base
+
+
+class Job(Base):
+    """
+    A unit of background work in the Postgres job queue.
+
+    Workers claim queued jobs with SELECT ... FOR UPDATE SKIP LOCKED and hold
+    them until locked_until (the visibility timeout), extending it while the
+    job runs. Expired claims are requeued; failures are retried with
+    exponential backoff until max_attempts.
+    """
+    __tablename__ = "jobs"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    queue = Column(String, nullable=False, server_default="default")
+    name = Column(String, nullable=False)  # registered task name
+    payload = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=True)
+
+    # queued, running, succeeded, failed, cancelled
+    status = Column(String, nullable=False, server_default="queued")
+    priority = Column(Integer, nullable=False, server_default="0")  # higher runs first
+    attempts = Column(Integer, nullable=False, server_default="0")
+    max_attempts = Column(Integer, nullable=False, server_default="5")
+    run_at = Column(TIMESTAMP(timezone=True), nullable=False, server_default=func.now())
+
+    locked_by = Column(String, nullable=True)
+    locked_until = Column(TIMESTAMP(timezone=True), nullable=True)
+    cancel_requested = Column(Boolean, nullable=False, server_default="false")
+
+    # Optional idempotency key: a second enqueue with the same key is a no-op.
+    dedupe_key = Column(String, nullable=True, unique=True)
+
+    result = Column(JSONB, nullable=True)
+    last_error = Column(TEXT, nullable=True)
+
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+    started_at = Column(TIMESTAMP(timezone=True), nullable=True)
+    finished_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index(
+            "ix_jobs_ready",
+            "queue", "priority", "run_at",
+            postgresql_where=text("status = 'queued'"),
+        ),
+        Index(
+            "ix_jobs_running_locked_until",
+            "locked_until",
+            postgresql_where=text("status = 'running'"),
+        ),
+        Index("ix_jobs_organization_status", "organization_id", "status"),
+    )
+
+
+class JobSchedule(Base):
+    """Recurring job definition (cron expression or "@every Ns"), advanced by workers."""
+    __tablename__ = "job_schedules"
+
+    name = Column(String, primary_key=True)
+    schedule = Column(String, nullable=False)
+    job_name = Column(String, nullable=False)
+    queue = Column(String, nullable=False, server_default="default")
+    payload = Column(JSONB, nullable=False, server_default=text("'{}'::jsonb"))
+    enabled = Column(Boolean, nullable=False, server_default="true")
+
+    next_run_at = Column(TIMESTAMP(timezone=True), nullable=False)
+    last_run_at = Column(TIMESTAMP(timezone=True), nullable=True)
+
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
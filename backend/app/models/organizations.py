@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, TIMESTAMP, Boolean, func, CheckConstraint, ForeignKey, Numeric
+from sqlalchemy import Column, String, TIMESTAMP, Boolean, func, CheckConstraint, ForeignKey, Index, Numeric, text
 from sqlalchemy.dialects.postgresql import UUID
 import uuid
 from datetime import datetime
@@ -54,4 +54,10 @@ class Organization(Base):
         CheckConstraint(
             "billing_status IN ('trial_active', 'trial_ended', 'active', 'past_due', 'canceled', 'blocked', 'billing_pending_review')"
         ),
+        # Plan-expiry sweep (app/cron_check_plans.py)
+        Index(
+            "ix_organizations_paid_access_ends_at",
+            "access_ends_at",
+            postgresql_where=text("billing_status = 'active' AND plan_id IS NOT NULL"),
+        ),
     )
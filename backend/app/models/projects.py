@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, TIMESTAMP, DATE, Boolean, BIGINT, func, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, TIMESTAMP, DATE, Boolean, BIGINT, Integer, func, ForeignKey, CheckConstraint
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -68,6 +68,27 @@ class Project(Base):
     services = relationship("Service", secondary="project_services", backref="projects")
 
 
+class ProjectCounters(Base):
+    """
+    Per-project counts of scenes, characters, shooting days and stakeholders.
+
+    Maintained by the scene, character, shooting-day and stakeholder services
+    (`project_stats_service.apply`, a `count + delta` upsert in the same
+    transaction as the write), so project cards read one row per project
+    instead of counting five tables. A missing row means all zeros.
+    """
+    __tablename__ = "project_counters"
+
+    project_id = Column(UUID(as_uuid=True), ForeignKey("projects.id", ondelete="CASCADE"), primary_key=True)
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+    scenes_count = Column(Integer, nullable=False, default=0)
+    characters_count = Column(Integer, nullable=False, default=0)
+    shooting_days_count = Column(Integer, nullable=False, default=0)
+    confirmed_shooting_days_count = Column(Integer, nullable=False, default=0)
+    team_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
+
+
 from sqlalchemy import Table
 
 # Association table for Project <-> Service
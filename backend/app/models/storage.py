@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, BIGINT, TIMESTAMP, func, ForeignKey, Boolean
+from sqlalchemy import Column, String, BIGINT, TIMESTAMP, func, ForeignKey, Boolean, UniqueConstraint, Index
 from sqlalchemy.dialects.postgresql import UUID, JSONB
 import uuid
 from app.core.base import Base
@@ -25,3 +25,41 @@ class StoredFile(Base):
     
     created_at = Column(TIMESTAMP(timezone=True), server_default=func.now())
     updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now())
+
+
+class GeneratedDocument(Base):
+    """
+    Content-addressed index of rendered PDFs (proposals, shooting days, invoices).
+
+    content_hash covers every rendered template input, so an identical
+    (entity, content_hash) pair can reuse the stored object instead of
+    re-rendering and re-uploading it.
+    """
+    __tablename__ = "generated_documents"
+
+    id = Column(UUID(as_uuid=True), primary_key=True, default=uuid.uuid4)
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), nullable=False)
+
+    entity_type = Column(String, nullable=False)  # proposal, shooting_day, invoice
+    entity_id = Column(UUID(as_uuid=True), nullable=False)
+    content_hash = Column(String(64), nullable=False)
+
+    bucket = Column(String, nullable=False)
+    file_path = Column(String, nullable=False)
+    filename = Column(String, nullable=False)
+    size_bytes = Column(BIGINT, nullable=False)
+
+    created_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+    # Bumped whenever the document is served again for identical content.
+    last_used_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), nullable=False)
+
+    __table_args__ = (
+        UniqueConstraint(
+            "organization_id", "entity_type", "entity_id", "content_hash",
+            name="uq_generated_documents_entity_hash",
+        ),
+        Index(
+            "ix_generated_documents_entity_last_used",
+            "organization_id", "entity_type", "entity_id", "last_used_at",
+        ),
+    )
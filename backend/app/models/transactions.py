@@ -1,4 +1,4 @@
-from sqlalchemy import Column, String, BIGINT, TIMESTAMP, DATE, func, ForeignKey, CheckConstraint
+from sqlalchemy import Column, String, BIGINT, Integer, TIMESTAMP, DATE, func, ForeignKey, CheckConstraint, Index, text
 from sqlalchemy.dialects.postgresql import UUID
 from sqlalchemy.orm import relationship
 import uuid
@@ -44,4 +44,63 @@ class Transaction(Base):
         CheckConstraint("type IN ('income', 'expense')"),
         CheckConstraint("category IN ('crew_hire', 'equipment_rental', 'logistics', 'post_production', 'other', 'production_revenue', 'maintenance', 'internal_transfer')"),
         CheckConstraint("payment_status IN ('pending', 'approved', 'paid', 'rejected')"),
+        # Org-scoped access paths (created CONCURRENTLY by migration e9b1d3f5a7c8; declared
+        # here so autogenerate does not drop them again).
+        # Listings and keyset pages: ORDER BY transaction_date, created_at, id (scanned backwards).
+        Index("ix_transactions_org_date_created_id", "organization_id", "transaction_date", "created_at", "id"),
+        # Approval queue.
+        Index(
+            "ix_transactions_org_pending",
+            "organization_id", "transaction_date", "created_at", "id",
+            postgresql_where=text("payment_status = 'pending'"),
+        ),
+        # Reporting sums over applied, non-transfer transactions (index-only scans).
+        Index(
+            "ix_transactions_org_applied_date",
+            "organization_id", "transaction_date",
+            postgresql_include=["type", "category", "amount_cents"],
+            postgresql_where=text("payment_status IN ('approved', 'paid') AND category <> 'internal_transfer'"),
+        ),
+        # Project profitability and budget actuals.
+        Index(
+            "ix_transactions_org_project",
+            "organization_id", "project_id",
+            postgresql_include=["type", "category", "payment_status", "budget_line_id", "amount_cents"],
+            postgresql_where=text("project_id IS NOT NULL"),
+        ),
+        Index(
+            "ix_transactions_org_budget_line",
+            "organization_id", "budget_line_id",
+            postgresql_include=["type", "category", "payment_status", "amount_cents"],
+            postgresql_where=text("budget_line_id IS NOT NULL"),
+        ),
+        # Supplier spend summaries.
+        Index(
+            "ix_transactions_org_supplier",
+            "organization_id", "supplier_id",
+            postgresql_include=["type", "transaction_date", "amount_cents"],
+            postgresql_where=text("supplier_id IS NOT NULL"),
+        ),
     )
+
+
+class OrgMonthlyFinancial(Base):
+    """
+    Monthly totals of applied (approved/paid) transactions per organization,
+    type and category.
+
+    Maintained incrementally by TransactionService (an upsert of
+    `amount_cents + delta` whenever a transaction is applied or removed), so
+    dashboard and stats queries read a handful of rows per month instead of
+    scanning `transactions`. `scripts/rebuild_monthly_financials.py` rebuilds
+    or verifies it from the raw table.
+    """
+    __tablename__ = "org_monthly_financials"
+
+    organization_id = Column(UUID(as_uuid=True), ForeignKey("organizations.id", ondelete="CASCADE"), primary_key=True)
+    month = Column(DATE, primary_key=True)  # first day of the month
+    type = Column(String, primary_key=True)  # income, expense
+    category = Column(String, primary_key=True)
+    amount_cents = Column(BIGINT, nullable=False, default=0)
+    transaction_count = Column(Integer, nullable=False, default=0)
+    updated_at = Column(TIMESTAMP(timezone=True), server_default=func.now(), onupdate=func.now(), nullable=False)
@@ -11,6 +11,7 @@ from app.schemas.organizations import OrganizationCreate, OrganizationUpdate
 from app.schemas.clients import ClientCreate, ClientUpdate
 from app.schemas.projects import ProjectCreate, ProjectUpdate
 from app.schemas.proposals import ProposalCreate, ProposalUpdate, ProposalApproval
+from app.services.dashboard_cache import PROJECT_SECTIONS, invalidate_dashboard_on_commit
 from app.services.entitlements import ensure_and_reserve_resource_limit
 from uuid import UUID
 
@@ -142,6 +143,31 @@ class ProjectService(BaseService[ProjectModel, ProjectCreate, ProjectUpdate]):
             options=final_options
         )
 
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        cursor: str | None = None,
+        limit: int = 100,
+        skip: int = 0,
+        filters=None,
+        options=None
+    ) -> tuple[list[ProjectModel], str | None]:
+        """Get one page of projects with services loaded, plus the next page cursor."""
+        default_options = [selectinload(ProjectModel.services)]
+        final_options = default_options + (options or [])
+
+        return await super().get_page(
+            db=db,
+            organization_id=organization_id,
+            cursor=cursor,
+            limit=limit,
+            skip=skip,
+            filters=filters,
+            options=final_options
+        )
+
     async def create(self, db, *, organization_id, obj_in, commit: bool = True):
         """Create project with services. Auto-adds service values to budget."""
         # Handle service_ids
@@ -181,6 +207,8 @@ class ProjectService(BaseService[ProjectModel, ProjectCreate, ProjectUpdate]):
                 proposal.project_id = db_obj.id
                 proposal.status = "approved"
 
+        invalidate_dashboard_on_commit(db, organization_id, *PROJECT_SECTIONS)
+
         if commit:
             await db.commit()
             await db.refresh(db_obj)
@@ -238,6 +266,8 @@ class ProjectService(BaseService[ProjectModel, ProjectCreate, ProjectUpdate]):
         
         # Check for completion status change
         if old_status and updated_project and updated_project.status != old_status:
+            invalidate_dashboard_on_commit(db, organization_id, *PROJECT_SECTIONS)
+
             concluded_statuses = {"delivered", "archived"}
             if updated_project.status in concluded_statuses and old_status not in concluded_statuses:
                 # Record equipment usage once the project is concluded.
@@ -268,6 +298,13 @@ class ProjectService(BaseService[ProjectModel, ProjectCreate, ProjectUpdate]):
                     
         return updated_project
 
+    async def remove(self, db, *, organization_id, id):
+        """Delete project and refresh the dashboard's project counts."""
+        project = await super().remove(db=db, organization_id=organization_id, id=id)
+        if project:
+            invalidate_dashboard_on_commit(db, organization_id, *PROJECT_SECTIONS)
+        return project
+
 
 class ProposalService(BaseService[ProposalModel, ProposalCreate, ProposalUpdate]):
     """Service for Proposal operations with approval/conversion logic."""
@@ -422,31 +459,29 @@ class ProposalService(BaseService[ProposalModel, ProposalCreate, ProposalUpdate]
             from app.models.profiles import Profile
             from sqlalchemy import select
 
-            query = select(Profile).where(
+            query = select(Profile.id).where(
                 Profile.organization_id == organization_id,
                 Profile.role.in_(["admin", "manager"])
             )
 
             result = await db.execute(query)
-            admin_manager_profiles = result.scalars().all()
+            admin_manager_ids = result.scalars().all()
 
-            # Send notification to each admin/manager
-            for profile in admin_manager_profiles:
-                await notification_service.create_for_user(
-                    db=db,
-                    organization_id=organization_id,
-                    profile_id=profile.id,
-                    title="proposal_approved_title",
-                    message="proposal_approved_converted_message",
-                    type="success",
-                    metadata={
-                        "proposal_id": str(proposal.id),
-                        "project_id": str(project.id),
-                        "client_id": str(proposal.client_id),
-                        "proposal_title": proposal.title,
-                        "project_title": project.title,
-                    }
-                )
+            # Send notification to every admin/manager in one batch
+            await notification_service.create_many(
+                db=db,
+                recipients=[(organization_id, profile_id) for profile_id in admin_manager_ids],
+                title="proposal_approved_title",
+                message="proposal_approved_converted_message",
+                type="success",
+                metadata={
+                    "proposal_id": str(proposal.id),
+                    "project_id": str(project.id),
+                    "client_id": str(proposal.client_id),
+                    "proposal_title": proposal.title,
+                    "project_title": project.title,
+                }
+            )
 
         except Exception as e:
             # Log but don't fail the approval if notifications fail
@@ -88,3 +88,8 @@ class ProjectStats(BaseModel):
     
     model_config = ConfigDict(from_attributes=True)
 
+
+class ProjectStatsEntry(ProjectStats):
+    """Statistics for one project in a batch stats response."""
+    project_id: UUID
+
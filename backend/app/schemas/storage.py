@@ -1,5 +1,8 @@
-from pydantic import BaseModel, ConfigDict
-from typing import Optional
+from pydantic import BaseModel, ConfigDict, Field
+from typing import Dict, List, Optional
+
+# Longest lifetime a client may request for a signed URL (7 days).
+MAX_SIGNED_URL_EXPIRES_IN = 7 * 24 * 3600
 
 
 class FileUploadRequest(BaseModel):
@@ -26,13 +29,13 @@ class SignedUrlRequest(BaseModel):
     """Schema for signed URL generation request."""
     bucket: str
     file_path: str
-    expires_in: Optional[int] = 3600  # Default 1 hour
+    expires_in: int = Field(3600, ge=60, le=MAX_SIGNED_URL_EXPIRES_IN)  # Default 1 hour
 
     model_config = ConfigDict(from_attributes=True)
 
 
 class SignedUrlResponse(BaseModel):
-    """Schema for signed URL response."""
+    """Schema for signed URL response (expires_in is the URL's remaining lifetime)."""
     signed_url: str
     expires_in: int
     file_path: str
@@ -41,3 +44,24 @@ class SignedUrlResponse(BaseModel):
     model_config = ConfigDict(from_attributes=True)
 
 
+
+
+class SignedUrlBatchRequest(BaseModel):
+    """Schema for signing several files of one bucket at once."""
+    bucket: str
+    file_paths: List[str] = Field(..., min_length=1, max_length=500)
+    expires_in: int = Field(3600, ge=60, le=MAX_SIGNED_URL_EXPIRES_IN)  # Default 1 hour
+
+    model_config = ConfigDict(from_attributes=True)
+
+
+class SignedUrlBatchResponse(BaseModel):
+    """
+    Schema for batch signed URL response (paths that could not be signed are
+    omitted; expires_in is the remaining lifetime of the first URL to expire).
+    """
+    signed_urls: Dict[str, str]
+    expires_in: int
+    bucket: str
+
+    model_config = ConfigDict(from_attributes=True)
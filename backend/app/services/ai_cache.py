@@ -0,0 +1,162 @@
+"""
+Two-tier cache for AI provider results.
+
+Identical AI requests (same operation, prompt inputs, analysis type,
+response language and prompt version) return the same result, so they are
+served from:
+
+1. an in-process TTL/LRU cache (per worker, bounded), then
+2. the `ai_result_cache` table, shared by every process and kept for
+   AI_RESULT_CACHE_TTL_DAYS.
+
+Entries are scoped per organization. Bump PROMPT_VERSION in ai_engine
+whenever a prompt template changes so old results stop matching.
+The persistent tier uses its own short sessions, so a cached result
+survives even if the calling request rolls back; cache errors are logged
+and treated as misses.
+"""
+import copy
+import hashlib
+import json
+import logging
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from cachetools import TTLCache
+from sqlalchemy import delete, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.ai import AiResultCache
+
+logger = logging.getLogger(__name__)
+
+
+def content_hash(*parts: Any) -> str:
+    """
+    SHA-256 of the prompt inputs. Strings are hashed as-is, other values as
+    canonical JSON; a single string hashes like hashlib.sha256(text).
+    """
+    digest = hashlib.sha256()
+    for index, part in enumerate(parts):
+        if not isinstance(part, str):
+            part = json.dumps(part, sort_keys=True, ensure_ascii=False, default=str)
+        if index:
+            digest.update(b"\x00")
+        digest.update(part.encode())
+    return digest.hexdigest()
+
+
+@dataclass(frozen=True)
+class AICacheKey:
+    organization_id: UUID
+    operation: str
+    content_hash: str
+    analysis_type: str
+    response_language: str
+    prompt_version: str
+
+
+class AIResultCache:
+    """In-process LRU in front of the ai_result_cache table."""
+
+    def __init__(self, maxsize: int, memory_ttl: int, ttl_days: int):
+        self.enabled = maxsize > 0 and ttl_days > 0
+        self.ttl_days = ttl_days
+        self._memory: Optional[TTLCache] = (
+            TTLCache(maxsize=maxsize, ttl=memory_ttl) if self.enabled and memory_ttl > 0 else None
+        )
+
+    async def get(self, key: AICacheKey) -> Optional[Dict[str, Any]]:
+        """Cached result for `key` (a copy the caller may modify), or None."""
+        if not self.enabled:
+            return None
+        if self._memory is not None:
+            cached = self._memory.get(key)
+            if cached is not None:
+                return copy.deepcopy(cached)
+
+        try:
+            async with SessionLocal() as db:
+                result = await db.execute(
+                    select(AiResultCache.result).where(
+                        AiResultCache.organization_id == key.organization_id,
+                        AiResultCache.operation == key.operation,
+                        AiResultCache.content_hash == key.content_hash,
+                        AiResultCache.analysis_type == key.analysis_type,
+                        AiResultCache.response_language == key.response_language,
+                        AiResultCache.prompt_version == key.prompt_version,
+                        AiResultCache.expires_at > datetime.now(timezone.utc),
+                    )
+                )
+                stored = result.scalar_one_or_none()
+        except Exception as e:
+            logger.warning(f"AI result cache lookup failed: {e}")
+            return None
+
+        if stored is None:
+            return None
+        if self._memory is not None:
+            self._memory[key] = stored
+        return copy.deepcopy(stored)
+
+    async def set(self, key: AICacheKey, result: Dict[str, Any]) -> None:
+        """Store a successful result in both tiers."""
+        if not self.enabled:
+            return
+        stored = copy.deepcopy(result)
+        if self._memory is not None:
+            self._memory[key] = stored
+
+        expires_at = datetime.now(timezone.utc) + timedelta(days=self.ttl_days)
+        stmt = pg_insert(AiResultCache).values(
+            organization_id=key.organization_id,
+            operation=key.operation,
+            content_hash=key.content_hash,
+            analysis_type=key.analysis_type,
+            response_language=key.response_language,
+            prompt_version=key.prompt_version,
+            result=stored,
+            expires_at=expires_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                AiResultCache.organization_id,
+                AiResultCache.operation,
+                AiResultCache.content_hash,
+                AiResultCache.analysis_type,
+                AiResultCache.response_language,
+                AiResultCache.prompt_version,
+            ],
+            set_={"result": stmt.excluded.result, "expires_at": stmt.excluded.expires_at},
+        )
+        try:
+            async with SessionLocal() as db:
+                await db.execute(stmt)
+                await db.commit()
+        except Exception as e:
+            logger.warning(f"AI result cache write failed: {e}")
+
+    async def prune_expired(self) -> int:
+        """Delete expired rows. Returns how many were removed."""
+        async with SessionLocal() as db:
+            result = await db.execute(
+                delete(AiResultCache).where(AiResultCache.expires_at <= datetime.now(timezone.utc))
+            )
+            await db.commit()
+        return result.rowcount or 0
+
+    def clear_memory(self) -> None:
+        if self._memory is not None:
+            self._memory.clear()
+
+
+# Global instance
+ai_result_cache = AIResultCache(
+    maxsize=settings.AI_RESULT_CACHE_MAXSIZE,
+    memory_ttl=settings.AI_RESULT_CACHE_MEMORY_TTL_SECONDS,
+    ttl_days=settings.AI_RESULT_CACHE_TTL_DAYS,
+)
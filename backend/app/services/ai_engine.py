@@ -5,12 +5,24 @@ import asyncio
 import hashlib
 import random
 import re
+import weakref
 from datetime import datetime, timezone
 from typing import Dict, Any, List, Optional, Union
 from uuid import UUID
 
 import google.generativeai as genai
+from sqlalchemy.ext.asyncio import AsyncSession
+
 from app.core.config import settings
+from app.services.ai_cache import AICacheKey, ai_result_cache, content_hash as hash_inputs
+from app.services.job_queue import (
+    JOB_CANCELLED,
+    JOB_FAILED,
+    JOB_QUEUED,
+    JOB_RUNNING,
+    JOB_SUCCEEDED,
+    job_queue,
+)
 
 try:
     from google.api_core.exceptions import (
@@ -49,6 +61,19 @@ MAX_RETRY_ATTEMPTS = 3  # Maximum retry attempts for failed requests
 MAX_CONCURRENT_API_CALLS = 2  # Protect provider quota from local request bursts
 RETRY_BASE_DELAY_SECONDS = 1.0
 RETRY_MAX_DELAY_SECONDS = 8.0
+SCRIPT_ANALYSIS_TYPES = ("full", "characters", "scenes", "locations")
+# Part of every AI result cache key: bump when any prompt template changes.
+PROMPT_VERSION = "1"
+
+# Job queue status -> status reported by get_processing_status
+JOB_STATUS_MAP = {
+    JOB_QUEUED: "queued",
+    JOB_RUNNING: "processing",
+    JOB_SUCCEEDED: "completed",
+    JOB_FAILED: "failed",
+    JOB_CANCELLED: "cancelled",
+}
+JOB_PROGRESS = {"queued": 0, "processing": 50, "completed": 100, "failed": 100, "cancelled": 100}
 
 SUPPORTED_RESPONSE_LANGUAGES = {"pt-br", "pt", "en", "en-us", "en-gb"}
 PT_BR_DIACRITICS_PATTERN = re.compile(r"[àáâãçéêíóôõú]")
@@ -114,6 +139,11 @@ class AIEngineService:
         self._error_count = 0
         self._total_processing_time = 0
         self._api_semaphore = asyncio.Semaphore(MAX_CONCURRENT_API_CALLS)
+        # Per-org limit taken before the global one, so a single organization
+        # cannot hold every provider slot while others wait.
+        self._org_semaphores: "weakref.WeakValueDictionary[UUID, asyncio.Semaphore]" = (
+            weakref.WeakValueDictionary()
+        )
 
         self._initialize_model()
 
@@ -184,6 +214,13 @@ class AIEngineService:
             )
         )
 
+    def _org_semaphore(self, organization_id: UUID) -> asyncio.Semaphore:
+        semaphore = self._org_semaphores.get(organization_id)
+        if semaphore is None:
+            semaphore = asyncio.Semaphore(max(1, settings.AI_MAX_CONCURRENT_CALLS_PER_ORG))
+            self._org_semaphores[organization_id] = semaphore
+        return semaphore
+
     @staticmethod
     def _retry_delay_seconds(attempt: int) -> float:
         """Exponential backoff with light jitter to avoid synchronized retries."""
@@ -211,7 +248,7 @@ class AIEngineService:
                 if not self.model:
                     raise RuntimeError("AI model is not initialized")
 
-                async with self._api_semaphore:
+                async with self._org_semaphore(organization_id), self._api_semaphore:
                     return await asyncio.wait_for(
                         self.model.generate_content_async(
                             prompt,
@@ -367,9 +404,12 @@ class AIEngineService:
         project_id: Optional[UUID] = None,
         analysis_type: str = "full",
         response_language: Optional[str] = None,
+        use_cache: bool = True,
     ) -> Dict[str, Any]:
         """
         Analyze script content and extract production elements.
+        Identical requests are served from the AI result cache unless
+        use_cache is False (the fresh result still refreshes the cache).
         
         PRODUCTION MONITORING:
         - Request/response auditing
@@ -380,7 +420,7 @@ class AIEngineService:
         """
         start_time = time.time()
         request_id = hashlib.md5(f"{organization_id}_{project_id}_{start_time}".encode()).hexdigest()[:16]
-        analysis_type = analysis_type if analysis_type in ("full", "characters", "scenes", "locations") else "full"
+        analysis_type = analysis_type if analysis_type in SCRIPT_ANALYSIS_TYPES else "full"
         
         # Increment request counter
         self._request_count += 1
@@ -446,6 +486,30 @@ class AIEngineService:
                 response_language=response_language,
                 script_content=clean_content,
             )
+
+            cache_key = self._script_analysis_cache_key(
+                organization_id=organization_id,
+                script_content=clean_content,
+                analysis_type=analysis_type,
+                response_language=resolved_language,
+            )
+            cached = await ai_result_cache.get(cache_key) if use_cache else None
+            if cached is not None:
+                logger.info(
+                    "AI script analysis served from cache",
+                    extra={
+                        "request_id": request_id,
+                        "organization_id": str(organization_id),
+                        "content_hash": content_hash[:16],
+                    }
+                )
+                return self._from_cache(
+                    cached,
+                    request_id=request_id,
+                    start_time=start_time,
+                    organization_id=str(organization_id),
+                    project_id=str(project_id) if project_id else None,
+                )
             
             # Create the analysis prompt with monitoring
             prompt = self._build_script_analysis_prompt(
@@ -526,6 +590,7 @@ class AIEngineService:
                 "response_language": resolved_language,
                 "request_id": request_id,
                 "content_hash": content_hash,
+                "cache_hit": False,
                 "processing_times": {
                     "total_ms": int(processing_time * 1000),
                     "prompt_build_ms": int(prompt_build_time * 1000),
@@ -561,7 +626,8 @@ class AIEngineService:
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 }
             )
-            
+
+            await ai_result_cache.set(cache_key, analysis_result)
             return analysis_result
 
         except asyncio.TimeoutError:
@@ -706,6 +772,21 @@ class AIEngineService:
                 response_language=response_language,
                 script_analysis=script_analysis,
             )
+            cache_key = self._production_suggestions_cache_key(
+                organization_id=organization_id,
+                script_analysis=script_analysis,
+                project_context=project_context,
+                response_language=resolved_language,
+            )
+            cached = await ai_result_cache.get(cache_key)
+            if cached is not None:
+                return self._from_cache(
+                    cached,
+                    request_id=request_id,
+                    start_time=start_time,
+                    organization_id=str(organization_id),
+                )
+
             prompt = self._build_production_suggestions_prompt(
                 script_analysis,
                 project_context,
@@ -773,6 +854,7 @@ class AIEngineService:
                 "suggestion_type": "production_elements",
                 "response_language": resolved_language,
                 "request_id": request_id,
+                "cache_hit": False,
                 "input_content_metrics": content_metrics,
                 "processing_times": {
                     "total_ms": int(processing_time * 1000),
@@ -802,7 +884,8 @@ class AIEngineService:
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 }
             )
-            
+
+            await ai_result_cache.set(cache_key, suggestions)
             return suggestions
 
         except asyncio.TimeoutError:
@@ -940,6 +1023,11 @@ Return a JSON object with the following structure:
 }}
 """
 
+    @staticmethod
+    def _analysis_for_prompt(script_analysis: Dict[str, Any]) -> Dict[str, Any]:
+        """Script analysis without per-request metadata (ids, timings), which the model does not need."""
+        return {key: value for key, value in script_analysis.items() if key != "metadata"}
+
     def _build_production_suggestions_prompt(
         self,
         script_analysis: Dict[str, Any],
@@ -959,7 +1047,7 @@ Return a JSON object with the following structure:
 Based on this script analysis, provide practical production suggestions:
 
 Script Analysis:
-{json.dumps(script_analysis, indent=2)}
+{json.dumps(self._analysis_for_prompt(script_analysis), indent=2)}
 
 {context_str}
 
@@ -1053,6 +1141,22 @@ Focus on actionable suggestions that help production planning and logistics.
                 "project_context_provided": bool(project_context),
                 "response_language": resolved_language,
             }
+
+            cache_key = self._budget_estimation_cache_key(
+                organization_id=organization_id,
+                script_content=script_content,
+                estimation_type=estimation_type,
+                project_context=project_context,
+                response_language=resolved_language,
+            )
+            cached = await ai_result_cache.get(cache_key)
+            if cached is not None:
+                return self._from_cache(
+                    cached,
+                    request_id=request_id,
+                    start_time=start_time,
+                    organization_id=str(organization_id),
+                )
             
             # Create prompt with monitoring
             prompt_start_time = time.time()
@@ -1122,6 +1226,7 @@ Focus on actionable suggestions that help production planning and logistics.
                 "model_used": "gemini-2.0-flash",
                 "response_language": resolved_language,
                 "request_id": request_id,
+                "cache_hit": False,
                 "processing_times": {
                     "total_ms": int(processing_time * 1000),
                     "prompt_build_ms": int(prompt_build_time * 1000),
@@ -1142,7 +1247,8 @@ Focus on actionable suggestions that help production planning and logistics.
                     "timestamp": datetime.now(timezone.utc).isoformat()
                 }
             )
-            
+
+            await ai_result_cache.set(cache_key, estimation)
             return estimation
 
         except asyncio.TimeoutError:
@@ -1249,23 +1355,140 @@ Focus on actionable suggestions that help production planning and logistics.
         logger.info(f"Content ownership validation for {content_type} in organization {organization_id}")
         return True  # Placeholder - actual validation would be implemented
 
+    # ── Result cache ─────────────────────────────────────────
+
+    def _script_analysis_cache_key(
+        self,
+        *,
+        organization_id: UUID,
+        script_content: str,
+        analysis_type: str = "full",
+        response_language: Optional[str] = None,
+    ) -> Optional[AICacheKey]:
+        clean_content = (script_content or "").strip()[:MAX_SCRIPT_LENGTH]
+        if not clean_content:
+            return None
+        return AICacheKey(
+            organization_id=organization_id,
+            operation="script_analysis",
+            content_hash=hash_inputs(clean_content),
+            analysis_type=analysis_type if analysis_type in SCRIPT_ANALYSIS_TYPES else "full",
+            response_language=self._infer_response_language(
+                response_language=response_language,
+                script_content=clean_content,
+            ),
+            prompt_version=PROMPT_VERSION,
+        )
+
+    def _production_suggestions_cache_key(
+        self,
+        *,
+        organization_id: UUID,
+        script_analysis: Dict[str, Any],
+        project_context: Optional[Dict[str, Any]] = None,
+        response_language: Optional[str] = None,
+    ) -> Optional[AICacheKey]:
+        if not script_analysis or not isinstance(script_analysis, dict):
+            return None
+        return AICacheKey(
+            organization_id=organization_id,
+            operation="production_suggestions",
+            content_hash=hash_inputs(self._analysis_for_prompt(script_analysis), project_context or {}),
+            analysis_type="production_elements",
+            response_language=self._infer_response_language(
+                response_language=response_language,
+                script_analysis=script_analysis,
+            ),
+            prompt_version=PROMPT_VERSION,
+        )
+
+    def _budget_estimation_cache_key(
+        self,
+        *,
+        organization_id: UUID,
+        script_content: str,
+        estimation_type: str = "detailed",
+        project_context: Optional[Dict[str, Any]] = None,
+        response_language: Optional[str] = None,
+    ) -> Optional[AICacheKey]:
+        if not script_content or not script_content.strip():
+            return None
+        return AICacheKey(
+            organization_id=organization_id,
+            operation="budget_estimation",
+            content_hash=hash_inputs(script_content, project_context or {}),
+            analysis_type=estimation_type,
+            response_language=self._infer_response_language(
+                response_language=response_language,
+                script_content=script_content,
+            ),
+            prompt_version=PROMPT_VERSION,
+        )
+
+    @staticmethod
+    def _from_cache(cached: Dict[str, Any], *, request_id: str, start_time: float, **metadata: Any) -> Dict[str, Any]:
+        """Refresh per-request metadata on a cached result."""
+        cached_metadata = cached.get("metadata")
+        if not isinstance(cached_metadata, dict):
+            cached_metadata = cached["metadata"] = {}
+        cached_metadata.update(metadata)
+        cached_metadata.update(
+            {
+                "request_id": request_id,
+                "cache_hit": True,
+                "processing_times": {"total_ms": int((time.time() - start_time) * 1000)},
+            }
+        )
+        return cached
+
+    async def get_cached_script_analysis(self, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        """Cached analyze_script_content() result for the same arguments, if any."""
+        key = self._script_analysis_cache_key(**kwargs)
+        return await ai_result_cache.get(key) if key else None
+
+    async def get_cached_production_suggestions(self, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        """Cached suggest_production_elements() result for the same arguments, if any."""
+        key = self._production_suggestions_cache_key(**kwargs)
+        return await ai_result_cache.get(key) if key else None
+
+    async def get_cached_budget_estimation(self, **kwargs: Any) -> Optional[Dict[str, Any]]:
+        """Cached estimate_project_budget() result for the same arguments, if any."""
+        key = self._budget_estimation_cache_key(**kwargs)
+        return await ai_result_cache.get(key) if key else None
+
     async def get_processing_status(
         self,
         *,
+        db: AsyncSession,
         organization_id: UUID,
         request_id: str
-    ) -> Dict[str, Any]:
+    ) -> Optional[Dict[str, Any]]:
         """
-        Get the status of an AI processing request.
+        Get the status of an AI processing request (a job queue job ID).
+        Returns None when the request does not exist for the organization.
         """
+        try:
+            job_id = UUID(request_id)
+        except ValueError:
+            return None
+
+        job = await job_queue.get(db, job_id, organization_id)
+        if job is None:
+            return None
+
+        status = JOB_STATUS_MAP.get(job.status, job.status)
         return {
-            "request_id": request_id,
+            "request_id": str(job.id),
             "organization_id": str(organization_id),
-            "status": "completed",
-            "progress": 100,
-            "result": None,
-            "created_at": "2024-01-01T00:00:00Z",
-            "completed_at": "2024-01-01T00:05:00Z"
+            "status": status,
+            "progress": JOB_PROGRESS.get(status, 0),
+            "attempts": job.attempts,
+            "cancel_requested": job.cancel_requested,
+            "result": job.result,
+            "error": job.last_error if status == "failed" else None,
+            "created_at": job.created_at.isoformat() if job.created_at else None,
+            "started_at": job.started_at.isoformat() if job.started_at else None,
+            "completed_at": job.finished_at.isoformat() if job.finished_at else None,
         }
 
     def get_service_health(self) -> Dict[str, Any]:
@@ -1,35 +1,42 @@
 import asyncio
 import contextvars
 import logging
+from collections import deque
 from datetime import datetime, timedelta
 from decimal import Decimal
-from typing import Dict, Any, Optional
+from typing import Any, Callable, Dict, Optional, Sequence
 from uuid import UUID
+from weakref import WeakValueDictionary
 from zoneinfo import ZoneInfo
 
-from cachetools import TTLCache
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, case
+from sqlalchemy import select, func
 
 from app.core.config import settings
+from app.db.session import SessionLocal
 from app.models.projects import Project
-from app.models.transactions import Transaction
 from app.models.inventory import KitItem
+from app.services.dashboard_cache import DASHBOARD_SECTIONS, DashboardCache, dashboard_cache
+from app.services.financial_rollup import financial_rollup_service
+
 logger = logging.getLogger(__name__)
 
 # Default timezone - can be made configurable per organization
 DEFAULT_TIMEZONE = ZoneInfo("America/Sao_Paulo")
 
-# Dashboard cache (in-process). Used only by AnalyticsService.get_executive_dashboard.
+# Dashboard cache status for the current request: "HIT", "MISS" or "PARTIAL" (some sections cached).
 _dashboard_cache_hit: contextvars.ContextVar = contextvars.ContextVar("dashboard_cache_hit", default=None)
 
 
 def get_dashboard_cache_status() -> Optional[str]:
-    """Return 'HIT'/'MISS' for the current request context when caching is used."""
-    hit = _dashboard_cache_hit.get()
-    if hit is None:
-        return None
-    return "HIT" if hit else "MISS"
+    """Return 'HIT'/'MISS'/'PARTIAL' for the current request context when caching is used."""
+    return _dashboard_cache_hit.get()
+
+
+def _summarize_cache_hits(hits: list[bool]) -> str:
+    if all(hits):
+        return "HIT"
+    return "PARTIAL" if any(hits) else "MISS"
 
 
 ACTIVE_PROJECT_STATUSES = {"draft", "pre-production", "production", "post-production"}
@@ -39,18 +46,26 @@ class AnalyticsService:
     """
     Executive dashboard analytics service.
     Provides high-level business metrics for CEO/Producer decision making.
+
+    Each dashboard section is cached on its own (see app.services.dashboard_cache),
+    so a write that invalidates one section leaves the others cached. Sections
+    that miss are built concurrently on the request session plus a few extra
+    pooled sessions, bounded per request and per process so dashboards cannot
+    drain the connection pool.
     """
 
-    def __init__(self):
-        ttl = int(getattr(settings, "DASHBOARD_CACHE_TTL_SECONDS", 0) or 0)
-        maxsize = int(getattr(settings, "DASHBOARD_CACHE_MAXSIZE", 0) or 0)
-        if ttl > 0 and maxsize > 0:
-            self._dashboard_cache = TTLCache(maxsize=maxsize, ttl=ttl)
-        else:
-            self._dashboard_cache = None
+    def __init__(
+        self,
+        cache: Optional[DashboardCache] = None,
+        session_factory: Callable[[], AsyncSession] = SessionLocal,
+    ):
+        self.cache = cache or dashboard_cache
+        self.session_factory = session_factory
 
         # Per-key lock to avoid thundering herds on cache misses.
-        self._dashboard_locks: dict[tuple[UUID, int], asyncio.Lock] = {}
+        self._section_locks: WeakValueDictionary = WeakValueDictionary()
+        # Process-wide budget of extra section sessions (created on first use).
+        self._section_sessions: Optional[asyncio.Semaphore] = None
 
     async def get_executive_dashboard(
         self,
@@ -69,42 +84,8 @@ class AnalyticsService:
         Returns:
             Executive dashboard data
         """
-        cache = self._dashboard_cache
-        ttl = int(getattr(settings, "DASHBOARD_CACHE_TTL_SECONDS", 0) or 0)
         months_back = int(months_back)
 
-        if cache is None or ttl <= 0:
-            _dashboard_cache_hit.set(None)
-            return await self._compute_executive_dashboard(organization_id, db, months_back=months_back)
-
-        cache_key = (organization_id, months_back)
-        cached = cache.get(cache_key)
-        if cached is not None:
-            _dashboard_cache_hit.set(True)
-            return cached
-
-        lock = self._dashboard_locks.get(cache_key)
-        if lock is None:
-            lock = asyncio.Lock()
-            self._dashboard_locks[cache_key] = lock
-
-        async with lock:
-            cached = cache.get(cache_key)
-            if cached is not None:
-                _dashboard_cache_hit.set(True)
-                return cached
-
-            data = await self._compute_executive_dashboard(organization_id, db, months_back=months_back)
-            cache[cache_key] = data
-            _dashboard_cache_hit.set(False)
-            return data
-
-    async def _compute_executive_dashboard(
-        self,
-        organization_id: UUID,
-        db: AsyncSession,
-        months_back: int = 12,
-    ) -> Dict[str, Any]:
         # Calculate date range using timezone-aware datetime
         end_date = datetime.now(DEFAULT_TIMEZONE)
         start_date = end_date - timedelta(days=30 * months_back)
@@ -117,15 +98,159 @@ class AnalyticsService:
                 "end_date": end_date.date().isoformat(),
                 "months_analyzed": months_back
             },
-            "financial": await self._get_financial_metrics(organization_id, start_date, end_date, db),
-            "production": await self._get_production_metrics(organization_id, db),
-            "inventory": await self._get_inventory_metrics(organization_id, db),
-            "cloud": await self._get_cloud_metrics(organization_id, db),
-            "trends": await self._get_trends_data(organization_id, start_date, end_date, db)
         }
 
+        sections = await self._get_sections(
+            organization_id, DASHBOARD_SECTIONS, db, start_date=start_date, end_date=end_date, months_back=months_back
+        )
+        hits = []
+        for section, (data, hit) in sections.items():
+            dashboard_data[section] = data
+            hits.append(hit)
+
+        _dashboard_cache_hit.set(_summarize_cache_hits(hits) if self.cache.enabled else None)
         return dashboard_data
 
+    async def get_dashboard_section(
+        self,
+        organization_id: UUID,
+        section: str,
+        db: AsyncSession,
+        months_back: int = 12
+    ) -> Dict[str, Any]:
+        """Build (or read from cache) a single dashboard section."""
+        if section not in DASHBOARD_SECTIONS:
+            raise ValueError(f"Unknown dashboard section: {section}")
+
+        months_back = int(months_back)
+        end_date = datetime.now(DEFAULT_TIMEZONE)
+        start_date = end_date - timedelta(days=30 * months_back)
+
+        data, hit = await self._get_section(
+            organization_id, section, db, start_date=start_date, end_date=end_date, months_back=months_back
+        )
+        _dashboard_cache_hit.set(("HIT" if hit else "MISS") if self.cache.enabled else None)
+        return data
+
+    async def _get_sections(
+        self,
+        organization_id: UUID,
+        sections: Sequence[str],
+        db: AsyncSession,
+        *,
+        start_date: datetime,
+        end_date: datetime,
+        months_back: int,
+    ) -> Dict[str, tuple[Dict[str, Any], bool]]:
+        """
+        Build sections concurrently; returns {section: (data, served from cache)}.
+
+        The request session works through the sections, helped by up to
+        DASHBOARD_SECTION_CONCURRENCY - 1 extra pooled sessions while the
+        process-wide DASHBOARD_SECTION_SESSIONS_MAX budget has room. Helpers
+        never wait for the budget: the request session builds whatever is left.
+        """
+        concurrency = max(1, int(settings.DASHBOARD_SECTION_CONCURRENCY or 1))
+        kwargs = {"start_date": start_date, "end_date": end_date, "months_back": months_back}
+        if self._section_sessions is None:
+            self._section_sessions = asyncio.Semaphore(max(0, int(settings.DASHBOARD_SECTION_SESSIONS_MAX or 0)))
+
+        pending = deque(sections)
+        results: Dict[str, tuple[Dict[str, Any], bool]] = {}
+
+        async def build_pending(session: AsyncSession, release_session: bool) -> None:
+            while pending:
+                section = pending.popleft()
+                results[section] = await self._get_section(
+                    organization_id, section, session, release_session=release_session, **kwargs
+                )
+
+        async def help_on_own_session() -> None:
+            try:
+                # AsyncSession connects lazily: a cache hit never checks out a connection.
+                async with self.session_factory() as section_db:
+                    await build_pending(section_db, release_session=True)
+            finally:
+                self._section_sessions.release()
+
+        # The request session starts first, so it always takes the first section.
+        workers = [asyncio.ensure_future(build_pending(db, release_session=False))]
+        for _ in range(min(concurrency, len(sections)) - 1):
+            if self._section_sessions.locked():
+                break
+            await self._section_sessions.acquire()
+            workers.append(asyncio.create_task(help_on_own_session()))
+
+        await asyncio.gather(*workers)
+        return {section: results[section] for section in sections}
+
+    @staticmethod
+    def _section_variant(section: str, months_back: int) -> str:
+        # Only the trends section depends on the analyzed period.
+        return str(months_back) if section == "trends" else "-"
+
+    async def _get_section(
+        self,
+        organization_id: UUID,
+        section: str,
+        db: AsyncSession,
+        *,
+        start_date: datetime,
+        end_date: datetime,
+        months_back: int,
+        release_session: bool = False,
+    ) -> tuple[Dict[str, Any], bool]:
+        """
+        Return (section data, served from cache). With release_session, `db`
+        gives its connection back before the cache write (the postgres cache
+        opens a session of its own), so a build never holds two connections.
+        """
+        if not self.cache.enabled:
+            return await self._compute_section(organization_id, section, db, start_date, end_date), False
+
+        variant = self._section_variant(section, months_back)
+        cached = await self.cache.get(organization_id, section, variant)
+        if cached is not None:
+            return cached, True
+
+        lock_key = (organization_id, section, variant)
+        lock = self._section_locks.get(lock_key)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._section_locks[lock_key] = lock
+
+        async with lock:
+            cached = await self.cache.get(organization_id, section, variant)
+            if cached is not None:
+                return cached, True
+
+            generation = await self.cache.generation(organization_id, section)
+            data = await self._compute_section(organization_id, section, db, start_date, end_date)
+            if release_session:
+                await db.close()
+            await self.cache.set(organization_id, section, variant, data, generation=generation)
+            return data, False
+
+    async def _compute_section(
+        self,
+        organization_id: UUID,
+        section: str,
+        db: AsyncSession,
+        start_date: datetime,
+        end_date: datetime,
+    ) -> Dict[str, Any]:
+        if section == "financial":
+            return await self._get_financial_metrics(organization_id, start_date, end_date, db)
+        if section == "production":
+            return await self._get_production_metrics(organization_id, db)
+        if section == "inventory":
+            return await self._get_inventory_metrics(organization_id, db)
+        if section == "cloud":
+            return await self._get_cloud_metrics(organization_id, db)
+        if section == "trends":
+            return await self._get_trends_data(organization_id, start_date, end_date, db)
+        raise ValueError(f"Unknown dashboard section: {section}")
+
     async def _get_financial_metrics(
         self,
         organization_id: UUID,
@@ -139,53 +264,15 @@ class AnalyticsService:
         today = now.date()
         month_start = today.replace(day=1)
         year_start = today.replace(month=1, day=1)
-        tomorrow = today + timedelta(days=1)
-
-        # One index-friendly query: filter on date range and compute MTD/YTD via CASE.
-        query = select(
-            func.sum(
-                case(
-                    (and_(Transaction.type == "income", Transaction.transaction_date >= month_start), Transaction.amount_cents),
-                    else_=0,
-                )
-            ).label("revenue_mtd_cents"),
-            func.sum(
-                case(
-                    (and_(Transaction.type == "expense", Transaction.transaction_date >= month_start), Transaction.amount_cents),
-                    else_=0,
-                )
-            ).label("expenses_mtd_cents"),
-            func.sum(
-                case(
-                    (Transaction.type == "income", Transaction.amount_cents),
-                    else_=0,
-                )
-            ).label("revenue_ytd_cents"),
-            func.sum(
-                case(
-                    (Transaction.type == "expense", Transaction.amount_cents),
-                    else_=0,
-                )
-            ).label("expenses_ytd_cents"),
-        ).where(
-            and_(
-                Transaction.organization_id == organization_id,
-                Transaction.payment_status.in_(("approved", "paid")),
-                Transaction.category != "internal_transfer",
-                Transaction.transaction_date >= year_start,
-                Transaction.transaction_date < tomorrow,
-            )
-        )
 
-        result = await db.execute(query)
-        row = result.first()
-
-        revenue_mtd = (row.revenue_mtd_cents or 0) if row else 0
-        expenses_mtd = (row.expenses_mtd_cents or 0) if row else 0
+        # Month-granular totals from the rollup: at most 12 months x categories per org.
+        revenue_mtd, expenses_mtd = await financial_rollup_service.get_totals(
+            db, organization_id=organization_id, start_month=month_start, end_month=month_start
+        )
+        revenue_ytd, expenses_ytd = await financial_rollup_service.get_totals(
+            db, organization_id=organization_id, start_month=year_start, end_month=month_start
+        )
         net_profit_mtd = revenue_mtd - expenses_mtd
-
-        revenue_ytd = (row.revenue_ytd_cents or 0) if row else 0
-        expenses_ytd = (row.expenses_ytd_cents or 0) if row else 0
         net_profit_ytd = revenue_ytd - expenses_ytd
 
         # Cash flow projection (simple - can be enhanced with more complex logic)
@@ -280,18 +367,10 @@ class AnalyticsService:
         utilization_rate = min(100.0, (total_usage_hours / max(total_items * 100, 1)) * 100)
 
         # Maintenance costs (from transactions with maintenance category)
-        maintenance_cost_query = select(func.sum(Transaction.amount_cents)).where(
-            and_(
-                Transaction.organization_id == organization_id,
-                Transaction.category == "maintenance",
-                Transaction.type == "expense",
-                Transaction.payment_status.in_(("approved", "paid")),
-            )
+        maintenance_cost_cents = await financial_rollup_service.get_category_total(
+            db, organization_id=organization_id, transaction_type="expense", category="maintenance"
         )
 
-        maintenance_cost_result = await db.execute(maintenance_cost_query)
-        maintenance_cost_cents = maintenance_cost_result.scalar() or 0
-
         return {
             "total_items": total_items,
             "items_by_health": items_by_health,
@@ -340,35 +419,14 @@ class AnalyticsService:
         start_d = start_date.date() if isinstance(start_date, datetime) else start_date
         end_d = end_date.date() if isinstance(end_date, datetime) else end_date
 
-        month_bucket = func.date_trunc("month", Transaction.transaction_date).label("month")
-        query = (
-            select(
-                month_bucket,
-                func.sum(case((Transaction.type == "income", Transaction.amount_cents), else_=0)).label("revenue_cents"),
-                func.sum(case((Transaction.type == "expense", Transaction.amount_cents), else_=0)).label("expenses_cents"),
-            )
-            .where(
-                and_(
-                    Transaction.organization_id == organization_id,
-                    Transaction.payment_status.in_(("approved", "paid")),
-                    Transaction.category != "internal_transfer",
-                    Transaction.transaction_date >= start_d,
-                    Transaction.transaction_date <= end_d,
-                )
-            )
-            .group_by(month_bucket)
-            .order_by(month_bucket)
-        )
-
-        result = await db.execute(query)
-        for row in result.all():
-            month_dt = row.month
-            month_str = month_dt.strftime("%Y-%m") if hasattr(month_dt, "strftime") else str(month_dt)
-            revenue_cents = row.revenue_cents or 0
-            expenses_cents = row.expenses_cents or 0
+        for row in await financial_rollup_service.get_monthly_totals(
+            db, organization_id=organization_id, start_month=start_d, end_month=end_d
+        ):
+            revenue_cents = row["income_cents"]
+            expenses_cents = row["expense_cents"]
             monthly_trends.append(
                 {
-                    "month": month_str,
+                    "month": row["month"].strftime("%Y-%m"),
                     "revenue_cents": revenue_cents,
                     "expenses_cents": expenses_cents,
                     "net_profit_cents": revenue_cents - expenses_cents,
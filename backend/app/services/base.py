@@ -1,6 +1,9 @@
-from typing import Generic, TypeVar, List, Optional, Any, Dict
+import base64
+import json
+from datetime import date, datetime
+from typing import Generic, TypeVar, List, Optional, Any, Dict, AsyncIterator, Tuple
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, delete, and_, func
+from sqlalchemy import select, update, delete, and_, or_, func, tuple_
 from sqlalchemy.orm import selectinload
 from pydantic import BaseModel
 from uuid import UUID
@@ -11,16 +14,92 @@ ModelType = TypeVar("ModelType", bound=Base)
 CreateSchemaType = TypeVar("CreateSchemaType", bound=BaseModel)
 UpdateSchemaType = TypeVar("UpdateSchemaType", bound=BaseModel)
 
+# Response header carrying the cursor of the next page (absent on the last page).
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+
+
+def _encode_cursor(values: List[Any]) -> str:
+    payload = json.dumps([
+        v.isoformat() if isinstance(v, (date, datetime)) else None if v is None else str(v)
+        for v in values
+    ])
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def _decode_cursor(cursor: str, columns: List[Any]) -> List[Any]:
+    try:
+        raw = json.loads(base64.urlsafe_b64decode(cursor + "=" * (-len(cursor) % 4)))
+        if not isinstance(raw, list) or len(raw) != len(columns):
+            raise ValueError
+        values = []
+        for column, value in zip(columns, raw):
+            python_type = column.type.python_type
+            if value is None and column.expression.nullable:
+                values.append(None)
+            elif python_type is datetime:
+                values.append(datetime.fromisoformat(value))
+            elif python_type is date:
+                values.append(date.fromisoformat(value))
+            else:
+                values.append(python_type(value))
+        return values
+    except (ValueError, TypeError, NotImplementedError):
+        raise ValueError("Invalid pagination cursor")
+
+
+def _after_cursor(columns: List[Any], values: List[Any]):
+    """
+    Rows that follow the cursor row in `ORDER BY column DESC, ...`, where
+    Postgres sorts NULLs first. A row comparison is NULL as soon as a pair
+    holds a NULL, which is right for rows with NULL keys after a non-NULL
+    cursor (they came earlier) but would drop every row after a cursor with
+    a NULL key, so that case is spelled out column by column.
+    """
+    if not any(value is None for value in values):
+        return tuple_(*columns) < tuple_(*values)
+    clauses, equal_prefix = [], []
+    for column, value in zip(columns, values):
+        if value is None:
+            clauses.append(and_(*equal_prefix, column.is_not(None)))
+            equal_prefix.append(column.is_(None))
+        else:
+            clauses.append(and_(*equal_prefix, column < value))
+            equal_prefix.append(column == value)
+    return or_(*clauses)
+
 
 class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     """
     Base service class with generic CRUD operations.
     All operations are automatically filtered by organization_id for multi-tenancy.
+
+    Lists are ordered newest first on `cursor_columns` + id (rows with a NULL
+    sort key first, as Postgres orders DESC). `get_page` pages
+    on that key with opaque cursors (keyset pagination: each page costs the
+    same however deep it is); `stream` walks every row with a server-side
+    cursor for batch jobs.
     """
 
+    # Sort key for listings and cursors (id is always appended as the tie-breaker).
+    cursor_columns: Tuple[str, ...] = ("created_at",)
+
     def __init__(self, model: type[ModelType]):
         self.model = model
 
+    def _order_columns(self) -> List[Any]:
+        columns = [getattr(self.model, name) for name in self.cursor_columns if hasattr(self.model, name)]
+        return columns + [self.model.id]
+
+    def _apply_filters(self, query, filters: Optional[Dict[str, Any]]):
+        if filters:
+            for field, value in filters.items():
+                if hasattr(self.model, field):
+                    if isinstance(value, (list, tuple, set)):
+                        query = query.where(getattr(self.model, field).in_(list(value)))
+                    else:
+                        query = query.where(getattr(self.model, field) == value)
+        return query
+
     async def get(
         self,
         db: AsyncSession,
@@ -55,22 +134,86 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> List[ModelType]:
         """Get multiple records, filtered by organization_id."""
         query = select(self.model).where(self.model.organization_id == organization_id)
-
-        if filters:
-            for field, value in filters.items():
-                if hasattr(self.model, field):
-                    if isinstance(value, (list, tuple, set)):
-                        query = query.where(getattr(self.model, field).in_(list(value)))
-                    else:
-                        query = query.where(getattr(self.model, field) == value)
+        query = self._apply_filters(query, filters)
 
         if options:
             query = query.options(*options)
 
+        query = query.order_by(*[column.desc() for column in self._order_columns()])
         query = query.offset(skip).limit(limit)
         result = await db.execute(query)
         return result.scalars().all()
 
+    async def get_page(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        options: Optional[List] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[ModelType], Optional[str]]:
+        """
+        Get one page of records and the cursor of the next page (None on the last page).
+
+        `skip` is only honoured without a cursor, for clients still paging by offset.
+        Raises ValueError for a malformed cursor.
+        """
+        columns = self._order_columns()
+        query = select(self.model).where(self.model.organization_id == organization_id)
+        query = self._apply_filters(query, filters)
+
+        if cursor:
+            query = query.where(_after_cursor(columns, _decode_cursor(cursor, columns)))
+        elif skip:
+            query = query.offset(skip)
+
+        if options:
+            query = query.options(*options)
+
+        query = query.order_by(*[column.desc() for column in columns]).limit(limit + 1)
+        result = await db.execute(query)
+        items = list(result.scalars().all())
+
+        next_cursor = None
+        if len(items) > limit:
+            items = items[:limit]
+            last = items[-1]
+            next_cursor = _encode_cursor([getattr(last, column.key) for column in columns])
+        return items, next_cursor
+
+    async def stream(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: Optional[UUID],
+        batch_size: int = 500,
+        options: Optional[List] = None,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> AsyncIterator[ModelType]:
+        """
+        Iterate over every matching record without loading them all at once.
+
+        Rows are fetched `batch_size` at a time through a server-side cursor,
+        which lives inside the session's transaction: keep the session open
+        (and do not commit it) while iterating. organization_id=None walks all
+        organizations and is meant for internal batch jobs only.
+        """
+        query = select(self.model)
+        if organization_id is not None:
+            query = query.where(self.model.organization_id == organization_id)
+        query = self._apply_filters(query, filters)
+
+        if options:
+            query = query.options(*options)
+
+        query = query.order_by(*[column.desc() for column in self._order_columns()])
+        result = await db.stream_scalars(query.execution_options(yield_per=batch_size))
+        async for obj in result:
+            yield obj
+
     async def create(
         self,
         db: AsyncSession,
@@ -154,14 +297,7 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
     ) -> int:
         """Count records, filtered by organization_id."""
         query = select(func.count(self.model.id)).where(self.model.organization_id == organization_id)
-
-        if filters:
-            for field, value in filters.items():
-                if hasattr(self.model, field):
-                    if isinstance(value, (list, tuple, set)):
-                        query = query.where(getattr(self.model, field).in_(list(value)))
-                    else:
-                        query = query.where(getattr(self.model, field) == value)
+        query = self._apply_filters(query, filters)
 
         result = await db.execute(query)
         return result.scalar() or 0
@@ -13,6 +13,7 @@ from app.core.config import settings
 from app.models.billing import BillingEvent, OrganizationUsage, Plan
 from app.models.organizations import Organization
 from app.models.refunds import BillingPurchase
+from app.services.stripe_gateway import stripe_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -121,7 +122,8 @@ async def create_stripe_customer(
     """Create a Stripe customer and return the customer ID."""
     _configure_stripe()
     try:
-        customer = stripe.Customer.create(
+        customer = await stripe_gateway.call(
+            stripe.Customer.create,
             email=email,
             name=name,
             metadata={"org_id": str(org_id)},
@@ -185,7 +187,8 @@ async def create_checkout_session(
         await db.refresh(organization)
 
     try:
-        session = stripe.checkout.Session.create(
+        session = await stripe_gateway.call(
+            stripe.checkout.Session.create,
             customer=organization.stripe_customer_id,
             payment_method_types=["card", "boleto"],
             payment_method_options={
@@ -211,7 +214,7 @@ async def retrieve_subscription(subscription_id: str) -> stripe.Subscription:
     """Retrieve a Stripe subscription."""
     _configure_stripe()
     try:
-        subscription = stripe.Subscription.retrieve(subscription_id)
+        subscription = await stripe_gateway.call(stripe.Subscription.retrieve, subscription_id)
         return subscription
     except stripe.error.StripeError as e:
         logger.error("Failed to retrieve Stripe subscription %s: %s", subscription_id, e)
@@ -746,56 +749,3 @@ def has_active_access(organization: Organization) -> bool:
         return True
 
     return False
-
-
-async def is_event_processed(db: AsyncSession, event_id: str) -> bool:
-    """Check if a webhook event has already been processed."""
-    query = select(BillingEvent).where(
-        (BillingEvent.stripe_event_id == event_id) | (BillingEvent.external_id == event_id),
-        BillingEvent.status == "processed",
-    )
-    result = await db.execute(query)
-    return result.scalars().first() is not None
-
-
-async def record_billing_event(
-    db: AsyncSession,
-    event_id: str,
-    event_type: str,
-    status_value: str,
-) -> BillingEvent:
-    """Record a new billing event."""
-    query = select(BillingEvent).where(
-        (BillingEvent.stripe_event_id == event_id) | (BillingEvent.external_id == event_id)
-    )
-    result = await db.execute(query)
-    existing = result.scalars().first()
-
-    if existing:
-        return existing
-
-    event = BillingEvent(
-        stripe_event_id=event_id,
-        external_id=event_id,
-        event_type=event_type,
-        status=status_value,
-        provider="stripe",
-        received_at=datetime.now(timezone.utc),
-    )
-    db.add(event)
-    await db.flush()
-    return event
-
-
-async def mark_event_processed(db: AsyncSession, event: BillingEvent) -> None:
-    """Mark event as processed."""
-    event.status = "processed"
-    event.processed_at = datetime.now(timezone.utc)
-    db.add(event)
-
-
-async def mark_event_failed(db: AsyncSession, event: BillingEvent) -> None:
-    """Mark event as failed."""
-    event.status = "failed"
-    event.processed_at = datetime.now(timezone.utc)
-    db.add(event)
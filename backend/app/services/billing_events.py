@@ -0,0 +1,235 @@
+"""
+Stripe webhook inbox.
+
+The webhook endpoints only verify the signature and insert the event into
+`billing_events` (status "received", payload = the event's "data"); a
+redelivery hits the unique external_id and is a no-op. The
+"billing-webhook-events" drain loop in the worker drains the inbox:
+
+- Ordering: events are grouped by ordering_key (the Stripe customer, or the
+  connected account for Connect events). Only the oldest unfinished event of
+  a key can be claimed, so one customer's events run in Stripe "created"
+  order while different customers are processed concurrently.
+- Idempotency: an event is claimed with FOR UPDATE SKIP LOCKED and its
+  handler runs in the transaction that marks it processed, so a processed
+  event never runs again and a crashed worker just releases its claim.
+- Retries: a failing handler is rolled back to a savepoint and the event is
+  retried with exponential backoff, holding back later events of its key.
+  After BILLING_EVENT_MAX_ATTEMPTS it is dead-lettered (status "failed")
+  and the key moves on; scripts/replay_billing_events.py requeues it.
+"""
+import asyncio
+import logging
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import exists, or_, select, tuple_, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import aliased
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.billing import BillingEvent
+from app.services import billing as billing_service
+from app.services import stripe_connect as connect_service
+from app.services.job_queue import compute_backoff
+from app.services.stripe_gateway import stripe_gateway
+
+logger = logging.getLogger(__name__)
+
+SOURCE_BILLING = "billing"
+SOURCE_CONNECT = "connect"
+
+EVENT_RECEIVED = "received"
+EVENT_PROCESSED = "processed"
+EVENT_FAILED = "failed"
+
+EventHandler = Callable[[AsyncSession, dict], Awaitable[None]]
+
+_HANDLERS: Dict[str, Dict[str, EventHandler]] = {
+    SOURCE_BILLING: billing_service.EVENT_HANDLERS,
+    SOURCE_CONNECT: connect_service.CONNECT_EVENT_HANDLERS,
+}
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+def ordering_key_for(event: Dict[str, Any], source: str) -> Optional[str]:
+    """The Stripe object whose events must be applied in order: connected account or customer."""
+    if source == SOURCE_CONNECT and event.get("account"):
+        return event["account"]
+    obj = (event.get("data") or {}).get("object") or {}
+    if obj.get("object") == "customer":
+        return obj.get("id")
+    customer = obj.get("customer")
+    if isinstance(customer, dict):
+        customer = customer.get("id")
+    return customer
+
+
+class BillingEventService:
+    """Persist verified Stripe events and process them in the background."""
+
+    def __init__(self, session_factory=SessionLocal):
+        self.session_factory = session_factory
+
+    # ── Webhook side ─────────────────────────────────────────
+
+    async def ingest(self, db: AsyncSession, event: Dict[str, Any], *, source: str) -> bool:
+        """
+        Insert a verified event into the inbox (not committed). Returns False
+        when the event was already received.
+        """
+        created = event.get("created")
+        stmt = (
+            pg_insert(BillingEvent)
+            .values(
+                stripe_event_id=event["id"],
+                external_id=event["id"],
+                event_type=event["type"],
+                status=EVENT_RECEIVED,
+                provider="stripe",
+                source=source,
+                ordering_key=ordering_key_for(event, source),
+                payload=event.get("data") or {},
+                event_created_at=(
+                    datetime.fromtimestamp(created, tz=timezone.utc) if isinstance(created, int) else None
+                ),
+                received_at=_utcnow(),
+            )
+            .on_conflict_do_nothing(index_elements=["external_id"])
+        )
+        result = await db.execute(stmt)
+        # Stripe already reflects the change; don't serve cached status until the worker catches up.
+        stripe_gateway.invalidate_for_event(event)
+        return result.rowcount == 1
+
+    # ── Worker side ──────────────────────────────────────────
+
+    async def claim_next(self, db: AsyncSession) -> Optional[BillingEvent]:
+        """Lock the oldest due event whose ordering key has no earlier unfinished event."""
+        earlier = aliased(BillingEvent)
+        blocked = exists().where(
+            earlier.status == EVENT_RECEIVED,
+            earlier.payload.isnot(None),
+            earlier.ordering_key == BillingEvent.ordering_key,
+            tuple_(earlier.event_created_at, earlier.received_at, earlier.id)
+            < tuple_(BillingEvent.event_created_at, BillingEvent.received_at, BillingEvent.id),
+        )
+        stmt = (
+            select(BillingEvent)
+            .where(
+                BillingEvent.status == EVENT_RECEIVED,
+                BillingEvent.payload.isnot(None),
+                or_(BillingEvent.next_attempt_at.is_(None), BillingEvent.next_attempt_at <= _utcnow()),
+                ~blocked,
+            )
+            .order_by(BillingEvent.event_created_at, BillingEvent.received_at)
+            .limit(1)
+            .with_for_update(skip_locked=True, of=BillingEvent)
+        )
+        result = await db.execute(stmt)
+        return result.scalars().first()
+
+    async def _settle(self, db: AsyncSession, event_id: UUID, **values: Any) -> None:
+        await db.execute(update(BillingEvent).where(BillingEvent.id == event_id).values(**values))
+
+    async def process_next(self) -> Optional[str]:
+        """
+        Claim and handle one event in its own transaction. Returns the outcome
+        ("processed", "retried", "failed") or None when nothing is due.
+        """
+        async with self.session_factory() as db:
+            event = await self.claim_next(db)
+            if event is None:
+                return None
+
+            event_id, external_id, event_type = event.id, event.external_id, event.event_type
+            attempts = (event.attempts or 0) + 1
+            handler = _HANDLERS.get(event.source or SOURCE_BILLING, {}).get(event_type)
+
+            try:
+                async with db.begin_nested():
+                    if handler:
+                        await handler(db, event.payload)
+                    else:
+                        logger.info(f"No handler for {event.source} event type: {event_type}")
+            except Exception as e:
+                now = _utcnow()
+                if attempts >= settings.BILLING_EVENT_MAX_ATTEMPTS:
+                    outcome = EVENT_FAILED
+                    logger.error(
+                        f"Dead-lettering {event_type} event {external_id} after {attempts} attempts: {e}",
+                        exc_info=True,
+                    )
+                    values = {"status": EVENT_FAILED, "processed_at": now}
+                else:
+                    outcome = "retried"
+                    logger.warning(f"{event_type} event {external_id} failed (attempt {attempts}): {e}")
+                    values = {"next_attempt_at": now + timedelta(seconds=compute_backoff(attempts))}
+                await self._settle(
+                    db, event_id, attempts=attempts, last_error=str(e)[:2000] or type(e).__name__, **values
+                )
+                await db.commit()
+                return outcome
+
+            await self._settle(
+                db, event_id,
+                status=EVENT_PROCESSED,
+                attempts=attempts,
+                processed_at=_utcnow(),
+                next_attempt_at=None,
+                last_error=None,
+            )
+            await db.commit()
+            logger.info(f"Processed {event_type} event {external_id}")
+            return EVENT_PROCESSED
+
+    async def process_pending(self, *, limit: Optional[int] = None) -> Dict[str, int]:
+        """Drain up to `limit` due events with BILLING_EVENT_CONCURRENCY parallel claimers."""
+        budget = limit or settings.BILLING_EVENT_BATCH_SIZE
+        counts = {EVENT_PROCESSED: 0, "retried": 0, EVENT_FAILED: 0}
+
+        async def drain() -> None:
+            nonlocal budget
+            while budget > 0:
+                budget -= 1
+                outcome = await self.process_next()
+                if outcome is None:
+                    return
+                counts[outcome] += 1
+
+        await asyncio.gather(*(drain() for _ in range(max(1, settings.BILLING_EVENT_CONCURRENCY))))
+        return counts
+
+    # ── Dead letters ─────────────────────────────────────────
+
+    async def list_failed(self, db: AsyncSession, *, limit: int = 100) -> List[BillingEvent]:
+        stmt = (
+            select(BillingEvent)
+            .where(BillingEvent.status == EVENT_FAILED, BillingEvent.payload.isnot(None))
+            .order_by(BillingEvent.received_at)
+            .limit(limit)
+        )
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def requeue_failed(self, db: AsyncSession, *, event_ids: Optional[Iterable[str]] = None) -> int:
+        """Put dead-lettered events (all, or these Stripe event ids) back in the inbox (not committed)."""
+        stmt = update(BillingEvent).where(
+            BillingEvent.status == EVENT_FAILED,
+            BillingEvent.payload.isnot(None),
+        )
+        if event_ids is not None:
+            stmt = stmt.where(BillingEvent.external_id.in_(list(event_ids)))
+        result = await db.execute(
+            stmt.values(status=EVENT_RECEIVED, attempts=0, next_attempt_at=None, processed_at=None)
+        )
+        return result.rowcount
+
+
+billing_event_service = BillingEventService()
@@ -1,4 +1,5 @@
 from app.services.base import BaseService
+from app.services.project_stats import ProjectCountedMixin
 from app.models.commercial import Supplier, Stakeholder
 from app.models.transactions import Transaction
 from app.models.clients import Client
@@ -318,12 +319,15 @@ class SupplierStatementService:
         )
 
 
-class StakeholderCRUDService(BaseService[Stakeholder, StakeholderCreate, StakeholderUpdate]):
+class StakeholderCRUDService(ProjectCountedMixin, BaseService[Stakeholder, StakeholderCreate, StakeholderUpdate]):
     """Service for project Stakeholder CRUD operations."""
 
     def __init__(self):
         super().__init__(Stakeholder)
 
+    def counter_deltas(self, stakeholder):
+        return {"team_count": 1}
+
     async def get_by_project(
         self,
         db: AsyncSession,
@@ -0,0 +1,339 @@
+"""
+Executive dashboard cache with explicit invalidation.
+
+Entries are stored per organization and dashboard section (financial,
+production, inventory, cloud, trends), so a write only drops the sections
+it can affect and the next request rebuilds just those.
+
+Backends (DASHBOARD_CACHE_BACKEND):
+- memory: in-process TTLCache (per worker; single-process deployments, tests).
+- postgres: the UNLOGGED `dashboard_cache` table, shared by every process so
+  one worker's invalidation is seen by all of them.
+
+Writers call `invalidate_dashboard_on_commit(db, organization_id, *sections)`;
+the invalidation runs once the session commits (a rollback discards it). For
+request sessions, get_db awaits it before the response is sent, so a read
+right after a write never sees the old numbers; elsewhere (worker jobs) it
+runs in the background.
+Every invalidation also bumps a per-(org, section) generation, kept by the
+backend (`dashboard_cache_generations` for postgres), and a section is only
+stored if the generation read before building it is still current. A build
+that started before another process committed therefore cannot re-cache the
+pre-commit numbers. Cache errors are logged and treated as misses.
+"""
+import asyncio
+import copy
+import logging
+from abc import ABC, abstractmethod
+from functools import partial
+from datetime import datetime, timedelta, timezone
+from typing import Any, Dict, Iterable, Optional, Set
+from uuid import UUID
+
+from cachetools import TTLCache
+from fastapi.encoders import jsonable_encoder
+from sqlalchemy import delete, event, select
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session
+
+from app.core.config import settings
+from app.db.session import SessionLocal, add_post_commit_callback
+from app.models.dashboard import DashboardCacheEntry, DashboardCacheGeneration
+
+logger = logging.getLogger(__name__)
+
+DASHBOARD_SECTIONS = ("financial", "production", "inventory", "cloud", "trends")
+
+# Sections each kind of write can change.
+TRANSACTION_SECTIONS = ("financial", "trends", "inventory")  # inventory: maintenance costs
+PROJECT_SECTIONS = ("production",)
+KIT_ITEM_SECTIONS = ("inventory",)
+
+_PENDING_INVALIDATIONS = "dashboard_cache_invalidations"
+
+
+class DashboardCacheBackend(ABC):
+    """
+    Section cache. `variant` distinguishes parameterized builds (e.g. months_back).
+
+    `set` with a `generation` must store nothing if `invalidate` ran for that
+    section after `generation` was read.
+    """
+
+    def __init__(self, ttl: int):
+        self.ttl = ttl
+
+    @abstractmethod
+    async def get(self, organization_id: UUID, section: str, variant: str) -> Optional[Dict[str, Any]]:
+        ...
+
+    @abstractmethod
+    async def generation(self, organization_id: UUID, section: str) -> int:
+        ...
+
+    @abstractmethod
+    async def set(
+        self,
+        organization_id: UUID,
+        section: str,
+        variant: str,
+        value: Dict[str, Any],
+        generation: Optional[int] = None,
+    ) -> None:
+        ...
+
+    @abstractmethod
+    async def invalidate(self, organization_id: UUID, sections: Iterable[str]) -> None:
+        ...
+
+
+class MemoryDashboardCache(DashboardCacheBackend):
+    """Per-process cache; invalidation only reaches the current process."""
+
+    def __init__(self, ttl: int, maxsize: int):
+        super().__init__(ttl)
+        self._entries: TTLCache = TTLCache(maxsize=maxsize, ttl=ttl)
+        self._generations: Dict[tuple, int] = {}
+
+    async def get(self, organization_id: UUID, section: str, variant: str) -> Optional[Dict[str, Any]]:
+        cached = self._entries.get((str(organization_id), section, variant))
+        return copy.deepcopy(cached) if cached is not None else None
+
+    async def generation(self, organization_id: UUID, section: str) -> int:
+        return self._generations.get((str(organization_id), section), 0)
+
+    async def set(
+        self,
+        organization_id: UUID,
+        section: str,
+        variant: str,
+        value: Dict[str, Any],
+        generation: Optional[int] = None,
+    ) -> None:
+        if generation is not None and generation != await self.generation(organization_id, section):
+            return
+        self._entries[(str(organization_id), section, variant)] = copy.deepcopy(value)
+
+    async def invalidate(self, organization_id: UUID, sections: Iterable[str]) -> None:
+        org_key, sections = str(organization_id), set(sections)
+        for section in sections:
+            self._generations[(org_key, section)] = self._generations.get((org_key, section), 0) + 1
+        for key in [k for k in list(self._entries.keys()) if k[0] == org_key and k[1] in sections]:
+            self._entries.pop(key, None)
+
+
+class PostgresDashboardCache(DashboardCacheBackend):
+    """
+    Shared cache in an UNLOGGED table (fast writes, emptied on crash recovery).
+
+    `set` and `invalidate` both take the section's row lock in
+    `dashboard_cache_generations` before touching entries, so they serialize:
+    either the entry is written first and the invalidation deletes it, or the
+    invalidation commits first and the write sees the bumped generation.
+    """
+
+    async def get(self, organization_id: UUID, section: str, variant: str) -> Optional[Dict[str, Any]]:
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(DashboardCacheEntry.payload).where(
+                    DashboardCacheEntry.organization_id == organization_id,
+                    DashboardCacheEntry.section == section,
+                    DashboardCacheEntry.variant == variant,
+                    DashboardCacheEntry.expires_at > datetime.now(timezone.utc),
+                )
+            )
+            return result.scalar_one_or_none()
+
+    async def generation(self, organization_id: UUID, section: str) -> int:
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(DashboardCacheGeneration.generation).where(
+                    DashboardCacheGeneration.organization_id == organization_id,
+                    DashboardCacheGeneration.section == section,
+                )
+            )
+            return result.scalar_one_or_none() or 0
+
+    @staticmethod
+    async def _lock_generation(
+        db: AsyncSession, organization_id: UUID, section: str, *, bump: bool
+    ) -> int:
+        """Upsert the section's generation row, holding its lock until commit."""
+        stmt = pg_insert(DashboardCacheGeneration).values(
+            organization_id=organization_id,
+            section=section,
+            generation=1 if bump else 0,
+            invalidated_at=datetime.now(timezone.utc) if bump else None,
+        )
+        table = DashboardCacheGeneration.__table__
+        if bump:
+            set_ = {"generation": table.c.generation + 1, "invalidated_at": stmt.excluded.invalidated_at}
+        else:
+            # A no-op update still locks the row and returns its latest committed value.
+            set_ = {"generation": table.c.generation}
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DashboardCacheGeneration.organization_id, DashboardCacheGeneration.section],
+            set_=set_,
+        ).returning(DashboardCacheGeneration.generation)
+        return (await db.execute(stmt)).scalar_one()
+
+    async def set(
+        self,
+        organization_id: UUID,
+        section: str,
+        variant: str,
+        value: Dict[str, Any],
+        generation: Optional[int] = None,
+    ) -> None:
+        expires_at = datetime.now(timezone.utc) + timedelta(seconds=self.ttl)
+        stmt = pg_insert(DashboardCacheEntry).values(
+            organization_id=organization_id,
+            section=section,
+            variant=variant,
+            payload=value,
+            expires_at=expires_at,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[DashboardCacheEntry.organization_id, DashboardCacheEntry.section, DashboardCacheEntry.variant],
+            set_={"payload": stmt.excluded.payload, "expires_at": stmt.excluded.expires_at},
+        )
+        async with SessionLocal() as db:
+            if generation is not None:
+                current = await self._lock_generation(db, organization_id, section, bump=False)
+                if current != generation:
+                    await db.rollback()
+                    return
+            await db.execute(stmt)
+            await db.commit()
+
+    async def invalidate(self, organization_id: UUID, sections: Iterable[str]) -> None:
+        sections = sorted(set(sections))  # fixed lock order across concurrent invalidations
+        async with SessionLocal() as db:
+            for section in sections:
+                await self._lock_generation(db, organization_id, section, bump=True)
+            await db.execute(
+                delete(DashboardCacheEntry).where(
+                    DashboardCacheEntry.organization_id == organization_id,
+                    DashboardCacheEntry.section.in_(sections),
+                )
+            )
+            await db.commit()
+
+
+class DashboardCache:
+    """Error-tolerant front for the configured backend (None when caching is disabled)."""
+
+    def __init__(self, backend: Optional[DashboardCacheBackend]):
+        self.backend = backend
+        self._pending: Set[asyncio.Task] = set()
+
+    @property
+    def enabled(self) -> bool:
+        return self.backend is not None
+
+    async def get(self, organization_id: UUID, section: str, variant: str) -> Optional[Dict[str, Any]]:
+        if self.backend is None:
+            return None
+        try:
+            return await self.backend.get(organization_id, section, variant)
+        except Exception as e:
+            logger.warning(f"Dashboard cache read failed for {section}: {e}")
+            return None
+
+    async def generation(self, organization_id: UUID, section: str) -> Optional[int]:
+        """Current invalidation generation; pass it to `set` after building the section."""
+        if self.backend is None:
+            return None
+        try:
+            return await self.backend.generation(organization_id, section)
+        except Exception as e:
+            logger.warning(f"Dashboard cache generation read failed for {section}: {e}")
+            # Never matches a stored generation, so the build is served but not cached.
+            return -1
+
+    async def set(
+        self,
+        organization_id: UUID,
+        section: str,
+        variant: str,
+        value: Dict[str, Any],
+        *,
+        generation: Optional[int] = None,
+    ) -> None:
+        """Store a section; skipped if it was invalidated since `generation` was read."""
+        if self.backend is None:
+            return
+        try:
+            # Store what the API would serialize (Decimal sums -> int/float), so
+            # hits look the same from every backend.
+            await self.backend.set(organization_id, section, variant, jsonable_encoder(value), generation)
+        except Exception as e:
+            logger.warning(f"Dashboard cache write failed for {section}: {e}")
+
+    async def invalidate(self, organization_id: UUID, sections: Iterable[str] = DASHBOARD_SECTIONS) -> None:
+        if self.backend is None:
+            return
+        sections = tuple(sections)
+        try:
+            await self.backend.invalidate(organization_id, sections)
+        except Exception as e:
+            logger.warning(f"Dashboard cache invalidation failed for org {organization_id}: {e}")
+
+    def schedule_invalidation(self, organization_id: UUID, sections: Iterable[str]) -> None:
+        """Invalidate in the background (from synchronous session events)."""
+        if self.backend is None:
+            return
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            return
+        task = loop.create_task(self.invalidate(organization_id, tuple(sections)))
+        self._pending.add(task)
+        task.add_done_callback(self._pending.discard)
+
+
+def build_dashboard_cache() -> DashboardCache:
+    ttl = int(settings.DASHBOARD_CACHE_TTL_SECONDS or 0)
+    if ttl <= 0:
+        return DashboardCache(None)
+
+    backend = (settings.DASHBOARD_CACHE_BACKEND or "memory").lower()
+    if backend == "postgres":
+        return DashboardCache(PostgresDashboardCache(ttl))
+    if backend != "memory":
+        raise ValueError(f"Unknown DASHBOARD_CACHE_BACKEND: {settings.DASHBOARD_CACHE_BACKEND}")
+    maxsize = int(settings.DASHBOARD_CACHE_MAXSIZE or 0)
+    return DashboardCache(MemoryDashboardCache(ttl, maxsize) if maxsize > 0 else None)
+
+
+def invalidate_dashboard_on_commit(db, organization_id: UUID, *sections: str) -> None:
+    """Drop the given dashboard sections (default: all) for an org once `db` commits."""
+    sections = sections or DASHBOARD_SECTIONS
+    sync_session = getattr(db, "sync_session", None)
+    if sync_session is None:
+        # Not an ORM session (e.g. a test double): nothing to wait for.
+        dashboard_cache.schedule_invalidation(organization_id, sections)
+        return
+    pending = sync_session.info.setdefault(_PENDING_INVALIDATIONS, {})
+    pending.setdefault(organization_id, set()).update(sections)
+
+
+@event.listens_for(Session, "after_commit")
+def _run_pending_invalidations(session: Session) -> None:
+    pending = session.info.pop(_PENDING_INVALIDATIONS, None)
+    for organization_id, sections in (pending or {}).items():
+        invalidation = partial(dashboard_cache.invalidate, organization_id, tuple(sections))
+        if not add_post_commit_callback(session, invalidation):
+            dashboard_cache.schedule_invalidation(organization_id, sections)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_invalidations(session: Session, previous_transaction) -> None:
+    # A savepoint rollback keeps the outer transaction's writes (and invalidations).
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_INVALIDATIONS, None)
+
+
+# Global dashboard cache instance
+dashboard_cache = build_dashboard_cache()
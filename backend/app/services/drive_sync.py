@@ -0,0 +1,233 @@
+"""
+Incremental Google Drive → CloudFileReference sync.
+
+Each ProjectDriveFolder keeps a Drive changes page token. The first sync
+lists the project's module folders and reconciles them with
+cloud_file_references; after that only the deltas reported by the Drive
+changes API are applied. The storage list endpoint reads the table
+directly, so browsing files never waits on Drive.
+
+Run periodically by every worker daemon process (sync_all); a folder that
+another process is syncing is skipped.
+"""
+import asyncio
+import logging
+from datetime import datetime, timezone
+from typing import Dict, Iterable, Optional
+from uuid import UUID
+
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.cloud import CloudFileReference, ProjectDriveFolder
+from app.services.google_drive import google_drive_service
+
+logger = logging.getLogger(__name__)
+
+FOLDER_MIME_TYPE = "application/vnd.google-apps.folder"
+
+# Module name (as used by the storage list endpoint) -> ProjectDriveFolder column
+MODULE_FOLDER_COLUMNS = {
+    "scripts": "scripts_folder_id",
+    "shooting-days": "shooting_days_folder_id",
+    "media": "media_folder_id",
+}
+
+
+def _parse_drive_time(value: Optional[str]) -> datetime:
+    try:
+        # e.g. 2023-10-25T12:00:00.000Z
+        return datetime.fromisoformat((value or "").replace("Z", "+00:00"))
+    except ValueError:
+        return datetime.now(timezone.utc)
+
+
+def _same_module(a: Optional[str], b: Optional[str]) -> bool:
+    return (a or "").replace("_", "-") == (b or "").replace("_", "-")
+
+
+class DriveSyncEngine:
+    """Keeps cloud_file_references in step with each project's Drive folders."""
+
+    def folder_modules(self, pf: ProjectDriveFolder) -> Dict[str, str]:
+        """Drive folder ID -> module name for a project's synced folders."""
+        modules: Dict[str, str] = {}
+        for module, column in MODULE_FOLDER_COLUMNS.items():
+            folder_id = getattr(pf, column, None)
+            if folder_id:
+                modules[folder_id] = module
+        return modules
+
+    async def sync_folder(self, db: AsyncSession, pf: ProjectDriveFolder) -> int:
+        """
+        Sync one project's Drive folders. Returns the number of references
+        created, updated or removed. Commits on success.
+        """
+        if pf.changes_page_token:
+            changes, next_token = await google_drive_service.list_changes(
+                pf.organization_id, pf.changes_page_token, db
+            )
+            applied = await self.apply_changes(db, pf, changes)
+        else:
+            # Take the token first so changes made while listing are replayed next time.
+            next_token = await google_drive_service.get_changes_start_token(pf.organization_id, db)
+            applied = await self._full_resync(db, pf)
+
+        pf.changes_page_token = next_token
+        pf.last_synced_at = datetime.now(timezone.utc)
+        await db.commit()
+        return applied
+
+    async def _existing_refs(
+        self, db: AsyncSession, pf: ProjectDriveFolder, external_ids: Optional[Iterable[str]] = None
+    ) -> Dict[str, CloudFileReference]:
+        query = select(CloudFileReference).where(
+            CloudFileReference.organization_id == pf.organization_id,
+            CloudFileReference.project_id == pf.project_id,
+            CloudFileReference.external_id.isnot(None),
+        )
+        if external_ids is not None:
+            query = query.where(CloudFileReference.external_id.in_(list(external_ids)))
+        result = await db.execute(query)
+        return {ref.external_id: ref for ref in result.scalars().all()}
+
+    def _upsert(
+        self,
+        db: AsyncSession,
+        pf: ProjectDriveFolder,
+        ref: Optional[CloudFileReference],
+        module: str,
+        file: dict,
+    ) -> CloudFileReference:
+        values = {
+            "file_name": file.get("name", "Untitled"),
+            "file_size": file.get("size", "0"),
+            "mime_type": file.get("mimeType", "application/octet-stream"),
+            "external_url": file.get("webViewLink"),
+        }
+        if ref is None:
+            ref = CloudFileReference(
+                organization_id=pf.organization_id,
+                project_id=pf.project_id,
+                module=module,
+                storage_provider="google_drive",
+                external_id=file["id"],
+                thumbnail_path=None,  # generic icon
+                created_at=_parse_drive_time(file.get("createdTime")),
+                **values,
+            )
+            db.add(ref)
+            return ref
+
+        if not _same_module(ref.module, module):
+            ref.module = module
+        for key, value in values.items():
+            if value is not None and getattr(ref, key) != value:
+                setattr(ref, key, value)
+        return ref
+
+    async def _full_resync(self, db: AsyncSession, pf: ProjectDriveFolder) -> int:
+        """List every module folder and reconcile the project's references."""
+        existing = await self._existing_refs(db, pf)
+        seen: set[str] = set()
+        touched = 0
+
+        for folder_id, module in self.folder_modules(pf).items():
+            files = await google_drive_service.list_folder_files(
+                organization_id=pf.organization_id,
+                folder_id=folder_id,
+                db=db,
+            )
+            if files is None:
+                raise RuntimeError(f"Failed to list Drive folder {folder_id}")
+
+            for file in files:
+                if not file.get("id"):
+                    continue
+                seen.add(file["id"])
+                self._upsert(db, pf, existing.get(file["id"]), module, file)
+                touched += 1
+
+            # References for this module that are no longer in the folder were deleted on Drive.
+            for external_id, ref in existing.items():
+                if external_id not in seen and _same_module(ref.module, module):
+                    await db.delete(ref)
+                    touched += 1
+
+        return touched
+
+    async def apply_changes(
+        self, db: AsyncSession, pf: ProjectDriveFolder, changes: list[dict]
+    ) -> int:
+        """Apply Drive change records to the project's references (no commit)."""
+        # Only the latest change per file matters.
+        latest: Dict[str, dict] = {}
+        for change in changes:
+            if change.get("fileId"):
+                latest[change["fileId"]] = change
+        if not latest:
+            return 0
+
+        modules = self.folder_modules(pf)
+        existing = await self._existing_refs(db, pf, latest.keys())
+        touched = 0
+
+        for file_id, change in latest.items():
+            file = change.get("file") or {}
+            ref = existing.get(file_id)
+            parents = file.get("parents") or []
+            module = next((modules[p] for p in parents if p in modules), None)
+
+            gone = change.get("removed") or file.get("trashed")
+            if not gone and module is None and ref is not None and pf.project_folder_id in parents:
+                # Uploaded to the project root (unknown module): keep, refresh metadata.
+                self._upsert(db, pf, ref, ref.module, {"id": file_id, **file})
+                touched += 1
+                continue
+
+            if gone or module is None or file.get("mimeType") == FOLDER_MIME_TYPE:
+                # Deleted, trashed or moved out of this project's folders.
+                if ref is not None:
+                    await db.delete(ref)
+                    touched += 1
+                continue
+
+            self._upsert(db, pf, ref, module, {"id": file_id, **file})
+            touched += 1
+
+        return touched
+
+    async def _sync_one(self, folder_id: UUID, semaphore: asyncio.Semaphore) -> bool:
+        async with semaphore:
+            async with SessionLocal() as db:
+                # Locked until sync_folder commits; another worker skips it meanwhile.
+                pf = await db.get(ProjectDriveFolder, folder_id, with_for_update={"skip_locked": True})
+                if pf is None or not pf.project_folder_id:
+                    return False
+                try:
+                    applied = await self.sync_folder(db, pf)
+                    if applied:
+                        logger.info(f"Drive sync: project {pf.project_id} applied {applied} change(s)")
+                    return True
+                except Exception as e:
+                    await db.rollback()
+                    logger.warning(f"Drive sync failed for project folder {folder_id}: {e}")
+                    return False
+
+    async def sync_all(self) -> int:
+        """Sync every project that has Drive folders. Returns how many succeeded."""
+        async with SessionLocal() as db:
+            result = await db.execute(
+                select(ProjectDriveFolder.id).where(ProjectDriveFolder.project_folder_id.isnot(None))
+            )
+            folder_ids = list(result.scalars().all())
+
+        semaphore = asyncio.Semaphore(max(1, settings.DRIVE_SYNC_CONCURRENCY))
+        results = await asyncio.gather(*(self._sync_one(fid, semaphore) for fid in folder_ids))
+        return sum(1 for ok in results if ok)
+
+
+# Global instance
+drive_sync_engine = DriveSyncEngine()
@@ -0,0 +1,578 @@
+"""
+Transactional email outbox.
+
+Producers call `email_outbox.enqueue(db, ...)` inside the transaction that
+makes the change the email is about, so an email goes out if and only if
+that change commits. The "email-outbox" drain loop in the worker drains the table:
+
+- Claim: due rows are locked with FOR UPDATE SKIP LOCKED and leased as
+  "sending" until locked_until, so concurrent workers never pick the same
+  email and a delivery that died mid-way is retried once the lease expires.
+- Attachments: stored as specs ({"type": "invoice_pdf", ...}) and rendered
+  at delivery time, so producers never wait on PDF rendering.
+- Delivery: emails without attachments go out through Resend batch sends
+  (up to 100 per request), the rest one request each; requests are spaced
+  to EMAIL_RATE_LIMIT_PER_SECOND per worker process and carry an
+  idempotency key. A batch's key is stored on its rows (batch_key) when
+  they are claimed, and a claim that takes over an expired lease takes the
+  whole batch, so a retried batch is the same request under the same key.
+- Retries: transient failures back off exponentially until
+  EMAIL_MAX_ATTEMPTS; messages the provider rejects fail immediately.
+
+EMAIL_TRANSPORT picks the transport: resend, file (one JSON file per email
+in EMAIL_CAPTURE_DIR) or smtp (plain SMTP to a local capture server such
+as Mailpit). The last two are for development and tests.
+"""
+import asyncio
+import base64
+import json
+import logging
+import smtplib
+import time
+from abc import ABC, abstractmethod
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from email.message import EmailMessage
+from email.utils import make_msgid
+from pathlib import Path
+from typing import Any, Awaitable, Callable, Dict, List, Optional, Sequence, Tuple, Union
+from uuid import UUID, uuid4
+
+import resend
+from sqlalchemy import and_, func, or_, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm.attributes import set_committed_value
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.emails import EmailOutboxMessage
+from app.services.job_queue import compute_backoff
+
+logger = logging.getLogger(__name__)
+
+EMAIL_QUEUED = "queued"
+EMAIL_SENDING = "sending"
+EMAIL_SENT = "sent"
+EMAIL_FAILED = "failed"
+
+DEFAULT_FROM_EMAIL = "noreply@produzo.app"
+
+
+class PermanentEmailError(Exception):
+    """Delivery can never succeed (e.g. the invoice to attach was deleted); do not retry."""
+
+
+@dataclass
+class OutgoingEmail:
+    id: UUID
+    to: List[str]
+    subject: str
+    html: str
+    attachments: List[Tuple[str, bytes]] = field(default_factory=list)
+    # Emails without attachments that share a batch key go out as one batch request.
+    batch_key: Optional[str] = None
+
+
+@dataclass
+class DeliveryResult:
+    provider_message_id: Optional[str] = None
+    error: Optional[str] = None
+    permanent: bool = False
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+def _failure(error: BaseException) -> DeliveryResult:
+    permanent = isinstance(
+        error,
+        (PermanentEmailError, resend.exceptions.ValidationError, resend.exceptions.MissingRequiredFieldsError),
+    )
+    return DeliveryResult(error=str(error) or type(error).__name__, permanent=permanent)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class RateLimiter:
+    """Spaces calls at least 1/per_second apart (0 disables)."""
+
+    def __init__(self, per_second: float, clock: Callable[[], float] = time.monotonic, sleep=asyncio.sleep):
+        self.interval = 1.0 / per_second if per_second > 0 else 0.0
+        self._clock = clock
+        self._sleep = sleep
+        self._next_at = 0.0
+        self._lock = asyncio.Lock()
+
+    async def wait(self) -> None:
+        if not self.interval:
+            return
+        async with self._lock:
+            delay = self._next_at - self._clock()
+            if delay > 0:
+                await self._sleep(delay)
+            self._next_at = max(self._next_at, self._clock()) + self.interval
+
+
+# ── Transports ───────────────────────────────────────────────
+
+class EmailTransport(ABC):
+    """Delivers claimed emails; returns one DeliveryResult per message, in order."""
+
+    max_batch: int = 100
+
+    def __init__(self, from_email: str):
+        self.from_email = from_email
+
+    def is_configured(self) -> bool:
+        return True
+
+    @abstractmethod
+    async def send(self, messages: List[OutgoingEmail]) -> List[DeliveryResult]:
+        ...
+
+
+class ResendTransport(EmailTransport):
+    max_batch = 100  # Resend batch API limit
+
+    def __init__(self, from_email: str, api_key: Optional[str], rate_limiter: RateLimiter):
+        super().__init__(from_email)
+        self.api_key = api_key
+        self.rate_limiter = rate_limiter
+
+    def is_configured(self) -> bool:
+        return bool(self.api_key)
+
+    def _params(self, message: OutgoingEmail) -> Dict[str, Any]:
+        params: Dict[str, Any] = {
+            "from": self.from_email,
+            "to": message.to,
+            "subject": message.subject,
+            "html": message.html,
+        }
+        if message.attachments:
+            params["attachments"] = [
+                {"filename": filename, "content": list(content)} for filename, content in message.attachments
+            ]
+        return params
+
+    async def send(self, messages: List[OutgoingEmail]) -> List[DeliveryResult]:
+        if not self.api_key:
+            raise RuntimeError("RESEND_API_KEY is not configured")
+        resend.api_key = self.api_key
+
+        results: Dict[UUID, DeliveryResult] = {}
+        batches: Dict[Optional[str], List[OutgoingEmail]] = {}
+        for message in messages:
+            if not message.attachments:
+                batches.setdefault(message.batch_key, []).append(message)
+        singles = [m for m in messages if m.attachments]
+        for batch_key, batch in batches.items():
+            if batch_key and len(batch) > 1:
+                results.update(await self._send_batch(batch, batch_key))
+            else:
+                singles.extend(batch)
+        for message in singles:
+            results[message.id] = await self._send_one(message)
+        return [results[m.id] for m in messages]
+
+    async def _send_one(self, message: OutgoingEmail) -> DeliveryResult:
+        await self.rate_limiter.wait()
+        try:
+            response = await asyncio.to_thread(
+                resend.Emails.send, self._params(message), {"idempotency_key": f"email-outbox/{message.id}"}
+            )
+        except Exception as e:
+            return _failure(e)
+        return DeliveryResult(provider_message_id=response.get("id"))
+
+    async def _send_batch(self, messages: List[OutgoingEmail], batch_key: str) -> Dict[UUID, DeliveryResult]:
+        await self.rate_limiter.wait()
+        try:
+            response = await asyncio.to_thread(
+                resend.Batch.send,
+                [self._params(m) for m in messages],
+                {"idempotency_key": f"email-outbox-batch/{batch_key}", "batch_validation": "permissive"},
+            )
+        except Exception as e:
+            failure = _failure(e)
+            return {m.id: failure for m in messages}
+
+        # Permissive mode: invalid emails are reported by index, the rest are sent in order.
+        rejected = {error.get("index"): error.get("message") for error in response.get("errors") or []}
+        sent = iter(response.get("data") or [])
+        results = {}
+        for index, message in enumerate(messages):
+            if index in rejected:
+                results[message.id] = DeliveryResult(error=rejected[index] or "Rejected by Resend", permanent=True)
+            else:
+                results[message.id] = DeliveryResult(provider_message_id=(next(sent, None) or {}).get("id"))
+        return results
+
+
+class FileTransport(EmailTransport):
+    """Writes each email to `<directory>/<outbox id>.json` instead of sending it."""
+
+    def __init__(self, from_email: str, directory: str):
+        super().__init__(from_email)
+        self.directory = Path(directory)
+
+    async def send(self, messages: List[OutgoingEmail]) -> List[DeliveryResult]:
+        return await asyncio.to_thread(lambda: [self._write(m) for m in messages])
+
+    def _write(self, message: OutgoingEmail) -> DeliveryResult:
+        self.directory.mkdir(parents=True, exist_ok=True)
+        target = self.directory / f"{message.id}.json"
+        target.write_text(json.dumps({
+            "id": str(message.id),
+            "from": self.from_email,
+            "to": message.to,
+            "subject": message.subject,
+            "html": message.html,
+            "attachments": [
+                {"filename": filename, "content_base64": base64.b64encode(content).decode()}
+                for filename, content in message.attachments
+            ],
+        }))
+        return DeliveryResult(provider_message_id=f"file:{target.name}")
+
+
+class SMTPTransport(EmailTransport):
+    """Plain, unauthenticated SMTP for local capture servers (Mailpit, MailHog)."""
+
+    def __init__(self, from_email: str, host: str, port: int):
+        super().__init__(from_email)
+        self.host = host
+        self.port = port
+
+    async def send(self, messages: List[OutgoingEmail]) -> List[DeliveryResult]:
+        return await asyncio.to_thread(self._send_all, messages)
+
+    def _build(self, message: OutgoingEmail) -> EmailMessage:
+        email = EmailMessage()
+        email["From"] = self.from_email
+        email["To"] = ", ".join(message.to)
+        email["Subject"] = message.subject
+        email["Message-ID"] = make_msgid(idstring=str(message.id))
+        email.set_content(message.html, subtype="html")
+        for filename, content in message.attachments:
+            email.add_attachment(content, maintype="application", subtype="octet-stream", filename=filename)
+        return email
+
+    def _send_all(self, messages: List[OutgoingEmail]) -> List[DeliveryResult]:
+        try:
+            smtp = smtplib.SMTP(self.host, self.port, timeout=30)
+        except OSError as e:
+            return [_failure(e) for _ in messages]
+
+        results = []
+        with smtp:
+            for message in messages:
+                email = self._build(message)
+                try:
+                    smtp.send_message(email)
+                except smtplib.SMTPRecipientsRefused as e:
+                    results.append(DeliveryResult(error=str(e), permanent=True))
+                except (smtplib.SMTPException, OSError) as e:
+                    results.append(_failure(e))
+                else:
+                    results.append(DeliveryResult(provider_message_id=email["Message-ID"]))
+        return results
+
+
+def build_transport() -> EmailTransport:
+    from_email = settings.RESEND_FROM_EMAIL or DEFAULT_FROM_EMAIL
+    transport = settings.EMAIL_TRANSPORT.lower()
+    if transport == "file":
+        return FileTransport(from_email, settings.EMAIL_CAPTURE_DIR)
+    if transport == "smtp":
+        return SMTPTransport(from_email, settings.EMAIL_SMTP_HOST, settings.EMAIL_SMTP_PORT)
+    if transport != "resend":
+        raise ValueError(f"Unknown EMAIL_TRANSPORT: {settings.EMAIL_TRANSPORT}")
+    return ResendTransport(from_email, settings.RESEND_API_KEY, RateLimiter(settings.EMAIL_RATE_LIMIT_PER_SECOND))
+
+
+# ── Attachments ──────────────────────────────────────────────
+
+AttachmentBuilder = Callable[[AsyncSession, Optional[UUID], Dict[str, Any]], Awaitable[Tuple[str, bytes]]]
+
+
+def invoice_pdf_attachment(invoice_id: UUID, filename: str, locale: str = "pt-BR") -> Dict[str, Any]:
+    """Attachment spec for an invoice PDF, rendered when the email is delivered."""
+    return {"type": "invoice_pdf", "invoice_id": str(invoice_id), "filename": filename, "locale": locale}
+
+
+async def _build_invoice_pdf(
+    db: AsyncSession, organization_id: Optional[UUID], spec: Dict[str, Any]
+) -> Tuple[str, bytes]:
+    from sqlalchemy.orm import selectinload
+
+    from app.models.financial import Invoice
+    from app.models.organizations import Organization
+    from app.services.invoice_pdf import invoice_pdf_service
+
+    result = await db.execute(
+        select(Invoice)
+        .where(Invoice.id == UUID(spec["invoice_id"]), Invoice.organization_id == organization_id)
+        .options(selectinload(Invoice.items), selectinload(Invoice.client))
+    )
+    invoice = result.scalar_one_or_none()
+    organization = await db.get(Organization, organization_id) if organization_id else None
+    if invoice is None or organization is None:
+        raise PermanentEmailError(f"Invoice {spec['invoice_id']} no longer exists")
+
+    pdf_bytes = await invoice_pdf_service.generate_pdf(
+        invoice=invoice,
+        organization=organization,
+        client=invoice.client,
+        items=list(invoice.items) if invoice.items else [],
+        locale=spec.get("locale") or "pt-BR",
+    )
+    return spec.get("filename") or f"invoice_{invoice.invoice_number}.pdf", pdf_bytes
+
+
+ATTACHMENT_BUILDERS: Dict[str, AttachmentBuilder] = {
+    "invoice_pdf": _build_invoice_pdf,
+}
+
+
+# ── Outbox ───────────────────────────────────────────────────
+
+class EmailOutboxService:
+    """Enqueue transactional emails and deliver them in the background."""
+
+    def __init__(self, transport: Optional[EmailTransport] = None, session_factory=SessionLocal):
+        self._transport = transport
+        self.session_factory = session_factory
+
+    @property
+    def transport(self) -> EmailTransport:
+        if self._transport is None:
+            self._transport = build_transport()
+        return self._transport
+
+    def is_configured(self) -> bool:
+        return self.transport.is_configured()
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        *,
+        kind: str,
+        to: Union[str, Sequence[str]],
+        subject: str,
+        html: str,
+        organization_id: Optional[UUID] = None,
+        attachments: Optional[List[Dict[str, Any]]] = None,
+        dedupe_key: Optional[str] = None,
+    ) -> Optional[UUID]:
+        """
+        Add an email to the outbox (not committed). Returns its id, or None
+        when dedupe_key matches an email already enqueued.
+        """
+        stmt = (
+            pg_insert(EmailOutboxMessage)
+            .values(
+                kind=kind,
+                organization_id=organization_id,
+                to_addresses=[to] if isinstance(to, str) else list(to),
+                subject=subject,
+                html_body=html,
+                attachments=attachments or [],
+                dedupe_key=dedupe_key,
+            )
+            .on_conflict_do_nothing(index_elements=["dedupe_key"])
+            .returning(EmailOutboxMessage.id)
+        )
+        result = await db.execute(stmt)
+        return result.scalar_one_or_none()
+
+    async def enqueue_many(self, db: AsyncSession, emails: Sequence[Dict[str, Any]]) -> List[UUID]:
+        """
+        Add several emails in one INSERT (not committed). Each item takes the
+        keyword arguments of enqueue(); duplicates by dedupe_key are skipped.
+        """
+        if not emails:
+            return []
+        rows = [
+            {
+                "kind": email["kind"],
+                "organization_id": email.get("organization_id"),
+                "to_addresses": [email["to"]] if isinstance(email["to"], str) else list(email["to"]),
+                "subject": email["subject"],
+                "html_body": email["html"],
+                "attachments": email.get("attachments") or [],
+                "dedupe_key": email.get("dedupe_key"),
+            }
+            for email in emails
+        ]
+        stmt = (
+            pg_insert(EmailOutboxMessage)
+            .values(rows)
+            .on_conflict_do_nothing(index_elements=["dedupe_key"])
+            .returning(EmailOutboxMessage.id)
+        )
+        result = await db.execute(stmt)
+        return list(result.scalars().all())
+
+    async def claim(self, db: AsyncSession, limit: int) -> List[EmailOutboxMessage]:
+        """
+        Lease up to `limit` due emails as "sending" (not committed).
+
+        Newly claimed emails share a fresh batch_key. An expired lease is only
+        taken over together with every other email of its batch (possibly
+        beyond `limit`), so the batch is resent exactly as it was first sent;
+        a batch partly held by another worker is left for a later claim.
+        """
+        now = _utcnow()
+        stmt = (
+            select(EmailOutboxMessage)
+            .where(
+                or_(
+                    and_(EmailOutboxMessage.status == EMAIL_QUEUED, EmailOutboxMessage.next_attempt_at <= now),
+                    and_(EmailOutboxMessage.status == EMAIL_SENDING, EmailOutboxMessage.locked_until < now),
+                )
+            )
+            .order_by(EmailOutboxMessage.next_attempt_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(stmt)
+        messages = list(result.scalars().all())
+
+        retried_keys = {m.batch_key for m in messages if m.status == EMAIL_SENDING and m.batch_key}
+        if retried_keys:
+            messages = [m for m in messages if m.batch_key not in retried_keys]
+            messages.extend(await self._claim_whole_batches(db, retried_keys, now))
+
+        if messages:
+            batch_key = uuid4().hex
+            for message in messages:
+                # Mirror the UPDATE below without marking the rows dirty.
+                set_committed_value(message, "batch_key", message.batch_key or batch_key)
+            await db.execute(
+                update(EmailOutboxMessage)
+                .where(EmailOutboxMessage.id.in_([m.id for m in messages]))
+                .values(
+                    status=EMAIL_SENDING,
+                    locked_until=now + timedelta(seconds=settings.EMAIL_SEND_LEASE_SECONDS),
+                    batch_key=func.coalesce(EmailOutboxMessage.batch_key, batch_key),
+                )
+                .execution_options(synchronize_session=False)
+            )
+        return messages
+
+    async def _claim_whole_batches(
+        self, db: AsyncSession, batch_keys: set[str], now: datetime
+    ) -> List[EmailOutboxMessage]:
+        """Lock the expired batches with these keys, skipping any this claim cannot take whole."""
+        result = await db.execute(
+            select(EmailOutboxMessage)
+            .where(
+                EmailOutboxMessage.batch_key.in_(batch_keys),
+                EmailOutboxMessage.status == EMAIL_SENDING,
+                EmailOutboxMessage.locked_until < now,
+            )
+            .with_for_update(skip_locked=True)
+        )
+        locked = list(result.scalars().all())
+        result = await db.execute(
+            select(EmailOutboxMessage.batch_key, func.count())
+            .where(EmailOutboxMessage.batch_key.in_(batch_keys), EmailOutboxMessage.status == EMAIL_SENDING)
+            .group_by(EmailOutboxMessage.batch_key)
+        )
+        sizes = dict(result.all())
+        taken: Dict[str, int] = {}
+        for message in locked:
+            taken[message.batch_key] = taken.get(message.batch_key, 0) + 1
+        return [m for m in locked if taken[m.batch_key] == sizes.get(m.batch_key)]
+
+    async def _render(self, message: EmailOutboxMessage) -> OutgoingEmail:
+        attachments = []
+        if message.attachments:
+            async with self.session_factory() as db:
+                for spec in message.attachments:
+                    builder = ATTACHMENT_BUILDERS.get(spec.get("type"))
+                    if builder is None:
+                        raise PermanentEmailError(f"Unknown attachment type: {spec.get('type')}")
+                    attachments.append(await builder(db, message.organization_id, spec))
+        return OutgoingEmail(
+            id=message.id,
+            to=list(message.to_addresses),
+            subject=message.subject,
+            html=message.html_body,
+            attachments=attachments,
+            batch_key=message.batch_key,
+        )
+
+    async def _send(self, messages: List[EmailOutboxMessage]) -> Dict[UUID, DeliveryResult]:
+        results: Dict[UUID, DeliveryResult] = {}
+        ready: List[OutgoingEmail] = []
+        for message in messages:
+            try:
+                ready.append(await self._render(message))
+            except Exception as e:
+                results[message.id] = _failure(e)
+
+        if ready:
+            try:
+                delivered = await self.transport.send(ready)
+            except Exception as e:
+                delivered = [_failure(e)] * len(ready)
+            results.update(zip([m.id for m in ready], delivered))
+        return results
+
+    async def _settle(self, db: AsyncSession, message: EmailOutboxMessage, result: DeliveryResult) -> str:
+        attempts = (message.attempts or 0) + 1
+        now = _utcnow()
+        values: Dict[str, Any] = {"attempts": attempts, "locked_until": None, "batch_key": None}
+        if result.ok:
+            outcome = EMAIL_SENT
+            values.update(status=EMAIL_SENT, sent_at=now, provider_message_id=result.provider_message_id, last_error=None)
+        elif result.permanent or attempts >= settings.EMAIL_MAX_ATTEMPTS:
+            outcome = EMAIL_FAILED
+            logger.error(f"Giving up on {message.kind} email {message.id} after {attempts} attempts: {result.error}")
+            values.update(status=EMAIL_FAILED, last_error=result.error)
+        else:
+            outcome = "retried"
+            logger.warning(f"{message.kind} email {message.id} failed (attempt {attempts}): {result.error}")
+            values.update(
+                status=EMAIL_QUEUED,
+                next_attempt_at=now + timedelta(seconds=compute_backoff(attempts)),
+                last_error=result.error,
+            )
+
+        await db.execute(
+            update(EmailOutboxMessage)
+            .where(EmailOutboxMessage.id == message.id, EmailOutboxMessage.status == EMAIL_SENDING)
+            .values(**values)
+            .execution_options(synchronize_session=False)
+        )
+        return outcome
+
+    async def deliver_pending(self, *, limit: Optional[int] = None) -> Dict[str, int]:
+        """Deliver up to `limit` due emails, one transport batch at a time."""
+        remaining = limit or settings.EMAIL_OUTBOX_BATCH_SIZE
+        counts = {EMAIL_SENT: 0, "retried": 0, EMAIL_FAILED: 0}
+
+        while remaining > 0:
+            async with self.session_factory() as db:
+                messages = await self.claim(db, min(remaining, self.transport.max_batch))
+                await db.commit()
+            if not messages:
+                break
+            remaining -= len(messages)
+
+            results = await self._send(messages)
+
+            async with self.session_factory() as db:
+                for message in messages:
+                    counts[await self._settle(db, message, results[message.id])] += 1
+                await db.commit()
+        return counts
+
+
+email_outbox = EmailOutboxService()
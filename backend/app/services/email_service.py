@@ -1,98 +1,70 @@
 """
-Email Service using Resend
+Transactional email templates.
 
-Sends transactional emails (e.g. invoices) with optional PDF attachments.
+Emails are not sent from here: messages are rendered here and added to the
+email outbox in the caller's transaction (app/services/email_outbox.py).
+The worker delivers them once that transaction commits.
 """
 
-import base64
 import logging
-from typing import Optional
+from datetime import datetime
+from typing import Any, Dict
+from uuid import UUID
 
-import resend
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from app.core.config import settings
+from app.services.email_outbox import email_outbox, invoice_pdf_attachment
 
 logger = logging.getLogger(__name__)
 
 
-def send_invoice_email(
+async def send_invoice_email(
+    db: AsyncSession,
+    *,
+    organization_id: UUID,
+    invoice_id: UUID,
+    invoice_number: str,
     to: str,
     subject: str,
     html_body: str,
-    pdf_bytes: Optional[bytes] = None,
-    pdf_filename: Optional[str] = None,
-) -> dict:
+) -> UUID:
     """
-    Send an invoice email, optionally attaching a PDF.
+    Queue an invoice email with the invoice PDF attached.
 
-    Args:
-        to: Recipient email address
-        subject: Email subject line
-        html_body: HTML content for the email body
-        pdf_bytes: Raw PDF bytes to attach (optional)
-        pdf_filename: Filename for the attachment (optional)
+    The PDF is rendered by the delivery worker, so this is a single insert.
 
     Returns:
-        Resend API response dict (contains 'id' on success)
+        The outbox id of the queued email
 
     Raises:
-        RuntimeError: If Resend is not configured
-        resend.exceptions.*: On API errors
+        RuntimeError: If email delivery is not configured
     """
-    if not settings.RESEND_API_KEY:
+    if not email_outbox.is_configured():
         raise RuntimeError("RESEND_API_KEY is not configured")
 
-    from_email = settings.RESEND_FROM_EMAIL or "noreply@produzo.app"
-
-    resend.api_key = settings.RESEND_API_KEY
-
-    params: dict = {
-        "from": from_email,
-        "to": [to],
-        "subject": subject,
-        "html": html_body,
-    }
-
-    if pdf_bytes and pdf_filename:
-        params["attachments"] = [
-            {
-                "filename": pdf_filename,
-                "content": list(pdf_bytes),
-            }
-        ]
-
-    response = resend.Emails.send(params)
-    logger.info(f"Invoice email sent to {to} (resend id={response.get('id', 'unknown')})")
-    return response
-def send_email(
-    to: list[str],
-    subject: str,
-    html: str,
-) -> dict:
-    if not settings.RESEND_API_KEY:
-        logger.warning("RESEND_API_KEY not set. Skipping email.")
-        return {}
-
-    from_email = settings.RESEND_FROM_EMAIL or "noreply@produzo.app"
-    resend.api_key = settings.RESEND_API_KEY
-
-    params = {
-        "from": from_email,
-        "to": to,
-        "subject": subject,
-        "html": html,
-    }
-    
-    try:
-        response = resend.Emails.send(params)
-        logger.info(f"Email sent to {to}: {subject}")
-        return response
-    except Exception as e:
-        logger.error(f"Failed to send email to {to}: {e}")
-        return {}
-
-
-def send_plan_expiry_warning(to_email: str, org_name: str, days_left: int, renew_link: str):
+    email_id = await email_outbox.enqueue(
+        db,
+        kind="invoice",
+        organization_id=organization_id,
+        to=to,
+        subject=subject,
+        html=html_body,
+        attachments=[invoice_pdf_attachment(invoice_id, f"invoice_{invoice_number}.pdf")],
+    )
+    logger.info(f"Invoice email to {to} queued (outbox id={email_id})")
+    return email_id
+
+
+def plan_expiry_warning_email(
+    *,
+    organization_id: UUID,
+    access_ends_at: datetime,
+    to_email: str,
+    org_name: str,
+    days_left: int,
+    renew_link: str,
+) -> Dict[str, Any]:
+    """Render a plan-expiry warning as email_outbox.enqueue() arguments."""
     subject = f"Action Required: Your Produzo plan expires in {days_left} days"
     html = f"""
     <h1>Your plan is expiring soon</h1>
@@ -104,11 +76,26 @@ def send_plan_expiry_warning(to_email: str, org_name: str, days_left: int, renew
     <br><br>
     <p>Or copy this link: {renew_link}</p>
     """
-    return send_email([to_email], subject, html)
+    return {
+        "kind": "plan_expiry_warning",
+        "organization_id": organization_id,
+        "to": to_email,
+        "subject": subject,
+        "html": html,
+        "dedupe_key": f"plan_expiry_warning:{organization_id}:{access_ends_at.date()}:{days_left}",
+    }
 
 
-def send_plan_expired_notice(to_email: str, org_name: str, renew_link: str):
-    subject = f"Your Produzo plan has expired"
+def plan_expired_email(
+    *,
+    organization_id: UUID,
+    access_ends_at: datetime,
+    to_email: str,
+    org_name: str,
+    renew_link: str,
+) -> Dict[str, Any]:
+    """Render a plan-expired notice as email_outbox.enqueue() arguments."""
+    subject = "Your Produzo plan has expired"
     html = f"""
     <h1>Plan Expired</h1>
     <p>Hello,</p>
@@ -117,4 +104,11 @@ def send_plan_expired_notice(to_email: str, org_name: str, renew_link: str):
     <br>
     <a href="{renew_link}" style="background:#000;color:#fff;padding:10px 20px;text-decoration:none;border-radius:5px;">Restore Access</a>
     """
-    return send_email([to_email], subject, html)
+    return {
+        "kind": "plan_expired",
+        "organization_id": organization_id,
+        "to": to_email,
+        "subject": subject,
+        "html": html,
+        "dedupe_key": f"plan_expired:{organization_id}:{access_ends_at.date()}",
+    }
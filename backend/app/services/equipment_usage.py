@@ -14,6 +14,7 @@ from app.models.inventory import KitItem, KitItemUsageLog
 from app.models.projects import Project as ProjectModel
 from app.models.scheduling import ShootingDay as ShootingDayModel
 from app.models.services import ServiceEquipment as ServiceEquipmentModel
+from app.services.dashboard_cache import KIT_ITEM_SECTIONS, invalidate_dashboard_on_commit
 
 
 def _time_to_minutes(value: time) -> float:
@@ -231,6 +232,7 @@ class EquipmentUsageService:
                         updated_at=func.now(),
                     )
                 )
+                invalidate_dashboard_on_commit(db, organization_id, *KIT_ITEM_SECTIONS)
 
                 # Force DB write inside the nested transaction so errors don't break project updates later.
                 await db.flush()
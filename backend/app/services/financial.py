@@ -1,4 +1,5 @@
-from typing import List, Optional, Dict, Any
+import logging
+from typing import List, Optional, Dict, Any, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy import select, update, func, and_, text
@@ -6,13 +7,17 @@ from sqlalchemy.orm import selectinload
 from datetime import date
 
 from app.services.base import BaseService
-from app.models.bank_accounts import BankAccount
+from app.models.bank_accounts import BankAccount, BankAccountLedgerEntry, BankAccountBalanceCheckpoint
 from app.models.transactions import Transaction
 from app.models.projects import Project
 from app.models.organizations import Organization
 from app.models.financial import ProjectBudgetLine, BudgetCategoryEnum
 from app.schemas.bank_accounts import BankAccountCreate, BankAccountUpdate
 from app.schemas.transactions import TransactionCreate, TransactionUpdate
+from app.services.dashboard_cache import TRANSACTION_SECTIONS, invalidate_dashboard_on_commit
+from app.services.financial_rollup import financial_rollup_service
+
+logger = logging.getLogger(__name__)
 
 
 class BankAccountService(BaseService[BankAccount, BankAccountCreate, BankAccountUpdate]):
@@ -48,17 +53,36 @@ class BankAccountService(BaseService[BankAccount, BankAccountCreate, BankAccount
         bank_account_id: UUID,
         amount_cents: int
     ) -> BankAccount:
-        """Update bank account balance atomically."""
-        # Get current account
-        account = await self.get(db=db, organization_id=organization_id, id=bank_account_id)
-        if not account:
-            raise ValueError("Bank account not found")
+        """Adjust bank account balance atomically (recorded as a ledger adjustment)."""
+        await self.apply_balance_delta(
+            db,
+            organization_id=organization_id,
+            bank_account_id=bank_account_id,
+            delta_cents=amount_cents,
+            reason="adjustment",
+        )
 
-        # Update balance
-        new_balance = account.balance_cents + amount_cents
+        # Return updated account
+        return await self.get(db=db, organization_id=organization_id, id=bank_account_id)
 
-        # Update in database
-        query = (
+    async def apply_balance_delta(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        bank_account_id: UUID,
+        delta_cents: int,
+        reason: str,
+        transaction_id: Optional[UUID] = None
+    ) -> int:
+        """
+        Apply a balance change and append it to the ledger. Returns the new balance.
+
+        The change is a single UPDATE ... SET balance_cents = balance_cents + :delta
+        RETURNING, so concurrent writers serialize on the row lock instead of
+        overwriting each other's read-modify-write.
+        """
+        result = await db.execute(
             update(BankAccount)
             .where(
                 and_(
@@ -66,19 +90,129 @@ class BankAccountService(BaseService[BankAccount, BankAccountCreate, BankAccount
                     BankAccount.organization_id == organization_id
                 )
             )
-            .values(balance_cents=new_balance)
+            .values(balance_cents=BankAccount.balance_cents + delta_cents)
+            .returning(BankAccount.balance_cents)
         )
+        new_balance = result.scalar_one_or_none()
+        if new_balance is None:
+            raise ValueError("Bank account not found")
 
-        await db.execute(query)
+        db.add(BankAccountLedgerEntry(
+            organization_id=organization_id,
+            bank_account_id=bank_account_id,
+            transaction_id=transaction_id,
+            reason=reason,
+            delta_cents=delta_cents,
+            balance_after_cents=new_balance,
+        ))
+        return new_balance
+
+    def _ledger_balance_query(self, bank_account_id: UUID):
+        """Latest checkpoint plus the ledger entries after it, as one query."""
+        checkpoint = (
+            select(
+                BankAccountBalanceCheckpoint.ledger_entry_id,
+                BankAccountBalanceCheckpoint.balance_cents,
+            )
+            .where(BankAccountBalanceCheckpoint.bank_account_id == bank_account_id)
+            .order_by(BankAccountBalanceCheckpoint.ledger_entry_id.desc())
+            .limit(1)
+            .subquery()
+        )
+        base_entry_id = func.coalesce(select(checkpoint.c.ledger_entry_id).scalar_subquery(), 0)
+        base_balance = func.coalesce(select(checkpoint.c.balance_cents).scalar_subquery(), 0)
+        return select(
+            base_balance.label("base_balance_cents"),
+            func.coalesce(func.sum(BankAccountLedgerEntry.delta_cents), 0).label("delta_cents"),
+            func.count(BankAccountLedgerEntry.id).label("entries"),
+            func.max(BankAccountLedgerEntry.id).label("last_entry_id"),
+        ).where(
+            BankAccountLedgerEntry.bank_account_id == bank_account_id,
+            BankAccountLedgerEntry.id > base_entry_id,
+        )
 
-        # Return updated account
-        return await self.get(db=db, organization_id=organization_id, id=bank_account_id)
+    async def recompute_balance(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        bank_account_id: UUID
+    ) -> int:
+        """Recompute a balance from the last checkpoint and the ledger entries after it."""
+        if not await self.get(db=db, organization_id=organization_id, id=bank_account_id):
+            raise ValueError("Bank account not found")
+
+        row = (await db.execute(self._ledger_balance_query(bank_account_id))).one()
+        return int(row.base_balance_cents) + int(row.delta_cents)
+
+    async def create_checkpoint(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        bank_account_id: UUID
+    ) -> Optional[BankAccountBalanceCheckpoint]:
+        """
+        Checkpoint an account's balance at its latest ledger entry.
+
+        Locks the account row first: every ledger write happens under that
+        lock, so no uncommitted entry can later appear below the checkpoint.
+        Returns None when there is nothing new since the last checkpoint.
+        """
+        locked = await db.execute(
+            select(BankAccount.balance_cents)
+            .where(
+                and_(
+                    BankAccount.id == bank_account_id,
+                    BankAccount.organization_id == organization_id
+                )
+            )
+            .with_for_update()
+        )
+        stored_balance = locked.scalar_one_or_none()
+        if stored_balance is None:
+            raise ValueError("Bank account not found")
+
+        row = (await db.execute(self._ledger_balance_query(bank_account_id))).one()
+        if not row.entries:
+            return None
+        balance = int(row.base_balance_cents) + int(row.delta_cents)
+        if balance != (stored_balance or 0):
+            logger.warning(
+                f"Bank account {bank_account_id} balance drift: stored={stored_balance}, ledger={balance}"
+            )
+
+        checkpoint = BankAccountBalanceCheckpoint(
+            organization_id=organization_id,
+            bank_account_id=bank_account_id,
+            ledger_entry_id=row.last_entry_id,
+            balance_cents=balance,
+        )
+        db.add(checkpoint)
+        await db.flush()
+        return checkpoint
+
+    async def accounts_needing_checkpoint(self, db: AsyncSession) -> List[tuple]:
+        """(organization_id, bank_account_id) of accounts with ledger entries after their last checkpoint."""
+        last_checkpoint = (
+            select(func.max(BankAccountBalanceCheckpoint.ledger_entry_id))
+            .where(BankAccountBalanceCheckpoint.bank_account_id == BankAccountLedgerEntry.bank_account_id)
+            .correlate(BankAccountLedgerEntry)
+            .scalar_subquery()
+        )
+        result = await db.execute(
+            select(BankAccountLedgerEntry.organization_id, BankAccountLedgerEntry.bank_account_id)
+            .where(BankAccountLedgerEntry.id > func.coalesce(last_checkpoint, 0))
+            .distinct()
+        )
+        return [tuple(row) for row in result.all()]
 
 
 class TransactionService(BaseService[Transaction, TransactionCreate, TransactionUpdate]):
     """Service for Transaction operations with atomic balance updates."""
 
     APPLIED_PAYMENT_STATUSES = ("approved", "paid")
+    cursor_columns = ("transaction_date", "created_at")
 
     def __init__(self):
         super().__init__(Transaction)
@@ -242,16 +376,23 @@ class TransactionService(BaseService[Transaction, TransactionCreate, Transaction
         # Update bank account balance only when the transaction is applied
         # (pending/rejected transactions should not impact cash/balance).
         if transaction_data.get("payment_status") in self.APPLIED_PAYMENT_STATUSES:
-            await db.execute(
-                update(BankAccount)
-                .where(
-                    and_(
-                        BankAccount.id == obj_in.bank_account_id,
-                        BankAccount.organization_id == organization_id
-                    )
-                )
-                .values(balance_cents=BankAccount.balance_cents + balance_change)
+            await bank_account_service.apply_balance_delta(
+                db,
+                organization_id=organization_id,
+                bank_account_id=obj_in.bank_account_id,
+                delta_cents=balance_change,
+                reason="transaction_applied",
+                transaction_id=db_transaction.id,
+            )
+            await financial_rollup_service.apply_transaction(
+                db,
+                organization_id=organization_id,
+                transaction_type=obj_in.type,
+                category=obj_in.category,
+                amount_cents=obj_in.amount_cents,
+                transaction_date=obj_in.transaction_date,
             )
+            invalidate_dashboard_on_commit(db, organization_id, *TRANSACTION_SECTIONS)
 
         # Reload transaction with relationships
         result = await db.execute(
@@ -456,16 +597,24 @@ class TransactionService(BaseService[Transaction, TransactionCreate, Transaction
 
         # Rollback bank account balance only if this transaction affected it
         if transaction.payment_status in self.APPLIED_PAYMENT_STATUSES:
-            await db.execute(
-                update(BankAccount)
-                .where(
-                    and_(
-                        BankAccount.id == transaction.bank_account_id,
-                        BankAccount.organization_id == organization_id
-                    )
-                )
-                .values(balance_cents=BankAccount.balance_cents + reverse_balance_change)
+            await bank_account_service.apply_balance_delta(
+                db,
+                organization_id=organization_id,
+                bank_account_id=transaction.bank_account_id,
+                delta_cents=reverse_balance_change,
+                reason="transaction_reversed",
+                transaction_id=transaction.id,
+            )
+            await financial_rollup_service.apply_transaction(
+                db,
+                organization_id=organization_id,
+                transaction_type=transaction.type,
+                category=transaction.category,
+                amount_cents=transaction.amount_cents,
+                transaction_date=transaction.transaction_date,
+                sign=-1,
             )
+            invalidate_dashboard_on_commit(db, organization_id, *TRANSACTION_SECTIONS)
 
         return transaction
 
@@ -496,16 +645,23 @@ class TransactionService(BaseService[Transaction, TransactionCreate, Transaction
         if transaction.type == "expense":
             balance_change = -balance_change
 
-        await db.execute(
-            update(BankAccount)
-            .where(
-                and_(
-                    BankAccount.id == transaction.bank_account_id,
-                    BankAccount.organization_id == organization_id,
-                )
-            )
-            .values(balance_cents=BankAccount.balance_cents + balance_change)
+        await bank_account_service.apply_balance_delta(
+            db,
+            organization_id=organization_id,
+            bank_account_id=transaction.bank_account_id,
+            delta_cents=balance_change,
+            reason="transaction_applied",
+            transaction_id=transaction.id,
+        )
+        await financial_rollup_service.apply_transaction(
+            db,
+            organization_id=organization_id,
+            transaction_type=transaction.type,
+            category=transaction.category,
+            amount_cents=transaction.amount_cents,
+            transaction_date=transaction.transaction_date,
         )
+        invalidate_dashboard_on_commit(db, organization_id, *TRANSACTION_SECTIONS)
 
         db.add(transaction)
         await db.flush()
@@ -557,6 +713,7 @@ class TransactionService(BaseService[Transaction, TransactionCreate, Transaction
         transaction.payment_status = "paid"
         transaction.paid_by = paid_by_id
         transaction.paid_at = datetime.now(timezone.utc)
+        invalidate_dashboard_on_commit(db, organization_id, *TRANSACTION_SECTIONS)
 
         db.add(transaction)
         await db.flush()
@@ -573,20 +730,35 @@ class TransactionService(BaseService[Transaction, TransactionCreate, Transaction
         filters: Optional[Dict[str, Any]] = None
     ) -> List[Transaction]:
         """Get transactions with bank account and project relations."""
-        query = select(Transaction).where(Transaction.organization_id == organization_id)
-
-        if filters:
-            for field, value in filters.items():
-                if hasattr(Transaction, field):
-                    query = query.where(getattr(Transaction, field) == value)
-
-        query = query.options(*self._get_relation_options()).order_by(
-            Transaction.transaction_date.desc(),
-            Transaction.created_at.desc()
-        ).offset(skip).limit(limit)
+        return await self.get_multi(
+            db,
+            organization_id=organization_id,
+            skip=skip,
+            limit=limit,
+            options=self._get_relation_options(),
+            filters=filters,
+        )
 
-        result = await db.execute(query)
-        return result.scalars().all()
+    async def get_page_with_relations(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        cursor: Optional[str] = None,
+        limit: int = 100,
+        skip: int = 0,
+        filters: Optional[Dict[str, Any]] = None
+    ) -> Tuple[List[Transaction], Optional[str]]:
+        """Get one page of transactions with relations, plus the next page cursor."""
+        return await self.get_page(
+            db,
+            organization_id=organization_id,
+            cursor=cursor,
+            limit=limit,
+            skip=skip,
+            options=self._get_relation_options(),
+            filters=filters,
+        )
 
     async def get_monthly_stats(
         self,
@@ -596,45 +768,14 @@ class TransactionService(BaseService[Transaction, TransactionCreate, Transaction
         year: int,
         month: int
     ) -> Dict[str, int]:
-        """Get monthly financial statistics for the organization."""
-        # Calculate date range for the month
-        from datetime import date
-
-        start_date = date(year, month, 1)
-        if month == 12:
-            end_date = date(year + 1, 1, 1)
-        else:
-            end_date = date(year, month + 1, 1)
-
-        # Query for income total
-        income_query = select(func.sum(Transaction.amount_cents)).where(
-            and_(
-                Transaction.organization_id == organization_id,
-                Transaction.type == "income",
-                Transaction.category != "internal_transfer",
-                Transaction.payment_status.in_(self.APPLIED_PAYMENT_STATUSES),
-                Transaction.transaction_date >= start_date,
-                Transaction.transaction_date < end_date
-            )
-        )
-
-        # Query for expense total
-        expense_query = select(func.sum(Transaction.amount_cents)).where(
-            and_(
-                Transaction.organization_id == organization_id,
-                Transaction.type == "expense",
-                Transaction.category != "internal_transfer",
-                Transaction.payment_status.in_(self.APPLIED_PAYMENT_STATUSES),
-                Transaction.transaction_date >= start_date,
-                Transaction.transaction_date < end_date
-            )
+        """Get monthly financial statistics for the organization (from the monthly rollup)."""
+        month_start = date(year, month, 1)
+        total_income, total_expense = await financial_rollup_service.get_totals(
+            db,
+            organization_id=organization_id,
+            start_month=month_start,
+            end_month=month_start,
         )
-
-        income_result = await db.execute(income_query)
-        expense_result = await db.execute(expense_query)
-
-        total_income = income_result.scalar() or 0
-        total_expense = expense_result.scalar() or 0
         net_balance = total_income - total_expense
 
         return {
@@ -652,24 +793,9 @@ class TransactionService(BaseService[Transaction, TransactionCreate, Transaction
         organization_id: UUID
     ) -> Dict[str, int]:
         """Get overall financial statistics for the organization."""
-        # Query for total income
-        income_query = select(func.sum(Transaction.amount_cents)).where(
-            and_(
-                Transaction.organization_id == organization_id,
-                Transaction.type == "income",
-                Transaction.category != "internal_transfer",
-                Transaction.payment_status.in_(self.APPLIED_PAYMENT_STATUSES),
-            )
-        )
-
-        # Query for total expense
-        expense_query = select(func.sum(Transaction.amount_cents)).where(
-            and_(
-                Transaction.organization_id == organization_id,
-                Transaction.type == "expense",
-                Transaction.category != "internal_transfer",
-                Transaction.payment_status.in_(self.APPLIED_PAYMENT_STATUSES),
-            )
+        # All-time income/expense totals come from the monthly rollup
+        total_income, total_expense = await financial_rollup_service.get_totals(
+            db, organization_id=organization_id
         )
 
         # Query for total active project budget
@@ -691,13 +817,9 @@ class TransactionService(BaseService[Transaction, TransactionCreate, Transaction
             )
         )
 
-        income_result = await db.execute(income_query)
-        expense_result = await db.execute(expense_query)
         budget_result = await db.execute(budget_query)
         active_project_expenses_result = await db.execute(active_project_expenses_query)
 
-        total_income = income_result.scalar() or 0
-        total_expense = expense_result.scalar() or 0
         total_budget = budget_result.scalar() or 0
         active_project_expenses = active_project_expenses_result.scalar() or 0
 
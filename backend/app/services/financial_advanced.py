@@ -5,6 +5,7 @@ from app.models.financial import (
     InvoiceItem,
     InvoiceStatusEnum,
     InvoicePaymentMethodEnum,
+    InvoiceNumberSequence,
 )
 from app.models.transactions import Transaction
 from app.schemas.financial import (
@@ -13,12 +14,34 @@ from app.schemas.financial import (
     ProjectFinancialReport
 )
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, func, and_, or_
+from sqlalchemy import select, func, and_, or_, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
 from typing import List, Optional, Dict, Any
 from uuid import UUID
 from datetime import datetime, date, timedelta
 from app.core.config import settings
-from app.models.organizations import Organization
+
+
+# Highest issued sequence per (org, year), parsed from INV-{year}-{org_prefix}-{seq};
+# legacy INV-{year}-{org_prefix} numbers carry no sequence and are ignored.
+SYNC_INVOICE_SEQUENCES_SQL = text(r"""
+    INSERT INTO invoice_number_sequences (organization_id, year, last_value)
+    SELECT organization_id, year, max(seq)
+    FROM (
+        SELECT
+            organization_id,
+            substring(invoice_number from '^INV-(\d{4})-')::int AS year,
+            substring(invoice_number from '-(\d+)$')::bigint AS seq
+        FROM invoices
+        WHERE invoice_number ~ '^INV-\d{4}-[0-9A-Fa-f]{8}-\d+$'
+          AND (CAST(:organization_id AS uuid) IS NULL OR organization_id = CAST(:organization_id AS uuid))
+    ) AS issued
+    GROUP BY organization_id, year
+    ON CONFLICT (organization_id, year) DO UPDATE
+    SET last_value = GREATEST(invoice_number_sequences.last_value, EXCLUDED.last_value),
+        updated_at = now()
+    RETURNING organization_id, year, last_value
+""")
 
 
 class TaxTableService(BaseService[TaxTable, TaxTableCreate, TaxTableUpdate]):
@@ -42,52 +65,49 @@ class InvoiceService(BaseService[Invoice, InvoiceCreate, InvoiceUpdate]):
         issue_date: date,
     ) -> str:
         """
-        Generate a human-friendly invoice number.
+        Generate a human-friendly invoice number: `INV-{year}-{org_id_prefix}-{seq}`.
 
-        Previous versions used `INV-{year}-{org_id_prefix}` which is NOT unique and causes duplicates.
-        We now generate `INV-{year}-{org_id_prefix}-{seq}` where seq is per-org/per-year.
+        seq comes from the per-org/per-year counter in `invoice_number_sequences`,
+        bumped with one upsert ... RETURNING in the caller's transaction. Only
+        the counter row is locked (until commit), so concurrent invoices get
+        distinct numbers without serializing other writes on the organization,
+        and a rolled-back invoice releases its number.
         """
         year = issue_date.year
         org_prefix = organization_id.hex[:8].upper()
 
-        # Serialize invoice number generation per org to avoid duplicates under concurrent requests.
-        await db.execute(
-            select(Organization.id)
-            .where(Organization.id == organization_id)
-            .with_for_update()
+        stmt = (
+            pg_insert(InvoiceNumberSequence)
+            .values(organization_id=organization_id, year=year, last_value=1)
+            .on_conflict_do_update(
+                index_elements=[InvoiceNumberSequence.organization_id, InvoiceNumberSequence.year],
+                set_={
+                    "last_value": InvoiceNumberSequence.last_value + 1,
+                    "updated_at": func.now(),
+                },
+            )
+            .returning(InvoiceNumberSequence.last_value)
         )
+        seq = (await db.execute(stmt)).scalar_one()
+        return f"INV-{year}-{org_prefix}-{seq:03d}"
 
-        start_date = date(year, 1, 1)
-        end_date = date(year + 1, 1, 1)
-
-        # Start sequence at (count in the year) + 1.
-        # We also check actual uniqueness below to be defensive against existing bad data.
-        count_result = await db.execute(
-            select(func.count(Invoice.id)).where(
-                and_(
-                    Invoice.organization_id == organization_id,
-                    Invoice.issue_date >= start_date,
-                    Invoice.issue_date < end_date,
-                )
-            )
+    async def sync_invoice_number_sequences(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: Optional[UUID] = None,
+    ) -> List[Dict[str, Any]]:
+        """
+        Raise each (org, year) counter to the highest number already issued.
+
+        Counters never move backwards, so numbers of deleted invoices are not
+        reused. Returns the resulting counters.
+        """
+        result = await db.execute(
+            SYNC_INVOICE_SEQUENCES_SQL,
+            {"organization_id": organization_id},
         )
-        seq = int(count_result.scalar() or 0) + 1
-
-        while True:
-            candidate = f"INV-{year}-{org_prefix}-{seq:03d}"
-            exists_result = await db.execute(
-                select(Invoice.id)
-                .where(
-                    and_(
-                        Invoice.organization_id == organization_id,
-                        Invoice.invoice_number == candidate,
-                    )
-                )
-                .limit(1)
-            )
-            if exists_result.scalar_one_or_none() is None:
-                return candidate
-            seq += 1
+        return [dict(row._mapping) for row in result.all()]
 
     def _get_default_due_date(self, proposal_valid_until: Optional[date]) -> date:
         if proposal_valid_until:
@@ -209,6 +229,39 @@ class InvoiceService(BaseService[Invoice, InvoiceCreate, InvoiceUpdate]):
 
         return invoice
 
+    async def remove(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        id: UUID
+    ) -> Optional[Invoice]:
+        """Delete an invoice, reversing its transactions before the FK cascade drops them."""
+        from app.services.financial import transaction_service
+
+        invoice = await self.get(db, organization_id=organization_id, id=id)
+        if not invoice:
+            return None
+
+        # transactions.invoice_id cascades on delete, which would bypass the
+        # balance ledger and the monthly rollup; remove them through the service.
+        result = await db.execute(
+            select(Transaction.id).where(
+                Transaction.organization_id == organization_id,
+                Transaction.invoice_id == id,
+            )
+        )
+        for transaction_id in result.scalars().all():
+            await transaction_service.remove(
+                db=db,
+                organization_id=organization_id,
+                id=transaction_id,
+            )
+        # The session does not autoflush; delete the rows before the cascade can.
+        await db.flush()
+
+        return await super().remove(db=db, organization_id=organization_id, id=id)
+
     async def create_from_proposal(
         self,
         db: AsyncSession,
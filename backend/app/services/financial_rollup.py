@@ -0,0 +1,247 @@
+"""
+Monthly financial rollup (`org_monthly_financials`).
+
+One row per organization, month, transaction type and category holding the
+sum and count of applied (approved/paid) transactions. TransactionService
+calls `apply_transaction` with sign=+1 when a transaction becomes applied and
+sign=-1 when an applied transaction is deleted, in the same database
+transaction, so the rollup commits or rolls back together with the write.
+Pending and rejected transactions never reach it, and approved -> paid does
+not change it.
+
+`rebuild` and `find_mismatches` recompute the rollup from `transactions`
+(see scripts/rebuild_monthly_financials.py and the nightly verification job).
+"""
+import logging
+from datetime import date
+from typing import Any, Dict, List, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import DATE, and_, case, delete, func, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.transactions import OrgMonthlyFinancial, Transaction
+
+logger = logging.getLogger(__name__)
+
+APPLIED_PAYMENT_STATUSES = ("approved", "paid")
+
+# Categories that move money between the organization's own accounts.
+EXCLUDED_CATEGORIES = ("internal_transfer",)
+
+
+def month_start(value: date) -> date:
+    return value.replace(day=1)
+
+
+class FinancialRollupService:
+    """Maintains and reads the monthly financial rollup."""
+
+    async def apply_transaction(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        transaction_type: str,
+        category: str,
+        amount_cents: int,
+        transaction_date: Optional[date],
+        sign: int = 1,
+    ) -> None:
+        """Add (sign=1) or remove (sign=-1) one applied transaction from its month."""
+        stmt = pg_insert(OrgMonthlyFinancial).values(
+            organization_id=organization_id,
+            month=month_start(transaction_date or date.today()),
+            type=transaction_type,
+            category=category,
+            amount_cents=sign * amount_cents,
+            transaction_count=sign,
+        )
+        stmt = stmt.on_conflict_do_update(
+            index_elements=[
+                OrgMonthlyFinancial.organization_id,
+                OrgMonthlyFinancial.month,
+                OrgMonthlyFinancial.type,
+                OrgMonthlyFinancial.category,
+            ],
+            set_={
+                "amount_cents": OrgMonthlyFinancial.amount_cents + stmt.excluded.amount_cents,
+                "transaction_count": OrgMonthlyFinancial.transaction_count + stmt.excluded.transaction_count,
+                "updated_at": func.now(),
+            },
+        )
+        await db.execute(stmt)
+
+    async def get_monthly_totals(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        start_month: Optional[date] = None,
+        end_month: Optional[date] = None,
+    ) -> List[Dict[str, Any]]:
+        """Income/expense per month (inclusive month bounds), oldest first."""
+        query = (
+            select(
+                OrgMonthlyFinancial.month,
+                func.sum(
+                    case((OrgMonthlyFinancial.type == "income", OrgMonthlyFinancial.amount_cents), else_=0)
+                ).label("income_cents"),
+                func.sum(
+                    case((OrgMonthlyFinancial.type == "expense", OrgMonthlyFinancial.amount_cents), else_=0)
+                ).label("expense_cents"),
+            )
+            .where(self._reportable(organization_id, start_month, end_month))
+            .group_by(OrgMonthlyFinancial.month)
+            .having(func.sum(OrgMonthlyFinancial.transaction_count) > 0)
+            .order_by(OrgMonthlyFinancial.month)
+        )
+        result = await db.execute(query)
+        return [
+            {
+                "month": row.month,
+                "income_cents": int(row.income_cents or 0),
+                "expense_cents": int(row.expense_cents or 0),
+            }
+            for row in result.all()
+        ]
+
+    async def get_totals(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        start_month: Optional[date] = None,
+        end_month: Optional[date] = None,
+    ) -> Tuple[int, int]:
+        """(income_cents, expense_cents) over the inclusive month range (all time by default)."""
+        query = select(
+            func.sum(case((OrgMonthlyFinancial.type == "income", OrgMonthlyFinancial.amount_cents), else_=0)),
+            func.sum(case((OrgMonthlyFinancial.type == "expense", OrgMonthlyFinancial.amount_cents), else_=0)),
+        ).where(self._reportable(organization_id, start_month, end_month))
+        result = await db.execute(query)
+        row = result.first()
+        if not row:
+            return 0, 0
+        return int(row[0] or 0), int(row[1] or 0)
+
+    async def get_category_total(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        transaction_type: str,
+        category: str,
+    ) -> int:
+        """All-time total for one type/category (e.g. maintenance expenses)."""
+        result = await db.execute(
+            select(func.sum(OrgMonthlyFinancial.amount_cents)).where(
+                OrgMonthlyFinancial.organization_id == organization_id,
+                OrgMonthlyFinancial.type == transaction_type,
+                OrgMonthlyFinancial.category == category,
+            )
+        )
+        return int(result.scalar() or 0)
+
+    def _reportable(self, organization_id: UUID, start_month: Optional[date], end_month: Optional[date]):
+        conditions = [
+            OrgMonthlyFinancial.organization_id == organization_id,
+            OrgMonthlyFinancial.category.not_in(EXCLUDED_CATEGORIES),
+        ]
+        if start_month is not None:
+            conditions.append(OrgMonthlyFinancial.month >= month_start(start_month))
+        if end_month is not None:
+            conditions.append(OrgMonthlyFinancial.month <= month_start(end_month))
+        return and_(*conditions)
+
+    def _expected_rows_query(self, organization_id: Optional[UUID] = None):
+        """The rollup as computed from `transactions`."""
+        month = func.date_trunc("month", Transaction.transaction_date).cast(DATE)
+        query = select(
+            Transaction.organization_id.label("organization_id"),
+            month.label("month"),
+            Transaction.type.label("type"),
+            Transaction.category.label("category"),
+            func.sum(Transaction.amount_cents).label("amount_cents"),
+            func.count().label("transaction_count"),
+        ).where(
+            Transaction.payment_status.in_(APPLIED_PAYMENT_STATUSES),
+            Transaction.transaction_date.is_not(None),
+        )
+        if organization_id is not None:
+            query = query.where(Transaction.organization_id == organization_id)
+        return query.group_by(Transaction.organization_id, month, Transaction.type, Transaction.category)
+
+    async def find_mismatches(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: Optional[UUID] = None,
+    ) -> List[Dict[str, Any]]:
+        """Rollup rows that disagree with `transactions` (missing rows count as zero)."""
+        expected = self._expected_rows_query(organization_id).subquery("expected")
+        rollup_query = select(OrgMonthlyFinancial)
+        if organization_id is not None:
+            rollup_query = rollup_query.where(OrgMonthlyFinancial.organization_id == organization_id)
+        rollup = rollup_query.subquery("rollup")
+
+        keys = ("organization_id", "month", "type", "category")
+        query = (
+            select(
+                *[func.coalesce(expected.c[key], rollup.c[key]).label(key) for key in keys],
+                func.coalesce(expected.c.amount_cents, 0).label("expected_amount_cents"),
+                func.coalesce(rollup.c.amount_cents, 0).label("rollup_amount_cents"),
+                func.coalesce(expected.c.transaction_count, 0).label("expected_count"),
+                func.coalesce(rollup.c.transaction_count, 0).label("rollup_count"),
+            )
+            .select_from(
+                expected.join(
+                    rollup,
+                    and_(*[expected.c[key] == rollup.c[key] for key in keys]),
+                    full=True,
+                )
+            )
+            .where(
+                or_(
+                    func.coalesce(expected.c.amount_cents, 0) != func.coalesce(rollup.c.amount_cents, 0),
+                    func.coalesce(expected.c.transaction_count, 0) != func.coalesce(rollup.c.transaction_count, 0),
+                )
+            )
+            .order_by("organization_id", "month")
+        )
+        result = await db.execute(query)
+        return [dict(row._mapping) for row in result.all()]
+
+    async def rebuild(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: Optional[UUID] = None,
+    ) -> int:
+        """
+        Replace the rollup (for one organization, or all) with fresh totals.
+
+        Takes an EXCLUSIVE lock on the rollup table until the caller commits:
+        in-flight writers finish first (so their transactions are in the
+        recomputed totals) and new ones wait (so their deltas land on top).
+        """
+        await db.execute(text("LOCK TABLE org_monthly_financials IN EXCLUSIVE MODE"))
+
+        delete_stmt = delete(OrgMonthlyFinancial)
+        if organization_id is not None:
+            delete_stmt = delete_stmt.where(OrgMonthlyFinancial.organization_id == organization_id)
+        await db.execute(delete_stmt)
+
+        expected = self._expected_rows_query(organization_id)
+        result = await db.execute(
+            pg_insert(OrgMonthlyFinancial).from_select(
+                ["organization_id", "month", "type", "category", "amount_cents", "transaction_count"],
+                expected,
+            )
+        )
+        return result.rowcount or 0
+
+
+# Global service instance
+financial_rollup_service = FinancialRollupService()
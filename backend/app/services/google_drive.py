@@ -13,6 +13,7 @@ from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
 from app.models.cloud import GoogleDriveCredentials, ProjectDriveFolder, CloudFileReference
+from app.services.google_http import google_http_client
 from app.services.google_oauth import google_oauth_service
 
 logger = logging.getLogger(__name__)
@@ -249,34 +250,88 @@ class GoogleDriveService:
             files: list[dict] = []
             page_token: str | None = None
 
-            async with httpx.AsyncClient() as client:
-                while True:
-                    params: dict = {
-                        "q": f"'{folder_id}' in parents and trashed = false and mimeType != 'application/vnd.google-apps.folder'",
-                        "fields": "nextPageToken, files(id, name, mimeType, size, webViewLink, createdTime)",
-                        "pageSize": 100,
-                    }
-                    if page_token:
-                        params["pageToken"] = page_token
-
-                    resp = await client.get(
-                        f"{DRIVE_API}/files",
-                        params=params,
-                        headers={"Authorization": f"Bearer {access_token}"},
-                    )
-                    resp.raise_for_status()
-                    data = resp.json()
-                    files.extend(data.get("files", []))
-
-                    page_token = data.get("nextPageToken")
-                    if not page_token:
-                        break
+            client = google_http_client.get()
+            while True:
+                params: dict = {
+                    "q": f"'{folder_id}' in parents and trashed = false and mimeType != 'application/vnd.google-apps.folder'",
+                    "fields": "nextPageToken, files(id, name, mimeType, size, webViewLink, createdTime)",
+                    "pageSize": 100,
+                }
+                if page_token:
+                    params["pageToken"] = page_token
+
+                resp = await client.get(
+                    f"{DRIVE_API}/files",
+                    params=params,
+                    headers={"Authorization": f"Bearer {access_token}"},
+                )
+                self._raise_for_status(resp, organization_id)
+                data = resp.json()
+                files.extend(data.get("files", []))
+
+                page_token = data.get("nextPageToken")
+                if not page_token:
+                    break
 
             return files
         except Exception as e:
             logger.warning(f"Failed to list folder {folder_id}: {e}")
             return None
 
+    # ── Changes ──────────────────────────────────────────────
+
+    async def get_changes_start_token(
+        self,
+        organization_id: UUID,
+        db: AsyncSession,
+    ) -> str:
+        """Return the Drive changes page token for "now"."""
+        access_token = await google_oauth_service.get_valid_access_token(organization_id, db)
+        resp = await google_http_client.get().get(
+            f"{DRIVE_API}/changes/startPageToken",
+            headers={"Authorization": f"Bearer {access_token}"},
+        )
+        self._raise_for_status(resp, organization_id)
+        return resp.json()["startPageToken"]
+
+    async def list_changes(
+        self,
+        organization_id: UUID,
+        page_token: str,
+        db: AsyncSession,
+    ) -> tuple[list[dict], str]:
+        """
+        Return all changes since page_token and the token to resume from.
+        Each change has fileId, removed and (unless removed) file with
+        id, name, mimeType, size, webViewLink, createdTime, parents, trashed.
+        """
+        access_token = await google_oauth_service.get_valid_access_token(organization_id, db)
+        client = google_http_client.get()
+        changes: list[dict] = []
+
+        while True:
+            resp = await client.get(
+                f"{DRIVE_API}/changes",
+                params={
+                    "pageToken": page_token,
+                    "pageSize": 1000,
+                    "spaces": "drive",
+                    "includeRemoved": "true",
+                    "fields": (
+                        "nextPageToken, newStartPageToken, changes(fileId, removed, "
+                        "file(id, name, mimeType, size, webViewLink, createdTime, parents, trashed))"
+                    ),
+                },
+                headers={"Authorization": f"Bearer {access_token}"},
+            )
+            self._raise_for_status(resp, organization_id)
+            data = resp.json()
+            changes.extend(data.get("changes", []))
+
+            if data.get("newStartPageToken"):
+                return changes, data["newStartPageToken"]
+            page_token = data["nextPageToken"]
+
     # ── Delete ───────────────────────────────────────────────
 
     async def delete_file(
@@ -288,22 +343,28 @@ class GoogleDriveService:
         """Delete a file from Google Drive. Returns True if successful."""
         try:
             access_token = await google_oauth_service.get_valid_access_token(organization_id, db)
-            async with httpx.AsyncClient() as client:
-                resp = await client.delete(
-                    f"{DRIVE_API}/files/{drive_file_id}",
-                    headers={"Authorization": f"Bearer {access_token}"},
-                )
-                # 204 = success, 404 = already deleted
-                if resp.status_code in (204, 404):
-                    return True
-                resp.raise_for_status()
+            client = google_http_client.get()
+            resp = await client.delete(
+                f"{DRIVE_API}/files/{drive_file_id}",
+                headers={"Authorization": f"Bearer {access_token}"},
+            )
+            # 204 = success, 404 = already deleted
+            if resp.status_code in (204, 404):
                 return True
+            self._raise_for_status(resp, organization_id)
+            return True
         except Exception as e:
             logger.warning(f"Failed to delete file {drive_file_id} from Drive: {e}")
             return False
 
     # ── Private helpers ──────────────────────────────────────
 
+    def _raise_for_status(self, resp: httpx.Response, organization_id: UUID) -> None:
+        if resp.status_code == 401:
+            # Token revoked or replaced elsewhere — stop serving it from the cache.
+            google_oauth_service.invalidate_access_token(organization_id)
+        resp.raise_for_status()
+
     async def _get_creds(
         self, organization_id: UUID, db: AsyncSession
     ) -> GoogleDriveCredentials:
@@ -327,15 +388,15 @@ class GoogleDriveService:
         if parent_id:
             metadata["parents"] = [parent_id]
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{DRIVE_API}/files",
-                headers={"Authorization": f"Bearer {access_token}"},
-                json=metadata,
-                params={"fields": "id"},
-            )
-            resp.raise_for_status()
-            return resp.json()["id"]
+        client = google_http_client.get()
+        resp = await client.post(
+            f"{DRIVE_API}/files",
+            headers={"Authorization": f"Bearer {access_token}"},
+            json=metadata,
+            params={"fields": "id"},
+        )
+        resp.raise_for_status()
+        return resp.json()["id"]
 
     async def _resolve_folder(
         self,
@@ -390,26 +451,26 @@ class GoogleDriveService:
         # Strip trailing slash
         origin = frontend_url.rstrip("/")
 
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                f"{DRIVE_UPLOAD_API}/files",
-                params={
-                    "uploadType": "resumable",
-                    "fields": "id,webViewLink",
-                },
-                headers={
-                    "Authorization": f"Bearer {access_token}",
-                    "Content-Type": "application/json; charset=UTF-8",
-                    "X-Upload-Content-Type": mime_type,
-                    "Origin": origin,
-                },
-                json=metadata,
-            )
-            resp.raise_for_status()
-            session_uri = resp.headers.get("Location")
-            if not session_uri:
-                raise ValueError("Google did not return a resumable upload URI")
-            return session_uri
+        client = google_http_client.get()
+        resp = await client.post(
+            f"{DRIVE_UPLOAD_API}/files",
+            params={
+                "uploadType": "resumable",
+                "fields": "id,webViewLink",
+            },
+            headers={
+                "Authorization": f"Bearer {access_token}",
+                "Content-Type": "application/json; charset=UTF-8",
+                "X-Upload-Content-Type": mime_type,
+                "Origin": origin,
+            },
+            json=metadata,
+        )
+        resp.raise_for_status()
+        session_uri = resp.headers.get("Location")
+        if not session_uri:
+            raise ValueError("Google did not return a resumable upload URI")
+        return session_uri
 
 
 # Global instance
@@ -0,0 +1,53 @@
+"""
+Shared HTTP client for Google APIs (Drive, OAuth2).
+
+One pooled, keep-alive, HTTP/2 httpx.AsyncClient is reused by every Drive
+and OAuth call, so requests after the first skip the TCP/TLS handshake and
+multiplex over the same connection. Closed on application shutdown.
+"""
+from typing import Optional
+
+import httpx
+
+from app.core.config import settings
+
+
+class GoogleHTTPClient:
+    """Lazily created, lifecycle-managed httpx.AsyncClient for Google APIs."""
+
+    def __init__(
+        self,
+        timeout_seconds: float,
+        max_connections: int,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.timeout_seconds = timeout_seconds
+        self.max_connections = max_connections
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def get(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                http2=True,
+                timeout=httpx.Timeout(self.timeout_seconds, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=self.max_connections,
+                    max_keepalive_connections=self.max_connections,
+                    keepalive_expiry=120.0,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    async def aclose(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+
+# Global client shared by GoogleDriveService and GoogleOAuthService
+google_http_client = GoogleHTTPClient(
+    timeout_seconds=settings.GOOGLE_HTTP_TIMEOUT_SECONDS,
+    max_connections=settings.GOOGLE_HTTP_MAX_CONNECTIONS,
+)
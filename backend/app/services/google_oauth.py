@@ -1,10 +1,13 @@
 """
 Google OAuth2 service — token management and credential storage.
 """
+import asyncio
 import logging
 import secrets
+import time
+import weakref
 from datetime import datetime, timezone
-from typing import Optional
+from typing import Dict, Optional, Tuple
 from uuid import UUID
 
 import httpx
@@ -12,6 +15,7 @@ from sqlalchemy import select
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from app.core.config import settings
+from app.services.google_http import google_http_client
 from app.models.cloud import GoogleDriveCredentials
 
 logger = logging.getLogger(__name__)
@@ -23,6 +27,9 @@ GOOGLE_USERINFO_URL = "https://www.googleapis.com/oauth2/v2/userinfo"
 
 DRIVE_FILE_SCOPE = "https://www.googleapis.com/auth/drive.file"
 
+# Tokens are refreshed once they are within this many seconds of expiring.
+TOKEN_REFRESH_MARGIN_SECONDS = 300
+
 
 class GoogleOAuthService:
     """Manages Google OAuth2 flow: authorize → callback → store/refresh tokens."""
@@ -32,6 +39,13 @@ class GoogleOAuthService:
         self.client_secret = settings.GOOGLE_CLIENT_SECRET
         self.redirect_uri = settings.GOOGLE_REDIRECT_URI
 
+        # organization_id -> (access_token, expiry epoch seconds)
+        self._token_cache: Dict[UUID, Tuple[str, float]] = {}
+        # One lock per org so concurrent requests share a single refresh.
+        self._refresh_locks: "weakref.WeakValueDictionary[UUID, asyncio.Lock]" = (
+            weakref.WeakValueDictionary()
+        )
+
     # ── Authorization ────────────────────────────────────────
 
     def generate_auth_url(self, organization_id: UUID) -> str:
@@ -107,38 +121,86 @@ class GoogleOAuthService:
 
         await db.commit()
         await db.refresh(creds)
+        self._cache_access_token(organization_id, access_token, token_expiry)
         return creds
 
     # ── Token refresh ────────────────────────────────────────
 
+    def _cached_access_token(self, organization_id: UUID) -> Optional[str]:
+        cached = self._token_cache.get(organization_id)
+        if cached and cached[1] - time.time() > TOKEN_REFRESH_MARGIN_SECONDS:
+            return cached[0]
+        return None
+
+    def _cache_access_token(
+        self, organization_id: UUID, access_token: Optional[str], token_expiry: Optional[datetime]
+    ) -> None:
+        if access_token and token_expiry:
+            self._token_cache[organization_id] = (access_token, token_expiry.timestamp())
+        else:
+            self._token_cache.pop(organization_id, None)
+
+    def invalidate_access_token(self, organization_id: UUID) -> None:
+        """Forget the cached token (e.g. after Google rejected it)."""
+        self._token_cache.pop(organization_id, None)
+
     async def get_valid_access_token(
         self, organization_id: UUID, db: AsyncSession
     ) -> str:
-        """Return a valid access token, refreshing if needed."""
-        query = select(GoogleDriveCredentials).where(
-            GoogleDriveCredentials.organization_id == organization_id
-        )
-        result = await db.execute(query)
-        creds = result.scalar_one_or_none()
-
-        if not creds or not creds.refresh_token:
-            raise ValueError("Google Drive not connected for this organization")
-
-        # Check if token is expired or close to expiring (< 5 min)
-        now = datetime.now(timezone.utc)
-        if creds.token_expiry and (creds.token_expiry.timestamp() - now.timestamp()) > 300:
-            return creds.access_token  # type: ignore[return-value]
+        """
+        Return a valid access token, refreshing if needed.
 
-        # Refresh
-        token_data = await self._refresh_access_token(creds.refresh_token)
-        creds.access_token = token_data["access_token"]
-        expires_in = token_data.get("expires_in", 3600)
-        creds.token_expiry = datetime.fromtimestamp(
-            now.timestamp() + expires_in, tz=timezone.utc
-        )
-        await db.commit()
+        Tokens are cached in memory per organization until shortly before
+        they expire, so most calls skip the credentials query entirely.
+        Refreshes are single-flight: concurrent callers for the same org
+        wait for one refresh instead of each calling Google.
+        """
+        access_token = self._cached_access_token(organization_id)
+        if access_token:
+            return access_token
+
+        lock = self._refresh_locks.get(organization_id)
+        if lock is None:
+            lock = asyncio.Lock()
+            self._refresh_locks[organization_id] = lock
+
+        async with lock:
+            # Another request may have refreshed while we waited.
+            access_token = self._cached_access_token(organization_id)
+            if access_token:
+                return access_token
+
+            query = select(GoogleDriveCredentials).where(
+                GoogleDriveCredentials.organization_id == organization_id
+            )
+            result = await db.execute(query)
+            creds = result.scalar_one_or_none()
+
+            if not creds or not creds.refresh_token:
+                self.invalidate_access_token(organization_id)
+                raise ValueError("Google Drive not connected for this organization")
+
+            # Check if token is expired or close to expiring (< 5 min)
+            now = datetime.now(timezone.utc)
+            if creds.token_expiry and (
+                creds.token_expiry.timestamp() - now.timestamp()
+            ) > TOKEN_REFRESH_MARGIN_SECONDS:
+                self._cache_access_token(organization_id, creds.access_token, creds.token_expiry)
+                return creds.access_token  # type: ignore[return-value]
+
+            # Refresh
+            token_data = await self._refresh_access_token(creds.refresh_token)
+            creds.access_token = token_data["access_token"]
+            expires_in = token_data.get("expires_in", 3600)
+            creds.token_expiry = datetime.fromtimestamp(
+                now.timestamp() + expires_in, tz=timezone.utc
+            )
+            access_token = creds.access_token
+            token_expiry = creds.token_expiry
+            await db.commit()
 
-        return creds.access_token  # type: ignore[return-value]
+            self._cache_access_token(organization_id, access_token, token_expiry)
+            return access_token  # type: ignore[return-value]
 
     # ── Status ───────────────────────────────────────────────
 
@@ -176,62 +238,63 @@ class GoogleOAuthService:
 
         await db.delete(creds)
         await db.commit()
+        self.invalidate_access_token(organization_id)
 
     # ── Private helpers ──────────────────────────────────────
 
     async def _exchange_code(self, code: str) -> dict:
         """Exchange authorization code for tokens."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "code": code,
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "redirect_uri": self.redirect_uri,
-                    "grant_type": "authorization_code",
-                },
-            )
-            resp.raise_for_status()
-            return resp.json()
+        client = google_http_client.get()
+        resp = await client.post(
+            GOOGLE_TOKEN_URL,
+            data={
+                "code": code,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "redirect_uri": self.redirect_uri,
+                "grant_type": "authorization_code",
+            },
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def _refresh_access_token(self, refresh_token: str) -> dict:
         """Refresh an expired access token."""
-        async with httpx.AsyncClient() as client:
-            resp = await client.post(
-                GOOGLE_TOKEN_URL,
-                data={
-                    "refresh_token": refresh_token,
-                    "client_id": self.client_id,
-                    "client_secret": self.client_secret,
-                    "grant_type": "refresh_token",
-                },
-            )
-            resp.raise_for_status()
-            return resp.json()
+        client = google_http_client.get()
+        resp = await client.post(
+            GOOGLE_TOKEN_URL,
+            data={
+                "refresh_token": refresh_token,
+                "client_id": self.client_id,
+                "client_secret": self.client_secret,
+                "grant_type": "refresh_token",
+            },
+        )
+        resp.raise_for_status()
+        return resp.json()
 
     async def _fetch_user_email(self, access_token: str) -> Optional[str]:
         """Fetch the authenticated user's email."""
         try:
-            async with httpx.AsyncClient() as client:
-                resp = await client.get(
-                    GOOGLE_USERINFO_URL,
-                    headers={"Authorization": f"Bearer {access_token}"},
-                )
-                resp.raise_for_status()
-                return resp.json().get("email")
+            client = google_http_client.get()
+            resp = await client.get(
+                GOOGLE_USERINFO_URL,
+                headers={"Authorization": f"Bearer {access_token}"},
+            )
+            resp.raise_for_status()
+            return resp.json().get("email")
         except Exception:
             logger.warning("Failed to fetch Google user email")
             return None
 
     async def _revoke_token(self, token: str) -> None:
         """Revoke a token with Google."""
-        async with httpx.AsyncClient() as client:
-            await client.post(
-                GOOGLE_REVOKE_URL,
-                params={"token": token},
-                headers={"Content-Type": "application/x-www-form-urlencoded"},
-            )
+        client = google_http_client.get()
+        await client.post(
+            GOOGLE_REVOKE_URL,
+            params={"token": token},
+            headers={"Content-Type": "application/x-www-form-urlencoded"},
+        )
 
 
 # Global instance
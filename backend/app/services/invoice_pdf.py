@@ -16,6 +16,8 @@ from datetime import datetime, timezone
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
+from app.services.pdf_renderer import pdf_render_engine
+
 logger = logging.getLogger(__name__)
 
 # Template directory path
@@ -254,7 +256,8 @@ class InvoicePDFService:
         organization: Any,
         client: Any,
         items: List[Any],
-        locale: str = "pt-BR"
+        locale: str = "pt-BR",
+        generated_at: Optional[str] = None
     ) -> str:
         """
         Render invoice data to HTML using Jinja2 template.
@@ -265,6 +268,7 @@ class InvoicePDFService:
             client: Client model instance
             items: List of InvoiceItem model instances
             locale: Locale for formatting (default: pt-BR)
+            generated_at: Override the generation timestamp (pinned when hashing)
 
         Returns:
             Rendered HTML string
@@ -280,7 +284,7 @@ class InvoicePDFService:
             "client": client,
             "items": items,
             "logo_url": self._get_logo_path(organization),
-            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_at": generated_at if generated_at is not None else datetime.now(timezone.utc).isoformat(),
             "locale": locale,
             "t": translations,
             "translate_status": lambda s: self._translate_status(s, locale),
@@ -321,8 +325,6 @@ class InvoicePDFService:
                 "WeasyPrint is not available. Please install it with: pip install weasyprint"
             )
 
-        from weasyprint import HTML, CSS
-
         # Render HTML content
         html_content = await self.render_html(
             invoice=invoice,
@@ -332,15 +334,13 @@ class InvoicePDFService:
             locale=locale
         )
 
-        # Load CSS file
-        css_path = TEMPLATE_DIR / "invoice.css"
-        stylesheets = []
-        if css_path.exists():
-            stylesheets.append(CSS(filename=str(css_path)))
-
-        # Generate PDF
-        html_doc = HTML(string=html_content, base_url=str(TEMPLATE_DIR))
-        pdf_bytes = html_doc.write_pdf(stylesheets=stylesheets if stylesheets else None)
+        # Render off the event loop in the shared worker pool
+        pdf_bytes = await pdf_render_engine.render(
+            html_content,
+            base_url=str(TEMPLATE_DIR),
+            css_path=str(TEMPLATE_DIR / "invoice.css"),
+            organization_id=getattr(organization, "id", None),
+        )
 
         logger.info(f"Generated PDF for invoice {invoice.id} ({len(pdf_bytes)} bytes)")
 
@@ -371,6 +371,46 @@ class InvoicePDFService:
         """
         from app.services.storage import storage_service
         from app.services.entitlements import ensure_and_reserve_storage_capacity
+        from app.services.pdf_cache import pdf_cache_service, PINNED_GENERATED_AT
+
+        # Content hash over the pinned HTML, stylesheet and logo
+        pinned_html = await self.render_html(
+            invoice=invoice,
+            organization=organization,
+            client=client,
+            items=items,
+            locale=locale,
+            generated_at=PINNED_GENERATED_AT
+        )
+        content_hash = pdf_cache_service.compute_content_hash(
+            pinned_html,
+            css_path=str(TEMPLATE_DIR / "invoice.css"),
+            logo_path=self._get_logo_path(organization)
+        )
+
+        cached = await pdf_cache_service.find(
+            db,
+            organization_id=invoice.organization_id,
+            entity_type="invoice",
+            entity_id=invoice.id,
+            content_hash=content_hash
+        )
+        if cached:
+            await pdf_cache_service.mark_used(db, cached)
+            signed_url = await storage_service.generate_signed_url(
+                bucket=cached.bucket,
+                file_path=cached.file_path,
+                expires_in=3600  # 1 hour
+            )
+            logger.info(f"Reused cached PDF for invoice {invoice.id} at {cached.file_path}")
+            return {
+                "pdf_path": cached.file_path,
+                "bucket": cached.bucket,
+                "size_bytes": cached.size_bytes,
+                "signed_url": signed_url,
+                "filename": cached.filename,
+                "cached": True,
+            }
 
         # Generate PDF
         pdf_bytes = await self.generate_pdf(
@@ -414,6 +454,16 @@ class InvoicePDFService:
         # Since Invoice model doesn't have a metadata JSONB column like proposals,
         # we return the info and let the endpoint handle storage tracking
 
+        await pdf_cache_service.record(
+            db,
+            organization_id=invoice.organization_id,
+            entity_type="invoice",
+            entity_id=invoice.id,
+            content_hash=content_hash,
+            upload_result=upload_result,
+            filename=filename
+        )
+
         # Generate signed URL for download
         signed_url = await storage_service.generate_signed_url(
             bucket=upload_result["bucket"],
@@ -431,13 +481,15 @@ class InvoicePDFService:
             "size_bytes": upload_result["size_bytes"],
             "signed_url": signed_url,
             "filename": filename,
+            "cached": False,
         }
 
     async def get_existing_pdf_url(
         self,
         organization_id: str,
         invoice_id: str,
-        expires_in: int = 3600
+        expires_in: int = 3600,
+        db: Optional[Any] = None
     ) -> Optional[Dict[str, Any]]:
         """
         Check if a PDF exists for this invoice in storage and return its signed URL.
@@ -446,13 +498,36 @@ class InvoicePDFService:
             organization_id: Organization UUID string
             invoice_id: Invoice UUID string
             expires_in: URL expiration in seconds
+            db: Database session; when given, the generated_documents index is
+                consulted first so no storage listing is needed
 
         Returns:
             Dict with signed_url and file info, or None if no PDF exists
         """
+        from uuid import UUID
         from app.services.storage import storage_service
+        from app.services.pdf_cache import pdf_cache_service
 
         try:
+            if db is not None:
+                latest = await pdf_cache_service.find_latest(
+                    db,
+                    organization_id=UUID(str(organization_id)),
+                    entity_type="invoice",
+                    entity_id=UUID(str(invoice_id))
+                )
+                if latest:
+                    signed_url = await storage_service.generate_signed_url(
+                        bucket=latest.bucket,
+                        file_path=latest.file_path,
+                        expires_in=expires_in
+                    )
+                    return {
+                        "signed_url": signed_url,
+                        "file_path": latest.file_path,
+                    }
+
+            # Fall back to listing storage (PDFs generated before the index existed)
             # List files in the invoice's storage folder
             # Path format: {organization_id}/invoices/{invoice_id}/
             folder_path = f"{organization_id}/invoices/{invoice_id}"
@@ -0,0 +1,414 @@
+"""
+Postgres-backed job queue.
+
+Jobs live in the `jobs` table. Workers claim them with
+SELECT ... FOR UPDATE SKIP LOCKED, so any number of worker processes can
+poll the same queue without double-processing:
+
+- Visibility timeout: a claimed job is locked until locked_until; the
+  worker extends it while the job runs (heartbeat). If a worker dies the
+  lock expires and the job is requeued.
+- Retries: failed jobs are retried with exponential backoff (plus jitter)
+  until max_attempts, then marked failed.
+- Schedules: recurring jobs (cron expressions or "@every Ns") live in
+  `job_schedules`; whichever worker locks a due schedule enqueues it.
+
+Handlers are registered with @job_task and receive the claimed Job. They
+open their own database sessions.
+"""
+import logging
+import random
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from uuid import UUID
+
+from sqlalchemy import and_, case, delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.core.config import settings
+from app.core.cron import parse_schedule
+from app.models.jobs import Job, JobSchedule
+
+logger = logging.getLogger(__name__)
+
+JOB_QUEUED = "queued"
+JOB_RUNNING = "running"
+JOB_SUCCEEDED = "succeeded"
+JOB_FAILED = "failed"
+JOB_CANCELLED = "cancelled"
+
+JobHandler = Callable[[Job], Awaitable[Optional[Dict[str, Any]]]]
+
+
+@dataclass(frozen=True)
+class JobTask:
+    name: str
+    handler: JobHandler
+    queue: str = "default"
+    max_attempts: Optional[int] = None
+    timeout_seconds: Optional[float] = None  # hard limit per attempt
+
+
+@dataclass(frozen=True)
+class ScheduledJob:
+    name: str
+    schedule: str  # cron expression, alias or "@every Ns"
+    job_name: str
+    queue: str = "default"
+    payload: Dict[str, Any] = field(default_factory=dict)
+
+
+_tasks: Dict[str, JobTask] = {}
+
+
+def job_task(
+    name: str,
+    *,
+    queue: str = "default",
+    max_attempts: Optional[int] = None,
+    timeout_seconds: Optional[float] = None,
+):
+    """Register an async handler for jobs called `name`."""
+    def decorator(func: JobHandler) -> JobHandler:
+        _tasks[name] = JobTask(
+            name=name,
+            handler=func,
+            queue=queue,
+            max_attempts=max_attempts,
+            timeout_seconds=timeout_seconds,
+        )
+        return func
+    return decorator
+
+
+def get_task(name: str) -> Optional[JobTask]:
+    return _tasks.get(name)
+
+
+def compute_backoff(attempts: int) -> float:
+    """Seconds to wait before retry number `attempts` (1-based), with jitter."""
+    delay = min(
+        settings.JOB_RETRY_MAX_SECONDS,
+        settings.JOB_RETRY_BASE_SECONDS * (2 ** max(0, attempts - 1)),
+    )
+    return delay * (0.5 + random.random() / 2)
+
+
+def _utcnow() -> datetime:
+    return datetime.now(timezone.utc)
+
+
+class JobQueueService:
+    """Enqueue, claim and settle jobs. Methods that change state commit
+    unless noted; enqueue() leaves the commit to the caller so a job is only
+    visible if the surrounding transaction commits."""
+
+    # ── Producers ────────────────────────────────────────────
+
+    async def enqueue(
+        self,
+        db: AsyncSession,
+        name: str,
+        payload: Optional[Dict[str, Any]] = None,
+        *,
+        organization_id: Optional[UUID] = None,
+        queue: Optional[str] = None,
+        run_at: Optional[datetime] = None,
+        priority: int = 0,
+        max_attempts: Optional[int] = None,
+        dedupe_key: Optional[str] = None,
+    ) -> Optional[Job]:
+        """
+        Add a job (flushed, not committed). Returns None when dedupe_key
+        matches an existing job.
+        """
+        task = get_task(name)
+        values: Dict[str, Any] = {
+            "name": name,
+            "payload": payload or {},
+            "organization_id": organization_id,
+            "queue": queue or (task.queue if task else "default"),
+            "priority": priority,
+            "max_attempts": max_attempts
+            or (task.max_attempts if task and task.max_attempts else settings.JOB_MAX_ATTEMPTS),
+            "dedupe_key": dedupe_key,
+        }
+        if run_at is not None:
+            values["run_at"] = run_at
+
+        stmt = pg_insert(Job).values(**values)
+        if dedupe_key:
+            stmt = stmt.on_conflict_do_nothing(index_elements=[Job.dedupe_key])
+        result = await db.execute(stmt.returning(Job))
+        return result.scalar_one_or_none()
+
+    async def get(
+        self, db: AsyncSession, job_id: UUID, organization_id: Optional[UUID] = None
+    ) -> Optional[Job]:
+        query = select(Job).where(Job.id == job_id)
+        if organization_id is not None:
+            query = query.where(Job.organization_id == organization_id)
+        result = await db.execute(query)
+        return result.scalar_one_or_none()
+
+    async def count_active(
+        self, db: AsyncSession, *, organization_id: UUID, name: str, lock: bool = False
+    ) -> int:
+        """
+        Queued or running jobs called `name` for an organization. With lock,
+        first take a transaction-scoped advisory lock on (name, organization)
+        so a limit check and the enqueue that follows are atomic: concurrent
+        callers wait until this transaction commits or rolls back.
+        """
+        if lock:
+            await db.execute(
+                select(func.pg_advisory_xact_lock(func.hashtextextended(f"jobs:{name}:{organization_id}", 0)))
+            )
+        result = await db.execute(
+            select(func.count())
+            .select_from(Job)
+            .where(
+                Job.organization_id == organization_id,
+                Job.name == name,
+                Job.status.in_([JOB_QUEUED, JOB_RUNNING]),
+            )
+        )
+        return int(result.scalar_one())
+
+    async def cancel(
+        self, db: AsyncSession, job_id: UUID, organization_id: Optional[UUID] = None
+    ) -> Optional[Job]:
+        """
+        Cancel a job: queued jobs stop immediately, running jobs are flagged
+        and cancelled by their worker at the next heartbeat.
+        """
+        job = await self.get(db, job_id, organization_id)
+        if job is None:
+            return None
+
+        if job.status == JOB_QUEUED:
+            await db.execute(
+                update(Job)
+                .where(Job.id == job_id, Job.status == JOB_QUEUED)
+                .values(status=JOB_CANCELLED, finished_at=func.now(), updated_at=func.now())
+            )
+        elif job.status == JOB_RUNNING:
+            await db.execute(
+                update(Job).where(Job.id == job_id).values(cancel_requested=True, updated_at=func.now())
+            )
+        await db.commit()
+        await db.refresh(job)
+        return job
+
+    # ── Workers ──────────────────────────────────────────────
+
+    async def claim(
+        self,
+        db: AsyncSession,
+        *,
+        worker_id: str,
+        queues: Iterable[str],
+        limit: int,
+        visibility_timeout: float,
+    ) -> List[Job]:
+        """Atomically lock up to `limit` ready jobs for this worker."""
+        ready = (
+            select(Job.id)
+            .where(
+                Job.status == JOB_QUEUED,
+                Job.queue.in_(list(queues)),
+                Job.run_at <= func.now(),
+            )
+            .order_by(Job.priority.desc(), Job.run_at)
+            .limit(limit)
+            .with_for_update(skip_locked=True)
+        )
+        result = await db.execute(
+            update(Job)
+            .where(Job.id.in_(ready.scalar_subquery()))
+            .values(
+                status=JOB_RUNNING,
+                attempts=Job.attempts + 1,
+                locked_by=worker_id,
+                locked_until=func.now() + timedelta(seconds=visibility_timeout),
+                started_at=func.now(),
+                updated_at=func.now(),
+            )
+            .returning(Job)
+            .execution_options(synchronize_session=False)
+        )
+        jobs = list(result.scalars().all())
+        await db.commit()
+        return jobs
+
+    async def heartbeat(
+        self,
+        db: AsyncSession,
+        *,
+        worker_id: str,
+        job_ids: Iterable[UUID],
+        visibility_timeout: float,
+    ) -> set[UUID]:
+        """Extend locks on running jobs; returns the IDs flagged for cancellation."""
+        ids = list(job_ids)
+        if not ids:
+            return set()
+        result = await db.execute(
+            update(Job)
+            .where(Job.id.in_(ids), Job.locked_by == worker_id, Job.status == JOB_RUNNING)
+            .values(locked_until=func.now() + timedelta(seconds=visibility_timeout))
+            .returning(Job.id, Job.cancel_requested)
+            .execution_options(synchronize_session=False)
+        )
+        rows = result.all()
+        await db.commit()
+        return {row.id for row in rows if row.cancel_requested}
+
+    async def _settle(self, db: AsyncSession, job: Job, worker_id: str, **values: Any) -> None:
+        await db.execute(
+            update(Job)
+            .where(Job.id == job.id, Job.locked_by == worker_id, Job.status == JOB_RUNNING)
+            .values(locked_by=None, locked_until=None, updated_at=func.now(), **values)
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+
+    async def complete(
+        self, db: AsyncSession, job: Job, worker_id: str, result: Optional[Dict[str, Any]] = None
+    ) -> None:
+        await self._settle(
+            db, job, worker_id,
+            status=JOB_SUCCEEDED, result=result, last_error=None, finished_at=func.now(),
+        )
+
+    async def fail(self, db: AsyncSession, job: Job, worker_id: str, error: str) -> None:
+        """Schedule a retry with backoff, or mark the job failed when out of attempts."""
+        if job.attempts < job.max_attempts:
+            delay = compute_backoff(job.attempts)
+            await self._settle(
+                db, job, worker_id,
+                status=JOB_QUEUED, last_error=error, run_at=_utcnow() + timedelta(seconds=delay),
+            )
+            logger.warning(f"Job {job.name} ({job.id}) failed, retrying in {delay:.0f}s: {error}")
+        else:
+            await self._settle(
+                db, job, worker_id, status=JOB_FAILED, last_error=error, finished_at=func.now(),
+            )
+            logger.error(f"Job {job.name} ({job.id}) failed permanently: {error}")
+
+    async def mark_cancelled(self, db: AsyncSession, job: Job, worker_id: str) -> None:
+        await self._settle(
+            db, job, worker_id, status=JOB_CANCELLED, last_error="Cancelled", finished_at=func.now(),
+        )
+
+    async def release(self, db: AsyncSession, job: Job, worker_id: str) -> None:
+        """Hand a job back untouched (worker shutting down); the attempt is not counted."""
+        await self._settle(db, job, worker_id, status=JOB_QUEUED, attempts=Job.attempts - 1)
+
+    async def requeue_expired(self, db: AsyncSession) -> int:
+        """Recover jobs whose worker stopped heartbeating (visibility timeout expired)."""
+        expired = and_(Job.status == JOB_RUNNING, Job.locked_until < func.now())
+        retried = await db.execute(
+            update(Job)
+            .where(expired, Job.attempts < Job.max_attempts)
+            .values(
+                status=JOB_QUEUED, locked_by=None, locked_until=None,
+                last_error="Visibility timeout expired", updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        exhausted = await db.execute(
+            update(Job)
+            .where(expired, Job.attempts >= Job.max_attempts)
+            .values(
+                status=JOB_FAILED, locked_by=None, locked_until=None,
+                last_error="Visibility timeout expired", finished_at=func.now(), updated_at=func.now(),
+            )
+            .execution_options(synchronize_session=False)
+        )
+        await db.commit()
+        return retried.rowcount + exhausted.rowcount
+
+    async def prune_finished(self, db: AsyncSession, older_than_days: int) -> int:
+        """Delete succeeded/cancelled jobs older than the retention window."""
+        result = await db.execute(
+            delete(Job).where(
+                Job.status.in_([JOB_SUCCEEDED, JOB_CANCELLED]),
+                Job.finished_at < _utcnow() - timedelta(days=older_than_days),
+            )
+        )
+        await db.commit()
+        return result.rowcount
+
+    # ── Schedules ────────────────────────────────────────────
+
+    async def sync_schedules(self, db: AsyncSession, schedules: Iterable[ScheduledJob]) -> None:
+        """Upsert the code-defined schedules and disable ones no longer defined."""
+        now = _utcnow()
+        names = []
+        for scheduled in schedules:
+            names.append(scheduled.name)
+            parsed = parse_schedule(scheduled.schedule)
+            # Interval schedules start right away; cron schedules at their next slot.
+            first_run = now if parsed.interval is not None else parsed.next_after(now)
+            stmt = pg_insert(JobSchedule).values(
+                name=scheduled.name,
+                schedule=scheduled.schedule,
+                job_name=scheduled.job_name,
+                queue=scheduled.queue,
+                payload=scheduled.payload,
+                enabled=True,
+                next_run_at=first_run,
+            )
+            await db.execute(
+                stmt.on_conflict_do_update(
+                    index_elements=[JobSchedule.name],
+                    set_={
+                        "job_name": stmt.excluded.job_name,
+                        "queue": stmt.excluded.queue,
+                        "payload": stmt.excluded.payload,
+                        "enabled": True,
+                        # Keep the pending slot unless the schedule itself changed.
+                        "next_run_at": case(
+                            (JobSchedule.schedule != stmt.excluded.schedule, stmt.excluded.next_run_at),
+                            else_=JobSchedule.next_run_at,
+                        ),
+                        "schedule": stmt.excluded.schedule,
+                        "updated_at": func.now(),
+                    },
+                )
+            )
+        if names:
+            await db.execute(
+                update(JobSchedule).where(JobSchedule.name.not_in(names)).values(enabled=False)
+            )
+        await db.commit()
+
+    async def enqueue_due_schedules(self, db: AsyncSession) -> int:
+        """Enqueue a job for every due schedule and advance it to its next slot."""
+        now = _utcnow()
+        result = await db.execute(
+            select(JobSchedule)
+            .where(JobSchedule.enabled.is_(True), JobSchedule.next_run_at <= now)
+            .with_for_update(skip_locked=True)
+        )
+        enqueued = 0
+        for schedule in result.scalars().all():
+            job = await self.enqueue(
+                db,
+                schedule.job_name,
+                schedule.payload,
+                queue=schedule.queue,
+                dedupe_key=f"schedule:{schedule.name}:{schedule.next_run_at.isoformat()}",
+            )
+            enqueued += job is not None
+            schedule.last_run_at = now
+            schedule.next_run_at = parse_schedule(schedule.schedule).next_after(now)
+        await db.commit()
+        return enqueued
+
+
+# Global service instance
+job_queue = JobQueueService()
@@ -0,0 +1,176 @@
+"""
+Job handlers, recurring schedules and drain loops run by the worker daemon.
+
+Importing this module registers the handlers with the job queue; the API
+only needs the job name to enqueue work.
+"""
+import logging
+from uuid import UUID
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.jobs import Job
+from app.services.job_queue import ScheduledJob, job_queue, job_task
+from app.services.job_worker import DrainLoop
+
+logger = logging.getLogger(__name__)
+
+
+@job_task("billing.check_expiring_plans", max_attempts=3, timeout_seconds=1800)
+async def check_expiring_plans_job(job: Job) -> dict:
+    from app.cron_check_plans import check_expiring_plans
+
+    return await check_expiring_plans()
+
+
+async def process_webhook_events() -> dict:
+    from app.services.billing_events import billing_event_service
+
+    return await billing_event_service.process_pending()
+
+
+async def deliver_email_outbox() -> dict:
+    from app.services.email_outbox import email_outbox
+
+    return await email_outbox.deliver_pending()
+
+
+async def sync_drive_folders() -> dict:
+    from app.services.drive_sync import drive_sync_engine
+
+    return {"synced_folders": await drive_sync_engine.sync_all()}
+
+
+@job_task("ai.script_analysis", queue="ai", max_attempts=1, timeout_seconds=settings.AI_ANALYSIS_TIMEOUT_SECONDS)
+async def script_analysis_job(job: Job) -> dict:
+    from app.services.script_analysis import process_script_analysis
+
+    payload = job.payload
+    async with SessionLocal() as db:
+        return await process_script_analysis(
+            organization_id=job.organization_id,
+            project_id=UUID(payload["project_id"]),
+            script_content=payload["script_content"],
+            profile_id=UUID(payload["profile_id"]),
+            db=db,
+            analysis_type=payload.get("analysis_type", "full"),
+        )
+
+
+@job_task("ai.prune_result_cache", max_attempts=1)
+async def prune_ai_result_cache_job(job: Job) -> dict:
+    from app.services.ai_cache import ai_result_cache
+
+    return {"deleted": await ai_result_cache.prune_expired()}
+
+
+@job_task("financial.checkpoint_bank_balances", max_attempts=3)
+async def checkpoint_bank_balances_job(job: Job) -> dict:
+    from app.services.financial import bank_account_service
+
+    async with SessionLocal() as db:
+        accounts = await bank_account_service.accounts_needing_checkpoint(db)
+
+    created = 0
+    for organization_id, bank_account_id in accounts:
+        # One short transaction per account: the checkpoint holds the account row lock.
+        async with SessionLocal() as db:
+            checkpoint = await bank_account_service.create_checkpoint(
+                db, organization_id=organization_id, bank_account_id=bank_account_id
+            )
+            await db.commit()
+        created += checkpoint is not None
+    return {"checkpoints": created}
+
+
+@job_task("financial.verify_monthly_rollup", max_attempts=1)
+async def verify_monthly_rollup_job(job: Job) -> dict:
+    from app.services.financial_rollup import financial_rollup_service
+
+    async with SessionLocal() as db:
+        mismatches = await financial_rollup_service.find_mismatches(db)
+
+    organization_ids = sorted({row["organization_id"] for row in mismatches}, key=str)
+    for organization_id in organization_ids:
+        logger.warning(f"Monthly financial rollup out of sync for org {organization_id}; rebuilding")
+        async with SessionLocal() as db:
+            await financial_rollup_service.rebuild(db, organization_id=organization_id)
+            await db.commit()
+    return {"mismatched_rows": len(mismatches), "rebuilt_organizations": len(organization_ids)}
+
+
+@job_task("projects.verify_counters", max_attempts=1)
+async def verify_project_counters_job(job: Job) -> dict:
+    from app.services.project_stats import project_stats_service
+
+    async with SessionLocal() as db:
+        mismatches = await project_stats_service.find_mismatches(db)
+
+    organization_ids = sorted({row["organization_id"] for row in mismatches}, key=str)
+    for organization_id in organization_ids:
+        logger.warning(f"Project counters out of sync for org {organization_id}; rebuilding")
+        async with SessionLocal() as db:
+            await project_stats_service.rebuild(db, organization_id=organization_id)
+            await db.commit()
+    return {"mismatched_projects": len(mismatches), "rebuilt_organizations": len(organization_ids)}
+
+
+@job_task("jobs.prune_finished", max_attempts=1)
+async def prune_finished_jobs(job: Job) -> dict:
+    async with SessionLocal() as db:
+        deleted = await job_queue.prune_finished(db, settings.JOB_RETENTION_DAYS)
+    return {"deleted": deleted}
+
+
+SCHEDULES = [
+    ScheduledJob(
+        name="plan-expiry-check",
+        schedule=settings.PLAN_EXPIRY_CHECK_SCHEDULE,
+        job_name="billing.check_expiring_plans",
+    ),
+    ScheduledJob(
+        name="prune-finished-jobs",
+        schedule="30 3 * * *",
+        job_name="jobs.prune_finished",
+    ),
+    ScheduledJob(
+        name="prune-ai-result-cache",
+        schedule="45 3 * * *",
+        job_name="ai.prune_result_cache",
+    ),
+    ScheduledJob(
+        name="bank-balance-checkpoints",
+        schedule="15 4 * * *",
+        job_name="financial.checkpoint_bank_balances",
+    ),
+    ScheduledJob(
+        name="monthly-financials-verify",
+        schedule="30 4 * * *",
+        job_name="financial.verify_monthly_rollup",
+    ),
+    ScheduledJob(
+        name="project-counters-verify",
+        schedule="45 4 * * *",
+        job_name="projects.verify_counters",
+    ),
+]
+
+
+# Frequent polling work run outside the jobs table, so it leaves no job rows.
+DRAINS = [
+    DrainLoop(
+        name="billing-webhook-events",
+        interval_seconds=settings.BILLING_EVENT_POLL_INTERVAL_SECONDS,
+        drain=process_webhook_events,
+    ),
+    DrainLoop(
+        name="email-outbox",
+        interval_seconds=settings.EMAIL_OUTBOX_POLL_INTERVAL_SECONDS,
+        drain=deliver_email_outbox,
+    ),
+    DrainLoop(
+        name="drive-sync",
+        interval_seconds=settings.DRIVE_SYNC_INTERVAL_SECONDS,
+        drain=sync_drive_folders,
+    ),
+]
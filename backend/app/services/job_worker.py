@@ -0,0 +1,244 @@
+"""
+Async worker pool for the Postgres job queue.
+
+One JobWorker runs at most `concurrency` jobs at a time in a single process;
+run several processes (or machines) to scale out, since claiming uses
+SKIP LOCKED. Each loop iteration the worker:
+
+1. requeues jobs whose visibility timeout expired and enqueues due schedules
+   (every few polls),
+2. claims as many ready jobs as it has free slots,
+3. sleeps for the poll interval when there was nothing to do.
+
+A heartbeat task extends the locks of running jobs and cancels the ones a
+user asked to cancel. On shutdown, running jobs get a grace period and are
+then handed back to the queue.
+
+Drain loops poll tables that are their own queue (the Stripe webhook inbox,
+the email outbox) every few seconds. They run as tasks next to the job loop
+instead of as scheduled jobs, so polling adds no rows to `jobs`; the tables
+claim rows with SKIP LOCKED, so every worker process can run them.
+"""
+import asyncio
+import logging
+import os
+import socket
+import uuid
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional
+from uuid import UUID
+
+from app.core.config import settings
+from app.db.session import SessionLocal
+from app.models.jobs import Job
+from app.services.job_queue import ScheduledJob, get_task, job_queue
+
+logger = logging.getLogger(__name__)
+
+MAINTENANCE_EVERY_POLLS = 5
+
+
+@dataclass(frozen=True)
+class DrainLoop:
+    name: str
+    interval_seconds: float
+    drain: Callable[[], Awaitable[Optional[Dict[str, Any]]]]
+
+
+class JobWorker:
+    """Concurrency-limited job runner for one process."""
+
+    def __init__(
+        self,
+        *,
+        queues: Iterable[str],
+        concurrency: int,
+        poll_interval: float,
+        visibility_timeout: float,
+        shutdown_grace: float,
+        schedules: Iterable[ScheduledJob] = (),
+        drains: Iterable[DrainLoop] = (),
+    ):
+        self.queues = list(queues)
+        self.concurrency = max(1, concurrency)
+        self.poll_interval = poll_interval
+        self.visibility_timeout = visibility_timeout
+        self.shutdown_grace = shutdown_grace
+        self.schedules = list(schedules)
+        self.drains = list(drains)
+        self.worker_id = f"{socket.gethostname()}:{os.getpid()}:{uuid.uuid4().hex[:6]}"
+
+        self._running: Dict[UUID, asyncio.Task] = {}
+        self._cancel_requested: set[UUID] = set()
+        self._slot_freed = asyncio.Event()
+
+    async def run(self, stop: asyncio.Event) -> None:
+        """Process jobs until `stop` is set."""
+        logger.info(f"Job worker {self.worker_id} started (queues={self.queues}, concurrency={self.concurrency})")
+        if self.schedules:
+            async with SessionLocal() as db:
+                await job_queue.sync_schedules(db, self.schedules)
+
+        heartbeat = asyncio.create_task(self._heartbeat_loop(stop))
+        drain_loops = [asyncio.create_task(self._drain_loop(drain, stop)) for drain in self.drains]
+        polls = 0
+        try:
+            while not stop.is_set():
+                if polls % MAINTENANCE_EVERY_POLLS == 0:
+                    await self._maintenance()
+                polls += 1
+
+                claimed = 0
+                free = self.concurrency - len(self._running)
+                if free > 0:
+                    try:
+                        claimed = await self._claim(free)
+                    except Exception as e:
+                        logger.error(f"Job claim failed: {e}")
+
+                if claimed == 0 or len(self._running) >= self.concurrency:
+                    await self._wait(stop)
+        finally:
+            heartbeat.cancel()
+            await self._drain(*drain_loops)
+            logger.info(f"Job worker {self.worker_id} stopped")
+
+    async def _wait(self, stop: asyncio.Event) -> None:
+        """Sleep until the poll interval passes, a slot frees up (when full) or stop is set."""
+        self._slot_freed.clear()
+        waiters = [asyncio.create_task(stop.wait())]
+        if len(self._running) >= self.concurrency:
+            waiters.append(asyncio.create_task(self._slot_freed.wait()))
+        try:
+            await asyncio.wait(waiters, timeout=self.poll_interval, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for waiter in waiters:
+                waiter.cancel()
+
+    async def _drain_loop(self, drain: DrainLoop, stop: asyncio.Event) -> None:
+        """Run `drain` every interval until stop is set; a run in progress is not interrupted."""
+        while not stop.is_set():
+            try:
+                counts = await drain.drain()
+            except Exception as e:
+                logger.error(f"Drain loop {drain.name} failed: {e}")
+            else:
+                if counts and any(counts.values()):
+                    logger.info(f"Drain loop {drain.name}: {counts}")
+            try:
+                await asyncio.wait_for(stop.wait(), timeout=drain.interval_seconds)
+            except asyncio.TimeoutError:
+                pass
+
+    async def _maintenance(self) -> None:
+        try:
+            async with SessionLocal() as db:
+                recovered = await job_queue.requeue_expired(db)
+                scheduled = await job_queue.enqueue_due_schedules(db)
+            if recovered:
+                logger.warning(f"Recovered {recovered} job(s) with expired visibility timeout")
+            if scheduled:
+                logger.info(f"Enqueued {scheduled} scheduled job(s)")
+        except Exception as e:
+            logger.error(f"Job queue maintenance failed: {e}")
+
+    async def _claim(self, limit: int) -> int:
+        async with SessionLocal() as db:
+            jobs = await job_queue.claim(
+                db,
+                worker_id=self.worker_id,
+                queues=self.queues,
+                limit=limit,
+                visibility_timeout=self.visibility_timeout,
+            )
+        for job in jobs:
+            self._running[job.id] = asyncio.create_task(self._execute(job))
+        return len(jobs)
+
+    async def _execute(self, job: Job) -> None:
+        task = get_task(job.name)
+        try:
+            if task is None:
+                raise LookupError(f"No handler registered for job '{job.name}'")
+            result = await asyncio.wait_for(task.handler(job), timeout=task.timeout_seconds)
+        except asyncio.CancelledError:
+            await self._settle_cancelled(job)
+        except asyncio.TimeoutError:
+            await self._settle(job_queue.fail, job, f"Timed out after {task.timeout_seconds}s")
+        except Exception as e:
+            await self._settle(job_queue.fail, job, f"{type(e).__name__}: {e}")
+        else:
+            await self._settle(job_queue.complete, job, result if isinstance(result, dict) else None)
+        finally:
+            self._running.pop(job.id, None)
+            self._cancel_requested.discard(job.id)
+            self._slot_freed.set()
+
+    async def _settle(self, method, job: Job, *args) -> None:
+        try:
+            async with SessionLocal() as db:
+                await method(db, job, self.worker_id, *args)
+        except Exception as e:
+            # The lock expires and the job is retried by visibility timeout.
+            logger.error(f"Failed to record outcome of job {job.id}: {e}")
+
+    async def _settle_cancelled(self, job: Job) -> None:
+        if job.id in self._cancel_requested:
+            await self._settle(job_queue.mark_cancelled, job)
+        else:
+            await self._settle(job_queue.release, job)
+
+    async def _heartbeat_loop(self, stop: asyncio.Event) -> None:
+        interval = max(1.0, self.visibility_timeout / 3)
+        while not stop.is_set():
+            await asyncio.sleep(interval)
+            if not self._running:
+                continue
+            try:
+                async with SessionLocal() as db:
+                    cancel_ids = await job_queue.heartbeat(
+                        db,
+                        worker_id=self.worker_id,
+                        job_ids=list(self._running),
+                        visibility_timeout=self.visibility_timeout,
+                    )
+            except Exception as e:
+                logger.error(f"Job heartbeat failed: {e}")
+                continue
+            for job_id in cancel_ids:
+                running = self._running.get(job_id)
+                if running is not None and job_id not in self._cancel_requested:
+                    self._cancel_requested.add(job_id)
+                    running.cancel()
+
+    async def _drain(self, *drain_loops: asyncio.Task) -> None:
+        """Let running jobs and drain loops finish within the grace period, then hand the rest back."""
+        tasks = [*self._running.values(), *drain_loops]
+        if not tasks:
+            return
+        _, pending = await asyncio.wait(tasks, timeout=self.shutdown_grace)
+        for pending_task in pending:
+            pending_task.cancel()
+        if pending:
+            await asyncio.gather(*pending, return_exceptions=True)
+
+
+def default_queues() -> list[str]:
+    return [q.strip() for q in settings.JOB_WORKER_QUEUES.split(",") if q.strip()]
+
+
+def build_worker(
+    queues: Optional[Iterable[str]] = None,
+    concurrency: Optional[int] = None,
+    schedules: Iterable[ScheduledJob] = (),
+    drains: Iterable[DrainLoop] = (),
+) -> JobWorker:
+    return JobWorker(
+        queues=queues or default_queues(),
+        concurrency=concurrency or settings.JOB_WORKER_CONCURRENCY,
+        poll_interval=settings.JOB_POLL_INTERVAL_SECONDS,
+        visibility_timeout=settings.JOB_VISIBILITY_TIMEOUT_SECONDS,
+        shutdown_grace=settings.JOB_SHUTDOWN_GRACE_SECONDS,
+        schedules=schedules,
+        drains=drains,
+    )
@@ -1,4 +1,5 @@
 from app.services.base import BaseService
+from app.services.dashboard_cache import KIT_ITEM_SECTIONS, invalidate_dashboard_on_commit
 from app.models.inventory import KitItem, MaintenanceLog
 from app.models.transactions import Transaction
 from app.schemas.inventory import (
@@ -31,14 +32,25 @@ class KitItemService(BaseService[KitItem, KitItemCreate, KitItemUpdate]):
     async def create(self, db, *, organization_id, obj_in):
         """Create kit item with kit validation."""
         await self._validate_kit_ownership(db, organization_id, obj_in.kit_id)
-        return await super().create(db=db, organization_id=organization_id, obj_in=obj_in)
+        kit_item = await super().create(db=db, organization_id=organization_id, obj_in=obj_in)
+        invalidate_dashboard_on_commit(db, organization_id, *KIT_ITEM_SECTIONS)
+        return kit_item
 
     async def update(self, db, *, organization_id, id, obj_in):
         """Update kit item with kit validation."""
         if hasattr(obj_in, 'kit_id') and obj_in.kit_id is not None:
             await self._validate_kit_ownership(db, organization_id, obj_in.kit_id)
 
-        return await super().update(db=db, organization_id=organization_id, id=id, obj_in=obj_in)
+        kit_item = await super().update(db=db, organization_id=organization_id, id=id, obj_in=obj_in)
+        invalidate_dashboard_on_commit(db, organization_id, *KIT_ITEM_SECTIONS)
+        return kit_item
+
+    async def remove(self, db, *, organization_id, id):
+        """Delete kit item and refresh the dashboard's inventory section."""
+        kit_item = await super().remove(db=db, organization_id=organization_id, id=id)
+        if kit_item:
+            invalidate_dashboard_on_commit(db, organization_id, *KIT_ITEM_SECTIONS)
+        return kit_item
 
     async def get_with_maintenance_info(
         self,
@@ -183,6 +195,7 @@ class MaintenanceService(BaseService[MaintenanceLog, MaintenanceLogCreate, None]
         if maintenance_data.usage_hours_reset > 0:
             kit_item.current_usage_hours = maintenance_data.usage_hours_reset
 
+        invalidate_dashboard_on_commit(db, organization_id, *KIT_ITEM_SECTIONS)
         await db.commit()
         await db.refresh(db_maintenance_log)
 
@@ -19,23 +19,21 @@ async def notify_organization_admins(
     metadata: dict = None
 ):
     """Send notification to all admin/manager users in organization."""
-    query = select(Profile).where(
+    query = select(Profile.id).where(
         Profile.organization_id == organization_id,
         Profile.role.in_(["admin", "manager", "owner"])
     )
     result = await db.execute(query)
-    profiles = result.scalars().all()
+    profile_ids = result.scalars().all()
 
-    for profile in profiles:
-        await notification_service.create_for_user(
-            db=db,
-            organization_id=organization_id,
-            profile_id=profile.id,
-            title=title,
-            message=message,
-            type=type,
-            metadata=metadata
-        )
+    await notification_service.create_many(
+        db=db,
+        recipients=[(organization_id, profile_id) for profile_id in profile_ids],
+        title=title,
+        message=message,
+        type=type,
+        metadata=metadata
+    )
 
 
 async def notify_platform_superadmins(
@@ -49,34 +47,30 @@ async def notify_platform_superadmins(
 ) -> None:
     """Send notification only to active platform superadmins."""
     query = (
-        select(Profile)
+        select(Profile.organization_id, Profile.id)
         .join(PlatformAdminUser, PlatformAdminUser.profile_id == Profile.id)
         .where(
             PlatformAdminUser.is_active == True,
             PlatformAdminUser.role == "superadmin",
+            # Notification model requires organization_id; skip profiles outside org scope.
+            Profile.organization_id.is_not(None),
         )
     )
     result = await db.execute(query)
-    superadmins = result.scalars().all()
+    recipients = [(row.organization_id, row.id) for row in result.all()]
 
-    for profile in superadmins:
-        if not profile.organization_id:
-            # Notification model requires organization_id; skip profiles outside org scope.
-            continue
+    final_metadata = dict(metadata or {})
+    if source_organization_id:
+        final_metadata.setdefault("source_organization_id", str(source_organization_id))
 
-        final_metadata = dict(metadata or {})
-        if source_organization_id:
-            final_metadata.setdefault("source_organization_id", str(source_organization_id))
-
-        await notification_service.create_for_user(
-            db=db,
-            organization_id=profile.organization_id,
-            profile_id=profile.id,
-            title=title,
-            message=message,
-            type=type,
-            metadata=final_metadata,
-        )
+    await notification_service.create_many(
+        db=db,
+        recipients=recipients,
+        title=title,
+        message=message,
+        type=type,
+        metadata=final_metadata,
+    )
 
 
 async def notify_invoice_status_change(
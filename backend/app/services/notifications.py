@@ -1,9 +1,12 @@
+import asyncio
 import json
 import logging
-from typing import List, Optional, Dict, Any
+import uuid
+from typing import List, Optional, Dict, Any, Sequence, Tuple
 from uuid import UUID
 from sqlalchemy.ext.asyncio import AsyncSession
-from sqlalchemy import select, update, func
+from sqlalchemy import event, insert, select, update, func
+from sqlalchemy.orm import Session
 
 from app.services.base import BaseService
 from app.models.notifications import Notification
@@ -12,6 +15,11 @@ from app.schemas.notifications import NotificationCreate, NotificationUpdate
 
 logger = logging.getLogger(__name__)
 
+_PENDING_BROADCASTS = "pending_notification_broadcasts"
+
+# (organization_id, profile_id, WebSocket payload)
+NotificationBroadcast = Tuple[UUID, UUID, Dict[str, Any]]
+
 
 class NotificationService(BaseService[Notification, NotificationCreate, NotificationUpdate]):
     """Service for managing internal notifications."""
@@ -55,29 +63,71 @@ class NotificationService(BaseService[Notification, NotificationCreate, Notifica
         db.add(notification)
         await db.flush()
         await db.refresh(notification)
-        
-        # Broadcast via WebSocket for real-time updates
-        try:
-            from app.core.websocket_manager import notification_ws_manager
-            await notification_ws_manager.broadcast_notification(
-                organization_id=organization_id,
-                profile_id=profile_id,
-                notification_data={
-                    "id": str(notification.id),
-                    "title": notification.title,
-                    "message": notification.message,
-                    "type": notification.type,
-                    "is_read": notification.is_read,
-                    "created_at": notification.created_at.isoformat() if notification.created_at else None,
-                    "metadata": metadata
-                }
-            )
-        except Exception as e:
-            # Don't fail notification creation if WebSocket broadcast fails
-            logger.warning(f"Failed to broadcast notification via WebSocket: {e}")
-        
+
+        # Broadcast via WebSocket for real-time updates once the row is committed
+        await _broadcast_on_commit(db, [(organization_id, profile_id, self._ws_payload(notification, metadata))])
+
         return notification
 
+    async def create_many(
+        self,
+        db: AsyncSession,
+        *,
+        recipients: Sequence[Tuple[UUID, UUID]],
+        title: str,
+        message: str,
+        type: str = "info",
+        metadata: Optional[Dict[str, Any]] = None
+    ) -> List[Notification]:
+        """
+        Create the same notification for many users.
+
+        All rows go in with a single multi-row INSERT ... RETURNING and are
+        handed to the WebSocket layer as one batch after commit, so fan-out
+        to a large group costs one round-trip instead of one per recipient.
+
+        Args:
+            recipients: (organization_id, profile_id) pairs; duplicates are ignored
+        """
+        recipients = list(dict.fromkeys((org_id, profile_id) for org_id, profile_id in recipients))
+        if not recipients:
+            return []
+
+        serialized_metadata = json.dumps(metadata) if metadata else None
+        rows = [
+            {
+                "id": uuid.uuid4(),
+                "organization_id": organization_id,
+                "profile_id": profile_id,
+                "title": title,
+                "message": message,
+                "type": type,
+                "is_read": False,
+                "notification_metadata": serialized_metadata,
+            }
+            for organization_id, profile_id in recipients
+        ]
+        result = await db.execute(insert(Notification).values(rows).returning(Notification))
+        notifications = list(result.scalars().all())
+
+        await _broadcast_on_commit(
+            db,
+            [(n.organization_id, n.profile_id, self._ws_payload(n, metadata)) for n in notifications],
+        )
+        return notifications
+
+    @staticmethod
+    def _ws_payload(notification: Notification, metadata: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+        return {
+            "id": str(notification.id),
+            "title": notification.title,
+            "message": notification.message,
+            "type": notification.type,
+            "is_read": notification.is_read,
+            "created_at": notification.created_at.isoformat() if notification.created_at else None,
+            "metadata": metadata
+        }
+
     async def get_user_notifications(
         self,
         db: AsyncSession,
@@ -336,5 +386,58 @@ class NotificationService(BaseService[Notification, NotificationCreate, Notifica
         }
 
 
+_background_broadcasts: set = set()
+
+
+async def _broadcast(notifications: List[NotificationBroadcast]) -> None:
+    try:
+        from app.core.websocket_manager import notification_ws_manager
+        await notification_ws_manager.broadcast_notifications(notifications)
+    except Exception as e:
+        # Don't fail notification creation if WebSocket broadcast fails
+        logger.warning(f"Failed to broadcast notifications via WebSocket: {e}")
+
+
+def _schedule_broadcast(notifications: List[NotificationBroadcast]) -> None:
+    """Broadcast in the background (from synchronous session events)."""
+    try:
+        loop = asyncio.get_running_loop()
+    except RuntimeError:
+        return
+    task = loop.create_task(_broadcast(notifications))
+    _background_broadcasts.add(task)
+    task.add_done_callback(_background_broadcasts.discard)
+
+
+async def _broadcast_on_commit(db, notifications: List[NotificationBroadcast]) -> None:
+    """
+    Queue WebSocket broadcasts until `db` commits, so clients never hear
+    about a notification that is not readable yet or is rolled back.
+    Everything created in one transaction goes out as one batch.
+    """
+    if not notifications:
+        return
+    sync_session = getattr(db, "sync_session", None)
+    if sync_session is None:
+        # Not an ORM session (e.g. a test double): nothing to wait for.
+        await _broadcast(notifications)
+        return
+    sync_session.info.setdefault(_PENDING_BROADCASTS, []).extend(notifications)
+
+
+@event.listens_for(Session, "after_commit")
+def _publish_pending_broadcasts(session: Session) -> None:
+    pending = session.info.pop(_PENDING_BROADCASTS, None)
+    if pending:
+        _schedule_broadcast(pending)
+
+
+@event.listens_for(Session, "after_soft_rollback")
+def _discard_pending_broadcasts(session: Session, previous_transaction) -> None:
+    # A savepoint rollback keeps the outer transaction's notifications.
+    if previous_transaction.parent is None:
+        session.info.pop(_PENDING_BROADCASTS, None)
+
+
 # Global notification service instance
 notification_service = NotificationService()
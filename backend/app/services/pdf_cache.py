@@ -0,0 +1,187 @@
+"""
+Content-addressed PDF cache.
+
+A PDF is identified by a SHA-256 over everything that shapes it: the HTML
+rendered from the template inputs (entity fields, line items, locale,
+template markup), the stylesheet contents and the logo. The generation
+timestamp is pinned while hashing so it doesn't defeat the cache.
+
+When an entity already has a stored PDF with the same hash we return that
+object with a fresh signed URL: no WeasyPrint render, no upload, and no
+storage folder listing to find out whether a PDF exists.
+"""
+
+import hashlib
+import logging
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+from uuid import UUID
+
+from sqlalchemy import delete, func, select, update
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.storage import GeneratedDocument
+
+logger = logging.getLogger(__name__)
+
+# Bump to invalidate every cached PDF (e.g. after a WeasyPrint upgrade).
+PDF_CACHE_VERSION = "1"
+
+# Value substituted for generated_at when rendering the HTML used for hashing.
+PINNED_GENERATED_AT = ""
+
+
+class PDFCacheService:
+    """Lookup/record of rendered PDFs keyed by (entity, content hash)."""
+
+    def __init__(self):
+        # (path, mtime_ns, size) -> digest; avoids re-reading unchanged assets.
+        self._file_digests: Dict[Tuple[str, int, int], str] = {}
+
+    def _file_digest(self, path: Optional[str]) -> str:
+        if not path:
+            return ""
+        local_path = Path(path[len("file://"):] if path.startswith("file://") else path)
+        try:
+            stat = local_path.stat()
+        except OSError:
+            # Remote URL (already part of the HTML) or missing file.
+            return path
+
+        key = (str(local_path), stat.st_mtime_ns, stat.st_size)
+        digest = self._file_digests.get(key)
+        if digest is None:
+            digest = hashlib.sha256(local_path.read_bytes()).hexdigest()
+            self._file_digests[key] = digest
+        return digest
+
+    def compute_content_hash(
+        self,
+        html_content: str,
+        *,
+        css_path: Optional[str] = None,
+        logo_path: Optional[str] = None,
+    ) -> str:
+        """
+        Hash the pinned HTML together with stylesheet and logo contents.
+        """
+        hasher = hashlib.sha256()
+        for part in (
+            PDF_CACHE_VERSION,
+            html_content,
+            self._file_digest(css_path),
+            self._file_digest(logo_path),
+        ):
+            hasher.update(part.encode("utf-8"))
+            hasher.update(b"\0")
+        return hasher.hexdigest()
+
+    async def find(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        entity_type: str,
+        entity_id: UUID,
+        content_hash: str,
+    ) -> Optional[GeneratedDocument]:
+        """Return the stored PDF for this exact content, if any."""
+        result = await db.execute(
+            select(GeneratedDocument).where(
+                GeneratedDocument.organization_id == organization_id,
+                GeneratedDocument.entity_type == entity_type,
+                GeneratedDocument.entity_id == entity_id,
+                GeneratedDocument.content_hash == content_hash,
+            )
+        )
+        return result.scalar_one_or_none()
+
+    async def find_latest(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        entity_type: str,
+        entity_id: UUID,
+    ) -> Optional[GeneratedDocument]:
+        """
+        Return the PDF an entity last generated or reused, if any. Ordering by
+        last_used_at means content that went back to an earlier hash serves
+        that document again rather than the newer, stale one.
+        """
+        result = await db.execute(
+            select(GeneratedDocument)
+            .where(
+                GeneratedDocument.organization_id == organization_id,
+                GeneratedDocument.entity_type == entity_type,
+                GeneratedDocument.entity_id == entity_id,
+            )
+            .order_by(GeneratedDocument.last_used_at.desc(), GeneratedDocument.created_at.desc())
+            .limit(1)
+        )
+        return result.scalar_one_or_none()
+
+    async def record(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        entity_type: str,
+        entity_id: UUID,
+        content_hash: str,
+        upload_result: Dict[str, Any],
+        filename: str,
+    ) -> None:
+        """
+        Remember a freshly uploaded PDF. Concurrent renders of the same
+        content keep the first row and mark it as used.
+        """
+        stmt = (
+            pg_insert(GeneratedDocument)
+            .values(
+                organization_id=organization_id,
+                entity_type=entity_type,
+                entity_id=entity_id,
+                content_hash=content_hash,
+                bucket=upload_result["bucket"],
+                file_path=upload_result["file_path"],
+                filename=filename,
+                size_bytes=upload_result["size_bytes"],
+            )
+        )
+        await db.execute(
+            stmt.on_conflict_do_update(
+                constraint="uq_generated_documents_entity_hash",
+                set_={"last_used_at": func.now()},
+            )
+        )
+
+    async def mark_used(self, db: AsyncSession, document: GeneratedDocument) -> None:
+        """Make a reused PDF the entity's latest one again (the caller commits)."""
+        await db.execute(
+            update(GeneratedDocument)
+            .where(GeneratedDocument.id == document.id)
+            .values(last_used_at=func.now())
+        )
+
+    async def forget_path(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        bucket: str,
+        file_path: str,
+    ) -> None:
+        """Drop cache entries pointing at a storage object that was deleted."""
+        await db.execute(
+            delete(GeneratedDocument).where(
+                GeneratedDocument.organization_id == organization_id,
+                GeneratedDocument.bucket == bucket,
+                GeneratedDocument.file_path == file_path,
+            )
+        )
+
+
+# Global service instance
+pdf_cache_service = PDFCacheService()
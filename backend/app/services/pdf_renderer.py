@@ -0,0 +1,294 @@
+"""
+Shared PDF Rendering Engine
+
+WeasyPrint rendering is CPU-bound and takes hundreds of milliseconds per
+document, so it must never run on the event loop. This engine renders HTML
+to PDF in a bounded ProcessPoolExecutor shared by the proposal, shooting day
+and invoice PDF services.
+
+- Bounded queue: at most PDF_RENDER_QUEUE_SIZE renders pending (queued or
+  running); beyond that callers get a 503 with Retry-After.
+- Per-org fairness: pending jobs are queued per organization and dispatched
+  round-robin, and each org may hold at most PDF_RENDER_MAX_PENDING_PER_ORG
+  pending renders (429 beyond that).
+- Timeouts: callers stop waiting after PDF_RENDER_TIMEOUT_SECONDS.
+- Warm workers: each worker imports WeasyPrint and parses every template
+  stylesheet (with a shared FontConfiguration) once at startup.
+"""
+
+import asyncio
+import logging
+import multiprocessing
+from collections import OrderedDict, deque
+from concurrent.futures import Executor, ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Deque, Dict, Optional
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+TEMPLATES_ROOT = Path(__file__).parent.parent / "templates"
+
+
+class PDFRenderError(RuntimeError):
+    """Base error for render engine failures (mapped to 503 by endpoints)."""
+    status_code = 503
+    retry_after = 5
+
+
+class PDFRenderQueueFullError(PDFRenderError):
+    """Raised when the global render queue is saturated."""
+
+
+class PDFRenderRateLimitedError(PDFRenderError):
+    """Raised when one organization already has too many pending renders."""
+    status_code = 429
+
+
+class PDFRenderTimeoutError(PDFRenderError):
+    """Raised when a render does not finish within the configured timeout."""
+
+
+# --- Worker process side ------------------------------------------------------
+
+_worker_font_config = None
+_worker_stylesheets: Dict[str, object] = {}
+
+
+def _init_worker(stylesheet_paths: list[str]) -> None:
+    """Process pool initializer: import WeasyPrint and preload fonts/CSS."""
+    global _worker_font_config
+    try:
+        from weasyprint import CSS
+        from weasyprint.text.fonts import FontConfiguration
+
+        _worker_font_config = FontConfiguration()
+        for path in stylesheet_paths:
+            _worker_stylesheets[path] = CSS(filename=path, font_config=_worker_font_config)
+    except Exception as e:
+        # Never break the pool here; renders surface the error per job instead.
+        logger.warning(f"PDF worker warm-up failed: {e}")
+
+
+def _render_pdf(html_content: str, base_url: str, css_path: Optional[str]) -> bytes:
+    """Render HTML to PDF bytes. Runs inside a worker (or a thread when the pool is disabled)."""
+    global _worker_font_config
+    from weasyprint import CSS, HTML
+    from weasyprint.text.fonts import FontConfiguration
+
+    if _worker_font_config is None:
+        _worker_font_config = FontConfiguration()
+
+    stylesheets = []
+    if css_path:
+        stylesheet = _worker_stylesheets.get(css_path)
+        if stylesheet is None and Path(css_path).exists():
+            stylesheet = CSS(filename=css_path, font_config=_worker_font_config)
+            _worker_stylesheets[css_path] = stylesheet
+        if stylesheet is not None:
+            stylesheets.append(stylesheet)
+
+    html_doc = HTML(string=html_content, base_url=base_url)
+    return html_doc.write_pdf(
+        stylesheets=stylesheets or None,
+        font_config=_worker_font_config,
+    )
+
+
+# --- Event loop side ----------------------------------------------------------
+
+@dataclass
+class _RenderJob:
+    organization_key: str
+    html_content: str
+    base_url: str
+    css_path: Optional[str]
+    future: asyncio.Future = field(repr=False)
+    # Pool the job was submitted to; only a failure on the current pool recycles it.
+    executor: Optional[Executor] = field(default=None, repr=False)
+
+
+class PDFRenderEngine:
+    """Bounded, org-fair PDF render queue in front of a process pool."""
+
+    def __init__(
+        self,
+        max_workers: int,
+        queue_size: int,
+        max_pending_per_org: int,
+        timeout_seconds: float,
+    ):
+        self.max_workers = max_workers
+        self.queue_size = max(1, queue_size)
+        self.max_pending_per_org = max(1, max_pending_per_org)
+        self.timeout_seconds = timeout_seconds
+
+        self._executor: Optional[Executor] = None
+        self._queues: "OrderedDict[str, Deque[_RenderJob]]" = OrderedDict()
+        self._pending_per_org: Dict[str, int] = {}
+        self._pending = 0
+        self._running = 0
+
+    @property
+    def concurrency(self) -> int:
+        return self.max_workers if self.max_workers > 0 else 1
+
+    def stats(self) -> Dict[str, int]:
+        return {
+            "pending": self._pending,
+            "running": self._running,
+            "queued": self._pending - self._running,
+            "workers": self.max_workers,
+        }
+
+    def _get_executor(self) -> Optional[Executor]:
+        """Create the process pool lazily. None means render in a thread."""
+        if self.max_workers <= 0:
+            return None
+        if self._executor is None:
+            stylesheets = [str(p) for p in sorted(TEMPLATES_ROOT.glob("*/*.css"))]
+            # spawn: never fork a process that holds an event loop and DB sockets.
+            self._executor = ProcessPoolExecutor(
+                max_workers=self.max_workers,
+                mp_context=multiprocessing.get_context("spawn"),
+                initializer=_init_worker,
+                initargs=(stylesheets,),
+            )
+        return self._executor
+
+    async def render(
+        self,
+        html_content: str,
+        *,
+        base_url: str,
+        css_path: Optional[str] = None,
+        organization_id: Optional[object] = None,
+        timeout: Optional[float] = None,
+    ) -> bytes:
+        """
+        Render HTML to PDF bytes off the event loop.
+
+        Raises:
+            PDFRenderQueueFullError: global queue saturated (503)
+            PDFRenderRateLimitedError: org has too many pending renders (429)
+            PDFRenderTimeoutError: render did not finish in time (503)
+        """
+        org_key = str(organization_id) if organization_id else "-"
+
+        if self._pending >= self.queue_size:
+            raise PDFRenderQueueFullError("PDF renderer is busy. Please try again shortly.")
+        if self._pending_per_org.get(org_key, 0) >= self.max_pending_per_org:
+            raise PDFRenderRateLimitedError(
+                "Too many PDF renders in progress for this organization. Please try again shortly."
+            )
+
+        loop = asyncio.get_running_loop()
+        job = _RenderJob(
+            organization_key=org_key,
+            html_content=html_content,
+            base_url=base_url,
+            css_path=css_path,
+            future=loop.create_future(),
+        )
+        self._pending += 1
+        self._pending_per_org[org_key] = self._pending_per_org.get(org_key, 0) + 1
+        self._queues.setdefault(org_key, deque()).append(job)
+        self._dispatch()
+
+        timeout = self.timeout_seconds if timeout is None else timeout
+        try:
+            return await asyncio.wait_for(asyncio.shield(job.future), timeout=timeout or None)
+        except asyncio.TimeoutError:
+            # A queued job is dropped at dispatch; a running one finishes in its worker.
+            job.future.cancel()
+            raise PDFRenderTimeoutError("PDF rendering timed out. Please try again.")
+        except asyncio.CancelledError:
+            job.future.cancel()
+            raise
+
+    def _next_job(self) -> Optional[_RenderJob]:
+        """Pop the next job, rotating organizations round-robin."""
+        while self._queues:
+            org_key, jobs = next(iter(self._queues.items()))
+            job = jobs.popleft()
+            if jobs:
+                self._queues.move_to_end(org_key)
+            else:
+                del self._queues[org_key]
+
+            if job.future.done():
+                self._release(job)
+                continue
+            return job
+        return None
+
+    def _dispatch(self) -> None:
+        loop = asyncio.get_running_loop()
+        while self._running < self.concurrency:
+            job = self._next_job()
+            if job is None:
+                return
+
+            self._running += 1
+            try:
+                job.executor = self._get_executor()
+                work = loop.run_in_executor(
+                    job.executor, _render_pdf, job.html_content, job.base_url, job.css_path
+                )
+            except Exception as e:
+                self._running -= 1
+                self._finish(job, error=e)
+                continue
+
+            work.add_done_callback(lambda fut, job=job: self._on_done(job, fut))
+
+    def _on_done(self, job: _RenderJob, work: asyncio.Future) -> None:
+        self._running -= 1
+        if work.cancelled():
+            self._release(job)
+            job.future.cancel()
+        else:
+            error = work.exception()
+            if isinstance(error, BrokenProcessPool) and job.executor is self._executor:
+                logger.error("PDF render worker crashed; recycling process pool")
+                self._reset_executor()
+            self._finish(job, result=None if error else work.result(), error=error)
+        self._dispatch()
+
+    def _finish(self, job: _RenderJob, result: Optional[bytes] = None, error: Optional[BaseException] = None) -> None:
+        self._release(job)
+        if job.future.done():
+            return
+        if error is not None:
+            job.future.set_exception(error)
+        else:
+            job.future.set_result(result)
+
+    def _release(self, job: _RenderJob) -> None:
+        self._pending -= 1
+        remaining = self._pending_per_org.get(job.organization_key, 1) - 1
+        if remaining > 0:
+            self._pending_per_org[job.organization_key] = remaining
+        else:
+            self._pending_per_org.pop(job.organization_key, None)
+
+    def _reset_executor(self) -> None:
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+    def shutdown(self) -> None:
+        """Stop worker processes (called on application shutdown)."""
+        self._reset_executor()
+
+
+# Global engine instance shared by all PDF services
+pdf_render_engine = PDFRenderEngine(
+    max_workers=settings.PDF_RENDER_WORKERS,
+    queue_size=settings.PDF_RENDER_QUEUE_SIZE,
+    max_pending_per_org=settings.PDF_RENDER_MAX_PENDING_PER_ORG,
+    timeout_seconds=settings.PDF_RENDER_TIMEOUT_SECONDS,
+)
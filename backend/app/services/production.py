@@ -1,4 +1,5 @@
 from app.services.base import BaseService
+from app.services.project_stats import ProjectCountedMixin, project_stats_service
 from app.models.production import Scene, Character, SceneCharacter
 from app.models.scheduling import ShootingDay
 from app.schemas.production import (
@@ -13,12 +14,15 @@ from typing import List
 from uuid import UUID
 
 
-class SceneService(BaseService[Scene, SceneCreate, SceneUpdate]):
+class SceneService(ProjectCountedMixin, BaseService[Scene, SceneCreate, SceneUpdate]):
     """Service for Scene operations."""
 
     def __init__(self):
         super().__init__(Scene)
 
+    def counter_deltas(self, scene):
+        return {"scenes_count": 1}
+
     async def _validate_project_ownership(self, db: AsyncSession, organization_id: UUID, project_id: UUID):
         """Validate that project belongs to the organization."""
         from app.modules.commercial.service import project_service
@@ -55,12 +59,15 @@ class SceneService(BaseService[Scene, SceneCreate, SceneUpdate]):
         return await super().update(db=db, organization_id=organization_id, id=id, obj_in=obj_in)
 
 
-class CharacterService(BaseService[Character, CharacterCreate, CharacterUpdate]):
+class CharacterService(ProjectCountedMixin, BaseService[Character, CharacterCreate, CharacterUpdate]):
     """Service for Character operations."""
 
     def __init__(self):
         super().__init__(Character)
 
+    def counter_deltas(self, character):
+        return {"characters_count": 1}
+
     async def _validate_project_ownership(self, db: AsyncSession, organization_id: UUID, project_id: UUID):
         """Validate that project belongs to the organization."""
         from app.modules.commercial.service import project_service
@@ -82,12 +89,20 @@ class CharacterService(BaseService[Character, CharacterCreate, CharacterUpdate])
         return await super().update(db=db, organization_id=organization_id, id=id, obj_in=obj_in)
 
 
-class ShootingDayService(BaseService[ShootingDay, ShootingDayCreate, ShootingDayUpdate]):
+class ShootingDayService(ProjectCountedMixin, BaseService[ShootingDay, ShootingDayCreate, ShootingDayUpdate]):
     """Service for Shooting Day operations."""
 
+    counted_columns = ("project_id", "status")
+
     def __init__(self):
         super().__init__(ShootingDay)
 
+    def counter_deltas(self, shooting_day):
+        return {
+            "shooting_days_count": 1,
+            "confirmed_shooting_days_count": int(shooting_day.status == "confirmed"),
+        }
+
     async def _validate_project_ownership(self, db: AsyncSession, organization_id: UUID, project_id: UUID):
         """Validate that project belongs to the organization."""
         from app.modules.commercial.service import project_service
@@ -241,8 +256,14 @@ class ProductionService:
 
                 created_scenes.append(scene)
 
+            await project_stats_service.apply(
+                db,
+                organization_id=organization_id,
+                project_id=project_id,
+                deltas={"scenes_count": len(created_scenes), "characters_count": len(created_characters)},
+            )
+
             # Relationships are flushed but not committed yet (managed by nested context or caller)
-            pass
 
         return {
             "characters_created": len(created_characters),
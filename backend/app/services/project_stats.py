@@ -0,0 +1,224 @@
+"""
+Per-project counters (`project_counters`).
+
+One row per project holding its scene, character, shooting-day (total and
+confirmed) and stakeholder counts. The scene, character, shooting-day and
+stakeholder services keep it current through `ProjectCountedMixin`, which
+applies a `count + delta` upsert in the same database transaction as the
+create/update/remove, so the counters commit or roll back with the write.
+Bulk inserts (AI script analysis) call `apply` directly; project deletion
+drops the row through the foreign key cascade.
+
+`get_many` reads the stats for any number of projects in one query.
+`rebuild` and `find_mismatches` recompute the counters from the source tables.
+"""
+import logging
+from abc import ABC, abstractmethod
+from typing import Any, Dict, List, Optional, Sequence
+from uuid import UUID
+
+from sqlalchemy import delete, func, or_, select, text
+from sqlalchemy.dialects.postgresql import insert as pg_insert
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.models.commercial import Stakeholder
+from app.models.production import Character, Scene
+from app.models.projects import Project, ProjectCounters
+from app.models.scheduling import ShootingDay
+
+logger = logging.getLogger(__name__)
+
+COUNTER_FIELDS = (
+    "scenes_count",
+    "characters_count",
+    "shooting_days_count",
+    "confirmed_shooting_days_count",
+    "team_count",
+)
+
+
+class ProjectStatsService:
+    """Maintains and reads the per-project counters."""
+
+    async def apply(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        project_id: UUID,
+        deltas: Dict[str, int],
+        sign: int = 1,
+    ) -> None:
+        """Add (sign=1) or subtract (sign=-1) `deltas` from a project's counters."""
+        values = {field: sign * deltas.get(field, 0) for field in COUNTER_FIELDS}
+        if not any(values.values()):
+            return
+        stmt = pg_insert(ProjectCounters).values(
+            project_id=project_id,
+            organization_id=organization_id,
+            **values,
+        )
+        set_ = {field: getattr(ProjectCounters, field) + stmt.excluded[field] for field in COUNTER_FIELDS}
+        set_["updated_at"] = func.now()
+        await db.execute(stmt.on_conflict_do_update(index_elements=[ProjectCounters.project_id], set_=set_))
+
+    async def get_many(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: UUID,
+        project_ids: Sequence[UUID],
+    ) -> Dict[UUID, Dict[str, int]]:
+        """
+        Stats for the given projects, keyed by project id.
+
+        Projects that do not exist or belong to another organization are left
+        out; projects without a counters row have all-zero stats.
+        """
+        if not project_ids:
+            return {}
+        query = (
+            select(
+                Project.id,
+                *[func.coalesce(getattr(ProjectCounters, field), 0).label(field) for field in COUNTER_FIELDS],
+            )
+            .outerjoin(ProjectCounters, ProjectCounters.project_id == Project.id)
+            .where(Project.organization_id == organization_id, Project.id.in_(list(project_ids)))
+        )
+        result = await db.execute(query)
+        return {
+            row.id: {field: int(row._mapping[field]) for field in COUNTER_FIELDS}
+            for row in result.all()
+        }
+
+    def _expected_rows_query(self, organization_id: Optional[UUID] = None):
+        """The counters as computed from the source tables, one row per project."""
+
+        def count(model, *conditions):
+            return (
+                select(func.count())
+                .select_from(model)
+                .where(model.project_id == Project.id, *conditions)
+                .scalar_subquery()
+            )
+
+        query = select(
+            Project.id.label("project_id"),
+            Project.organization_id.label("organization_id"),
+            count(Scene).label("scenes_count"),
+            count(Character).label("characters_count"),
+            count(ShootingDay).label("shooting_days_count"),
+            count(ShootingDay, ShootingDay.status == "confirmed").label("confirmed_shooting_days_count"),
+            count(Stakeholder).label("team_count"),
+        )
+        if organization_id is not None:
+            query = query.where(Project.organization_id == organization_id)
+        return query
+
+    async def find_mismatches(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: Optional[UUID] = None,
+    ) -> List[Dict[str, Any]]:
+        """Projects whose counters disagree with the source tables (missing rows count as zero)."""
+        expected = self._expected_rows_query(organization_id).subquery("expected")
+        counters = ProjectCounters.__table__
+        query = (
+            select(
+                expected.c.project_id,
+                expected.c.organization_id,
+                *[expected.c[field].label(f"expected_{field}") for field in COUNTER_FIELDS],
+                *[func.coalesce(counters.c[field], 0).label(f"counter_{field}") for field in COUNTER_FIELDS],
+            )
+            .select_from(expected.outerjoin(counters, counters.c.project_id == expected.c.project_id))
+            .where(or_(*[expected.c[field] != func.coalesce(counters.c[field], 0) for field in COUNTER_FIELDS]))
+            .order_by(expected.c.organization_id, expected.c.project_id)
+        )
+        result = await db.execute(query)
+        return [dict(row._mapping) for row in result.all()]
+
+    async def rebuild(
+        self,
+        db: AsyncSession,
+        *,
+        organization_id: Optional[UUID] = None,
+    ) -> int:
+        """
+        Replace the counters (for one organization, or all) with fresh counts.
+
+        Takes an EXCLUSIVE lock on the counters table until the caller commits,
+        like FinancialRollupService.rebuild: in-flight writers finish first and
+        new ones wait, so no delta is lost or counted twice.
+        """
+        await db.execute(text("LOCK TABLE project_counters IN EXCLUSIVE MODE"))
+
+        delete_stmt = delete(ProjectCounters)
+        if organization_id is not None:
+            delete_stmt = delete_stmt.where(ProjectCounters.organization_id == organization_id)
+        await db.execute(delete_stmt)
+
+        result = await db.execute(
+            pg_insert(ProjectCounters).from_select(
+                ["project_id", "organization_id", *COUNTER_FIELDS],
+                self._expected_rows_query(organization_id),
+            )
+        )
+        return result.rowcount or 0
+
+
+class ProjectCountedMixin(ABC):
+    """
+    Keeps `project_counters` in step with a BaseService's create/update/remove.
+
+    Subclasses (listed before BaseService) implement `counter_deltas(obj)`,
+    the counter increments one row contributes, and list in
+    `counted_columns` the fields whose change can move those counts.
+    """
+
+    counted_columns = ("project_id",)
+
+    @abstractmethod
+    def counter_deltas(self, obj: Any) -> Dict[str, int]:
+        ...
+
+    async def create(self, db, *, organization_id, obj_in):
+        obj = await super().create(db=db, organization_id=organization_id, obj_in=obj_in)
+        await project_stats_service.apply(
+            db, organization_id=organization_id, project_id=obj.project_id, deltas=self.counter_deltas(obj)
+        )
+        return obj
+
+    async def update(self, db, *, organization_id, id, obj_in):
+        data = obj_in if isinstance(obj_in, dict) else obj_in.dict(exclude_unset=True)
+        before = None
+        if any(column in data for column in self.counted_columns):
+            before = await self.get(db, organization_id=organization_id, id=id)
+        # Snapshot now: the update refreshes the same identity-mapped instance.
+        old = (before.project_id, self.counter_deltas(before)) if before is not None else None
+
+        obj = await super().update(db=db, organization_id=organization_id, id=id, obj_in=obj_in)
+
+        if old is not None and obj is not None:
+            new = (obj.project_id, self.counter_deltas(obj))
+            if new != old:
+                await project_stats_service.apply(
+                    db, organization_id=organization_id, project_id=old[0], deltas=old[1], sign=-1
+                )
+                await project_stats_service.apply(
+                    db, organization_id=organization_id, project_id=new[0], deltas=new[1]
+                )
+        return obj
+
+    async def remove(self, db, *, organization_id, id):
+        obj = await super().remove(db=db, organization_id=organization_id, id=id)
+        if obj is not None:
+            await project_stats_service.apply(
+                db, organization_id=organization_id, project_id=obj.project_id,
+                deltas=self.counter_deltas(obj), sign=-1,
+            )
+        return obj
+
+
+# Global service instance
+project_stats_service = ProjectStatsService()
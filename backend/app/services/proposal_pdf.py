@@ -14,6 +14,8 @@ from datetime import datetime, timezone
 
 from jinja2 import Environment, FileSystemLoader, select_autoescape
 
+from app.services.pdf_renderer import pdf_render_engine
+
 logger = logging.getLogger(__name__)
 
 # Template directory path
@@ -117,7 +119,8 @@ class ProposalPDFService:
         organization: Any,
         client: Any,
         services: List[Any],
-        locale: str = "pt-BR"
+        locale: str = "pt-BR",
+        generated_at: Optional[str] = None
     ) -> str:
         """
         Render proposal data to HTML using Jinja2 template.
@@ -128,7 +131,8 @@ class ProposalPDFService:
             client: Client model instance
             services: List of Service model instances
             locale: Locale for formatting (default: pt-BR)
-            
+            generated_at: Override the generation timestamp (pinned when hashing)
+
         Returns:
             Rendered HTML string
         """
@@ -145,7 +149,7 @@ class ProposalPDFService:
             "services": services,
             "line_items": line_items,
             "logo_url": self._get_logo_path(organization),
-            "generated_at": datetime.now(timezone.utc).isoformat(),
+            "generated_at": generated_at if generated_at is not None else datetime.now(timezone.utc).isoformat(),
             "locale": locale,
         }
         
@@ -183,8 +187,6 @@ class ProposalPDFService:
                 "WeasyPrint is not available. Please install it with: pip install weasyprint"
             )
         
-        from weasyprint import HTML, CSS
-        
         # Render HTML content
         html_content = await self.render_html(
             proposal=proposal,
@@ -193,16 +195,14 @@ class ProposalPDFService:
             services=services,
             locale=locale
         )
-        
-        # Load CSS file
-        css_path = TEMPLATE_DIR / "proposal.css"
-        stylesheets = []
-        if css_path.exists():
-            stylesheets.append(CSS(filename=str(css_path)))
-        
-        # Generate PDF
-        html_doc = HTML(string=html_content, base_url=str(TEMPLATE_DIR))
-        pdf_bytes = html_doc.write_pdf(stylesheets=stylesheets if stylesheets else None)
+
+        # Render off the event loop in the shared worker pool
+        pdf_bytes = await pdf_render_engine.render(
+            html_content,
+            base_url=str(TEMPLATE_DIR),
+            css_path=str(TEMPLATE_DIR / "proposal.css"),
+            organization_id=getattr(organization, "id", None),
+        )
         
         logger.info(f"Generated PDF for proposal {proposal.id} ({len(pdf_bytes)} bytes)")
         
@@ -233,6 +233,33 @@ class ProposalPDFService:
         """
         from app.services.storage import storage_service
         from app.services.entitlements import ensure_and_reserve_storage_capacity
+        from app.services.pdf_cache import pdf_cache_service, PINNED_GENERATED_AT
+
+        # Content hash over the pinned HTML, stylesheet and logo
+        pinned_html = await self.render_html(
+            proposal=proposal,
+            organization=organization,
+            client=client,
+            services=services,
+            locale=locale,
+            generated_at=PINNED_GENERATED_AT
+        )
+        content_hash = pdf_cache_service.compute_content_hash(
+            pinned_html,
+            css_path=str(TEMPLATE_DIR / "proposal.css"),
+            logo_path=self._get_logo_path(organization)
+        )
+
+        cached = await pdf_cache_service.find(
+            db,
+            organization_id=proposal.organization_id,
+            entity_type="proposal",
+            entity_id=proposal.id,
+            content_hash=content_hash
+        )
+        if cached:
+            await pdf_cache_service.mark_used(db, cached)
+            return await self._reuse_cached_pdf(proposal, cached)
         
         # Generate PDF
         pdf_bytes = await self.generate_pdf(
@@ -283,7 +310,8 @@ class ProposalPDFService:
             "bucket": upload_result["bucket"],
             "generated_at": datetime.now(timezone.utc).isoformat(),
             "size_bytes": upload_result["size_bytes"],
-            "version": pdf_version
+            "version": pdf_version,
+            "content_hash": content_hash
         }
         
         proposal.proposal_metadata = current_metadata
@@ -291,6 +319,16 @@ class ProposalPDFService:
         # Flag the JSONB column as modified so SQLAlchemy detects the change
         from sqlalchemy.orm.attributes import flag_modified
         flag_modified(proposal, "proposal_metadata")
+
+        await pdf_cache_service.record(
+            db,
+            organization_id=proposal.organization_id,
+            entity_type="proposal",
+            entity_id=proposal.id,
+            content_hash=content_hash,
+            upload_result=upload_result,
+            filename=filename
+        )
         
         # Generate signed URL for download
         signed_url = await storage_service.generate_signed_url(
@@ -309,7 +347,48 @@ class ProposalPDFService:
             "bucket": upload_result["bucket"],
             "size_bytes": upload_result["size_bytes"],
             "version": pdf_version,
-            "signed_url": signed_url
+            "signed_url": signed_url,
+            "cached": False
+        }
+
+    async def _reuse_cached_pdf(self, proposal: Any, cached: Any) -> Dict[str, Any]:
+        """
+        Return a previously stored PDF with identical content, pointing the
+        proposal metadata back at it if a newer render replaced it.
+        """
+        from app.services.storage import storage_service
+
+        current_metadata = proposal.proposal_metadata or {}
+        pdf_info = current_metadata.get("pdf") or {}
+        if pdf_info.get("path") != cached.file_path:
+            current_metadata["pdf"] = {
+                "path": cached.file_path,
+                "bucket": cached.bucket,
+                "generated_at": cached.created_at.isoformat() if cached.created_at else None,
+                "size_bytes": cached.size_bytes,
+                "version": pdf_info.get("version", 0) + 1,
+                "content_hash": cached.content_hash
+            }
+            proposal.proposal_metadata = current_metadata
+
+            from sqlalchemy.orm.attributes import flag_modified
+            flag_modified(proposal, "proposal_metadata")
+
+        signed_url = await storage_service.generate_signed_url(
+            bucket=cached.bucket,
+            file_path=cached.file_path,
+            expires_in=3600  # 1 hour
+        )
+
+        logger.info(f"Reused cached PDF for proposal {proposal.id} at {cached.file_path}")
+
+        return {
+            "pdf_path": cached.file_path,
+            "bucket": cached.bucket,
+            "size_bytes": cached.size_bytes,
+            "version": current_metadata["pdf"].get("version"),
+            "signed_url": signed_url,
+            "cached": True
         }
 
     async def get_existing_pdf_url(
@@ -0,0 +1,197 @@
+"""
+Script analysis run by the worker daemon.
+
+The analyze-script endpoint reserves credits and enqueues a
+SCRIPT_ANALYSIS_JOB; the worker's "ai.script_analysis" handler calls
+`process_script_analysis`, which asks the AI engine for the analysis and
+production suggestions, saves them and notifies the requesting user.
+"""
+import json
+import time
+from typing import Any, Dict, Optional
+from uuid import UUID
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.modules.ai.service import (
+    ai_suggestion_service,
+    ai_usage_log_service,
+    script_analysis_service,
+)
+from app.services.ai_engine import ai_engine_service
+from app.services.notifications import notification_service
+
+# Handled by app.services.job_tasks in the worker daemon
+SCRIPT_ANALYSIS_JOB = "ai.script_analysis"
+SCRIPT_ANALYSIS_QUEUE = "ai"
+
+
+def resolve_response_language(
+    *,
+    script_content: Optional[str] = None,
+    analysis_result: Optional[Dict[str, Any]] = None,
+) -> str:
+    """
+    Resolve response language for downstream AI or server-generated text.
+    Priority:
+    1) analysis metadata.response_language
+    2) language detected from script content
+    3) language detected from analysis payload text
+    4) English fallback
+    """
+    if isinstance(analysis_result, dict):
+        metadata = analysis_result.get("metadata")
+        if isinstance(metadata, dict):
+            metadata_language = metadata.get("response_language")
+            if isinstance(metadata_language, str) and metadata_language.strip():
+                normalized = metadata_language.strip().lower()
+                if normalized.startswith("pt"):
+                    return "pt-BR"
+                if normalized.startswith("en"):
+                    return "en"
+
+    if script_content and script_content.strip():
+        return ai_engine_service.detect_content_language(script_content)
+
+    if isinstance(analysis_result, dict):
+        payload_text = json.dumps(analysis_result, ensure_ascii=False)
+        if payload_text.strip():
+            return ai_engine_service.detect_content_language(payload_text)
+
+    return "en"
+
+
+async def process_script_analysis(
+    organization_id: UUID,
+    project_id: UUID,
+    script_content: str,
+    profile_id: UUID,
+    db: AsyncSession,
+    analysis_type: str = "full"
+) -> Dict[str, Any]:
+    """
+    Run a script analysis and send notifications. Called by the
+    "ai.script_analysis" job with the worker's own session; saves results to
+    the database and returns the job result. Failures are logged and
+    notified, then re-raised so the job is marked failed.
+    """
+    start_time = time.time()
+    try:
+        # Analyze the script with AI
+        analysis_result = await ai_engine_service.analyze_script_content(
+            organization_id=organization_id,
+            script_content=script_content,
+            project_id=project_id
+        )
+        if isinstance(analysis_result, dict) and analysis_result.get("error"):
+            raise RuntimeError(str(analysis_result["error"]))
+        response_language = resolve_response_language(
+            script_content=script_content,
+            analysis_result=analysis_result,
+        )
+
+        # Generate production suggestions
+        suggestions = await ai_engine_service.suggest_production_elements(
+            organization_id=organization_id,
+            script_analysis=analysis_result,
+            project_context={"project_id": str(project_id)},
+            response_language=response_language,
+        )
+        if isinstance(suggestions, dict) and suggestions.get("error"):
+            raise RuntimeError(str(suggestions["error"]))
+
+        # Save script analysis to database
+        saved_analysis = await script_analysis_service.create_from_ai_result(
+            db=db,
+            organization_id=organization_id,
+            project_id=project_id,
+            script_text=script_content[:5000],  # Limit stored text
+            analysis_result=analysis_result,
+            analysis_type=analysis_type,
+            confidence=analysis_result.get('confidence', 0.85),
+            token_count=len(script_content.split()) * 2,  # Rough estimate
+            cost_cents=int(len(script_content.split()) * 0.0005)  # Rough cost estimate
+        )
+
+        # Save suggestions to database if any
+        if suggestions and isinstance(suggestions, list):
+            for suggestion in suggestions[:10]:  # Limit to 10 suggestions
+                await ai_suggestion_service.create_from_ai_result(
+                    db=db,
+                    organization_id=organization_id,
+                    project_id=project_id,
+                    suggestion_type=suggestion.get('type', 'other'),
+                    suggestion_text=suggestion.get('text', ''),
+                    confidence=suggestion.get('confidence', 0.75),
+                    priority=suggestion.get('priority', 'medium'),
+                    related_scenes=suggestion.get('related_scenes', []),
+                    estimated_savings_cents=suggestion.get('estimated_savings_cents'),
+                    estimated_time_saved_minutes=suggestion.get('estimated_time_saved_minutes')
+                )
+
+        # Log successful usage
+        processing_time_ms = int((time.time() - start_time) * 1000)
+        await ai_usage_log_service.log_request(
+            db=db,
+            organization_id=organization_id,
+            project_id=project_id,
+            request_type="script_analysis",
+            endpoint="/api/v1/ai/projects/{project_id}/analyze-script",
+            token_count=len(script_content.split()) * 2,
+            cost_cents=int(len(script_content.split()) * 0.0005),
+            processing_time_ms=processing_time_ms,
+            success=True
+        )
+
+        # Create notification for the user
+        await notification_service.create_for_user(
+            db=db,
+            organization_id=organization_id,
+            profile_id=profile_id,
+            title="script_analysis_complete_title",
+            message="script_analysis_complete_message",
+            type="success",
+            metadata={
+                "analysis_id": str(saved_analysis.id),
+                "characters": len(analysis_result.get("characters", [])),
+                "scenes": len(analysis_result.get("scenes", [])),
+                "analysis_result": analysis_result,
+                "suggestions": suggestions,
+                "project_id": str(project_id)
+            }
+        )
+        await db.commit()
+
+        return {
+            "analysis_id": str(saved_analysis.id),
+            "project_id": str(project_id),
+            "suggestions": len(suggestions) if isinstance(suggestions, list) else 0,
+        }
+
+    except Exception as e:
+        await db.rollback()
+        # Log failed usage
+        processing_time_ms = int((time.time() - start_time) * 1000)
+        await ai_usage_log_service.log_request(
+            db=db,
+            organization_id=organization_id,
+            project_id=project_id,
+            request_type="script_analysis",
+            endpoint="/api/v1/ai/projects/{project_id}/analyze-script",
+            processing_time_ms=processing_time_ms,
+            success=False,
+            error_message=str(e)
+        )
+        
+        # Create error notification
+        await notification_service.create_for_user(
+            db=db,
+            organization_id=organization_id,
+            profile_id=profile_id,
+            title="script_analysis_failed_title",
+            message="script_analysis_failed_message",
+            type="error",
+            metadata={"error": str(e), "project_id": str(project_id)}
+        )
+        await db.commit()
+        raise
@@ -1,18 +1,47 @@
+import asyncio
 import os
+import time
 import uuid
-from typing import Optional, Dict, Any
+from typing import Optional, Dict, Any, AsyncIterator, Iterable, NamedTuple, Tuple
 from pathlib import Path
 
+from cachetools import TLRUCache
+from fastapi import UploadFile
+
 from app.core.config import settings
+from app.services.storage_backends import (
+    LocalStorageBackend,
+    StorageBackend,
+    SupabaseStorageBackend,
+)
+
+
+class _SignedUrl(NamedTuple):
+    url: str
+    expires_at: float  # time.monotonic() deadline
+
+
+def _seconds_left(entry: _SignedUrl) -> int:
+    return max(0, int(entry.expires_at - time.monotonic()))
+
+
+def _signed_url_ttu(key: Any, value: _SignedUrl, now: float) -> float:
+    # Stop handing out a URL shortly before it actually expires.
+    return value.expires_at - settings.SIGNED_URL_CACHE_MARGIN_SECONDS
 
 
 class StorageService:
-    """Service for handling file uploads and storage operations with Supabase Storage."""
+    """Service for handling file uploads and storage operations (Supabase Storage or local disk)."""
 
     def __init__(self):
         # Lazy initialization - only check environment variables when needed
-        self._supabase: Optional[Any] = None
-        self._initialized = False
+        self._backend: Optional[StorageBackend] = None
+        # (bucket, file_path, expires_in) -> signed URL, reused until near expiry
+        self._signed_urls: TLRUCache = TLRUCache(
+            maxsize=settings.SIGNED_URL_CACHE_MAXSIZE,
+            ttu=_signed_url_ttu,
+            timer=time.monotonic,
+        )
 
         # Bucket configurations
         self.buckets = {
@@ -28,31 +57,32 @@ class StorageService:
             }
         }
 
-    def _get_supabase_client(self) -> Any:
-        """Get or create Supabase client with lazy initialization."""
-        if not self._initialized:
-            if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
-                raise ValueError(
-                    "SUPABASE_URL and SUPABASE_KEY must be set in environment variables"
+    def _get_backend(self) -> StorageBackend:
+        """Get or create the configured storage backend with lazy initialization."""
+        if self._backend is None:
+            if settings.STORAGE_BACKEND == "local":
+                self._backend = LocalStorageBackend(settings.STORAGE_LOCAL_ROOT)
+            elif settings.STORAGE_BACKEND == "supabase":
+                if not settings.SUPABASE_URL or not settings.SUPABASE_KEY:
+                    raise ValueError(
+                        "SUPABASE_URL and SUPABASE_KEY must be set in environment variables"
+                    )
+                self._backend = SupabaseStorageBackend(
+                    settings.SUPABASE_URL,
+                    settings.SUPABASE_KEY,
+                    timeout_seconds=settings.STORAGE_HTTP_TIMEOUT_SECONDS,
+                    max_connections=settings.STORAGE_HTTP_MAX_CONNECTIONS,
                 )
+            else:
+                raise ValueError(f"Unknown STORAGE_BACKEND: {settings.STORAGE_BACKEND}")
 
-            # Avoid import-time deprecation noise from third-party deps during app startup.
-            import warnings
-            with warnings.catch_warnings():
-                warnings.filterwarnings(
-                    "ignore",
-                    message=r"The `gotrue` package is deprecated.*",
-                    category=DeprecationWarning,
-                )
-                from supabase import create_client
-
-            self._supabase = create_client(
-                supabase_url=settings.SUPABASE_URL,
-                supabase_key=settings.SUPABASE_KEY
-            )
-            self._initialized = True
+        return self._backend
 
-        return self._supabase
+    async def close(self) -> None:
+        """Close pooled backend connections (called on application shutdown)."""
+        backend, self._backend = self._backend, None
+        if backend is not None:
+            await backend.close()
 
     def _get_file_path(self, organization_id: str, module: str, filename: str, entity_id: Optional[str] = None) -> str:
         """Generate a multi-tenant file path: /{organization_id}/{module}/{entity_id?}/{filename}"""
@@ -67,14 +97,17 @@ class StorageService:
 
     def _validate_file(self, file_content: bytes, filename: str, bucket: str) -> None:
         """Validate file type and size."""
+        self._validate_upload(len(file_content), filename, bucket)
+
+    def _validate_upload(self, size_bytes: Optional[int], filename: str, bucket: str) -> None:
+        """Validate file type and (when known up front) size."""
         if bucket not in self.buckets:
             raise ValueError(f"Invalid bucket: {bucket}")
 
         bucket_config = self.buckets[bucket]
 
         # Check file size
-        max_size_bytes = bucket_config["max_size_mb"] * 1024 * 1024
-        if len(file_content) > max_size_bytes:
+        if size_bytes is not None and size_bytes > self._max_size_bytes(bucket):
             raise ValueError(f"File too large. Maximum size: {bucket_config['max_size_mb']}MB")
 
         # Check file type (basic check)
@@ -82,6 +115,9 @@ class StorageService:
         if content_type not in bucket_config["allowed_types"]:
             raise ValueError(f"File type not allowed: {content_type}")
 
+    def _max_size_bytes(self, bucket: str) -> int:
+        return self.buckets[bucket]["max_size_mb"] * 1024 * 1024
+
     def _guess_content_type(self, filename: str) -> str:
         """Guess content type from filename extension."""
         ext = Path(filename).suffix.lower()
@@ -98,6 +134,13 @@ class StorageService:
         }
         return content_types.get(ext, "application/octet-stream")
 
+    def _access_url(self, bucket: str, file_path: str) -> Optional[str]:
+        if self.buckets[bucket]["public"]:
+            # Public bucket - direct URL
+            return self._get_backend().get_public_url(bucket, file_path)
+        # Private bucket - will need signed URL, generated on demand
+        return None
+
     async def upload_file(
         self,
         organization_id: str,
@@ -108,7 +151,7 @@ class StorageService:
         entity_id: Optional[str] = None
     ) -> Dict[str, Any]:
         """
-        Upload a file to Supabase Storage with multi-tenant path.
+        Upload a file to storage with multi-tenant path.
 
         Args:
             organization_id: The organization ID for multi-tenancy
@@ -127,45 +170,113 @@ class StorageService:
 
             # Generate multi-tenant file path
             file_path = self._get_file_path(organization_id, module, filename, entity_id)
-
-            # Upload to Supabase Storage
-            supabase_client = self._get_supabase_client()
-            response = supabase_client.storage.from_(bucket).upload(
-                path=file_path,
-                file=file_content,
-                file_options={
-                    "content-type": self._guess_content_type(filename),
-                    "cache-control": "3600"
-                }
+            content_type = self._guess_content_type(filename)
+
+            await self._get_backend().upload(
+                bucket,
+                file_path,
+                file_content,
+                content_type=content_type,
+                size=len(file_content),
             )
 
-            # The response object structure varies by client version
-            # Check if upload was successful (response should have path or error)
-            if hasattr(response, 'path') or (isinstance(response, dict) and 'path' in response):
-                # Upload successful
-                pass
-            else:
-                # Check for error
-                error_msg = getattr(response, 'error', response.get('error') if isinstance(response, dict) else None)
-                if error_msg:
-                    raise Exception(f"Upload failed: {error_msg}")
-
-            # Generate access URL
-            bucket_config = self.buckets[bucket]
-            if bucket_config["public"]:
-                # Public bucket - direct URL
-                access_url = supabase_client.storage.from_(bucket).get_public_url(file_path)
-            else:
-                # Private bucket - will need signed URL
-                access_url = None  # Will be generated on demand
-
             return {
                 "file_path": file_path,
                 "bucket": bucket,
-                "access_url": access_url,
-                "is_public": bucket_config["public"],
+                "access_url": self._access_url(bucket, file_path),
+                "is_public": self.buckets[bucket]["public"],
                 "size_bytes": len(file_content),
-                "content_type": self._guess_content_type(filename)
+                "content_type": content_type
+            }
+
+        except ValueError:
+            raise
+        except Exception as e:
+            raise Exception(f"File upload failed: {str(e)}")
+
+    async def get_upload_size(self, upload: UploadFile) -> int:
+        """
+        Size of an incoming multipart upload without reading it into memory.
+        Starlette spools the body to a temporary file, so seeking is cheap.
+        """
+        if upload.size is not None:
+            return upload.size
+        size = await asyncio.to_thread(upload.file.seek, 0, os.SEEK_END)
+        await upload.seek(0)
+        return size
+
+    async def _iter_upload(
+        self,
+        upload: UploadFile,
+        max_size_bytes: int,
+        max_size_mb: int,
+        counter: Dict[str, int],
+    ) -> AsyncIterator[bytes]:
+        """Yield the upload in chunks, aborting as soon as it exceeds the limit."""
+        await upload.seek(0)
+        while True:
+            chunk = await upload.read(settings.STORAGE_UPLOAD_CHUNK_SIZE)
+            if not chunk:
+                return
+            counter["size_bytes"] += len(chunk)
+            if counter["size_bytes"] > max_size_bytes:
+                raise ValueError(f"File too large. Maximum size: {max_size_mb}MB")
+            yield chunk
+
+    async def upload_stream(
+        self,
+        organization_id: str,
+        module: str,
+        upload: UploadFile,
+        bucket: str = "production-files",
+        entity_id: Optional[str] = None,
+        size_bytes: Optional[int] = None,
+    ) -> Dict[str, Any]:
+        """
+        Upload a multipart file by streaming it to storage in chunks of
+        STORAGE_UPLOAD_CHUNK_SIZE, instead of reading it into memory first.
+
+        Args:
+            organization_id: The organization ID for multi-tenancy
+            module: The module name (e.g., 'kits', 'scripts', 'shooting-days')
+            upload: The incoming UploadFile
+            bucket: Storage bucket ('public-assets' or 'production-files')
+            entity_id: Optional entity ID for sub-folder organization
+            size_bytes: Upload size, if the caller already determined it
+
+        Returns:
+            Dict with file path and access URL
+        """
+        filename = upload.filename or "upload"
+        try:
+            if size_bytes is None:
+                size_bytes = await self.get_upload_size(upload)
+            self._validate_upload(size_bytes, filename, bucket)
+
+            file_path = self._get_file_path(organization_id, module, filename, entity_id)
+            content_type = self._guess_content_type(filename)
+            counter = {"size_bytes": 0}
+
+            await self._get_backend().upload(
+                bucket,
+                file_path,
+                self._iter_upload(
+                    upload,
+                    self._max_size_bytes(bucket),
+                    self.buckets[bucket]["max_size_mb"],
+                    counter,
+                ),
+                content_type=content_type,
+                size=size_bytes,
+            )
+
+            return {
+                "file_path": file_path,
+                "bucket": bucket,
+                "access_url": self._access_url(bucket, file_path),
+                "is_public": self.buckets[bucket]["public"],
+                "size_bytes": counter["size_bytes"],
+                "content_type": content_type
             }
 
         except ValueError:
@@ -175,7 +286,7 @@ class StorageService:
 
     async def delete_file(self, bucket: str, file_path: str) -> bool:
         """
-        Delete a file from Supabase Storage.
+        Delete a file from storage.
 
         Args:
             bucket: Storage bucket
@@ -185,46 +296,49 @@ class StorageService:
             True if deleted successfully
         """
         try:
-            supabase_client = self._get_supabase_client()
-            response = supabase_client.storage.from_(bucket).remove([file_path])
-
-            # Check if deletion was successful
-            # Response is usually a list of deleted file info or an error object
-            if isinstance(response, list) and len(response) > 0:
-                return True
-            elif hasattr(response, 'error') or (isinstance(response, dict) and 'error' in response):
-                error_msg = getattr(response, 'error', response.get('error'))
-                raise Exception(f"Delete failed: {error_msg}")
-
+            await self._get_backend().remove(bucket, [file_path])
+            self._forget_signed_urls(bucket, file_path)
             return True
 
         except Exception as e:
             raise Exception(f"File deletion failed: {str(e)}")
 
+    async def _find_entry(self, bucket: str, file_path: str) -> Optional[Dict[str, Any]]:
+        """Find a file's listing entry by listing its parent folder."""
+        folder_path = str(Path(file_path).parent)
+        if folder_path == ".":
+            folder_path = ""
+
+        filename = Path(file_path).name
+        for entry in await self._get_backend().list(bucket, folder_path):
+            if entry.get("name") == filename:
+                return entry
+        return None
+
     async def get_file_size(self, bucket: str, file_path: str) -> Optional[int]:
         """
         Return file size in bytes if available, otherwise None.
         """
         try:
-            supabase_client = self._get_supabase_client()
-            parts = file_path.split("/")
-            if len(parts) < 2:
+            if len(file_path.split("/")) < 2:
                 return None
-            directory = "/".join(parts[:-1])
-            filename = parts[-1]
-            entries = supabase_client.storage.from_(bucket).list(directory)
-            if not isinstance(entries, list):
+            entry = await self._find_entry(bucket, file_path)
+            if entry is None:
                 return None
-            for entry in entries:
-                if entry.get("name") == filename:
-                    metadata = entry.get("metadata") or {}
-                    size = metadata.get("size")
-                    if isinstance(size, int):
-                        return size
-            return None
+            size = (entry.get("metadata") or {}).get("size")
+            return size if isinstance(size, int) else None
         except Exception:
             return None
 
+    def _remember_signed_url(
+        self, bucket: str, file_path: str, expires_in: int, url: str, signed_at: float
+    ) -> None:
+        self._signed_urls[(bucket, file_path, expires_in)] = _SignedUrl(url, signed_at + expires_in)
+
+    def _forget_signed_urls(self, bucket: str, file_path: str) -> None:
+        for key in [k for k in list(self._signed_urls.keys()) if k[0] == bucket and k[1] == file_path]:
+            self._signed_urls.pop(key, None)
+
     async def generate_signed_url(
         self,
         bucket: str,
@@ -233,6 +347,7 @@ class StorageService:
     ) -> str:
         """
         Generate a signed URL for private files.
+        Cached URLs are reused until shortly before they expire.
 
         Args:
             bucket: Storage bucket
@@ -242,21 +357,103 @@ class StorageService:
         Returns:
             Signed URL string
         """
-        try:
-            supabase_client = self._get_supabase_client()
-            response = supabase_client.storage.from_(bucket).create_signed_url(
-                path=file_path,
-                expires_in=expires_in
-            )
+        url, _ = await self.generate_signed_url_with_expiry(bucket, file_path, expires_in)
+        return url
 
-            if response.get("signedURL"):
-                return response["signedURL"]
-            else:
-                raise Exception(f"Failed to generate signed URL: {response}")
+    async def generate_signed_url_with_expiry(
+        self,
+        bucket: str,
+        file_path: str,
+        expires_in: int = 3600
+    ) -> Tuple[str, int]:
+        """
+        Like generate_signed_url, but also return the seconds the URL stays
+        valid: less than expires_in when a cached URL is reused.
+        """
+        cached = self._signed_urls.get((bucket, file_path, expires_in))
+        if cached is not None:
+            return cached.url, _seconds_left(cached)
 
+        try:
+            signed_at = time.monotonic()
+            url = await self._get_backend().create_signed_url(bucket, file_path, expires_in)
         except Exception as e:
             raise Exception(f"Signed URL generation failed: {str(e)}")
 
+        self._remember_signed_url(bucket, file_path, expires_in, url, signed_at)
+        return url, expires_in
+
+    async def generate_signed_urls(
+        self,
+        bucket: str,
+        file_paths: Iterable[str],
+        expires_in: int = 3600
+    ) -> Dict[str, str]:
+        """
+        Generate signed URLs for many private files with one storage round-trip.
+        Paths with a cached URL are not re-signed; paths that cannot be signed
+        (e.g. missing objects) are left out of the result.
+
+        Args:
+            bucket: Storage bucket
+            file_paths: Full file paths
+            expires_in: URL expiration time in seconds (default 1 hour)
+
+        Returns:
+            Dict mapping file path to signed URL
+        """
+        urls, _ = await self.generate_signed_urls_with_expiry(bucket, file_paths, expires_in)
+        return urls
+
+    async def generate_signed_urls_with_expiry(
+        self,
+        bucket: str,
+        file_paths: Iterable[str],
+        expires_in: int = 3600
+    ) -> Tuple[Dict[str, str], int]:
+        """
+        Like generate_signed_urls, but also return the seconds until the first
+        of the returned URLs expires (cached URLs have less left than expires_in).
+        """
+        urls: Dict[str, str] = {}
+        valid_for = expires_in
+        to_sign: list[str] = []
+        for file_path in dict.fromkeys(file_paths):
+            cached = self._signed_urls.get((bucket, file_path, expires_in))
+            if cached is not None:
+                urls[file_path] = cached.url
+                valid_for = min(valid_for, _seconds_left(cached))
+            else:
+                to_sign.append(file_path)
+
+        if to_sign:
+            try:
+                signed_at = time.monotonic()
+                signed = await self._get_backend().create_signed_urls(bucket, to_sign, expires_in)
+            except Exception as e:
+                raise Exception(f"Signed URL generation failed: {str(e)}")
+
+            for file_path, url in signed.items():
+                self._remember_signed_url(bucket, file_path, expires_in, url, signed_at)
+                urls[file_path] = url
+
+        return urls, valid_for
+
+    async def get_access_urls(
+        self,
+        bucket: str,
+        file_paths: Iterable[str],
+        expires_in: int = 3600
+    ) -> Dict[str, str]:
+        """
+        Access URLs for files in any bucket: permanent URLs for public
+        buckets, batch-signed URLs for private ones.
+        """
+        if bucket in self.buckets and self.buckets[bucket]["public"]:
+            backend = self._get_backend()
+            return {path: backend.get_public_url(bucket, path) for path in file_paths}
+        return await self.generate_signed_urls(bucket, file_paths, expires_in)
+
     async def get_file_info(self, bucket: str, file_path: str) -> Dict[str, Any]:
         """
         Get file information from storage.
@@ -269,28 +466,10 @@ class StorageService:
             File metadata
         """
         try:
-            supabase_client = self._get_supabase_client()
-            
-            # List all files in the parent directory
-            folder_path = str(Path(file_path).parent)
-            if folder_path == ".":
-                folder_path = ""
-
-            response = supabase_client.storage.from_(bucket).list(path=folder_path)
-
-            # Find the specific file by name
-            filename = Path(file_path).name
-            if response:
-                for file_obj in response:
-                    file_name = file_obj.get('name') if isinstance(file_obj, dict) else getattr(file_obj, 'name', None)
-                    if file_name == filename:
-                        return file_obj if isinstance(file_obj, dict) else {
-                            'name': file_name,
-                            'id': getattr(file_obj, 'id', None),
-                            'size': getattr(file_obj, 'metadata', {}).get('size', None)
-                        }
-
-            raise Exception("File not found")
+            entry = await self._find_entry(bucket, file_path)
+            if entry is None:
+                raise Exception("File not found")
+            return entry
 
         except Exception as e:
             raise Exception(f"File info retrieval failed: {str(e)}")
@@ -307,9 +486,7 @@ class StorageService:
             List of file objects with metadata
         """
         try:
-            supabase_client = self._get_supabase_client()
-            response = supabase_client.storage.from_(bucket).list(path=path)
-            return response or []
+            return await self._get_backend().list(bucket, path)
         except Exception as e:
             raise Exception(f"File listing failed: {str(e)}")
 
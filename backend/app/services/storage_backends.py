@@ -0,0 +1,324 @@
+"""
+Async storage backends used by StorageService.
+
+- SupabaseStorageBackend talks to the Supabase Storage REST API over one
+  pooled keep-alive httpx.AsyncClient, so uploads, listings and signed URLs
+  never block the event loop.
+- LocalStorageBackend keeps objects under a directory on disk, for tests and
+  offline development.
+
+Both accept either bytes or an async iterator of byte chunks as the upload
+body, so large files can be streamed instead of being held in memory.
+"""
+
+import asyncio
+import mimetypes
+import os
+import time
+from abc import ABC, abstractmethod
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, AsyncIterator, Dict, List, Optional, Union
+from urllib.parse import quote, urlencode
+
+import httpx
+
+StorageBody = Union[bytes, AsyncIterator[bytes]]
+
+
+class StorageBackendError(Exception):
+    """Raised when the storage backend rejects or fails an operation."""
+
+    def __init__(self, message: str, status_code: Optional[int] = None):
+        super().__init__(message)
+        self.status_code = status_code
+
+
+class StorageBackend(ABC):
+    """Interface implemented by every storage backend."""
+
+    @abstractmethod
+    async def upload(
+        self,
+        bucket: str,
+        path: str,
+        body: StorageBody,
+        *,
+        content_type: str,
+        size: Optional[int] = None,
+        cache_control: str = "3600",
+    ) -> None:
+        """Store an object. Fails if the path already exists."""
+
+    @abstractmethod
+    async def remove(self, bucket: str, paths: List[str]) -> List[Dict[str, Any]]:
+        """Delete objects and return the entries that were removed."""
+
+    @abstractmethod
+    async def list(self, bucket: str, prefix: str = "") -> List[Dict[str, Any]]:
+        """
+        List the direct children of a folder, in the Supabase Storage shape:
+        {"name", "id", "metadata": {"size", "mimetype"}, ...}. Folders have
+        id and metadata set to None.
+        """
+
+    @abstractmethod
+    async def create_signed_url(self, bucket: str, path: str, expires_in: int) -> str:
+        """Return a temporary URL for a private object."""
+
+    async def create_signed_urls(
+        self, bucket: str, paths: List[str], expires_in: int
+    ) -> Dict[str, str]:
+        """
+        Sign several objects at once, returning {path: url}. Paths that
+        cannot be signed (e.g. missing objects) are left out. Backends with
+        a batch endpoint override this to make a single round-trip.
+        """
+        urls: Dict[str, str] = {}
+        for path in paths:
+            try:
+                urls[path] = await self.create_signed_url(bucket, path, expires_in)
+            except StorageBackendError:
+                continue
+        return urls
+
+    @abstractmethod
+    def get_public_url(self, bucket: str, path: str) -> str:
+        """Return the permanent URL of an object in a public bucket."""
+
+    async def close(self) -> None:
+        """Release pooled resources (called on application shutdown)."""
+
+
+class SupabaseStorageBackend(StorageBackend):
+    """Supabase Storage REST API over a pooled keep-alive HTTP client."""
+
+    def __init__(
+        self,
+        supabase_url: str,
+        service_key: str,
+        *,
+        timeout_seconds: float = 30.0,
+        max_connections: int = 20,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.base_url = f"{supabase_url.rstrip('/')}/storage/v1"
+        self._service_key = service_key
+        self._timeout_seconds = timeout_seconds
+        self._max_connections = max_connections
+        self._transport = transport
+        self._client: Optional[httpx.AsyncClient] = None
+
+    def _get_client(self) -> httpx.AsyncClient:
+        if self._client is None or self._client.is_closed:
+            self._client = httpx.AsyncClient(
+                base_url=self.base_url,
+                headers={
+                    "Authorization": f"Bearer {self._service_key}",
+                    "apikey": self._service_key,
+                },
+                # Uploads may take a while; connecting should not.
+                timeout=httpx.Timeout(self._timeout_seconds, connect=10.0),
+                limits=httpx.Limits(
+                    max_connections=self._max_connections,
+                    max_keepalive_connections=self._max_connections,
+                    keepalive_expiry=60.0,
+                ),
+                transport=self._transport,
+            )
+        return self._client
+
+    @staticmethod
+    def _object_path(bucket: str, path: str) -> str:
+        return f"{quote(bucket)}/{quote(path.lstrip('/'), safe='/')}"
+
+    @staticmethod
+    def _raise_for_status(response: httpx.Response) -> None:
+        if response.status_code < 400:
+            return
+        try:
+            payload = response.json()
+            message = payload.get("message") or payload.get("error") or response.text
+        except ValueError:
+            message = response.text
+        raise StorageBackendError(
+            f"Storage request failed ({response.status_code}): {message}",
+            status_code=response.status_code,
+        )
+
+    async def upload(
+        self,
+        bucket: str,
+        path: str,
+        body: StorageBody,
+        *,
+        content_type: str,
+        size: Optional[int] = None,
+        cache_control: str = "3600",
+    ) -> None:
+        headers = {
+            "Content-Type": content_type,
+            "Cache-Control": f"max-age={cache_control}",
+            "x-upsert": "false",
+        }
+        if size is not None:
+            # Avoid chunked transfer encoding when the size is known up front.
+            headers["Content-Length"] = str(size)
+
+        response = await self._get_client().post(
+            f"/object/{self._object_path(bucket, path)}",
+            content=body,
+            headers=headers,
+        )
+        self._raise_for_status(response)
+
+    async def remove(self, bucket: str, paths: List[str]) -> List[Dict[str, Any]]:
+        response = await self._get_client().request(
+            "DELETE",
+            f"/object/{quote(bucket)}",
+            json={"prefixes": paths},
+        )
+        self._raise_for_status(response)
+        return response.json() or []
+
+    async def list(self, bucket: str, prefix: str = "") -> List[Dict[str, Any]]:
+        response = await self._get_client().post(
+            f"/object/list/{quote(bucket)}",
+            json={
+                "prefix": prefix,
+                "limit": 1000,
+                "offset": 0,
+                "sortBy": {"column": "name", "order": "asc"},
+            },
+        )
+        self._raise_for_status(response)
+        return response.json() or []
+
+    async def create_signed_url(self, bucket: str, path: str, expires_in: int) -> str:
+        response = await self._get_client().post(
+            f"/object/sign/{self._object_path(bucket, path)}",
+            json={"expiresIn": expires_in},
+        )
+        self._raise_for_status(response)
+        signed_path = (response.json() or {}).get("signedURL")
+        if not signed_path:
+            raise StorageBackendError(f"Failed to generate signed URL: {response.text}")
+        return f"{self.base_url}/{signed_path.lstrip('/')}"
+
+    async def create_signed_urls(
+        self, bucket: str, paths: List[str], expires_in: int
+    ) -> Dict[str, str]:
+        if not paths:
+            return {}
+        response = await self._get_client().post(
+            f"/object/sign/{quote(bucket)}",
+            json={"expiresIn": expires_in, "paths": paths},
+        )
+        self._raise_for_status(response)
+
+        urls: Dict[str, str] = {}
+        for item in response.json() or []:
+            signed_path = item.get("signedURL")
+            if item.get("error") or not signed_path:
+                continue
+            urls[item["path"]] = f"{self.base_url}/{signed_path.lstrip('/')}"
+        return urls
+
+    def get_public_url(self, bucket: str, path: str) -> str:
+        return f"{self.base_url}/object/public/{self._object_path(bucket, path)}"
+
+    async def close(self) -> None:
+        client, self._client = self._client, None
+        if client is not None:
+            await client.aclose()
+
+
+class LocalStorageBackend(StorageBackend):
+    """Objects stored under {root}/{bucket}/{path} on the local filesystem."""
+
+    def __init__(self, root: Union[str, Path]):
+        self.root = Path(root).resolve()
+
+    def _resolve(self, bucket: str, path: str = "") -> Path:
+        bucket_root = (self.root / bucket).resolve()
+        target = (bucket_root / path.lstrip("/")).resolve()
+        if target != bucket_root and bucket_root not in target.parents:
+            raise StorageBackendError(f"Invalid storage path: {path}", status_code=400)
+        return target
+
+    async def upload(
+        self,
+        bucket: str,
+        path: str,
+        body: StorageBody,
+        *,
+        content_type: str,
+        size: Optional[int] = None,
+        cache_control: str = "3600",
+    ) -> None:
+        target = self._resolve(bucket, path)
+        if target.exists():
+            raise StorageBackendError("The resource already exists", status_code=409)
+        await asyncio.to_thread(target.parent.mkdir, parents=True, exist_ok=True)
+
+        partial = target.with_name(f".{target.name}.partial")
+        handle = await asyncio.to_thread(open, partial, "wb")
+        try:
+            if isinstance(body, (bytes, bytearray, memoryview)):
+                await asyncio.to_thread(handle.write, body)
+            else:
+                async for chunk in body:
+                    await asyncio.to_thread(handle.write, chunk)
+        except BaseException:
+            handle.close()
+            partial.unlink(missing_ok=True)
+            raise
+        handle.close()
+        await asyncio.to_thread(os.replace, partial, target)
+
+    async def remove(self, bucket: str, paths: List[str]) -> List[Dict[str, Any]]:
+        removed: List[Dict[str, Any]] = []
+        for path in paths:
+            target = self._resolve(bucket, path)
+            if target.is_file():
+                await asyncio.to_thread(target.unlink)
+                removed.append({"name": path, "bucket_id": bucket})
+        return removed
+
+    def _list_sync(self, bucket: str, prefix: str) -> List[Dict[str, Any]]:
+        folder = self._resolve(bucket, prefix)
+        if not folder.is_dir():
+            return []
+
+        entries: List[Dict[str, Any]] = []
+        for child in sorted(folder.iterdir(), key=lambda p: p.name):
+            if child.name.startswith(".") and child.name.endswith(".partial"):
+                continue
+            if child.is_dir():
+                entries.append({"name": child.name, "id": None, "metadata": None})
+                continue
+            stat = child.stat()
+            modified = datetime.fromtimestamp(stat.st_mtime, tz=timezone.utc).isoformat()
+            entries.append({
+                "name": child.name,
+                "id": str(child.relative_to(self.root)),
+                "created_at": modified,
+                "updated_at": modified,
+                "metadata": {
+                    "size": stat.st_size,
+                    "mimetype": mimetypes.guess_type(child.name)[0] or "application/octet-stream",
+                },
+            })
+        return entries
+
+    async def list(self, bucket: str, prefix: str = "") -> List[Dict[str, Any]]:
+        return await asyncio.to_thread(self._list_sync, bucket, prefix)
+
+    async def create_signed_url(self, bucket: str, path: str, expires_in: int) -> str:
+        target = self._resolve(bucket, path)
+        if not target.is_file():
+            raise StorageBackendError("Object not found", status_code=404)
+        return f"{target.as_uri()}?{urlencode({'expires': int(time.time()) + expires_in})}"
+
+    def get_public_url(self, bucket: str, path: str) -> str:
+        return self._resolve(bucket, path).as_uri()
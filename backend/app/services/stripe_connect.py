@@ -19,6 +19,7 @@ from app.models.financial import Invoice, InvoicePaymentMethodEnum
 from app.models.transactions import Transaction
 from app.schemas.transactions import TransactionCreate
 from app.services.financial import transaction_service
+from app.services.stripe_gateway import stripe_gateway
 
 logger = logging.getLogger(__name__)
 
@@ -102,7 +103,8 @@ async def handle_connect_oauth_callback(
 
     # Exchange the authorization code for connected account credentials
     try:
-        response = stripe.OAuth.token(
+        response = await stripe_gateway.call(
+            stripe.OAuth.token,
             grant_type="authorization_code",
             code=code,
         )
@@ -126,6 +128,7 @@ async def handle_connect_oauth_callback(
         )
 
     # Update the organization with the connected account
+    stripe_gateway.invalidate_account(organization.stripe_connect_account_id)
     organization.stripe_connect_account_id = connected_account_id
     organization.stripe_connect_onboarding_complete = True
     organization.stripe_connect_enabled_at = datetime.now(timezone.utc)
@@ -169,11 +172,9 @@ async def get_connect_status(
             "requirements": None,
         }
 
-    # Fetch live status from Stripe
+    # Fetch status from Stripe (cached briefly; account.updated webhooks invalidate it)
     try:
-        account = stripe.Account.retrieve(
-            organization.stripe_connect_account_id
-        )
+        account = await stripe_gateway.retrieve_account(organization.stripe_connect_account_id)
         requirements = account.get("requirements") or {}
         requirements_summary = {
             "disabled_reason": requirements.get("disabled_reason"),
@@ -246,7 +247,8 @@ async def disconnect_connect_account(
 
     # Deauthorize on Stripe's side
     try:
-        stripe.OAuth.deauthorize(
+        await stripe_gateway.call(
+            stripe.OAuth.deauthorize,
             client_id=settings.STRIPE_CONNECT_CLIENT_ID,
             stripe_user_id=organization.stripe_connect_account_id,
         )
@@ -256,6 +258,7 @@ async def disconnect_connect_account(
 
     # Clear local record
     old_account_id = organization.stripe_connect_account_id
+    stripe_gateway.invalidate_account(old_account_id)
     organization.stripe_connect_account_id = None
     organization.stripe_connect_onboarding_complete = False
     organization.stripe_connect_enabled_at = None
@@ -316,7 +319,8 @@ async def create_invoice_payment_link(
     frontend_url = str(settings.FRONTEND_URL).rstrip("/")
 
     try:
-        session = stripe.checkout.Session.create(
+        session = await stripe_gateway.call(
+            stripe.checkout.Session.create,
             line_items=[{
                 "price_data": {
                     "currency": invoice.currency.lower() if invoice.currency else "brl",
@@ -400,7 +404,7 @@ async def get_invoice_payment_status(
         return result
 
     try:
-        session = stripe.checkout.Session.retrieve(
+        session = await stripe_gateway.retrieve_checkout_session(
             invoice.stripe_checkout_session_id,
             stripe_account=organization.stripe_connect_account_id,
         )
@@ -472,6 +476,7 @@ async def handle_connect_checkout_completed(
     payment_status = session.get("payment_status", "")
     metadata = session.get("metadata", {})
     invoice_id_str = metadata.get("invoice_id")
+    stripe_gateway.invalidate_checkout_session(session_id)
 
     if not invoice_id_str:
         logger.warning(f"checkout.session.completed missing invoice_id in metadata: {session_id}")
@@ -519,6 +524,7 @@ async def handle_connect_async_payment_succeeded(
     session_id = session["id"]
     metadata = session.get("metadata", {})
     invoice_id_str = metadata.get("invoice_id")
+    stripe_gateway.invalidate_checkout_session(session_id)
 
     if not invoice_id_str:
         logger.warning(f"async_payment_succeeded missing invoice_id: {session_id}")
@@ -559,6 +565,7 @@ async def handle_connect_async_payment_failed(
     session_id = session["id"]
     metadata = session.get("metadata", {})
     invoice_id_str = metadata.get("invoice_id")
+    stripe_gateway.invalidate_checkout_session(session_id)
 
     if not invoice_id_str:
         return
@@ -582,6 +589,8 @@ async def handle_connect_account_updated(
     if not account_id:
         return
 
+    stripe_gateway.invalidate_account(account_id)
+
     query = select(Organization).where(Organization.stripe_connect_account_id == account_id)
     result = await db.execute(query)
     organization = result.scalar_one_or_none()
@@ -0,0 +1,225 @@
+"""
+Async gateway for the synchronous Stripe SDK.
+
+stripe-python does blocking HTTP, so calling it from an `async def` stalls
+every request on the event loop until Stripe answers. All Stripe calls go
+through `stripe_gateway.call(...)`, which:
+
+- runs the SDK call in a bounded thread pool (STRIPE_GATEWAY_MAX_WORKERS);
+- gives up after STRIPE_GATEWAY_TIMEOUT_SECONDS, queueing time included
+  (the SDK's own HTTP timeout is set to the same value so threads free up);
+- trips a circuit breaker after STRIPE_CIRCUIT_FAILURE_THRESHOLD consecutive
+  connection errors, timeouts or 5xx responses. While open, calls fail fast
+  for STRIPE_CIRCUIT_RESET_SECONDS; then one trial call decides whether to
+  close it again.
+
+Gateway failures raise StripeUnavailableError, a stripe APIConnectionError,
+so existing `except stripe.error.StripeError` handling still applies.
+
+Connected-account and checkout-session lookups are cached for
+STRIPE_STATUS_CACHE_TTL_SECONDS. The Connect webhook drops the affected
+entries when the event is received and again when it is handled; other
+processes converge within the TTL.
+"""
+import asyncio
+import logging
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from functools import partial
+from typing import Any, Callable, Dict, Hashable, Optional
+
+import stripe
+from cachetools import TTLCache
+
+from app.core.config import settings
+
+logger = logging.getLogger(__name__)
+
+CIRCUIT_CLOSED = "closed"
+CIRCUIT_OPEN = "open"
+CIRCUIT_HALF_OPEN = "half_open"
+
+
+class StripeUnavailableError(stripe.error.APIConnectionError):
+    """Stripe did not answer in time, or the circuit breaker is open."""
+
+
+def _is_outage(error: BaseException) -> bool:
+    """Errors that say Stripe is unreachable or failing, as opposed to a rejected request."""
+    if isinstance(error, (asyncio.TimeoutError, stripe.error.APIConnectionError, stripe.error.APIError)):
+        return True
+    return isinstance(error, stripe.error.StripeError) and (error.http_status or 0) >= 500
+
+
+class CircuitBreaker:
+    """Consecutive-failure breaker with a single half-open trial call."""
+
+    def __init__(self, failure_threshold: int, reset_seconds: float, clock: Callable[[], float] = time.monotonic):
+        self.failure_threshold = max(1, failure_threshold)
+        self.reset_seconds = reset_seconds
+        self._clock = clock
+        self._failures = 0
+        self._opened_at: Optional[float] = None
+        self._trial_running = False
+
+    @property
+    def state(self) -> str:
+        if self._opened_at is None:
+            return CIRCUIT_CLOSED
+        if self._clock() - self._opened_at >= self.reset_seconds:
+            return CIRCUIT_HALF_OPEN
+        return CIRCUIT_OPEN
+
+    def allow(self) -> bool:
+        state = self.state
+        if state == CIRCUIT_CLOSED:
+            return True
+        if state == CIRCUIT_HALF_OPEN and not self._trial_running:
+            self._trial_running = True
+            return True
+        return False
+
+    def record_success(self) -> None:
+        self._failures = 0
+        self._opened_at = None
+        self._trial_running = False
+
+    def record_failure(self) -> None:
+        self._failures += 1
+        if self._trial_running or self._failures >= self.failure_threshold:
+            if self._opened_at is None:
+                logger.warning(f"Stripe circuit opened after {self._failures} consecutive failures")
+            self._opened_at = self._clock()
+        self._trial_running = False
+
+    def release(self) -> None:
+        """A cancelled call says nothing about Stripe; let another caller run the trial."""
+        self._trial_running = False
+
+
+class StripeGateway:
+    """Bounded, time-limited, circuit-broken access to the Stripe SDK."""
+
+    def __init__(
+        self,
+        *,
+        max_workers: int,
+        timeout_seconds: float,
+        failure_threshold: int,
+        reset_seconds: float,
+        cache_ttl: int,
+        cache_maxsize: int,
+    ):
+        self.max_workers = max(1, max_workers)
+        self.timeout_seconds = timeout_seconds
+        self.breaker = CircuitBreaker(failure_threshold, reset_seconds)
+        self._executor: Optional[ThreadPoolExecutor] = None
+        self._cache: Optional[TTLCache] = (
+            TTLCache(maxsize=cache_maxsize, ttl=cache_ttl) if cache_ttl > 0 and cache_maxsize > 0 else None
+        )
+        self._cache_lock = threading.Lock()
+        self._generation = 0
+
+    def _get_executor(self) -> ThreadPoolExecutor:
+        if self._executor is None:
+            stripe.default_http_client = stripe.new_default_http_client(timeout=self.timeout_seconds)
+            self._executor = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="stripe")
+        return self._executor
+
+    async def call(self, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        """Run a blocking Stripe SDK call in the pool and return its result."""
+        if not self.breaker.allow():
+            raise StripeUnavailableError("Stripe is temporarily unavailable, please try again shortly")
+
+        loop = asyncio.get_running_loop()
+        try:
+            result = await asyncio.wait_for(
+                loop.run_in_executor(self._get_executor(), partial(func, *args, **kwargs)),
+                timeout=self.timeout_seconds or None,
+            )
+        except asyncio.CancelledError:
+            self.breaker.release()
+            raise
+        except Exception as e:
+            if _is_outage(e):
+                self.breaker.record_failure()
+            else:
+                self.breaker.record_success()
+            if isinstance(e, asyncio.TimeoutError):
+                raise StripeUnavailableError("Stripe request timed out") from e
+            raise
+
+        self.breaker.record_success()
+        return result
+
+    # ── Cached lookups ───────────────────────────────────────
+
+    async def _cached(self, key: Hashable, func: Callable[..., Any], *args: Any, **kwargs: Any) -> Any:
+        if self._cache is not None:
+            with self._cache_lock:
+                cached = self._cache.get(key)
+            if cached is not None:
+                return cached
+
+        # An invalidation while the call is in flight means the answer may predate it.
+        generation = self._generation
+        value = await self.call(func, *args, **kwargs)
+        if self._cache is not None:
+            with self._cache_lock:
+                if generation == self._generation:
+                    self._cache[key] = value
+        return value
+
+    async def retrieve_account(self, account_id: str) -> Any:
+        """stripe.Account.retrieve, cached per connected account."""
+        return await self._cached(("account", account_id), stripe.Account.retrieve, account_id)
+
+    async def retrieve_checkout_session(self, session_id: str, *, stripe_account: Optional[str] = None) -> Any:
+        """stripe.checkout.Session.retrieve, cached per session."""
+        return await self._cached(
+            ("checkout_session", session_id),
+            stripe.checkout.Session.retrieve,
+            session_id,
+            stripe_account=stripe_account,
+        )
+
+    def _invalidate(self, key: Hashable) -> None:
+        if self._cache is not None:
+            with self._cache_lock:
+                self._generation += 1
+                self._cache.pop(key, None)
+
+    def invalidate_account(self, account_id: Optional[str]) -> None:
+        if account_id:
+            self._invalidate(("account", account_id))
+
+    def invalidate_checkout_session(self, session_id: Optional[str]) -> None:
+        if session_id:
+            self._invalidate(("checkout_session", session_id))
+
+    def invalidate_for_event(self, event: Dict[str, Any]) -> None:
+        """Drop cached objects a webhook event reports as changed."""
+        obj = (event.get("data") or {}).get("object") or {}
+        event_type = event.get("type") or ""
+        if event_type.startswith("account."):
+            self.invalidate_account(obj.get("id") or event.get("account"))
+        elif event_type.startswith("checkout.session."):
+            self.invalidate_checkout_session(obj.get("id"))
+
+    def shutdown(self) -> None:
+        """Stop the thread pool (called on application shutdown)."""
+        executor, self._executor = self._executor, None
+        if executor is not None:
+            executor.shutdown(wait=False, cancel_futures=True)
+
+
+# Global gateway used by the billing and Stripe Connect services
+stripe_gateway = StripeGateway(
+    max_workers=settings.STRIPE_GATEWAY_MAX_WORKERS,
+    timeout_seconds=settings.STRIPE_GATEWAY_TIMEOUT_SECONDS,
+    failure_threshold=settings.STRIPE_CIRCUIT_FAILURE_THRESHOLD,
+    reset_seconds=settings.STRIPE_CIRCUIT_RESET_SECONDS,
+    cache_ttl=settings.STRIPE_STATUS_CACHE_TTL_SECONDS,
+    cache_maxsize=settings.STRIPE_STATUS_CACHE_MAXSIZE,
+)
@@ -4,6 +4,7 @@ from unittest.mock import AsyncMock, MagicMock, patch
 from uuid import uuid4
 
 import pytest
+from sqlalchemy.dialects import postgresql
 
 
 @pytest.fixture(autouse=True)
@@ -12,88 +13,94 @@ async def _truncate_public_schema():
     yield
 
 
-@pytest.mark.asyncio
-async def test_cron_expiration_warning_5_days():
-    """Org with 5 days left should trigger warning email."""
-    now = datetime.now(timezone.utc)
-    org = SimpleNamespace(
-        id=uuid4(),
-        name="Warning Org",
-        plan_id=uuid4(),
-        billing_status="active",
-        subscription_status="active",
-        access_ends_at=now + timedelta(days=5, hours=2),
-        billing_contact_user_id=uuid4(),
-        owner_profile_id=None,
+def _cohort_row(notice, access_ends_at, email="billing@test.com"):
+    return SimpleNamespace(
+        id=uuid4(), name="Sweep Org", access_ends_at=access_ends_at, notice=notice, email=email,
     )
-    profile = SimpleNamespace(email="warning@test.com")
+
+
+async def _run_sweep(cohort, recorded, blocked=()):
+    """Run the sweep against one scripted session: repair, cohort, ledger insert, block."""
+    repair_result = MagicMock()
+    repair_result.scalars.return_value.all.return_value = []
+    cohort_result = MagicMock()
+    cohort_result.all.return_value = cohort
+    ledger_result = MagicMock()
+    ledger_result.all.return_value = recorded
+    block_result = MagicMock()
+    block_result.scalars.return_value.all.return_value = list(blocked)
 
     with patch("app.cron_check_plans.SessionLocal") as MockSession, \
-         patch("app.cron_check_plans.send_plan_expiry_warning") as mock_warning, \
-         patch("app.cron_check_plans.send_plan_expired_notice") as mock_expired:
+         patch("app.cron_check_plans.email_outbox") as mock_outbox:
         mock_db = AsyncMock()
         MockSession.return_value.__aenter__ = AsyncMock(return_value=mock_db)
         MockSession.return_value.__aexit__ = AsyncMock(return_value=False)
+        results = [repair_result, cohort_result]
+        if any(row.email for row in cohort):
+            results.append(ledger_result)
+        results.append(block_result)
+        mock_db.execute = AsyncMock(side_effect=results)
+        mock_db.commit = AsyncMock()
+        mock_outbox.is_configured.return_value = True
+        mock_outbox.enqueue_many = AsyncMock(return_value=[])
 
-        org_result = MagicMock()
-        org_result.scalars.return_value.all.return_value = [org]
+        from app.cron_check_plans import check_expiring_plans
 
-        profile_result = MagicMock()
-        profile_result.scalar_one_or_none.return_value = profile
+        stats = await check_expiring_plans()
 
-        mock_db.execute = AsyncMock(side_effect=[org_result, profile_result])
-        mock_db.commit = AsyncMock()
+    statements = [call.args[0] for call in mock_db.execute.call_args_list]
+    (queued,) = [call.args[1] for call in mock_outbox.enqueue_many.call_args_list] or [None]
+    return stats, statements, queued
 
-        from app.cron_check_plans import check_expiring_plans
 
-        await check_expiring_plans()
+@pytest.mark.asyncio
+async def test_cron_expiration_warning_5_days():
+    """Org with 5 days left is recorded in the ledger and gets one warning email."""
+    now = datetime.now(timezone.utc)
+    row = _cohort_row("warning_5d", now + timedelta(days=5, hours=2))
 
-    mock_warning.assert_called_once()
-    assert mock_warning.call_args[0][0] == "warning@test.com"
-    assert mock_warning.call_args[0][2] == 5
-    mock_expired.assert_not_called()
+    stats, statements, queued = await _run_sweep([row], recorded=[(row.id, "warning_5d")])
+
+    (email,) = queued
+    assert email["to"] == "billing@test.com"
+    assert email["kind"] == "plan_expiry_warning"
+    assert "5 days" in email["subject"]
+    assert stats["warning_5d"] == 1 and stats["expired"] == 0
+    assert set(stats["timings_ms"]) == {"repair_ms", "notify_ms", "block_ms", "total_ms"}
+
+    ledger = statements[2].compile(dialect=postgresql.dialect())
+    assert [value for key, value in ledger.params.items() if key.startswith("organization_id")] == [row.id]
+    assert [value for key, value in ledger.params.items() if key.startswith("notice")] == ["warning_5d"]
 
 
 @pytest.mark.asyncio
 async def test_cron_expired_notice_and_blocks_org():
-    """Recently expired org should trigger expired notice and be blocked."""
+    """Recently expired org gets an expired notice and all expired orgs are blocked in one UPDATE."""
     now = datetime.now(timezone.utc)
-    org = SimpleNamespace(
-        id=uuid4(),
-        name="Expired Org",
-        plan_id=uuid4(),
-        billing_status="active",
-        subscription_status="active",
-        access_ends_at=now - timedelta(hours=12),
-        billing_contact_user_id=uuid4(),
-        owner_profile_id=None,
-    )
-    profile = SimpleNamespace(email="expired@test.com")
+    row = _cohort_row("expired", now - timedelta(hours=12))
 
-    with patch("app.cron_check_plans.SessionLocal") as MockSession, \
-         patch("app.cron_check_plans.send_plan_expired_notice") as mock_expired, \
-         patch("app.cron_check_plans.send_plan_expiry_warning") as mock_warning:
-        mock_db = AsyncMock()
-        MockSession.return_value.__aenter__ = AsyncMock(return_value=mock_db)
-        MockSession.return_value.__aexit__ = AsyncMock(return_value=False)
+    stats, statements, queued = await _run_sweep([row], recorded=[(row.id, "expired")], blocked=[row.id])
 
-        org_result = MagicMock()
-        org_result.scalars.return_value.all.return_value = [org]
+    (email,) = queued
+    assert email["kind"] == "plan_expired"
+    assert email["dedupe_key"] == f"plan_expired:{row.id}:{row.access_ends_at.date()}"
+    assert stats["expired"] == 1 and stats["blocked"] == 1
 
-        profile_result = MagicMock()
-        profile_result.scalar_one_or_none.return_value = profile
+    block = statements[-1].compile(dialect=postgresql.dialect())
+    assert block.params["billing_status"] == "blocked"
+    assert block.params["subscription_status"] == "past_due"
 
-        mock_db.execute = AsyncMock(side_effect=[org_result, profile_result])
-        mock_db.commit = AsyncMock()
-        mock_db.add = MagicMock()
 
-        from app.cron_check_plans import check_expiring_plans
+@pytest.mark.asyncio
+async def test_cron_skips_notified_orgs_and_missing_contacts():
+    """A notice already in the ledger is not re-sent; orgs without a contact email are skipped."""
+    now = datetime.now(timezone.utc)
+    notified = _cohort_row("warning_1d", now + timedelta(days=1, hours=3))
+    no_contact = _cohort_row("warning_1d", now + timedelta(days=1, hours=5), email=None)
 
-        await check_expiring_plans()
+    stats, statements, queued = await _run_sweep([notified, no_contact], recorded=[])
 
-    mock_expired.assert_called_once()
-    assert mock_expired.call_args[0][0] == "expired@test.com"
-    mock_warning.assert_not_called()
-    assert org.billing_status == "blocked"
-    assert org.subscription_status == "past_due"
-    mock_db.add.assert_called()
+    assert queued == []
+    assert stats["warning_1d"] == 0 and stats["no_contact"] == 1
+    ledger = statements[2].compile(dialect=postgresql.dialect())
+    assert [value for key, value in ledger.params.items() if key.startswith("organization_id")] == [notified.id]
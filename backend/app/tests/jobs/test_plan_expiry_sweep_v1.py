@@ -0,0 +1,129 @@
+"""
+Plan-expiry sweep against the database: cohort windows, ledger and blocking.
+
+Runs against TEST_DATABASE_URI; each test gets a clean public schema from
+app/tests/conftest.py.
+"""
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app import cron_check_plans
+from app.core.base import Base
+from app.cron_check_plans import check_expiring_plans
+from app.db.session import SessionLocal, engine
+from app.models.billing import Plan, PlanExpiryNotice
+from app.models.emails import EmailOutboxMessage
+from app.models.organizations import Organization
+from app.models.profiles import Profile
+
+
+async def _seed(access_ends_in: dict, *, without_contact=(), free=()):
+    """Create one org per name, ending access after the given offset; returns ids by name."""
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+    ids = {name: uuid4() for name in access_ends_in}
+    now = datetime.now(timezone.utc)
+    async with SessionLocal() as db:
+        plan = Plan(name="pro")
+        db.add(plan)
+        await db.flush()
+        for name, offset in access_ends_in.items():
+            db.add(Organization(
+                id=ids[name],
+                name=name,
+                slug=f"{name}-{ids[name].hex[:8]}",
+                plan_id=None if name in free else plan.id,
+                billing_status="active",
+                access_ends_at=now + offset,
+            ))
+        await db.flush()
+        for name in access_ends_in:
+            if name in without_contact:
+                continue
+            db.add(Profile(id=ids[name], organization_id=ids[name], email=f"{name}@test.com"))
+        await db.flush()
+        for name in access_ends_in:
+            if name not in without_contact:
+                org = await db.get(Organization, ids[name])
+                org.billing_contact_user_id = ids[name]
+        await db.commit()
+    return ids
+
+
+async def _state(ids):
+    names = {org_id: name for name, org_id in ids.items()}
+    async with SessionLocal() as db:
+        notices = (await db.execute(select(PlanExpiryNotice.organization_id, PlanExpiryNotice.notice))).all()
+        emails = (await db.execute(select(EmailOutboxMessage.organization_id, EmailOutboxMessage.kind))).all()
+        statuses = (await db.execute(select(Organization.id, Organization.billing_status))).all()
+    return (
+        {(names[org_id], notice) for org_id, notice in notices},
+        sorted((names[org_id], kind) for org_id, kind in emails),
+        {names[org_id]: status for org_id, status in statuses},
+    )
+
+
+@pytest.fixture
+def email_configured(monkeypatch):
+    monkeypatch.setattr(cron_check_plans.email_outbox, "is_configured", lambda: True)
+
+
+@pytest.mark.asyncio
+async def test_sweep_notifies_each_cohort_once_and_blocks_expired_orgs(email_configured):
+    ids = await _seed(
+        {
+            "five_days": timedelta(days=5, hours=2),
+            "one_day": timedelta(days=1, hours=3),
+            "just_expired": timedelta(hours=-12),
+            "long_expired": timedelta(days=-3),
+            "not_due": timedelta(days=10),
+            "three_days": timedelta(days=3),
+            "no_contact": timedelta(days=1, hours=5),
+            "free": timedelta(hours=-12),
+        },
+        without_contact={"no_contact"},
+        free={"free"},
+    )
+
+    stats = await check_expiring_plans()
+
+    notices, emails, statuses = await _state(ids)
+    assert notices == {("five_days", "warning_5d"), ("one_day", "warning_1d"), ("just_expired", "expired")}
+    assert emails == [
+        ("five_days", "plan_expiry_warning"),
+        ("just_expired", "plan_expired"),
+        ("one_day", "plan_expiry_warning"),
+    ]
+    assert {name for name, status in statuses.items() if status == "blocked"} == {"just_expired", "long_expired"}
+    assert (stats["warning_5d"], stats["warning_1d"], stats["expired"]) == (1, 1, 1)
+    assert stats["no_contact"] == 1 and stats["blocked"] == 2
+
+    # A second run finds every notice in the ledger and nothing left to block.
+    stats = await check_expiring_plans()
+
+    assert await _state(ids) == (notices, emails, statuses)
+    assert (stats["warning_5d"], stats["warning_1d"], stats["expired"], stats["blocked"]) == (0, 0, 0, 0)
+
+
+@pytest.mark.asyncio
+async def test_notice_from_a_previous_access_period_does_not_suppress_the_current_one(email_configured):
+    ids = await _seed({"renewed": timedelta(days=1, hours=3)})
+    async with SessionLocal() as db:
+        org = await db.get(Organization, ids["renewed"])
+        db.add(PlanExpiryNotice(
+            organization_id=org.id, notice="warning_1d", access_ends_at=org.access_ends_at - timedelta(days=30),
+        ))
+        await db.commit()
+
+    stats = await check_expiring_plans()
+
+    async with SessionLocal() as db:
+        periods = (await db.execute(select(PlanExpiryNotice.access_ends_at))).scalars().all()
+    _, emails, _ = await _state(ids)
+    assert len(periods) == 2
+    assert emails == [("renewed", "plan_expiry_warning")]
+    assert stats["warning_1d"] == 1
@@ -0,0 +1,102 @@
+"""
+Bank account balance changes against the database: concurrent deltas,
+the ledger and checkpoints.
+
+Runs against TEST_DATABASE_URI; each test gets a clean public schema from
+app/tests/conftest.py.
+"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.core.base import Base
+from app.db.session import SessionLocal, engine
+from app.models.bank_accounts import BankAccount, BankAccountLedgerEntry
+from app.models.organizations import Organization
+from app.services.financial import bank_account_service
+
+
+@pytest.fixture
+async def account():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    org_id, account_id = uuid4(), uuid4()
+    async with SessionLocal() as db:
+        db.add(Organization(id=org_id, name="Ledger Org", slug=f"ledger-{org_id.hex[:8]}"))
+        await db.flush()
+        db.add(BankAccount(id=account_id, organization_id=org_id, name="Main", balance_cents=0))
+        await db.commit()
+    return org_id, account_id
+
+
+async def _apply(account, delta_cents: int, *, commit: bool = True) -> None:
+    org_id, account_id = account
+    async with SessionLocal() as db:
+        await bank_account_service.apply_balance_delta(
+            db, organization_id=org_id, bank_account_id=account_id, delta_cents=delta_cents, reason="adjustment"
+        )
+        # Hold the row lock across a yield so the other writers queue up behind it.
+        await asyncio.sleep(0)
+        if commit:
+            await db.commit()
+        else:
+            await db.rollback()
+
+
+async def _balance_and_ledger(account):
+    _, account_id = account
+    async with SessionLocal() as db:
+        balance = (await db.execute(
+            select(BankAccount.balance_cents).where(BankAccount.id == account_id)
+        )).scalar_one()
+        entries = (await db.execute(
+            select(BankAccountLedgerEntry)
+            .where(BankAccountLedgerEntry.bank_account_id == account_id)
+            .order_by(BankAccountLedgerEntry.id)
+        )).scalars().all()
+    return balance, entries
+
+
+@pytest.mark.asyncio
+async def test_concurrent_deltas_keep_balance_equal_to_the_ledger(account):
+    deltas = [1000, -250, 75, 5000, -1200, 300, -40, 999, 10, -3000] * 3
+    rolled_back = [7777, -8888]
+
+    await asyncio.gather(
+        *(_apply(account, delta) for delta in deltas),
+        *(_apply(account, delta, commit=False) for delta in rolled_back),
+    )
+
+    balance, entries = await _balance_and_ledger(account)
+    assert balance == sum(deltas)
+    assert sum(entry.delta_cents for entry in entries) == balance
+    assert sorted(entry.delta_cents for entry in entries) == sorted(deltas)
+
+    # Entries chain in id order: every write saw the previous one's balance.
+    running = 0
+    for entry in entries:
+        running += entry.delta_cents
+        assert entry.balance_after_cents == running
+
+
+@pytest.mark.asyncio
+async def test_recompute_from_a_checkpoint_matches_the_stored_balance(account):
+    org_id, account_id = account
+    await asyncio.gather(*(_apply(account, delta) for delta in (500, 700, -100)))
+    async with SessionLocal() as db:
+        checkpoint = await bank_account_service.create_checkpoint(
+            db, organization_id=org_id, bank_account_id=account_id
+        )
+        await db.commit()
+    assert checkpoint.balance_cents == 1100
+
+    await asyncio.gather(*(_apply(account, delta) for delta in (40, -2000, 60)))
+
+    balance, _ = await _balance_and_ledger(account)
+    async with SessionLocal() as db:
+        recomputed = await bank_account_service.recompute_balance(
+            db, organization_id=org_id, bank_account_id=account_id
+        )
+    assert recomputed == balance == -800
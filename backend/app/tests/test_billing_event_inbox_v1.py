@@ -0,0 +1,222 @@
+"""
+Stripe webhook inbox against the database: ingestion, per-customer claiming,
+processing, retries and dead letters.
+
+Runs against TEST_DATABASE_URI; each test gets a clean public schema from
+app/tests/conftest.py.
+"""
+import asyncio
+import json
+from datetime import datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, update
+
+from app.api.v1.endpoints import billing as billing_endpoints
+from app.core.base import Base
+from app.db.session import SessionLocal, engine
+from app.models.billing import BillingEvent
+from app.models.organizations import Organization
+from app.services import billing_events as inbox_module
+from app.services.billing_events import BillingEventService
+
+EVENT_TYPE = "invoice.payment_succeeded"
+CREATED = 1_790_000_000
+
+
+@pytest.fixture(autouse=True)
+async def schema():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+
+
+def _event(event_id, customer="cus_1", *, created=CREATED, **overrides):
+    event = {
+        "id": event_id,
+        "type": EVENT_TYPE,
+        "created": created,
+        "data": {"object": {"object": "invoice", "id": f"in_{event_id}", "customer": customer}},
+    }
+    event.update(overrides)
+    return event
+
+
+async def _ingest(*events, source="billing"):
+    service = BillingEventService()
+    async with SessionLocal() as db:
+        inserted = [await service.ingest(db, event, source=source) for event in events]
+        await db.commit()
+    return inserted
+
+
+async def _rows():
+    """Inbox rows as {external_id: (status, attempts)}."""
+    async with SessionLocal() as db:
+        result = await db.execute(select(BillingEvent.external_id, BillingEvent.status, BillingEvent.attempts))
+        return {external_id: (status, attempts) for external_id, status, attempts in result.all()}
+
+
+def _handle_with(monkeypatch, handler):
+    monkeypatch.setitem(inbox_module._HANDLERS["billing"], EVENT_TYPE, handler)
+
+
+class FakeRequest:
+    def __init__(self, body):
+        self.body_bytes = body
+        self.headers = {"stripe-signature": "t=1,v1=abc"}
+
+    async def body(self):
+        return self.body_bytes
+
+
+@pytest.mark.asyncio
+async def test_webhook_stores_the_event_once_without_running_handlers(monkeypatch):
+    event = _event("evt_1", "cus_9")
+    monkeypatch.setattr(billing_endpoints.settings, "STRIPE_WEBHOOK_SECRET", "whsec_test")
+    monkeypatch.setattr(billing_endpoints.stripe.Webhook, "construct_event", lambda payload, sig, secret: event)
+
+    async def fail(db, data):
+        raise AssertionError("handlers must not run inside the webhook")
+
+    _handle_with(monkeypatch, fail)
+
+    for _ in range(2):
+        async with SessionLocal() as db:
+            response = await billing_endpoints.stripe_webhook(FakeRequest(json.dumps(event).encode()), db=db)
+        assert response["status"] == "success"
+
+    async with SessionLocal() as db:
+        (stored,) = (await db.execute(select(BillingEvent))).scalars().all()
+    assert (stored.external_id, stored.status, stored.source) == ("evt_1", "received", "billing")
+    assert stored.ordering_key == "cus_9"
+    assert stored.payload == event["data"]
+    assert stored.event_created_at == datetime.fromtimestamp(CREATED, tz=timezone.utc)
+    assert stored.attempts == 0
+
+
+@pytest.mark.asyncio
+async def test_redelivery_is_a_no_op_and_connect_events_are_keyed_by_account():
+    assert await _ingest(_event("evt_1")) == [True]
+    assert await _ingest(_event("evt_1")) == [False]
+
+    connect_event = _event(
+        "evt_2", account="acct_7", type="account.updated", data={"object": {"object": "account", "id": "acct_7"}}
+    )
+    assert await _ingest(connect_event, source="connect") == [True]
+
+    async with SessionLocal() as db:
+        keys = dict((await db.execute(select(BillingEvent.external_id, BillingEvent.ordering_key))).all())
+    assert keys == {"evt_1": "cus_1", "evt_2": "acct_7"}
+
+
+@pytest.mark.asyncio
+async def test_claims_take_the_oldest_event_per_customer_and_skip_locked_ones():
+    await _ingest(
+        _event("a2", "cus_a", created=CREATED + 10),
+        _event("a1", "cus_a", created=CREATED),
+        _event("b1", "cus_b", created=CREATED + 5),
+        _event("c1", "cus_c", created=CREATED + 1),
+    )
+    async with SessionLocal() as db:
+        await db.execute(
+            update(BillingEvent)
+            .where(BillingEvent.external_id == "c1")
+            .values(next_attempt_at=datetime.now(timezone.utc) + timedelta(minutes=5))
+        )
+        await db.commit()
+    service = BillingEventService()
+
+    async with SessionLocal() as first, SessionLocal() as second, SessionLocal() as third:
+        claimed = [await service.claim_next(session) for session in (first, second, third)]
+
+    # a2 waits behind a1 (claimed but unfinished) and c1 is backing off.
+    assert [event and event.external_id for event in claimed] == ["a1", "b1", None]
+
+
+@pytest.mark.asyncio
+async def test_processed_event_commits_with_the_handler_writes(monkeypatch):
+    org_id = uuid4()
+    payloads = []
+
+    async def handler(db, data):
+        payloads.append(data)
+        db.add(Organization(id=org_id, name="Handled", slug=f"handled-{org_id.hex[:8]}"))
+
+    _handle_with(monkeypatch, handler)
+    await _ingest(_event("evt_1"))
+
+    assert await BillingEventService().process_next() == "processed"
+    assert await BillingEventService().process_next() is None
+
+    assert payloads == [_event("evt_1")["data"]]
+    assert await _rows() == {"evt_1": ("processed", 1)}
+    async with SessionLocal() as db:
+        assert await db.get(Organization, org_id) is not None
+        event = (await db.execute(select(BillingEvent))).scalar_one()
+    assert event.processed_at is not None and event.last_error is None
+
+
+@pytest.mark.asyncio
+async def test_failures_roll_back_the_handler_back_off_then_dead_letter(monkeypatch):
+    monkeypatch.setattr(inbox_module.settings, "BILLING_EVENT_MAX_ATTEMPTS", 2)
+    org_id = uuid4()
+
+    async def handler(db, data):
+        if data["object"]["id"] == "in_evt_1":
+            db.add(Organization(id=org_id, name="Rolled back", slug=f"rolled-back-{org_id.hex[:8]}"))
+            await db.flush()
+            raise RuntimeError("stripe unavailable")
+
+    _handle_with(monkeypatch, handler)
+    await _ingest(_event("evt_1"), _event("evt_2", created=CREATED + 1))
+    service = BillingEventService()
+
+    assert await service.process_next() == "retried"
+    async with SessionLocal() as db:
+        event = (await db.execute(select(BillingEvent).where(BillingEvent.external_id == "evt_1"))).scalar_one()
+        assert await db.get(Organization, org_id) is None
+    assert (event.status, event.attempts, event.last_error) == ("received", 1, "stripe unavailable")
+    assert event.next_attempt_at > datetime.now(timezone.utc)
+    # Backing off holds back the customer's later event.
+    assert await service.process_next() is None
+
+    async with SessionLocal() as db:
+        await db.execute(update(BillingEvent).where(BillingEvent.external_id == "evt_1").values(next_attempt_at=None))
+        await db.commit()
+
+    assert await service.process_next() == "failed"
+    assert await service.process_next() == "processed"
+    assert await _rows() == {"evt_1": ("failed", 2), "evt_2": ("processed", 1)}
+
+
+@pytest.mark.asyncio
+async def test_parallel_drain_keeps_each_customers_order(monkeypatch):
+    monkeypatch.setattr(inbox_module.settings, "BILLING_EVENT_CONCURRENCY", 4)
+    handled = {}
+
+    async def handler(db, data):
+        invoice = data["object"]
+        await asyncio.sleep(0.01)
+        handled.setdefault(invoice["customer"], []).append(invoice["id"])
+
+    _handle_with(monkeypatch, handler)
+    events = [
+        _event(f"{customer}{n}", f"cus_{customer}", created=CREATED + n)
+        for n in range(3)
+        for customer in ("a", "b", "c")
+    ]
+    await _ingest(*reversed(events))
+
+    # A claimer that finds every due key busy stops, so drain until a pass finds nothing.
+    service, processed = BillingEventService(), 0
+    while True:
+        counts = await service.process_pending()
+        if not any(counts.values()):
+            break
+        assert counts["retried"] == counts["failed"] == 0
+        processed += counts["processed"]
+
+    assert processed == 9
+    assert handled == {f"cus_{customer}": [f"in_{customer}{n}" for n in range(3)] for customer in ("a", "b", "c")}
+    assert set((await _rows()).values()) == {("processed", 1)}
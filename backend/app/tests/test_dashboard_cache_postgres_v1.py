@@ -0,0 +1,50 @@
+"""
+Shared (postgres) dashboard cache generation tests.
+
+Runs against TEST_DATABASE_URI; each test gets a clean public schema from
+app/tests/conftest.py.
+"""
+from uuid import uuid4
+
+import pytest
+
+from app.core.base import Base
+from app.db.session import SessionLocal, engine
+from app.models.organizations import Organization
+from app.services.dashboard_cache import PostgresDashboardCache
+
+
+@pytest.fixture
+async def organization_id():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    org_id = uuid4()
+    async with SessionLocal() as db:
+        db.add(Organization(id=org_id, name="Dashboard Cache Org", slug=f"dashboard-cache-{org_id.hex[:8]}"))
+        await db.commit()
+    return org_id
+
+
+@pytest.mark.asyncio
+async def test_build_started_before_another_process_invalidates_is_not_stored(organization_id):
+    # Two backends stand in for two worker processes sharing the table.
+    builder, writer = PostgresDashboardCache(ttl=60), PostgresDashboardCache(ttl=60)
+
+    generation = await builder.generation(organization_id, "financial")
+    await writer.invalidate(organization_id, ["financial"])
+    await builder.set(organization_id, "financial", "-", {"revenue_cents": 1}, generation)
+
+    assert await builder.get(organization_id, "financial", "-") is None
+    assert await builder.generation(organization_id, "financial") == generation + 1
+
+
+@pytest.mark.asyncio
+async def test_entry_stored_before_an_invalidation_is_deleted_by_it(organization_id):
+    cache = PostgresDashboardCache(ttl=60)
+
+    generation = await cache.generation(organization_id, "financial")
+    await cache.set(organization_id, "financial", "-", {"revenue_cents": 1}, generation)
+    assert await cache.get(organization_id, "financial", "-") == {"revenue_cents": 1}
+
+    await cache.invalidate(organization_id, ["financial", "trends"])
+    assert await cache.get(organization_id, "financial", "-") is None
@@ -0,0 +1,228 @@
+"""
+Transactional email outbox against the database: queueing, claims and leases,
+delivery, retries and batch idempotency keys.
+
+Runs against TEST_DATABASE_URI; each test gets a clean public schema from
+app/tests/conftest.py.
+"""
+import json
+from datetime import date, datetime, timedelta, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, update
+
+from app.api.v1.endpoints import financial as financial_endpoints
+from app.core.base import Base
+from app.db.session import SessionLocal, engine
+from app.models.clients import Client
+from app.models.emails import EmailOutboxMessage
+from app.models.financial import Invoice
+from app.models.organizations import Organization
+from app.services import email_outbox as outbox_module
+from app.services.email_outbox import DeliveryResult, EmailOutboxService, FileTransport
+
+
+@pytest.fixture
+async def organization_id():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    org_id = uuid4()
+    async with SessionLocal() as db:
+        db.add(Organization(id=org_id, name="Outbox Org", slug=f"outbox-{org_id.hex[:8]}"))
+        await db.commit()
+    return org_id
+
+
+class RecordingTransport:
+    """Records each send as [(outbox id, batch key)] and reports every email sent."""
+
+    max_batch = 100
+
+    def __init__(self, results=None):
+        self.sends = []
+        self.results = results
+
+    async def send(self, messages):
+        self.sends.append([(m.id, m.batch_key) for m in messages])
+        if self.results is not None:
+            return [self.results[m.subject] for m in messages]
+        return [DeliveryResult(provider_message_id=f"re_{m.id}") for m in messages]
+
+
+async def _enqueue(organization_id, *subjects, attachments=None):
+    async with SessionLocal() as db:
+        ids = [
+            await outbox_module.email_outbox.enqueue(
+                db,
+                kind="notice",
+                organization_id=organization_id,
+                to="client@example.com",
+                subject=subject,
+                html="<p>Hi</p>",
+                attachments=attachments,
+            )
+            for subject in subjects
+        ]
+        await db.commit()
+    return ids
+
+
+async def _rows():
+    async with SessionLocal() as db:
+        result = await db.execute(select(EmailOutboxMessage))
+        return {row.id: row for row in result.scalars().all()}
+
+
+async def _claim(service, limit=100):
+    async with SessionLocal() as db:
+        claimed = await service.claim(db, limit)
+        await db.commit()
+    return claimed
+
+
+async def _expire_leases():
+    async with SessionLocal() as db:
+        await db.execute(
+            update(EmailOutboxMessage)
+            .where(EmailOutboxMessage.status == "sending")
+            .values(locked_until=datetime.now(timezone.utc) - timedelta(seconds=1))
+        )
+        await db.commit()
+
+
+@pytest.mark.asyncio
+async def test_invoice_send_only_queues_the_email(organization_id, monkeypatch):
+    async def no_render(*args, **kwargs):
+        raise AssertionError("the PDF is rendered by the delivery worker")
+
+    monkeypatch.setattr(outbox_module.email_outbox, "_transport", FileTransport("billing@example.com", "unused"))
+    monkeypatch.setattr("app.services.invoice_pdf.invoice_pdf_service.generate_pdf", no_render)
+    async with SessionLocal() as db:
+        client = Client(organization_id=organization_id, name="Client")
+        db.add(client)
+        await db.flush()
+        invoice = Invoice(
+            organization_id=organization_id,
+            client_id=client.id,
+            invoice_number="2026-0042",
+            subtotal_cents=100,
+            total_amount_cents=100,
+            due_date=date(2026, 3, 1),
+        )
+        db.add(invoice)
+        await db.commit()
+    body = financial_endpoints.SendInvoiceEmailRequest(
+        recipient_email="client@example.com", subject="Invoice", message="Hi\nthere"
+    )
+
+    async with SessionLocal() as db:
+        response = await financial_endpoints.send_invoice_email(
+            invoice.id, body, organization_id=organization_id, db=db
+        )
+        await db.commit()
+
+    assert response["status"] == "queued"
+    (email,) = (await _rows()).values()
+    assert (email.kind, email.status, email.to_addresses) == ("invoice", "queued", ["client@example.com"])
+    assert email.attachments == [{
+        "type": "invoice_pdf", "invoice_id": str(invoice.id), "filename": "invoice_2026-0042.pdf", "locale": "pt-BR",
+    }]
+    async with SessionLocal() as db:
+        assert (await db.get(Invoice, invoice.id)).status == "sent"
+
+
+@pytest.mark.asyncio
+async def test_delivery_renders_attachments_and_settles_the_rows(organization_id, monkeypatch, tmp_path):
+    async def build_pdf(db, organization_id, spec):
+        return spec["filename"], b"%PDF-1.7"
+
+    monkeypatch.setitem(outbox_module.ATTACHMENT_BUILDERS, "invoice_pdf", build_pdf)
+    spec = {"type": "invoice_pdf", "invoice_id": str(uuid4()), "filename": "i.pdf"}
+    (invoice_email,) = await _enqueue(organization_id, "Invoice", attachments=[spec])
+    (notice,) = await _enqueue(organization_id, "Notice")
+    service = EmailOutboxService(transport=FileTransport("billing@example.com", str(tmp_path)))
+
+    counts = await service.deliver_pending()
+
+    assert counts == {"sent": 2, "retried": 0, "failed": 0}
+    captured = json.loads((tmp_path / f"{invoice_email}.json").read_text())
+    assert captured["to"] == ["client@example.com"]
+    assert captured["attachments"][0]["filename"] == "i.pdf"
+    rows = await _rows()
+    for email_id in (invoice_email, notice):
+        row = rows[email_id]
+        assert (row.status, row.attempts, row.provider_message_id) == ("sent", 1, f"file:{email_id}.json")
+        assert row.sent_at is not None and row.locked_until is None and row.batch_key is None
+    assert await service.deliver_pending() == {"sent": 0, "retried": 0, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_transient_failures_retry_and_rejections_fail(organization_id, monkeypatch):
+    monkeypatch.setattr(outbox_module.settings, "EMAIL_MAX_ATTEMPTS", 3)
+    transient, rejected, exhausted = await _enqueue(organization_id, "transient", "rejected", "exhausted")
+    async with SessionLocal() as db:
+        await db.execute(update(EmailOutboxMessage).where(EmailOutboxMessage.id == exhausted).values(attempts=2))
+        await db.commit()
+    transport = RecordingTransport({
+        "transient": DeliveryResult(error="timeout"),
+        "rejected": DeliveryResult(error="Invalid `to` field", permanent=True),
+        "exhausted": DeliveryResult(error="timeout"),
+    })
+
+    counts = await EmailOutboxService(transport=transport).deliver_pending()
+
+    assert counts == {"sent": 0, "retried": 1, "failed": 2}
+    rows = await _rows()
+    assert (rows[transient].status, rows[transient].attempts, rows[transient].last_error) == ("queued", 1, "timeout")
+    assert rows[transient].next_attempt_at > datetime.now(timezone.utc)
+    assert (rows[rejected].status, rows[rejected].attempts) == ("failed", 1)
+    assert (rows[exhausted].status, rows[exhausted].attempts) == ("failed", 3)
+    # The retry is not due yet.
+    assert await EmailOutboxService(transport=transport).deliver_pending() == {"sent": 0, "retried": 0, "failed": 0}
+
+
+@pytest.mark.asyncio
+async def test_expired_lease_resends_the_whole_batch_under_its_key(organization_id):
+    first, second = await _enqueue(organization_id, "one", "two")
+    transport = RecordingTransport()
+    service = EmailOutboxService(transport=transport)
+
+    # A worker claims the batch and dies before settling it.
+    claimed = await _claim(service)
+    (batch_key,) = {message.batch_key for message in claimed}
+    assert batch_key and {message.id for message in claimed} == {first, second}
+    await _expire_leases()
+    (fresh,) = await _enqueue(organization_id, "three")
+
+    async with SessionLocal() as db:
+        # The batch is taken over whole, even past the limit.
+        retried = await service.claim(db, 1)
+        await db.rollback()
+    assert {(m.id, m.batch_key) for m in retried} == {(first, batch_key), (second, batch_key)}
+
+    counts = await service.deliver_pending()
+
+    assert counts == {"sent": 3, "retried": 0, "failed": 0}
+    sent = dict(pair for send in transport.sends for pair in send)
+    assert sent[first] == sent[second] == batch_key
+    assert sent[fresh] not in (None, batch_key)
+    assert {row.batch_key for row in (await _rows()).values()} == {None}
+
+
+@pytest.mark.asyncio
+async def test_batch_partly_locked_elsewhere_is_left_for_a_later_claim(organization_id):
+    ids = await _enqueue(organization_id, "one", "two", "three")
+    service = EmailOutboxService(transport=RecordingTransport())
+    await _claim(service)
+    await _expire_leases()
+
+    async with SessionLocal() as other_worker:
+        await other_worker.execute(
+            select(EmailOutboxMessage).where(EmailOutboxMessage.id == ids[0]).with_for_update()
+        )
+        assert await _claim(service) == []
+
+    retried = await _claim(service)
+    assert {m.id for m in retried} == set(ids)
+    assert len({m.batch_key for m in retried}) == 1
@@ -0,0 +1,106 @@
+"""
+Invoice number allocation tests against the per-org, per-year counter table.
+
+Runs against TEST_DATABASE_URI; each test gets a clean public schema from
+app/tests/conftest.py.
+"""
+import asyncio
+from datetime import date
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select
+
+from app.core.base import Base
+from app.db.session import SessionLocal, engine
+from app.models.clients import Client
+from app.models.financial import Invoice, InvoiceNumberSequence
+from app.models.organizations import Organization
+from app.services.financial_advanced import invoice_service
+
+ISSUE_DATE = date(2026, 3, 1)
+
+
+@pytest.fixture
+async def organization_id():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    org_id = uuid4()
+    async with SessionLocal() as db:
+        db.add(Organization(id=org_id, name="Invoice Numbers Org", slug=f"invoice-numbers-{org_id.hex[:8]}"))
+        await db.commit()
+    return org_id
+
+
+async def _allocate(organization_id) -> str:
+    async with SessionLocal() as db:
+        number = await invoice_service._generate_invoice_number(db, organization_id, issue_date=ISSUE_DATE)
+        await db.commit()
+    return number
+
+
+async def _counter(organization_id, year=ISSUE_DATE.year):
+    async with SessionLocal() as db:
+        result = await db.execute(
+            select(InvoiceNumberSequence.last_value).where(
+                InvoiceNumberSequence.organization_id == organization_id,
+                InvoiceNumberSequence.year == year,
+            )
+        )
+        return result.scalar_one_or_none()
+
+
+@pytest.mark.asyncio
+async def test_concurrent_allocations_get_distinct_consecutive_numbers(organization_id):
+    numbers = await asyncio.gather(*(_allocate(organization_id) for _ in range(10)))
+
+    prefix = f"INV-2026-{organization_id.hex[:8].upper()}-"
+    assert all(number.startswith(prefix) for number in numbers)
+    assert sorted(int(number.rsplit("-", 1)[1]) for number in numbers) == list(range(1, 11))
+    assert await _counter(organization_id) == 10
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_invoice_gives_its_number_back(organization_id):
+    assert await _allocate(organization_id) == f"INV-2026-{organization_id.hex[:8].upper()}-001"
+
+    async with SessionLocal() as db:
+        abandoned = await invoice_service._generate_invoice_number(db, organization_id, issue_date=ISSUE_DATE)
+        await db.rollback()
+
+    assert abandoned.endswith("-002")
+    assert await _allocate(organization_id) == abandoned
+
+
+@pytest.mark.asyncio
+async def test_sync_raises_counters_to_issued_numbers_and_never_lowers_them(organization_id):
+    other_org_id = uuid4()
+    prefix = organization_id.hex[:8].upper()
+    async with SessionLocal() as db:
+        db.add(Organization(id=other_org_id, name="Other Org", slug=f"invoice-numbers-{other_org_id.hex[:8]}"))
+        client = Client(organization_id=organization_id, name="Client")
+        db.add(client)
+        await db.flush()
+        for number in (f"INV-2025-{prefix}-041", f"INV-2026-{prefix}-007", f"INV-2026-{prefix}"):
+            db.add(Invoice(
+                organization_id=organization_id,
+                client_id=client.id,
+                invoice_number=number,
+                subtotal_cents=100,
+                total_amount_cents=100,
+                due_date=ISSUE_DATE,
+            ))
+        # 2026 is already ahead of the issued numbers.
+        db.add(InvoiceNumberSequence(organization_id=organization_id, year=2026, last_value=12))
+        db.add(InvoiceNumberSequence(organization_id=other_org_id, year=2026, last_value=3))
+        await db.commit()
+
+    async with SessionLocal() as db:
+        counters = await invoice_service.sync_invoice_number_sequences(db, organization_id=organization_id)
+        await db.commit()
+
+    assert {(row["year"], row["last_value"]) for row in counters} == {(2025, 41), (2026, 12)}
+    assert await _counter(organization_id, 2025) == 41
+    assert await _counter(organization_id, 2026) == 12
+    assert await _counter(other_org_id, 2026) == 3
+    assert (await _allocate(organization_id)).endswith("-013")
@@ -0,0 +1,69 @@
+"""
+Per-organization active job limits checked under the advisory lock.
+
+Runs against TEST_DATABASE_URI; each test gets a clean public schema from
+app/tests/conftest.py.
+"""
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.core.base import Base
+from app.db.session import SessionLocal, engine
+from app.models.organizations import Organization
+from app.services.job_queue import job_queue
+from app.services.script_analysis import SCRIPT_ANALYSIS_JOB, SCRIPT_ANALYSIS_QUEUE
+
+LIMIT = 2
+
+
+@pytest.fixture
+async def organization_id():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    org_id = uuid4()
+    async with SessionLocal() as db:
+        db.add(Organization(id=org_id, name="Job Limits Org", slug=f"job-limits-{org_id.hex[:8]}"))
+        await db.commit()
+    return org_id
+
+
+async def _start_analysis(organization_id) -> bool:
+    """The analyze-script check-then-enqueue, with a pause between the two."""
+    async with SessionLocal() as db:
+        active = await job_queue.count_active(
+            db, organization_id=organization_id, name=SCRIPT_ANALYSIS_JOB, lock=True
+        )
+        if active >= LIMIT:
+            await db.rollback()
+            return False
+        await asyncio.sleep(0.05)
+        await job_queue.enqueue(
+            db, SCRIPT_ANALYSIS_JOB, {}, organization_id=organization_id, queue=SCRIPT_ANALYSIS_QUEUE
+        )
+        await db.commit()
+    return True
+
+
+@pytest.mark.asyncio
+async def test_concurrent_requests_cannot_exceed_the_active_limit(organization_id):
+    started = await asyncio.gather(*(_start_analysis(organization_id) for _ in range(5)))
+
+    assert started.count(True) == LIMIT
+    async with SessionLocal() as db:
+        assert await job_queue.count_active(db, organization_id=organization_id, name=SCRIPT_ANALYSIS_JOB) == LIMIT
+
+
+@pytest.mark.asyncio
+async def test_limits_are_per_organization(organization_id):
+    other_org_id = uuid4()
+    async with SessionLocal() as db:
+        db.add(Organization(id=other_org_id, name="Other Org", slug=f"job-limits-{other_org_id.hex[:8]}"))
+        await db.commit()
+
+    started = await asyncio.gather(
+        *(_start_analysis(org_id) for org_id in (organization_id, other_org_id) for _ in range(3))
+    )
+
+    assert started.count(True) == 2 * LIMIT
@@ -0,0 +1,134 @@
+"""
+Keyset pagination and streaming in BaseService against real transaction rows,
+including equal and NULL sort keys.
+
+Runs against TEST_DATABASE_URI; each test gets a clean public schema from
+app/tests/conftest.py.
+"""
+import base64
+from datetime import date, datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.base import Base
+from app.db.session import SessionLocal, engine
+from app.models.bank_accounts import BankAccount
+from app.models.organizations import Organization
+from app.models.transactions import Transaction
+from app.services.financial import transaction_service
+
+NOON = datetime(2026, 5, 10, 12, tzinfo=timezone.utc)
+# (transaction_date, created_at) per row; several rows share a sort key.
+SORT_KEYS = [
+    (None, None),
+    (None, None),
+    (None, NOON),
+    (date(2026, 5, 10), None),
+    (date(2026, 5, 10), NOON),
+    (date(2026, 5, 10), NOON),
+    (date(2026, 5, 10), NOON),
+    (date(2026, 5, 9), NOON),
+    (date(2026, 5, 8), NOON),
+]
+
+
+@pytest.fixture
+async def org():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    org_id, other_org_id = uuid4(), uuid4()
+    rows = []
+    async with SessionLocal() as db:
+        for organization_id in (org_id, other_org_id):
+            db.add(Organization(id=organization_id, name="Keyset Org", slug=f"keyset-{organization_id.hex[:8]}"))
+        await db.flush()
+        accounts = {
+            organization_id: BankAccount(organization_id=organization_id, name="Main")
+            for organization_id in (org_id, other_org_id)
+        }
+        db.add_all(accounts.values())
+        await db.flush()
+        for transaction_date, created_at in SORT_KEYS:
+            transaction = Transaction(
+                organization_id=org_id,
+                bank_account_id=accounts[org_id].id,
+                category="other",
+                type="expense",
+                amount_cents=100,
+                transaction_date=transaction_date,
+                created_at=created_at,
+            )
+            db.add(transaction)
+            rows.append(transaction)
+        db.add(Transaction(
+            organization_id=other_org_id,
+            bank_account_id=accounts[other_org_id].id,
+            category="other",
+            type="expense",
+            amount_cents=100,
+            transaction_date=None,
+            created_at=None,
+        ))
+        await db.commit()
+    return SimpleNamespace(id=org_id, expected=[row.id for row in sorted(rows, key=_listing_key, reverse=True)])
+
+
+def _listing_key(row):
+    # Sorted in reverse: ORDER BY transaction_date DESC, created_at DESC, id DESC,
+    # where Postgres puts NULLs first.
+    return (row.transaction_date is None, row.transaction_date, row.created_at is None, row.created_at, row.id)
+
+
+async def _walk(organization_id, limit):
+    ids, cursor, pages = [], None, 0
+    while True:
+        async with SessionLocal() as db:
+            page, cursor = await transaction_service.get_page(
+                db, organization_id=organization_id, cursor=cursor, limit=limit
+            )
+        ids.extend(transaction.id for transaction in page)
+        pages += 1
+        if cursor is None:
+            return ids, pages
+
+
+@pytest.mark.asyncio
+@pytest.mark.parametrize("limit", [1, 2, 3, 4, len(SORT_KEYS), len(SORT_KEYS) + 1])
+async def test_pages_cover_every_row_once_in_listing_order(org, limit):
+    ids, pages = await _walk(org.id, limit)
+
+    assert ids == org.expected
+    assert pages == max(1, -(-len(SORT_KEYS) // limit))
+
+
+@pytest.mark.asyncio
+async def test_cursor_on_a_null_sort_key_continues_with_the_next_rows(org):
+    async with SessionLocal() as db:
+        first, cursor = await transaction_service.get_page(db, organization_id=org.id, limit=1)
+        assert first[0].transaction_date is None and first[0].created_at is None
+        rest, _ = await transaction_service.get_page(db, organization_id=org.id, cursor=cursor, limit=100)
+
+    assert [transaction.id for transaction in first + rest] == org.expected
+
+
+@pytest.mark.asyncio
+async def test_stream_yields_rows_in_listing_order(org):
+    async with SessionLocal() as db:
+        streamed = [
+            transaction.id
+            async for transaction in transaction_service.stream(db, organization_id=org.id, batch_size=2)
+        ]
+
+    assert streamed == org.expected
+
+
+@pytest.mark.asyncio
+async def test_malformed_cursor_is_a_value_error(org):
+    wrong_types = base64.urlsafe_b64encode(b'["yesterday", "noon", "abc"]').decode()
+    null_id = base64.urlsafe_b64encode(b'[null, null, null]').decode()
+    async with SessionLocal() as db:
+        for cursor in ("not-a-cursor", "W10", wrong_types, null_id):
+            with pytest.raises(ValueError, match="Invalid pagination cursor"):
+                await transaction_service.get_page(db, organization_id=org.id, cursor=cursor)
@@ -0,0 +1,176 @@
+"""
+Monthly financial rollup against the database: transaction writes, invoice
+deletion and the nightly verify/rebuild.
+
+Runs against TEST_DATABASE_URI; each test gets a clean public schema from
+app/tests/conftest.py.
+"""
+from datetime import date
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import select, update
+
+from app.core.base import Base
+from app.db.session import SessionLocal, engine
+from app.models.bank_accounts import BankAccount
+from app.models.clients import Client
+from app.models.financial import Invoice
+from app.models.organizations import Organization
+from app.models.profiles import Profile
+from app.models.transactions import OrgMonthlyFinancial, Transaction
+from app.schemas.transactions import TransactionCreate
+from app.services.financial import transaction_service
+from app.services.financial_advanced import invoice_service
+from app.services.financial_rollup import financial_rollup_service
+from app.services.job_tasks import verify_monthly_rollup_job
+
+MARCH, APRIL = date(2026, 3, 1), date(2026, 4, 1)
+
+
+@pytest.fixture
+async def org():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    org_id, account_id, approver_id, client_id = uuid4(), uuid4(), uuid4(), uuid4()
+    async with SessionLocal() as db:
+        db.add(Organization(id=org_id, name="Rollup Org", slug=f"rollup-{org_id.hex[:8]}"))
+        await db.flush()
+        db.add(BankAccount(id=account_id, organization_id=org_id, name="Main", balance_cents=0))
+        db.add(Profile(id=approver_id, organization_id=org_id, email=f"{approver_id.hex[:8]}@test.com"))
+        db.add(Client(id=client_id, organization_id=org_id, name="Client"))
+        await db.commit()
+    return SimpleNamespace(id=org_id, account_id=account_id, approver_id=approver_id, client_id=client_id)
+
+
+async def _create(org, *, type, category, amount_cents, on, invoice_id=None) -> Transaction:
+    async with SessionLocal() as db:
+        transaction = await transaction_service.create(
+            db,
+            organization_id=org.id,
+            obj_in=TransactionCreate(
+                bank_account_id=org.account_id,
+                category=category,
+                type=type,
+                amount_cents=amount_cents,
+                transaction_date=on,
+                invoice_id=invoice_id,
+            ),
+        )
+        await db.commit()
+    return transaction
+
+
+async def _approve(org, transaction_id) -> None:
+    async with SessionLocal() as db:
+        await transaction_service.approve(
+            db, organization_id=org.id, transaction_id=transaction_id, approver_id=org.approver_id
+        )
+        await db.commit()
+
+
+async def _remove(org, transaction_id) -> None:
+    async with SessionLocal() as db:
+        await transaction_service.remove(db, organization_id=org.id, id=transaction_id)
+        await db.commit()
+
+
+async def _rollup(org):
+    """Non-empty rollup rows as {(month, type, category): (amount_cents, transaction_count)}."""
+    async with SessionLocal() as db:
+        rows = (await db.execute(
+            select(OrgMonthlyFinancial).where(OrgMonthlyFinancial.organization_id == org.id)
+        )).scalars().all()
+    return {
+        (row.month, row.type, row.category): (row.amount_cents, row.transaction_count)
+        for row in rows
+        if row.transaction_count
+    }
+
+
+@pytest.mark.asyncio
+async def test_only_applied_transactions_reach_their_month(org):
+    await _create(org, type="income", category="production_revenue", amount_cents=90_000, on=date(2026, 3, 5))
+    crew = await _create(org, type="expense", category="crew_hire", amount_cents=12_500, on=date(2026, 3, 17))
+    pending = await _create(org, type="expense", category="crew_hire", amount_cents=4_000, on=date(2026, 3, 20))
+    april = await _create(org, type="expense", category="logistics", amount_cents=7_000, on=date(2026, 4, 2))
+
+    # Expenses wait for approval; income is applied on creation.
+    assert await _rollup(org) == {(MARCH, "income", "production_revenue"): (90_000, 1)}
+
+    await _approve(org, crew.id)
+    await _approve(org, april.id)
+    await _remove(org, pending.id)
+    await _remove(org, april.id)
+
+    assert await _rollup(org) == {
+        (MARCH, "income", "production_revenue"): (90_000, 1),
+        (MARCH, "expense", "crew_hire"): (12_500, 1),
+    }
+    async with SessionLocal() as db:
+        stats = await transaction_service.get_monthly_stats(db, organization_id=org.id, year=2026, month=3)
+        assert (stats["total_income_cents"], stats["net_balance_cents"]) == (90_000, 77_500)
+        assert await financial_rollup_service.find_mismatches(db, organization_id=org.id) == []
+
+
+@pytest.mark.asyncio
+async def test_invoice_delete_reverses_its_transactions(org):
+    async with SessionLocal() as db:
+        invoice = Invoice(
+            organization_id=org.id,
+            client_id=org.client_id,
+            invoice_number="INV-2026-0001",
+            subtotal_cents=50_000,
+            total_amount_cents=50_000,
+            due_date=date(2026, 3, 31),
+        )
+        db.add(invoice)
+        await db.commit()
+    await _create(
+        org, type="income", category="production_revenue", amount_cents=50_000, on=date(2026, 3, 10),
+        invoice_id=invoice.id,
+    )
+    assert await _rollup(org) == {(MARCH, "income", "production_revenue"): (50_000, 1)}
+
+    async with SessionLocal() as db:
+        await invoice_service.remove(db, organization_id=org.id, id=invoice.id)
+        await db.commit()
+
+    assert await _rollup(org) == {}
+    async with SessionLocal() as db:
+        assert (await db.execute(select(Transaction.id))).all() == []
+        assert await financial_rollup_service.find_mismatches(db, organization_id=org.id) == []
+
+
+@pytest.mark.asyncio
+async def test_nightly_verify_rebuilds_a_drifted_rollup(org):
+    await _create(org, type="income", category="production_revenue", amount_cents=10_000, on=date(2026, 3, 5))
+    async with SessionLocal() as db:
+        # A corrupted row, and a transaction written around the service.
+        await db.execute(
+            update(OrgMonthlyFinancial)
+            .where(OrgMonthlyFinancial.organization_id == org.id)
+            .values(amount_cents=1)
+        )
+        db.add(Transaction(
+            organization_id=org.id,
+            bank_account_id=org.account_id,
+            category="logistics",
+            type="expense",
+            amount_cents=3_000,
+            transaction_date=date(2026, 4, 8),
+            payment_status="paid",
+        ))
+        await db.commit()
+        mismatches = await financial_rollup_service.find_mismatches(db, organization_id=org.id)
+    assert {(row["month"], row["type"]) for row in mismatches} == {(MARCH, "income"), (APRIL, "expense")}
+
+    result = await verify_monthly_rollup_job(None)
+
+    assert result == {"mismatched_rows": 2, "rebuilt_organizations": 1}
+    assert await _rollup(org) == {
+        (MARCH, "income", "production_revenue"): (10_000, 1),
+        (APRIL, "expense", "logistics"): (3_000, 1),
+    }
+    assert await verify_monthly_rollup_job(None) == {"mismatched_rows": 0, "rebuilt_organizations": 0}
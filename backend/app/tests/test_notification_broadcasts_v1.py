@@ -0,0 +1,88 @@
+"""
+Notification WebSocket broadcasts wait for the creating transaction to commit.
+
+Runs against TEST_DATABASE_URI; each test gets a clean public schema from
+app/tests/conftest.py.
+"""
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+
+from app.core import websocket_manager as ws_module
+from app.core.base import Base
+from app.core.pubsub import InMemoryBroker
+from app.core.websocket_manager import NotificationConnectionManager
+from app.db.session import SessionLocal, engine
+from app.models.organizations import Organization
+from app.models.profiles import Profile
+from app.services.notifications import notification_service
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+async def _drain():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.fixture
+async def recipient(monkeypatch):
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    org_id, profile_id = uuid4(), uuid4()
+    async with SessionLocal() as db:
+        db.add(Organization(id=org_id, name="Notifications Org", slug=f"notifications-{org_id.hex[:8]}"))
+        await db.flush()
+        db.add(Profile(id=profile_id, organization_id=org_id, email=f"{profile_id.hex[:8]}@test.com"))
+        await db.commit()
+
+    manager = NotificationConnectionManager(broker=InMemoryBroker())
+    monkeypatch.setattr(ws_module, "notification_ws_manager", manager)
+    socket = FakeWebSocket()
+    await manager.connect(socket, org_id, profile_id)
+    yield org_id, profile_id, socket
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_notification_is_broadcast_only_after_commit(recipient):
+    org_id, profile_id, socket = recipient
+
+    async with SessionLocal() as db:
+        for title in ("first", "second"):
+            await notification_service.create_for_user(
+                db=db, organization_id=org_id, profile_id=profile_id, title=title, message="m"
+            )
+        await _drain()
+        assert socket.sent == []
+
+        await db.commit()
+    await _drain()
+
+    assert [message["data"]["title"] for message in socket.sent] == ["first", "second"]
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_notification_is_never_broadcast(recipient):
+    org_id, profile_id, socket = recipient
+
+    async with SessionLocal() as db:
+        await notification_service.create_many(
+            db=db, recipients=[(org_id, profile_id)], title="t", message="m"
+        )
+        await db.rollback()
+        await db.commit()
+    await _drain()
+
+    assert socket.sent == []
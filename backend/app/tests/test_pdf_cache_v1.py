@@ -0,0 +1,87 @@
+"""
+Content-addressed PDF cache tests: which stored document an entity serves.
+
+Runs against TEST_DATABASE_URI; each test gets a clean public schema from
+app/tests/conftest.py.
+"""
+from uuid import uuid4
+
+import pytest
+
+from app.core.base import Base
+from app.db.session import SessionLocal, engine
+from app.models.organizations import Organization
+from app.services.pdf_cache import pdf_cache_service
+
+ENTITY_ID = uuid4()
+
+
+@pytest.fixture
+async def organization_id():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    org_id = uuid4()
+    async with SessionLocal() as db:
+        db.add(Organization(id=org_id, name="PDF Cache Org", slug=f"pdf-cache-{org_id.hex[:8]}"))
+        await db.commit()
+    return org_id
+
+
+async def _generate(organization_id, content_hash: str) -> str:
+    """Mirror generate_and_store: reuse a stored PDF for the hash or record a new one."""
+    async with SessionLocal() as db:
+        key = dict(organization_id=organization_id, entity_type="invoice", entity_id=ENTITY_ID)
+        cached = await pdf_cache_service.find(db, content_hash=content_hash, **key)
+        if cached:
+            await pdf_cache_service.mark_used(db, cached)
+            file_path = cached.file_path
+        else:
+            file_path = f"{organization_id}/invoices/{content_hash}.pdf"
+            await pdf_cache_service.record(
+                db,
+                content_hash=content_hash,
+                upload_result={"bucket": "documents", "file_path": file_path, "size_bytes": 10},
+                filename=f"{content_hash}.pdf",
+                **key,
+            )
+        await db.commit()
+    return file_path
+
+
+async def _latest_path(organization_id) -> str:
+    async with SessionLocal() as db:
+        latest = await pdf_cache_service.find_latest(
+            db, organization_id=organization_id, entity_type="invoice", entity_id=ENTITY_ID
+        )
+    return latest.file_path
+
+
+@pytest.mark.asyncio
+async def test_content_reverting_to_an_earlier_hash_serves_that_document_again(organization_id):
+    path_a = await _generate(organization_id, "a" * 64)
+    path_b = await _generate(organization_id, "b" * 64)
+    assert await _latest_path(organization_id) == path_b
+
+    assert await _generate(organization_id, "a" * 64) == path_a
+    assert await _latest_path(organization_id) == path_a
+
+
+@pytest.mark.asyncio
+async def test_recording_already_stored_content_marks_it_latest(organization_id):
+    path_a = await _generate(organization_id, "a" * 64)
+    await _generate(organization_id, "b" * 64)
+
+    # A concurrent render of A lost the race to find() and records it again.
+    async with SessionLocal() as db:
+        await pdf_cache_service.record(
+            db,
+            organization_id=organization_id,
+            entity_type="invoice",
+            entity_id=ENTITY_ID,
+            content_hash="a" * 64,
+            upload_result={"bucket": "documents", "file_path": "duplicate.pdf", "size_bytes": 10},
+            filename="duplicate.pdf",
+        )
+        await db.commit()
+
+    assert await _latest_path(organization_id) == path_a
@@ -0,0 +1,247 @@
+"""
+Per-project counters against the database: scene and shooting-day writes,
+batch reads and rebuilds.
+
+Runs against TEST_DATABASE_URI; each test gets a clean public schema from
+app/tests/conftest.py.
+"""
+from datetime import date, time
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy import delete, func, select, update
+
+from app.api.v1.endpoints import projects as projects_endpoints
+from app.core.base import Base
+from app.db.session import SessionLocal, engine
+from app.models.clients import Client
+from app.models.organizations import Organization
+from app.models.production import Scene
+from app.models.projects import Project, ProjectCounters
+from app.models.scheduling import ShootingDay
+from app.schemas.production import SceneCreate, ShootingDayCreate
+from app.services.production import scene_service, shooting_day_service
+from app.services.project_stats import project_stats_service
+
+
+async def _organization(name):
+    org_id = uuid4()
+    async with SessionLocal() as db:
+        db.add(Organization(id=org_id, name=name, slug=f"project-stats-{org_id.hex[:8]}"))
+        await db.flush()
+        client = Client(organization_id=org_id, name="Client")
+        db.add(client)
+        await db.flush()
+        projects = [Project(organization_id=org_id, client_id=client.id, title=f"Project {n}") for n in range(3)]
+        db.add_all(projects)
+        await db.commit()
+    return SimpleNamespace(id=org_id, project_ids=[project.id for project in projects])
+
+
+@pytest.fixture
+async def orgs():
+    async with engine.begin() as conn:
+        await conn.run_sync(Base.metadata.create_all)
+    return await _organization("Stats Org"), await _organization("Other Stats Org")
+
+
+async def _stats(org):
+    async with SessionLocal() as db:
+        return await project_stats_service.get_many(db, organization_id=org.id, project_ids=org.project_ids)
+
+
+async def _source_counts(org):
+    """The stats counted straight from the scene and shooting-day tables."""
+    async with SessionLocal() as db:
+        counts = {}
+        for project_id in org.project_ids:
+            scenes = await db.scalar(select(func.count()).select_from(Scene).where(Scene.project_id == project_id))
+            days = await db.scalar(
+                select(func.count()).select_from(ShootingDay).where(ShootingDay.project_id == project_id)
+            )
+            confirmed = await db.scalar(
+                select(func.count()).select_from(ShootingDay).where(
+                    ShootingDay.project_id == project_id, ShootingDay.status == "confirmed"
+                )
+            )
+            counts[project_id] = {
+                "scenes_count": scenes,
+                "characters_count": 0,
+                "shooting_days_count": days,
+                "confirmed_shooting_days_count": confirmed,
+                "team_count": 0,
+            }
+        return counts
+
+
+async def _write(org, service, method, **kwargs):
+    async with SessionLocal() as db:
+        obj = await getattr(service, method)(db, organization_id=org.id, **kwargs)
+        await db.commit()
+    return obj
+
+
+async def _create_scene(org, project_id, number):
+    return await _write(org, scene_service, "create", obj_in=SceneCreate(
+        project_id=project_id, scene_number=number, heading=f"INT. SET {number} - DAY", description="Scene",
+        day_night="day", internal_external="internal", estimated_time_minutes=30,
+    ))
+
+
+async def _create_shooting_day(org, project_id, status="draft"):
+    return await _write(org, shooting_day_service, "create", obj_in=ShootingDayCreate(
+        project_id=project_id, date=date(2026, 11, 2), call_time=time(7, 0), location_name="Studio A", status=status,
+    ))
+
+
+async def _assert_counters_match(org):
+    stats = await _stats(org)
+    assert stats == await _source_counts(org)
+    async with SessionLocal() as db:
+        assert await project_stats_service.find_mismatches(db, organization_id=org.id) == []
+    return stats
+
+
+@pytest.mark.asyncio
+async def test_scene_writes_keep_the_counters_current(orgs):
+    org, _ = orgs
+    first, second, _ = org.project_ids
+
+    scenes = [await _create_scene(org, first, number) for number in (1, 2, 3)]
+    stats = await _assert_counters_match(org)
+    assert stats[first]["scenes_count"] == 3
+
+    await _write(org, scene_service, "update", id=scenes[0].id, obj_in={"project_id": second})
+    await _write(org, scene_service, "update", id=scenes[1].id, obj_in={"heading": "EXT. ROOF - NIGHT"})
+    stats = await _assert_counters_match(org)
+    assert (stats[first]["scenes_count"], stats[second]["scenes_count"]) == (2, 1)
+
+    await _write(org, scene_service, "remove", id=scenes[2].id)
+    await _write(org, scene_service, "remove", id=scenes[0].id)
+    stats = await _assert_counters_match(org)
+    assert (stats[first]["scenes_count"], stats[second]["scenes_count"]) == (1, 0)
+
+
+@pytest.mark.asyncio
+async def test_shooting_day_writes_and_status_changes_keep_the_counters_current(orgs):
+    org, _ = orgs
+    first, second, _ = org.project_ids
+
+    draft = await _create_shooting_day(org, first)
+    confirmed = await _create_shooting_day(org, first, status="confirmed")
+    stats = await _assert_counters_match(org)
+    assert (stats[first]["shooting_days_count"], stats[first]["confirmed_shooting_days_count"]) == (2, 1)
+
+    await _write(org, shooting_day_service, "update", id=draft.id, obj_in={"status": "confirmed"})
+    await _write(org, shooting_day_service, "update", id=draft.id, obj_in={"notes": "Bring rain covers"})
+    stats = await _assert_counters_match(org)
+    assert stats[first]["confirmed_shooting_days_count"] == 2
+
+    await _write(org, shooting_day_service, "update", id=confirmed.id, obj_in={"status": "draft"})
+    await _write(org, shooting_day_service, "update", id=draft.id, obj_in={"project_id": second})
+    stats = await _assert_counters_match(org)
+    assert (stats[first]["shooting_days_count"], stats[first]["confirmed_shooting_days_count"]) == (1, 0)
+    assert (stats[second]["shooting_days_count"], stats[second]["confirmed_shooting_days_count"]) == (1, 1)
+
+    await _write(org, shooting_day_service, "remove", id=draft.id)
+    stats = await _assert_counters_match(org)
+    assert (stats[second]["shooting_days_count"], stats[second]["confirmed_shooting_days_count"]) == (0, 0)
+
+
+@pytest.mark.asyncio
+async def test_rolled_back_write_leaves_the_counters_alone(orgs):
+    org, _ = orgs
+    first = org.project_ids[0]
+    await _create_scene(org, first, 1)
+
+    async with SessionLocal() as db:
+        await scene_service.create(db, organization_id=org.id, obj_in=SceneCreate(
+            project_id=first, scene_number=2, heading="INT. SET - DAY", description="Scene",
+            day_night="day", internal_external="internal", estimated_time_minutes=30,
+        ))
+        await db.rollback()
+
+    stats = await _assert_counters_match(org)
+    assert stats[first]["scenes_count"] == 1
+
+
+@pytest.mark.asyncio
+async def test_get_many_reports_only_the_organizations_projects(orgs):
+    org, other = orgs
+    first, _, untouched = org.project_ids
+    await _create_scene(org, first, 1)
+    await _create_shooting_day(other, other.project_ids[0], status="confirmed")
+
+    async with SessionLocal() as db:
+        stats = await project_stats_service.get_many(
+            db, organization_id=org.id, project_ids=[first, untouched, other.project_ids[0], uuid4()]
+        )
+
+    assert set(stats) == {first, untouched}
+    assert stats[first]["scenes_count"] == 1
+    # No counters row yet reads as zeros.
+    assert set(stats[untouched].values()) == {0}
+
+    async with SessionLocal() as db:
+        entries = await projects_endpoints.get_projects_stats(
+            project_ids=[untouched, first, first, other.project_ids[0]],
+            organization_id=org.id,
+            profile=SimpleNamespace(is_master_owner=False, role_v2="admin"),
+            db=db,
+        )
+    assert [(entry.project_id, entry.scenes_count) for entry in entries] == [(untouched, 0), (first, 1)]
+
+
+@pytest.mark.asyncio
+async def test_freelancers_only_get_stats_for_assigned_projects(orgs, monkeypatch):
+    org, _ = orgs
+    assigned, unassigned, _ = org.project_ids
+    await _create_shooting_day(org, assigned, status="confirmed")
+    await _create_shooting_day(org, unassigned, status="confirmed")
+
+    async def assigned_ids(db, profile):
+        return [assigned]
+
+    monkeypatch.setattr(projects_endpoints, "get_assigned_project_ids", assigned_ids)
+    async with SessionLocal() as db:
+        entries = await projects_endpoints.get_projects_stats(
+            project_ids=[assigned, unassigned],
+            organization_id=org.id,
+            profile=SimpleNamespace(is_master_owner=False, role_v2="freelancer"),
+            db=db,
+        )
+
+    assert [(entry.project_id, entry.confirmed_shooting_days_count) for entry in entries] == [(assigned, 1)]
+
+
+@pytest.mark.asyncio
+async def test_rebuild_repairs_altered_counters_of_one_organization(orgs):
+    org, other = orgs
+    first, second, _ = org.project_ids
+    for number in (1, 2):
+        await _create_scene(org, first, number)
+    await _create_shooting_day(org, second, status="confirmed")
+    await _create_scene(other, other.project_ids[0], 1)
+
+    async with SessionLocal() as db:
+        await db.execute(update(ProjectCounters).where(ProjectCounters.project_id == first).values(scenes_count=99))
+        await db.execute(delete(ProjectCounters).where(ProjectCounters.project_id == second))
+        await db.execute(
+            update(ProjectCounters).where(ProjectCounters.project_id == other.project_ids[0]).values(scenes_count=7)
+        )
+        await db.commit()
+
+    async with SessionLocal() as db:
+        mismatches = await project_stats_service.find_mismatches(db, organization_id=org.id)
+    assert {row["project_id"] for row in mismatches} == {first, second}
+
+    async with SessionLocal() as db:
+        await project_stats_service.rebuild(db, organization_id=org.id)
+        await db.commit()
+
+    stats = await _assert_counters_match(org)
+    assert stats[first]["scenes_count"] == 2
+    assert stats[second]["confirmed_shooting_days_count"] == 1
+    # Another organization's counters are left as they were.
+    assert (await _stats(other))[other.project_ids[0]]["scenes_count"] == 7
@@ -1,28 +1,73 @@
+import argparse
 import asyncio
 import logging
+import multiprocessing
+import signal
 import sys
 import os
 
 # Ensure backend is in path
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
-from app.cron_check_plans import check_expiring_plans
+from app.core.config import settings
+from app.services.job_tasks import DRAINS, SCHEDULES
+from app.services.job_worker import build_worker, default_queues
 
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-async def run_scheduler():
-    logger.info("Worker Daemon Started. Running immediately first...")
-    
-    while True:
+
+async def run_worker(queues: list[str], concurrency: int):
+    """Run one job worker until SIGTERM/SIGINT."""
+    stop = asyncio.Event()
+    loop = asyncio.get_running_loop()
+    for sig in (signal.SIGTERM, signal.SIGINT):
         try:
-            await check_expiring_plans()
-        except Exception as e:
-            logger.error(f"Job failed: {e}")
-        
-        # Sleep for 24 hours (86400 seconds)
-        logger.info("Sleeping for 24 hours...")
-        await asyncio.sleep(86400)
+            loop.add_signal_handler(sig, stop.set)
+        except NotImplementedError:  # pragma: no cover - non-Unix
+            pass
+
+    worker = build_worker(queues=queues, concurrency=concurrency, schedules=SCHEDULES, drains=DRAINS)
+    await worker.run(stop)
+
+
+def _worker_process(queues: list[str], concurrency: int):
+    asyncio.run(run_worker(queues, concurrency))
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run background job workers.")
+    parser.add_argument("--processes", type=int, default=settings.JOB_WORKER_PROCESSES)
+    parser.add_argument("--concurrency", type=int, default=settings.JOB_WORKER_CONCURRENCY,
+                        help="Jobs run concurrently per process")
+    parser.add_argument("--queues", default=",".join(default_queues()),
+                        help="Comma-separated queues to consume")
+    args = parser.parse_args(argv)
+    queues = [q.strip() for q in args.queues.split(",") if q.strip()]
+
+    logger.info(f"Worker Daemon Started: {args.processes} process(es) x {args.concurrency} job(s), queues={queues}")
+    if args.processes <= 1:
+        _worker_process(queues, args.concurrency)
+        return
+
+    ctx = multiprocessing.get_context("spawn")
+    processes = [
+        ctx.Process(target=_worker_process, args=(queues, args.concurrency), daemon=False)
+        for _ in range(args.processes)
+    ]
+    for process in processes:
+        process.start()
+
+    def _forward(signum, _frame):
+        for process in processes:
+            if process.is_alive():
+                os.kill(process.pid, signum)
+
+    signal.signal(signal.SIGTERM, _forward)
+    signal.signal(signal.SIGINT, _forward)
+    for process in processes:
+        process.join()
+
 
 if __name__ == "__main__":
-    asyncio.run(run_scheduler())
+    main()
@@ -0,0 +1,87 @@
+#!/usr/bin/env python3
+"""
+Backfill / repair per-organization invoice number counters.
+
+Invoice numbers (`INV-{year}-{org_prefix}-{seq}`) are allocated from `invoice_number_sequences`.
+This script raises every (organization, year) counter to the highest sequence already issued, which
+is needed after importing invoices or restoring data that bypassed the counter. Counters are never
+lowered, so numbers of deleted invoices are not reused.
+
+Usage
+-----
+  python backend/scripts/backfill_invoice_sequences.py
+  python backend/scripts/backfill_invoice_sequences.py --organization-id <uuid>
+  python backend/scripts/backfill_invoice_sequences.py --dry-run
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+from uuid import UUID
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+os.chdir(backend_dir)
+
+from sqlalchemy import select
+
+from app.db.session import SessionLocal
+from app.models.financial import InvoiceNumberSequence
+from app.services.financial_advanced import invoice_service
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Backfill invoice number sequences from issued invoices")
+    parser.add_argument(
+        "--organization-id",
+        type=UUID,
+        default=None,
+        help="Only backfill counters for this organization",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Print changes without writing to the database",
+    )
+    return parser.parse_args()
+
+
+async def _main() -> int:
+    args = _parse_args()
+
+    async with SessionLocal() as db:
+        before_query = select(InvoiceNumberSequence)
+        if args.organization_id:
+            before_query = before_query.where(InvoiceNumberSequence.organization_id == args.organization_id)
+        before = {
+            (row.organization_id, row.year): row.last_value
+            for row in (await db.execute(before_query)).scalars().all()
+        }
+
+        counters = await invoice_service.sync_invoice_number_sequences(
+            db, organization_id=args.organization_id
+        )
+
+        changed = 0
+        for counter in counters:
+            key = (counter["organization_id"], counter["year"])
+            previous = before.get(key)
+            if previous != counter["last_value"]:
+                changed += 1
+                print(f" - [{key[0]}] {key[1]}: {previous if previous is not None else '(none)'} -> {counter['last_value']}")
+
+        if args.dry_run:
+            await db.rollback()
+            print(f"\nDry run: {changed} counters would be updated.")
+            return 0
+
+        await db.commit()
+        print(f"\nDone: updated {changed} counters.")
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(_main()))
@@ -0,0 +1,98 @@
+#!/usr/bin/env python3
+"""
+Report sequential scans in the plans of captured slow queries.
+
+Why this exists
+---------------
+With LOG_SLOW_QUERIES_MS > 0 and SLOW_QUERY_CAPTURE_PATH set, every statement slower than the
+threshold is appended (SQL text only, no parameters) to the capture file. This script groups the
+captured statements, EXPLAINs each one against the database (generic plan, nothing is executed)
+and lists the statements whose plan sequentially scans a table with at least --min-table-rows
+rows: those are the candidates for a new composite or partial index.
+
+Table sizes come from pg_class.reltuples; run ANALYZE first on a fresh database.
+
+Usage
+-----
+  python backend/scripts/index_advisor.py
+  python backend/scripts/index_advisor.py --capture-file /var/log/produzo/slow_queries.jsonl --top 20
+  python backend/scripts/index_advisor.py --min-table-rows 50000
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+os.chdir(backend_dir)
+
+from app.core.config import settings
+from app.db.index_advisor import advise, load_captured_queries
+from app.db.session import engine
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="EXPLAIN captured slow queries and report sequential scans")
+    parser.add_argument(
+        "--capture-file",
+        default=settings.SLOW_QUERY_CAPTURE_PATH,
+        help="JSON-lines capture file (default: SLOW_QUERY_CAPTURE_PATH)",
+    )
+    parser.add_argument(
+        "--min-table-rows",
+        type=int,
+        default=1000,
+        help="Ignore sequential scans of tables smaller than this",
+    )
+    parser.add_argument(
+        "--top",
+        type=int,
+        default=50,
+        help="Only plan the N statements with the most total time",
+    )
+    return parser.parse_args()
+
+
+async def _main() -> int:
+    args = _parse_args()
+    if not args.capture_file:
+        print("No capture file: pass --capture-file or set SLOW_QUERY_CAPTURE_PATH.")
+        return 1
+    if not Path(args.capture_file).exists():
+        print(f"Capture file not found: {args.capture_file}")
+        return 1
+
+    with open(args.capture_file, encoding="utf-8") as capture_file:
+        queries = load_captured_queries(capture_file)[: args.top]
+    print(f"Planning {len(queries)} distinct statements from {args.capture_file}\n")
+
+    async with engine.connect() as conn:
+        raw = await conn.get_raw_connection()
+        report = await advise(raw.driver_connection, queries, min_table_rows=args.min_table_rows)
+
+    flagged = 0
+    for advice in report:
+        query = advice.query
+        header = f"[{query.count}x, avg {query.avg_ms:.0f} ms, max {query.max_ms:.0f} ms]"
+        if advice.error:
+            print(f"{header} could not plan: {advice.error}\n  {query.sql[:300]}\n")
+            continue
+        flagged += 1
+        print(f"{header} {query.sql[:300]}")
+        for scan in advice.seq_scans:
+            print(f"  Seq Scan on {scan.relation} (~{scan.table_rows:.0f} rows, est. {scan.estimated_rows:.0f} returned)")
+            if scan.filter:
+                print(f"    Filter: {scan.filter}")
+        print()
+
+    print(f"Done: {flagged}/{len(queries)} statements sequentially scan a large table.")
+    await engine.dispose()
+    return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(_main()))
@@ -0,0 +1,95 @@
+#!/usr/bin/env python3
+"""
+Rebuild or verify the monthly financial rollup.
+
+Why this exists
+---------------
+`org_monthly_financials` is maintained incrementally by TransactionService (create/approve/delete
+of applied transactions). Rows written around the service (raw SQL, database cascades when a
+project or invoice is deleted, restores) leave it out of step with `transactions`; this script
+recomputes it from the raw table.
+
+Modes:
+  --check   Report rollup rows that disagree with `transactions`; exits 1 if any do.
+  default   Replace the rollup rows (one organization or all) with recomputed totals.
+
+Usage
+-----
+  python backend/scripts/rebuild_monthly_financials.py --check
+  python backend/scripts/rebuild_monthly_financials.py --organization-id <uuid>
+  python backend/scripts/rebuild_monthly_financials.py --dry-run
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+from uuid import UUID
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+os.chdir(backend_dir)
+
+from app.db.session import SessionLocal
+from app.services.financial_rollup import financial_rollup_service
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Rebuild or verify org_monthly_financials")
+    parser.add_argument(
+        "--organization-id",
+        type=UUID,
+        default=None,
+        help="Only rebuild/check this organization",
+    )
+    parser.add_argument(
+        "--check",
+        action="store_true",
+        help="Only report mismatches between the rollup and transactions",
+    )
+    parser.add_argument(
+        "--dry-run",
+        action="store_true",
+        help="Rebuild inside a transaction and roll it back",
+    )
+    return parser.parse_args()
+
+
+def _print_mismatches(mismatches) -> None:
+    for row in mismatches:
+        print(
+            f" - [{row['organization_id']}] {row['month']:%Y-%m} {row['type']}/{row['category']}: "
+            f"rollup {row['rollup_amount_cents']} ({row['rollup_count']} txns), "
+            f"expected {row['expected_amount_cents']} ({row['expected_count']} txns)"
+        )
+
+
+async def _main() -> int:
+    args = _parse_args()
+
+    async with SessionLocal() as db:
+        mismatches = await financial_rollup_service.find_mismatches(
+            db, organization_id=args.organization_id
+        )
+        _print_mismatches(mismatches)
+
+        if args.check:
+            print(f"\nCheck: {len(mismatches)} rollup rows out of sync.")
+            return 1 if mismatches else 0
+
+        rows = await financial_rollup_service.rebuild(db, organization_id=args.organization_id)
+
+        if args.dry_run:
+            await db.rollback()
+            print(f"\nDry run: {len(mismatches)} rows out of sync; rebuild would write {rows} rows.")
+            return 0
+
+        await db.commit()
+        print(f"\nDone: fixed {len(mismatches)} rows out of sync; rebuilt {rows} rows.")
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(_main()))
@@ -1,22 +1,29 @@
 #!/usr/bin/env python3
 """
-Recalculate bank account balances from applied transactions.
+Verify and repair bank account balances.
 
 Why this exists
 ---------------
-`bank_accounts.balance_cents` is maintained incrementally when transactions are created/approved.
-Historical Stripe Connect invoice payments created `transactions` records directly (without applying
-the corresponding balance change), which can leave balances out of sync.
+`bank_accounts.balance_cents` is changed with atomic `balance_cents + delta` updates, each one
+appended to `bank_account_ledger`; `bank_account_balance_checkpoints` periodically snapshots the
+ledger. Historical Stripe Connect invoice payments created `transactions` records directly (without
+applying the corresponding balance change), which can leave balances out of sync.
 
-This script recomputes balances as:
-  sum(income.amount_cents) - sum(expense.amount_cents)
-for transactions whose `payment_status` is in ("approved", "paid").
+Modes:
+  --from-ledger  Recompute each balance as last checkpoint + later ledger entries (cheap; catches
+                 balance writes that bypassed the ledger).
+  default        Full rescan: sum(income.amount_cents) - sum(expense.amount_cents) for transactions
+                 whose `payment_status` is in ("approved", "paid").
+
+A full rescan repairs differences with an "adjustment" ledger entry followed by a new checkpoint,
+so the ledger keeps explaining the stored balance; --from-ledger resets the stored balance to the
+ledger value.
 
 Usage
 -----
   python backend/scripts/recalculate_bank_balances.py
   python backend/scripts/recalculate_bank_balances.py --organization-id <uuid>
-  python backend/scripts/recalculate_bank_balances.py --dry-run
+  python backend/scripts/recalculate_bank_balances.py --from-ledger --dry-run
 """
 
 import argparse
@@ -31,24 +38,30 @@ backend_dir = Path(__file__).parent.parent
 sys.path.insert(0, str(backend_dir))
 os.chdir(backend_dir)
 
-from sqlalchemy import case, func, select
+from sqlalchemy import case, func, select, update
 
 from app.db.session import SessionLocal
 from app.models.bank_accounts import BankAccount
 from app.models.transactions import Transaction
+from app.services.financial import bank_account_service
 
 
 APPLIED_PAYMENT_STATUSES = ("approved", "paid")
 
 
 def _parse_args() -> argparse.Namespace:
-    parser = argparse.ArgumentParser(description="Recalculate bank account balances from transactions")
+    parser = argparse.ArgumentParser(description="Verify and repair bank account balances")
     parser.add_argument(
         "--organization-id",
         type=UUID,
         default=None,
         help="Only recalculate balances for this organization",
     )
+    parser.add_argument(
+        "--from-ledger",
+        action="store_true",
+        help="Compare against checkpoint + ledger instead of rescanning all transactions",
+    )
     parser.add_argument(
         "--dry-run",
         action="store_true",
@@ -57,6 +70,24 @@ def _parse_args() -> argparse.Namespace:
     return parser.parse_args()
 
 
+async def _balances_from_transactions(db, organization_id):
+    signed_amount_cents = case(
+        (Transaction.type == "income", Transaction.amount_cents),
+        else_=-Transaction.amount_cents,
+    )
+    computed_balance_cents = func.coalesce(func.sum(signed_amount_cents), 0).label("balance_cents")
+
+    balances_query = select(Transaction.bank_account_id, computed_balance_cents).where(
+        Transaction.payment_status.in_(APPLIED_PAYMENT_STATUSES)
+    )
+    if organization_id:
+        balances_query = balances_query.where(Transaction.organization_id == organization_id)
+    balances_query = balances_query.group_by(Transaction.bank_account_id)
+
+    balances_result = await db.execute(balances_query)
+    return {row.bank_account_id: int(row.balance_cents or 0) for row in balances_result.all()}
+
+
 async def _main() -> int:
     args = _parse_args()
 
@@ -68,33 +99,44 @@ async def _main() -> int:
         accounts_result = await db.execute(accounts_query)
         accounts = accounts_result.scalars().all()
 
-        signed_amount_cents = case(
-            (Transaction.type == "income", Transaction.amount_cents),
-            else_=-Transaction.amount_cents,
-        )
-        computed_balance_cents = func.coalesce(func.sum(signed_amount_cents), 0).label("balance_cents")
-
-        balances_query = select(Transaction.bank_account_id, computed_balance_cents).where(
-            Transaction.payment_status.in_(APPLIED_PAYMENT_STATUSES)
-        )
-        if args.organization_id:
-            balances_query = balances_query.where(Transaction.organization_id == args.organization_id)
-        balances_query = balances_query.group_by(Transaction.bank_account_id)
-
-        balances_result = await db.execute(balances_query)
-        computed_by_account_id = {
-            row.bank_account_id: int(row.balance_cents or 0) for row in balances_result.all()
-        }
+        computed_by_account_id = {}
+        if not args.from_ledger:
+            computed_by_account_id = await _balances_from_transactions(db, args.organization_id)
 
         changed = 0
         for account in accounts:
-            new_balance = computed_by_account_id.get(account.id, 0)
-            if account.balance_cents != new_balance:
-                print(f" - [{account.organization_id}] {account.name} ({account.id}): {account.balance_cents} -> {new_balance}")
+            if args.from_ledger:
+                new_balance = await bank_account_service.recompute_balance(
+                    db, organization_id=account.organization_id, bank_account_id=account.id
+                )
+            else:
+                new_balance = computed_by_account_id.get(account.id, 0)
+
+            current_balance = account.balance_cents or 0
+            if current_balance != new_balance:
+                print(f" - [{account.organization_id}] {account.name} ({account.id}): {current_balance} -> {new_balance}")
                 changed += 1
-                if not args.dry_run:
-                    account.balance_cents = new_balance
-                    db.add(account)
+                if args.dry_run:
+                    continue
+                if args.from_ledger:
+                    # The ledger is the record here; the stored balance was written around it.
+                    await db.execute(
+                        update(BankAccount)
+                        .where(BankAccount.id == account.id)
+                        .values(balance_cents=new_balance)
+                    )
+                else:
+                    await bank_account_service.apply_balance_delta(
+                        db,
+                        organization_id=account.organization_id,
+                        bank_account_id=account.id,
+                        delta_cents=new_balance - current_balance,
+                        reason="adjustment",
+                    )
+                    await db.flush()
+                    await bank_account_service.create_checkpoint(
+                        db, organization_id=account.organization_id, bank_account_id=account.id
+                    )
 
         if args.dry_run:
             await db.rollback()
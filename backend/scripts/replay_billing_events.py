@@ -0,0 +1,80 @@
+#!/usr/bin/env python3
+"""
+List or requeue dead-lettered Stripe webhook events.
+
+Why this exists
+---------------
+Stripe webhooks are acknowledged as soon as they are stored in the `billing_events` inbox and
+processed later by the worker (app/services/billing_events.py). An event whose handler keeps
+failing is dead-lettered (status "failed") after BILLING_EVENT_MAX_ATTEMPTS so later events of
+the same customer are not held back forever. Once the cause is fixed, this script puts such
+events back in the inbox; the worker picks them up on its next run.
+
+Usage
+-----
+  python backend/scripts/replay_billing_events.py                 # list dead letters
+  python backend/scripts/replay_billing_events.py --event-id evt_123 --event-id evt_456
+  python backend/scripts/replay_billing_events.py --all
+"""
+
+import argparse
+import asyncio
+import os
+import sys
+from pathlib import Path
+
+# Add backend to path
+backend_dir = Path(__file__).parent.parent
+sys.path.insert(0, str(backend_dir))
+os.chdir(backend_dir)
+
+from app.db.session import SessionLocal
+from app.services.billing_events import billing_event_service
+
+
+def _parse_args() -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="List or requeue dead-lettered Stripe webhook events")
+    parser.add_argument(
+        "--event-id",
+        action="append",
+        default=None,
+        help="Stripe event id to requeue (repeatable)",
+    )
+    parser.add_argument(
+        "--all",
+        action="store_true",
+        help="Requeue every dead-lettered event",
+    )
+    parser.add_argument(
+        "--limit",
+        type=int,
+        default=100,
+        help="Maximum number of dead letters to list",
+    )
+    return parser.parse_args()
+
+
+async def _main() -> int:
+    args = _parse_args()
+
+    async with SessionLocal() as db:
+        if not args.event_id and not args.all:
+            events = await billing_event_service.list_failed(db, limit=args.limit)
+            for event in events:
+                print(
+                    f" - {event.external_id} [{event.source}] {event.event_type} "
+                    f"key={event.ordering_key} attempts={event.attempts}: {event.last_error}"
+                )
+            print(f"\n{len(events)} dead-lettered events.")
+            return 0
+
+        requeued = await billing_event_service.requeue_failed(
+            db, event_ids=None if args.all else args.event_id
+        )
+        await db.commit()
+        print(f"Requeued {requeued} events.")
+        return 0
+
+
+if __name__ == "__main__":
+    raise SystemExit(asyncio.run(_main()))
@@ -0,0 +1,131 @@
+"""
+Tests for script analysis as a queued job: status polling, failure handling
+and the per-organization AI call limit (no database required).
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services import ai_engine as ai_engine_module
+from app.services import script_analysis
+from app.services.ai_engine import AIEngineService
+
+
+def _job(**overrides):
+    now = datetime(2026, 3, 1, 12, 0, tzinfo=timezone.utc)
+    values = dict(
+        id=uuid4(),
+        status="running",
+        attempts=1,
+        cancel_requested=False,
+        result=None,
+        last_error=None,
+        created_at=now,
+        started_at=now,
+        finished_at=None,
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+@pytest.mark.asyncio
+async def test_processing_status_reflects_job_row(monkeypatch):
+    org_id = uuid4()
+    job = _job(status="succeeded", result={"analysis_id": "abc"}, finished_at=datetime.now(timezone.utc))
+    lookups = []
+
+    async def fake_get(db, job_id, organization_id=None):
+        lookups.append((job_id, organization_id))
+        return job if job_id == job.id else None
+
+    monkeypatch.setattr(ai_engine_module.job_queue, "get", fake_get)
+    service = AIEngineService()
+
+    status_info = await service.get_processing_status(db=None, organization_id=org_id, request_id=str(job.id))
+    assert status_info["status"] == "completed"
+    assert status_info["progress"] == 100
+    assert status_info["result"] == {"analysis_id": "abc"}
+    assert lookups == [(job.id, org_id)]
+
+    assert await service.get_processing_status(db=None, organization_id=org_id, request_id=str(uuid4())) is None
+    assert await service.get_processing_status(db=None, organization_id=org_id, request_id="not-a-uuid") is None
+
+
+@pytest.mark.asyncio
+async def test_failed_analysis_is_recorded_and_reraised(monkeypatch):
+    class FakeSession:
+        def __init__(self):
+            self.commits = 0
+            self.rollbacks = 0
+
+        async def commit(self):
+            self.commits += 1
+
+        async def rollback(self):
+            self.rollbacks += 1
+
+    async def failing_analysis(**kwargs):  # noqa: ARG001
+        raise RuntimeError("provider down")
+
+    logged, notified = [], []
+
+    async def fake_log_request(**kwargs):
+        logged.append(kwargs)
+
+    async def fake_notify(**kwargs):
+        notified.append(kwargs)
+
+    monkeypatch.setattr(script_analysis.ai_engine_service, "analyze_script_content", failing_analysis)
+    monkeypatch.setattr(script_analysis.ai_usage_log_service, "log_request", fake_log_request)
+    monkeypatch.setattr(script_analysis.notification_service, "create_for_user", fake_notify)
+
+    db = FakeSession()
+    with pytest.raises(RuntimeError, match="provider down"):
+        await script_analysis.process_script_analysis(uuid4(), uuid4(), "INT. OFFICE - DAY", uuid4(), db)
+
+    assert logged[0]["success"] is False
+    assert notified[0]["title"] == "script_analysis_failed_title"
+    assert db.rollbacks == 1 and db.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_ai_calls_are_limited_per_organization(monkeypatch):
+    monkeypatch.setattr(ai_engine_module.settings, "AI_MAX_CONCURRENT_CALLS_PER_ORG", 1)
+    service = AIEngineService()
+
+    active = {"busy": 0, "other": 0}
+    peak = {"busy": 0, "other": 0}
+    release = asyncio.Event()
+
+    class SlowModel:
+        async def generate_content_async(self, prompt, generation_config):  # noqa: ARG002
+            active[prompt] += 1
+            peak[prompt] = max(peak[prompt], active[prompt])
+            await release.wait()
+            active[prompt] -= 1
+            return SimpleNamespace(text="{}")
+
+    service.model = SlowModel()
+    busy_org, other_org = uuid4(), uuid4()
+
+    def call(org_id, prompt):
+        return service._generate_content_with_retry(
+            request_id="r", organization_id=org_id, operation="test", prompt=prompt, generation_config=None
+        )
+
+    calls = [
+        asyncio.create_task(call(busy_org, "busy")),
+        asyncio.create_task(call(busy_org, "busy")),
+        asyncio.create_task(call(other_org, "other")),
+    ]
+    await asyncio.sleep(0.01)
+    # The second call from busy_org waits; the other org still gets a slot.
+    assert active == {"busy": 1, "other": 1}
+
+    release.set()
+    await asyncio.gather(*calls)
+    assert peak == {"busy": 1, "other": 1}
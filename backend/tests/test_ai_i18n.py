@@ -4,9 +4,9 @@ from app.api.v1.endpoints.ai import (
     infer_suggestion_priority_confidence,
     infer_suggestion_type,
     _localized_text,
-    _resolve_response_language,
     _schedule_recommendation_copy,
 )
+from app.services.script_analysis import resolve_response_language
 from app.services.ai_engine import AIEngineService
 
 
@@ -58,7 +58,7 @@ def test_script_prompt_includes_requested_response_language():
 
 
 def test_resolve_response_language_prefers_metadata_when_present():
-    language = _resolve_response_language(
+    language = resolve_response_language(
         script_content="EXT. RUA - NOITE\nEste roteiro esta em portugues.",
         analysis_result={"metadata": {"response_language": "en"}},
     )
@@ -67,7 +67,7 @@ def test_resolve_response_language_prefers_metadata_when_present():
 
 
 def test_resolve_response_language_detects_script_language():
-    language = _resolve_response_language(
+    language = resolve_response_language(
         script_content="INT. APARTAMENTO - DIA\nEste roteiro tem cenas e personagens.",
     )
 
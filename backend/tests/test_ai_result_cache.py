@@ -0,0 +1,123 @@
+"""
+Tests for the two-tier AI result cache (no database required).
+"""
+
+import hashlib
+import json
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services import ai_cache as ai_cache_module
+from app.services import ai_engine as ai_engine_module
+from app.services.ai_cache import AICacheKey, AIResultCache, content_hash
+from app.services.ai_engine import AIEngineService
+
+
+class _FakeSession:
+    """Stands in for SessionLocal(): returns `stored` for lookups and records writes."""
+
+    def __init__(self, stored=None):
+        self.stored = stored
+        self.executed = []
+        self.commits = 0
+
+    def __call__(self):
+        return self
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+    async def execute(self, stmt):
+        self.executed.append(stmt)
+        return SimpleNamespace(scalar_one_or_none=lambda: self.stored)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _key(**overrides):
+    values = dict(
+        organization_id=uuid4(),
+        operation="script_analysis",
+        content_hash="abc",
+        analysis_type="full",
+        response_language="en",
+        prompt_version="1",
+    )
+    values.update(overrides)
+    return AICacheKey(**values)
+
+
+def test_content_hash_matches_plain_sha256_for_text():
+    assert content_hash("INT. OFFICE - DAY") == hashlib.sha256(b"INT. OFFICE - DAY").hexdigest()
+    assert content_hash({"b": 1, "a": 2}, "x") == content_hash({"a": 2, "b": 1}, "x")
+    assert content_hash("ab", "c") != content_hash("a", "bc")
+
+
+@pytest.mark.asyncio
+async def test_persistent_tier_fills_memory_and_returns_copies(monkeypatch):
+    session = _FakeSession(stored={"characters": ["JOHN"]})
+    monkeypatch.setattr(ai_cache_module, "SessionLocal", session)
+    cache = AIResultCache(maxsize=10, memory_ttl=60, ttl_days=30)
+    key = _key()
+
+    first = await cache.get(key)
+    first["characters"].append("SARAH")
+    second = await cache.get(key)
+
+    assert second == {"characters": ["JOHN"]}
+    assert len(session.executed) == 1  # second read came from memory
+
+    await cache.set(_key(content_hash="def"), {"scenes": []})
+    assert session.commits == 1
+
+
+@pytest.mark.asyncio
+async def test_identical_analysis_is_served_without_provider_call(monkeypatch):
+    session = _FakeSession()
+    monkeypatch.setattr(ai_cache_module, "SessionLocal", session)
+    monkeypatch.setattr(ai_engine_module, "ai_result_cache", AIResultCache(maxsize=10, memory_ttl=60, ttl_days=30))
+
+    class CountingModel:
+        calls = 0
+
+        async def generate_content_async(self, prompt, generation_config):  # noqa: ARG002
+            self.calls += 1
+            return SimpleNamespace(
+                text=json.dumps(
+                    {
+                        "characters": [{"name": "JOHN"}],
+                        "locations": [],
+                        "scenes": [],
+                        "suggested_equipment": [],
+                        "production_notes": [],
+                    }
+                )
+            )
+
+    service = AIEngineService()
+    service.model = CountingModel()
+    service.is_active = True
+    org_id = uuid4()
+    script = "INT. COFFEE SHOP - DAY\nJohn sits alone."
+
+    first = await service.analyze_script_content(organization_id=org_id, script_content=script)
+    assert await service.get_cached_script_analysis(organization_id=org_id, script_content=script) is not None
+    second = await service.analyze_script_content(organization_id=org_id, script_content=f"  {script}\n")
+
+    assert service.model.calls == 1
+    assert first["metadata"]["cache_hit"] is False
+    assert second["metadata"]["cache_hit"] is True
+    assert second["characters"] == first["characters"]
+    assert second["metadata"]["request_id"] != first["metadata"]["request_id"]
+
+    # A different analysis type, organization or an explicit bypass calls the provider again.
+    await service.analyze_script_content(organization_id=org_id, script_content=script, analysis_type="characters")
+    await service.analyze_script_content(organization_id=uuid4(), script_content=script)
+    await service.analyze_script_content(organization_id=org_id, script_content=script, use_cache=False)
+    assert service.model.calls == 4
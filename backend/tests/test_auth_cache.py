@@ -0,0 +1,168 @@
+"""
+Unit tests for the process-wide auth cache (no database required).
+"""
+
+from datetime import datetime, timezone
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.orm import Session, make_transient_to_detached
+
+from app.core import auth_cache as auth_cache_module
+from app.core.auth_cache import AuthCache, AuthCacheInvalidationRelay
+from app.core.pubsub import InMemoryBroker
+from app.models.organizations import Organization
+from app.models.profiles import Profile
+
+
+def _loaded(model, **values):
+    """Build an instance with every column populated, as if loaded from the DB."""
+    now = datetime.now(timezone.utc)
+    columns = {attr.key: None for attr in model.__mapper__.column_attrs}
+    columns.update(created_at=now, updated_at=now)
+    columns.update(values)
+    instance = model(**columns)
+    make_transient_to_detached(instance)
+    return instance
+
+
+def _profile(org_id=None, **values):
+    return _loaded(
+        Profile,
+        id=uuid4(),
+        email="user@example.com",
+        organization_id=org_id,
+        role="admin",
+        is_master_owner=False,
+        is_active=True,
+        **values,
+    )
+
+
+def _organization():
+    return _loaded(
+        Organization,
+        id=uuid4(),
+        name="Org",
+        slug=f"org-{uuid4().hex[:8]}",
+        plan="starter",
+        subscription_status="active",
+        billing_status="active",
+        stripe_connect_onboarding_complete=False,
+        is_active=True,
+    )
+
+
+def test_set_and_get_return_detached_copies():
+    cache = AuthCache(maxsize=10, ttl=60)
+    org = _organization()
+    profile = _profile(org.id)
+
+    cache.set(profile, org, generation=cache.generation)
+    entry = cache.get(profile.id)
+
+    assert entry is not None
+    assert entry.profile is not profile
+    assert entry.profile.email == profile.email
+    assert entry.organization.billing_status == "active"
+
+
+def test_merge_without_load_attaches_cached_profile():
+    cache = AuthCache(maxsize=10, ttl=60)
+    profile = _profile()
+    cache.set(profile, None, generation=cache.generation)
+
+    session = Session()
+    merged = session.merge(cache.get(profile.id).profile, load=False)
+
+    assert merged in session
+    assert merged.id == profile.id
+    assert not session.dirty
+
+
+def test_stale_generation_is_not_cached():
+    cache = AuthCache(maxsize=10, ttl=60)
+    profile = _profile()
+    generation = cache.generation
+
+    cache.invalidate_user(uuid4())
+    cache.set(profile, None, generation=generation)
+
+    assert cache.get(profile.id) is None
+
+
+def test_modified_instances_are_not_cached():
+    cache = AuthCache(maxsize=10, ttl=60)
+    profile = _profile()
+    session = Session()
+    session.add(profile)
+    profile.full_name = "Changed"
+
+    cache.set(profile, None, generation=cache.generation)
+
+    assert cache.get(profile.id) is None
+
+
+def test_invalidate_organization_drops_all_members():
+    cache = AuthCache(maxsize=10, ttl=60)
+    org = _organization()
+    first, second, outsider = _profile(org.id), _profile(org.id), _profile()
+    for profile in (first, second, outsider):
+        cache.set(profile, org if profile.organization_id else None, generation=cache.generation)
+
+    cache.invalidate_organization(org.id)
+
+    assert cache.get(first.id) is None
+    assert cache.get(second.id) is None
+    assert cache.get(outsider.id) is not None
+
+
+def test_disabled_cache_is_a_no_op():
+    cache = AuthCache(maxsize=0, ttl=0)
+    profile = _profile()
+    cache.set(profile, None, generation=cache.generation)
+
+    assert cache.get(profile.id) is None
+
+
+def test_commit_hook_applies_pending_invalidations(monkeypatch):
+    cache = AuthCache(maxsize=10, ttl=60)
+    monkeypatch.setattr(auth_cache_module, "auth_cache", cache)
+    org = _organization()
+    member, other = _profile(org.id), _profile()
+    cache.set(member, org, generation=cache.generation)
+    cache.set(other, None, generation=cache.generation)
+
+    session = Session()
+    session.info["_auth_cache_pending"] = {("org", org.id)}
+    auth_cache_module._apply_auth_invalidations(session)
+
+    assert cache.get(member.id) is None
+    assert cache.get(other.id) is not None
+    assert "_auth_cache_pending" not in session.info
+
+
+@pytest.mark.asyncio
+async def test_invalidations_from_other_processes_are_applied(monkeypatch):
+    cache = AuthCache(maxsize=10, ttl=60)
+    monkeypatch.setattr(auth_cache_module, "auth_cache", cache)
+    org = _organization()
+    member, other = _profile(org.id), _profile()
+    cache.set(member, org, generation=cache.generation)
+    cache.set(other, None, generation=cache.generation)
+
+    broker = InMemoryBroker()
+    api = AuthCacheInvalidationRelay(broker)
+    await api.start()
+    worker = AuthCacheInvalidationRelay(broker)
+
+    # The publishing process has already applied its own invalidations.
+    await api._publish({("user", other.id)})
+    assert cache.get(other.id) is not None
+
+    await worker._publish({("org", org.id)})
+    assert cache.get(member.id) is None
+    assert cache.get(other.id) is not None
+
+    await worker._publish({"*"})
+    assert cache.get(other.id) is None
@@ -0,0 +1,95 @@
+"""
+Tests for ledger-based bank account balances (no database required).
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Update
+
+from app.models.bank_accounts import BankAccountBalanceCheckpoint, BankAccountLedgerEntry
+from app.services.financial import bank_account_service
+
+
+class FakeDB:
+    """Answers each execute() with the next scripted row and records what was added."""
+
+    def __init__(self, *rows):
+        self.rows = list(rows)
+        self.statements = []
+        self.added = []
+
+    async def execute(self, stmt):
+        self.statements.append(stmt)
+        row = self.rows.pop(0)
+        return SimpleNamespace(scalar_one_or_none=lambda: row, one=lambda: row)
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def flush(self):
+        pass
+
+
+@pytest.mark.asyncio
+async def test_balance_delta_is_one_atomic_update_plus_ledger_entry():
+    org_id, account_id, tx_id = uuid4(), uuid4(), uuid4()
+    db = FakeDB(1500)
+
+    new_balance = await bank_account_service.apply_balance_delta(
+        db,
+        organization_id=org_id,
+        bank_account_id=account_id,
+        delta_cents=-500,
+        reason="transaction_applied",
+        transaction_id=tx_id,
+    )
+
+    assert new_balance == 1500
+    (stmt,) = db.statements
+    assert isinstance(stmt, Update)
+    sql = str(stmt.compile(dialect=postgresql.dialect()))
+    assert "balance_cents=(bank_accounts.balance_cents +" in sql.replace(" = ", "=")
+    assert "RETURNING bank_accounts.balance_cents" in sql
+
+    (entry,) = db.added
+    assert isinstance(entry, BankAccountLedgerEntry)
+    assert (entry.delta_cents, entry.balance_after_cents, entry.transaction_id) == (-500, 1500, tx_id)
+
+
+@pytest.mark.asyncio
+async def test_balance_delta_on_unknown_account_raises_without_ledger_entry():
+    db = FakeDB(None)
+    with pytest.raises(ValueError, match="Bank account not found"):
+        await bank_account_service.apply_balance_delta(
+            db, organization_id=uuid4(), bank_account_id=uuid4(), delta_cents=100, reason="adjustment"
+        )
+    assert db.added == []
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_extends_previous_checkpoint_with_new_entries():
+    org_id, account_id = uuid4(), uuid4()
+    ledger_row = SimpleNamespace(base_balance_cents=10_000, delta_cents=-2_500, entries=3, last_entry_id=42)
+    db = FakeDB(7_500, ledger_row)
+
+    checkpoint = await bank_account_service.create_checkpoint(
+        db, organization_id=org_id, bank_account_id=account_id
+    )
+
+    assert isinstance(checkpoint, BankAccountBalanceCheckpoint)
+    assert (checkpoint.ledger_entry_id, checkpoint.balance_cents) == (42, 7_500)
+    assert "FOR UPDATE" in str(db.statements[0].compile(dialect=postgresql.dialect()))
+
+
+@pytest.mark.asyncio
+async def test_checkpoint_is_skipped_when_ledger_has_nothing_new():
+    ledger_row = SimpleNamespace(base_balance_cents=10_000, delta_cents=0, entries=0, last_entry_id=None)
+    db = FakeDB(10_000, ledger_row)
+
+    assert await bank_account_service.create_checkpoint(
+        db, organization_id=uuid4(), bank_account_id=uuid4()
+    ) is None
+    assert db.added == []
@@ -0,0 +1,133 @@
+"""
+Tests for the per-section executive dashboard cache and its invalidation hooks (no database required).
+"""
+
+import asyncio
+from decimal import Decimal
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from app.db.session import get_db
+from app.services import analytics as analytics_module
+from app.services import dashboard_cache as dashboard_cache_module
+from app.services.analytics import AnalyticsService, get_dashboard_cache_status
+from app.services.dashboard_cache import (
+    TRANSACTION_SECTIONS,
+    DashboardCache,
+    MemoryDashboardCache,
+    invalidate_dashboard_on_commit,
+)
+
+
+def _service_with_counters(cache):
+    service = AnalyticsService(cache=cache)
+    calls = {}
+
+    def counting(section, value):
+        async def compute(*args, **kwargs):
+            calls[section] = calls.get(section, 0) + 1
+            return value
+
+        return compute
+
+    service._get_financial_metrics = counting("financial", {"revenue_cents": Decimal("1500")})
+    service._get_production_metrics = counting("production", {"active_projects": 2})
+    service._get_inventory_metrics = counting("inventory", {"total_items": 3})
+    service._get_cloud_metrics = counting("cloud", {"total_sync_operations": 0})
+    service._get_trends_data = counting("trends", {"monthly_financial_trends": []})
+    return service, calls
+
+
+@pytest.mark.asyncio
+async def test_invalidation_rebuilds_only_affected_sections():
+    cache = DashboardCache(MemoryDashboardCache(ttl=60, maxsize=100))
+    service, calls = _service_with_counters(cache)
+    org_id = uuid4()
+
+    first = await service.get_executive_dashboard(org_id, db=None)
+    assert get_dashboard_cache_status() == "MISS"
+    second = await service.get_executive_dashboard(org_id, db=None)
+    assert get_dashboard_cache_status() == "HIT"
+    assert second["financial"] == {"revenue_cents": 1500}
+    assert first["production"] == second["production"]
+
+    await cache.invalidate(org_id, TRANSACTION_SECTIONS)
+    await service.get_executive_dashboard(org_id, db=None)
+
+    assert get_dashboard_cache_status() == "PARTIAL"
+    assert calls == {"financial": 2, "trends": 2, "inventory": 2, "production": 1, "cloud": 1}
+
+
+@pytest.mark.asyncio
+async def test_trends_are_cached_per_period_and_other_sections_shared():
+    cache = DashboardCache(MemoryDashboardCache(ttl=60, maxsize=100))
+    service, calls = _service_with_counters(cache)
+    org_id = uuid4()
+
+    await service.get_executive_dashboard(org_id, db=None, months_back=12)
+    await service.get_executive_dashboard(org_id, db=None, months_back=1)
+
+    assert calls["trends"] == 2
+    assert calls["financial"] == calls["production"] == 1
+
+
+@pytest.mark.asyncio
+async def test_section_built_before_an_invalidation_is_not_stored():
+    cache = DashboardCache(MemoryDashboardCache(ttl=60, maxsize=100))
+    org_id = uuid4()
+
+    generation = await cache.generation(org_id, "financial")
+    await cache.invalidate(org_id, ["financial"])
+    await cache.set(org_id, "financial", "-", {"stale": True}, generation=generation)
+
+    assert await cache.get(org_id, "financial", "-") is None
+
+
+@pytest.mark.asyncio
+async def test_invalidation_waits_for_commit_and_is_dropped_on_rollback(monkeypatch):
+    cache = DashboardCache(MemoryDashboardCache(ttl=60, maxsize=100))
+    monkeypatch.setattr(dashboard_cache_module, "dashboard_cache", cache)
+    org_id = uuid4()
+    await cache.set(org_id, "financial", "-", {"revenue_cents": 1})
+
+    db = AsyncSession()
+    await db.begin()
+    invalidate_dashboard_on_commit(db, org_id, "financial")
+    await asyncio.sleep(0)
+    assert await cache.get(org_id, "financial", "-") is not None
+
+    await db.rollback()
+    await asyncio.sleep(0)
+    assert await cache.get(org_id, "financial", "-") is not None
+
+    await db.begin()
+    invalidate_dashboard_on_commit(db, org_id, "financial")
+    await db.commit()
+    await asyncio.sleep(0)
+    assert await cache.get(org_id, "financial", "-") is None
+
+
+@pytest.mark.asyncio
+async def test_request_session_invalidates_before_get_db_returns(monkeypatch):
+    cache = DashboardCache(MemoryDashboardCache(ttl=60, maxsize=100))
+    monkeypatch.setattr(dashboard_cache_module, "dashboard_cache", cache)
+    org_id = uuid4()
+    await cache.set(org_id, "financial", "-", {"revenue_cents": 1})
+
+    request = get_db()
+    db = await request.__anext__()
+    invalidate_dashboard_on_commit(db, org_id, "financial")
+    with pytest.raises(StopAsyncIteration):
+        await request.__anext__()
+
+    # No background task to wait for: get_db awaited the invalidation.
+    assert cache._pending == set()
+    assert await cache.get(org_id, "financial", "-") is None
+
+
+def test_disabled_cache_reports_no_status(monkeypatch):
+    service, _ = _service_with_counters(DashboardCache(None))
+    asyncio.run(service.get_executive_dashboard(uuid4(), db=None))
+    assert analytics_module.get_dashboard_cache_status() is None
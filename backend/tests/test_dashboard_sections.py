@@ -0,0 +1,157 @@
+"""
+Tests for concurrent, per-section executive dashboard builds (no database required).
+"""
+
+import asyncio
+from uuid import uuid4
+
+import pytest
+
+from app.services import analytics as analytics_module
+from app.services.analytics import AnalyticsService, get_dashboard_cache_status
+from app.services.dashboard_cache import DASHBOARD_SECTIONS, DashboardCache, MemoryDashboardCache
+
+
+class FakeSession:
+    def __init__(self, name):
+        self.name = name
+        self.closed = False
+        self.released = False
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        self.closed = True
+
+    async def close(self):
+        self.released = True
+
+
+def _service(cache=None):
+    opened = []
+
+    def session_factory():
+        session = FakeSession(f"pooled-{len(opened)}")
+        opened.append(session)
+        return session
+
+    service = AnalyticsService(cache=cache or DashboardCache(None), session_factory=session_factory)
+    state = {"running": 0, "peak": 0, "sessions": {}}
+
+    async def compute(organization_id, section, db, start_date, end_date):
+        state["sessions"][section] = db
+        state["running"] += 1
+        state["peak"] = max(state["peak"], state["running"])
+        await asyncio.sleep(0.01)
+        state["running"] -= 1
+        return {"section": section}
+
+    service._compute_section = compute
+    return service, state, opened
+
+
+@pytest.mark.asyncio
+async def test_sections_build_concurrently_on_separate_sessions(monkeypatch):
+    monkeypatch.setattr(analytics_module.settings, "DASHBOARD_SECTION_CONCURRENCY", 5)
+    monkeypatch.setattr(analytics_module.settings, "DASHBOARD_SECTION_SESSIONS_MAX", 4)
+    service, state, opened = _service()
+    request_db = FakeSession("request")
+
+    dashboard = await service.get_executive_dashboard(uuid4(), db=request_db)
+
+    assert all(dashboard[section] == {"section": section} for section in DASHBOARD_SECTIONS)
+    assert state["peak"] == len(DASHBOARD_SECTIONS)
+    sessions = state["sessions"]
+    assert sessions[DASHBOARD_SECTIONS[0]] is request_db
+    assert len({id(s) for s in sessions.values()}) == len(DASHBOARD_SECTIONS)
+    assert len(opened) == len(DASHBOARD_SECTIONS) - 1
+    assert all(session.closed for session in opened)
+
+
+@pytest.mark.asyncio
+async def test_concurrency_setting_bounds_parallel_sections(monkeypatch):
+    monkeypatch.setattr(analytics_module.settings, "DASHBOARD_SECTION_CONCURRENCY", 2)
+    service, state, _ = _service()
+
+    await service.get_executive_dashboard(uuid4(), db=FakeSession("request"))
+    assert state["peak"] == 2
+
+    monkeypatch.setattr(analytics_module.settings, "DASHBOARD_SECTION_CONCURRENCY", 1)
+    service, state, opened = _service()
+    request_db = FakeSession("request")
+
+    await service.get_executive_dashboard(uuid4(), db=request_db)
+    assert state["peak"] == 1
+    assert opened == []
+    assert all(db is request_db for db in state["sessions"].values())
+
+
+@pytest.mark.asyncio
+async def test_section_sessions_are_capped_across_concurrent_dashboards(monkeypatch):
+    monkeypatch.setattr(analytics_module.settings, "DASHBOARD_SECTION_CONCURRENCY", 5)
+    monkeypatch.setattr(analytics_module.settings, "DASHBOARD_SECTION_SESSIONS_MAX", 2)
+    service, _, _ = _service()
+    open_now = {"count": 0, "peak": 0}
+
+    class CountedSession(FakeSession):
+        async def __aenter__(self):
+            open_now["count"] += 1
+            open_now["peak"] = max(open_now["peak"], open_now["count"])
+            return self
+
+        async def __aexit__(self, *exc):
+            open_now["count"] -= 1
+            self.closed = True
+
+    service.session_factory = lambda: CountedSession("pooled")
+
+    dashboards = await asyncio.gather(
+        *(service.get_executive_dashboard(uuid4(), db=FakeSession(f"request-{i}")) for i in range(3))
+    )
+
+    assert all(dashboard[section] == {"section": section} for dashboard in dashboards for section in DASHBOARD_SECTIONS)
+    assert open_now["peak"] == 2
+    assert open_now["count"] == 0
+
+
+@pytest.mark.asyncio
+async def test_section_session_is_released_before_the_cache_write(monkeypatch):
+    monkeypatch.setattr(analytics_module.settings, "DASHBOARD_SECTION_CONCURRENCY", 5)
+    monkeypatch.setattr(analytics_module.settings, "DASHBOARD_SECTION_SESSIONS_MAX", 4)
+    cache = DashboardCache(MemoryDashboardCache(ttl=60, maxsize=100))
+    service, state, opened = _service(cache)
+    request_db = FakeSession("request")
+    released_at_write = {}
+    cache_set = cache.set
+
+    async def recording_set(organization_id, section, *args, **kwargs):
+        released_at_write[section] = state["sessions"][section].released
+        await cache_set(organization_id, section, *args, **kwargs)
+
+    monkeypatch.setattr(cache, "set", recording_set)
+    await service.get_executive_dashboard(uuid4(), db=request_db)
+
+    assert released_at_write.pop(DASHBOARD_SECTIONS[0]) is False
+    assert request_db.released is False
+    assert set(released_at_write) == set(DASHBOARD_SECTIONS[1:])
+    assert all(released_at_write.values())
+
+
+@pytest.mark.asyncio
+async def test_single_section_endpoint_builds_and_caches_only_that_section():
+    cache = DashboardCache(MemoryDashboardCache(ttl=60, maxsize=100))
+    service, state, opened = _service(cache)
+    org_id = uuid4()
+
+    data = await service.get_dashboard_section(org_id, "production", db=FakeSession("request"))
+    assert data == {"section": "production"}
+    assert get_dashboard_cache_status() == "MISS"
+    assert list(state["sessions"]) == ["production"]
+    assert opened == []
+
+    await service.get_dashboard_section(org_id, "production", db=FakeSession("request"))
+    assert get_dashboard_cache_status() == "HIT"
+
+    with pytest.raises(ValueError):
+        await service.get_dashboard_section(org_id, "payroll", db=FakeSession("request"))
@@ -0,0 +1,98 @@
+"""
+Tests for applying Drive change records to cloud file references (no database or network).
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.models.cloud import CloudFileReference
+from app.services.drive_sync import DriveSyncEngine
+
+
+class _FakeSession:
+    def __init__(self, refs):
+        self.refs = refs
+        self.added = []
+        self.deleted = []
+
+    async def execute(self, _query):
+        refs = self.refs
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: refs))
+
+    def add(self, obj):
+        self.added.append(obj)
+
+    async def delete(self, obj):
+        self.deleted.append(obj)
+
+
+def _project_folder():
+    return SimpleNamespace(
+        organization_id=uuid4(),
+        project_id=uuid4(),
+        project_folder_id="root",
+        scripts_folder_id="scripts-folder",
+        shooting_days_folder_id="days-folder",
+        media_folder_id=None,
+    )
+
+
+def _ref(external_id, module="scripts", name="old.pdf"):
+    return CloudFileReference(
+        external_id=external_id,
+        module=module,
+        file_name=name,
+        file_size="1",
+        mime_type="application/pdf",
+        storage_provider="google_drive",
+    )
+
+
+@pytest.mark.asyncio
+async def test_apply_changes_creates_updates_moves_and_removes():
+    pf = _project_folder()
+    renamed = _ref("renamed")
+    moved_out = _ref("moved-out")
+    deleted = _ref("deleted")
+    moved = _ref("moved", module="shooting_days")
+    db = _FakeSession([renamed, moved_out, deleted, moved])
+
+    changes = [
+        {"fileId": "new", "removed": False, "file": {
+            "name": "new.pdf", "mimeType": "application/pdf", "size": "10",
+            "parents": ["days-folder"], "createdTime": "2026-01-02T10:00:00.000Z",
+        }},
+        {"fileId": "renamed", "removed": False, "file": {"name": "first.pdf", "parents": ["scripts-folder"]}},
+        {"fileId": "renamed", "removed": False, "file": {"name": "final.pdf", "parents": ["scripts-folder"]}},
+        {"fileId": "moved-out", "removed": False, "file": {"name": "x.pdf", "parents": ["elsewhere"]}},
+        {"fileId": "deleted", "removed": True},
+        {"fileId": "moved", "removed": False, "file": {"name": "m.pdf", "parents": ["scripts-folder"]}},
+        {"fileId": "unrelated", "removed": False, "file": {"name": "u.pdf", "parents": ["elsewhere"]}},
+    ]
+
+    touched = await DriveSyncEngine().apply_changes(db, pf, changes)
+
+    assert touched == 5
+    assert [ref.external_id for ref in db.added] == ["new"]
+    assert db.added[0].module == "shooting-days"
+    assert db.added[0].project_id == pf.project_id
+    assert renamed.file_name == "final.pdf"
+    assert moved.module == "scripts"
+    assert set(db.deleted) == {moved_out, deleted}
+
+
+@pytest.mark.asyncio
+async def test_apply_changes_keeps_files_in_project_root():
+    pf = _project_folder()
+    ref = _ref("root-file", module="other")
+    db = _FakeSession([ref])
+
+    await DriveSyncEngine().apply_changes(
+        db, pf, [{"fileId": "root-file", "file": {"name": "renamed.pdf", "parents": ["root"]}}]
+    )
+
+    assert db.deleted == []
+    assert ref.file_name == "renamed.pdf"
+    assert ref.module == "other"
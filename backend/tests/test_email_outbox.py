@@ -0,0 +1,93 @@
+"""
+Tests for the outbox's Resend transport and rate limiter (no database required).
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+import resend
+
+from app.services.email_outbox import OutgoingEmail, RateLimiter, ResendTransport
+
+
+@pytest.mark.asyncio
+async def test_resend_batches_plain_emails_and_sends_attachments_alone(monkeypatch):
+    calls = []
+
+    def batch_send(params, options):
+        calls.append(("batch", [p["to"] for p in params], options))
+        return {"data": [{"id": "re_1"}, {"id": "re_3"}], "errors": [{"index": 1, "message": "Invalid `to` field"}]}
+
+    def email_send(params, options):
+        calls.append(("single", params["to"], options))
+        return {"id": "re_pdf"}
+
+    monkeypatch.setattr(resend.Batch, "send", batch_send)
+    monkeypatch.setattr(resend.Emails, "send", email_send)
+    waits = []
+
+    class CountingLimiter:
+        async def wait(self):
+            waits.append(1)
+
+    transport = ResendTransport("billing@example.com", "re_key", CountingLimiter())
+    messages = [
+        OutgoingEmail(id=uuid4(), to=["a@example.com"], subject="s", html="h", batch_key="k1"),
+        OutgoingEmail(id=uuid4(), to=["not-an-email"], subject="s", html="h", batch_key="k1"),
+        OutgoingEmail(
+            id=uuid4(), to=["c@example.com"], subject="s", html="h", attachments=[("i.pdf", b"%PDF")], batch_key="k1",
+        ),
+        OutgoingEmail(id=uuid4(), to=["d@example.com"], subject="s", html="h", batch_key="k1"),
+    ]
+
+    results = await transport.send(messages)
+
+    assert [(r.provider_message_id, r.permanent) for r in results] == [
+        ("re_1", False), (None, True), ("re_pdf", False), ("re_3", False),
+    ]
+    assert calls[0][:2] == ("batch", [["a@example.com"], ["not-an-email"], ["d@example.com"]])
+    assert calls[0][2] == {"idempotency_key": "email-outbox-batch/k1", "batch_validation": "permissive"}
+    assert calls[1] == ("single", ["c@example.com"], {"idempotency_key": f"email-outbox/{messages[2].id}"})
+    assert len(waits) == 2
+
+
+@pytest.mark.asyncio
+async def test_resend_only_batches_emails_that_share_a_batch_key(monkeypatch):
+    calls = []
+    monkeypatch.setattr(
+        resend.Batch, "send", lambda params, options: calls.append(options["idempotency_key"]) or {"data": []}
+    )
+    monkeypatch.setattr(resend.Emails, "send", lambda params, options: calls.append(options["idempotency_key"]) or {})
+
+    class NoLimit:
+        async def wait(self):
+            pass
+
+    messages = [
+        OutgoingEmail(id=uuid4(), to=["a@example.com"], subject="s", html="h", batch_key="k1"),
+        OutgoingEmail(id=uuid4(), to=["b@example.com"], subject="s", html="h", batch_key="k2"),
+        OutgoingEmail(id=uuid4(), to=["c@example.com"], subject="s", html="h"),
+        OutgoingEmail(id=uuid4(), to=["d@example.com"], subject="s", html="h"),
+    ]
+
+    await ResendTransport("billing@example.com", "re_key", NoLimit()).send(messages)
+
+    # Without a stored batch key a retry could not repeat the request, so each email goes alone.
+    assert sorted(calls) == sorted(f"email-outbox/{m.id}" for m in messages)
+
+
+@pytest.mark.asyncio
+async def test_rate_limiter_spaces_requests():
+    clock = SimpleNamespace(now=100.0)
+    slept = []
+
+    async def sleep(seconds):
+        slept.append(seconds)
+        clock.now += seconds
+
+    limiter = RateLimiter(2.0, clock=lambda: clock.now, sleep=sleep)
+    for _ in range(3):
+        await limiter.wait()
+
+    assert slept == [0.5, 0.5]
@@ -0,0 +1,84 @@
+"""
+Tests for the per-organization Google access-token cache (no database or network).
+"""
+
+import asyncio
+from datetime import datetime, timedelta, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services.google_oauth import GoogleOAuthService
+
+
+class _FakeSession:
+    def __init__(self, creds):
+        self.creds = creds
+        self.queries = 0
+        self.commits = 0
+
+    async def execute(self, _query):
+        self.queries += 1
+        return SimpleNamespace(scalar_one_or_none=lambda: self.creds)
+
+    async def commit(self):
+        self.commits += 1
+
+
+def _creds(expires_in_seconds):
+    return SimpleNamespace(
+        access_token="old-token",
+        refresh_token="refresh",
+        token_expiry=datetime.now(timezone.utc) + timedelta(seconds=expires_in_seconds),
+    )
+
+
+@pytest.mark.asyncio
+async def test_valid_token_is_served_from_cache():
+    service = GoogleOAuthService()
+    org_id = uuid4()
+    db = _FakeSession(_creds(3600))
+
+    assert await service.get_valid_access_token(org_id, db) == "old-token"
+    assert await service.get_valid_access_token(org_id, db) == "old-token"
+    assert db.queries == 1
+
+    service.invalidate_access_token(org_id)
+    await service.get_valid_access_token(org_id, db)
+    assert db.queries == 2
+
+
+@pytest.mark.asyncio
+async def test_concurrent_callers_share_one_refresh(monkeypatch):
+    service = GoogleOAuthService()
+    org_id = uuid4()
+    db = _FakeSession(_creds(60))
+    refreshes = 0
+
+    async def fake_refresh(refresh_token):
+        nonlocal refreshes
+        refreshes += 1
+        await asyncio.sleep(0.01)
+        return {"access_token": "new-token", "expires_in": 3600}
+
+    monkeypatch.setattr(service, "_refresh_access_token", fake_refresh)
+
+    tokens = await asyncio.gather(
+        *(service.get_valid_access_token(org_id, db) for _ in range(10))
+    )
+
+    assert tokens == ["new-token"] * 10
+    assert refreshes == 1
+    assert db.commits == 1
+    assert db.queries == 1
+
+
+@pytest.mark.asyncio
+async def test_disconnected_org_is_not_cached():
+    service = GoogleOAuthService()
+    org_id = uuid4()
+
+    with pytest.raises(ValueError):
+        await service.get_valid_access_token(org_id, _FakeSession(None))
+    assert org_id not in service._token_cache
@@ -0,0 +1,108 @@
+"""
+Tests for slow-query capture, the index advisor and the transaction indexes (no database required).
+"""
+
+import json
+import time
+from contextlib import asynccontextmanager
+from types import SimpleNamespace
+
+import pytest
+
+from app.db import index_advisor
+from app.db import session as session_module
+from app.models.transactions import Transaction
+
+
+def test_slow_statements_are_captured_without_parameters(monkeypatch, tmp_path):
+    capture = tmp_path / "slow.jsonl"
+    monkeypatch.setattr(session_module, "_enable_db_metrics", True)
+    monkeypatch.setattr(session_module.settings, "LOG_SLOW_QUERIES_MS", 5)
+    monkeypatch.setattr(session_module.settings, "SLOW_QUERY_CAPTURE_PATH", str(capture))
+
+    for elapsed in (0.5, 0.0):
+        context = SimpleNamespace(_query_start_time=time.perf_counter() - elapsed)
+        session_module._after_cursor_execute(
+            None, None, "SELECT * FROM transactions WHERE organization_id = $1", ("secret",), context, False
+        )
+
+    (line,) = capture.read_text().splitlines()
+    entry = json.loads(line)
+    assert entry["sql"] == "SELECT * FROM transactions WHERE organization_id = $1"
+    assert entry["elapsed_ms"] >= 500
+    assert "secret" not in line
+
+
+def test_captured_queries_are_grouped_by_normalized_sql():
+    lines = [
+        json.dumps({"sql": "SELECT 1\n  FROM transactions", "elapsed_ms": 40}),
+        json.dumps({"sql": "SELECT 1 FROM transactions", "elapsed_ms": 60}),
+        json.dumps({"sql": "SELECT 2 FROM projects", "elapsed_ms": 30}),
+        json.dumps({"sql": "LOCK TABLE org_monthly_financials IN EXCLUSIVE MODE", "elapsed_ms": 900}),
+        "not json",
+    ]
+
+    queries = index_advisor.load_captured_queries(lines)
+
+    assert [q.sql for q in queries] == ["SELECT 1 FROM transactions", "SELECT 2 FROM projects"]
+    assert (queries[0].count, queries[0].max_ms, queries[0].avg_ms) == (2, 60, 50)
+
+
+class FakeConnection:
+    def __init__(self, plans):
+        self.plans = plans
+        self.executed = []
+
+    @asynccontextmanager
+    async def transaction(self):
+        yield
+
+    async def execute(self, sql):
+        self.executed.append(sql)
+
+    async def fetch(self, sql):
+        return [{"relname": "transactions", "reltuples": 2_000_000}, {"relname": "plans", "reltuples": 4}]
+
+    async def fetchval(self, sql, *args):
+        if sql.startswith("SELECT cardinality"):
+            return 2
+        self.executed.append(sql)
+        return json.dumps(self.plans.pop(0))
+
+
+@pytest.mark.asyncio
+async def test_advisor_reports_seq_scans_of_large_tables_only():
+    seq_scan_plan = [{"Plan": {
+        "Node Type": "Aggregate",
+        "Plans": [
+            {"Node Type": "Seq Scan", "Relation Name": "transactions", "Plan Rows": 120,
+             "Filter": "(organization_id = $1)"},
+            {"Node Type": "Seq Scan", "Relation Name": "plans", "Plan Rows": 4},
+        ],
+    }}]
+    index_plan = [{"Plan": {"Node Type": "Index Only Scan", "Relation Name": "transactions"}}]
+    connection = FakeConnection([seq_scan_plan, index_plan])
+    queries = [
+        index_advisor.CapturedQuery(sql="SELECT sum(amount_cents) FROM transactions WHERE organization_id = $1 AND type = $2", count=3),
+        index_advisor.CapturedQuery(sql="SELECT id FROM transactions WHERE organization_id = $1 AND project_id = $2", count=1),
+    ]
+
+    report = await index_advisor.advise(connection, queries)
+
+    (advice,) = report
+    assert advice.query is queries[0]
+    assert [(s.relation, s.filter) for s in advice.seq_scans] == [("transactions", "(organization_id = $1)")]
+    assert "SET LOCAL plan_cache_mode = force_generic_plan" in connection.executed
+    assert "EXPLAIN (FORMAT JSON) EXECUTE index_advisor_stmt(NULL, NULL)" in connection.executed
+    assert connection.executed.count("DEALLOCATE index_advisor_stmt") == 2
+
+
+def test_transaction_model_declares_partial_reporting_indexes():
+    indexes = {index.name: index for index in Transaction.__table__.indexes}
+
+    applied = indexes["ix_transactions_org_applied_date"]
+    assert [c.name for c in applied.columns] == ["organization_id", "transaction_date"]
+    assert "internal_transfer" in str(applied.dialect_options["postgresql"]["where"])
+    assert applied.dialect_options["postgresql"]["include"] == ["type", "category", "amount_cents"]
+    assert "payment_status = 'pending'" in str(indexes["ix_transactions_org_pending"].dialect_options["postgresql"]["where"])
+    assert {"ix_transactions_org_project", "ix_transactions_org_budget_line", "ix_transactions_org_supplier"} <= set(indexes)
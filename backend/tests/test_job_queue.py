@@ -0,0 +1,172 @@
+"""
+Tests for job schedules, retry backoff and worker job execution (no database required).
+"""
+
+import asyncio
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.core.cron import parse_schedule
+from app.services import job_queue as job_queue_module
+from app.services import job_worker
+from app.services.job_queue import compute_backoff, job_task
+
+
+def _utc(*args):
+    return datetime(*args, tzinfo=timezone.utc)
+
+
+def test_cron_next_after():
+    daily = parse_schedule("0 9 * * *")
+    assert daily.next_after(_utc(2026, 3, 1, 8, 59)) == _utc(2026, 3, 1, 9, 0)
+    assert daily.next_after(_utc(2026, 3, 1, 9, 0)) == _utc(2026, 3, 2, 9, 0)
+
+    every_15 = parse_schedule("*/15 * * * *")
+    assert every_15.next_after(_utc(2026, 3, 1, 10, 14, 30)) == _utc(2026, 3, 1, 10, 15)
+
+    # Mondays at 08:30 (0 and 7 are both Sunday).
+    monday = parse_schedule("30 8 * * 1")
+    assert monday.next_after(_utc(2026, 10, 16, 12, 0)) == _utc(2026, 10, 19, 8, 30)
+    assert parse_schedule("0 0 * * 7").next_after(_utc(2026, 10, 16)) == _utc(2026, 10, 18)
+
+    # Day-of-month and day-of-week restricted: either matches.
+    either = parse_schedule("0 0 1 * 1")
+    assert either.next_after(_utc(2026, 10, 16)) == _utc(2026, 10, 19)
+
+    assert parse_schedule("@monthly").next_after(_utc(2026, 12, 15)) == _utc(2027, 1, 1)
+    assert parse_schedule("@every 90s").next_after(_utc(2026, 1, 1)) == _utc(2026, 1, 1, 0, 1, 30)
+
+
+@pytest.mark.parametrize("expression", ["* * * *", "61 * * * *", "@every 0s", "*/0 * * * *", "0 0 31 2 *"])
+def test_invalid_schedules_are_rejected(expression):
+    with pytest.raises(ValueError):
+        parse_schedule(expression).next_after(_utc(2026, 1, 1))
+
+
+def test_backoff_grows_exponentially_and_is_capped(monkeypatch):
+    monkeypatch.setattr(job_queue_module.random, "random", lambda: 1.0)
+    monkeypatch.setattr(job_queue_module.settings, "JOB_RETRY_BASE_SECONDS", 10)
+    monkeypatch.setattr(job_queue_module.settings, "JOB_RETRY_MAX_SECONDS", 100)
+
+    assert [compute_backoff(n) for n in (1, 2, 3, 4, 5)] == [10, 20, 40, 80, 100]
+
+
+class _NullSession:
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        return False
+
+
+@pytest.fixture
+def settled(monkeypatch):
+    """Record how the worker settles jobs instead of writing to the database."""
+    calls = []
+
+    def recorder(kind):
+        async def record(db, job, worker_id, *args):
+            calls.append((kind, job.name, args))
+        return record
+
+    monkeypatch.setattr(job_worker, "SessionLocal", _NullSession)
+    for kind in ("complete", "fail", "mark_cancelled", "release"):
+        monkeypatch.setattr(job_worker.job_queue, kind, recorder(kind))
+    return calls
+
+
+def _worker():
+    return job_worker.JobWorker(
+        queues=["default"], concurrency=2, poll_interval=0.01,
+        visibility_timeout=30, shutdown_grace=0.05,
+    )
+
+
+def _job(name):
+    return SimpleNamespace(id=uuid4(), name=name, payload={}, attempts=1, max_attempts=3)
+
+
+@pytest.mark.asyncio
+async def test_worker_completes_and_fails_jobs(settled):
+    @job_task("tests.ok")
+    async def ok(job):
+        return {"done": True}
+
+    @job_task("tests.boom")
+    async def boom(job):
+        raise RuntimeError("boom")
+
+    @job_task("tests.slow", timeout_seconds=0.01)
+    async def slow(job):
+        await asyncio.sleep(1)
+
+    worker = _worker()
+    for name in ("tests.ok", "tests.boom", "tests.slow", "tests.unknown"):
+        await worker._execute(_job(name))
+
+    assert settled[0] == ("complete", "tests.ok", ({"done": True},))
+    assert settled[1] == ("fail", "tests.boom", ("RuntimeError: boom",))
+    assert settled[2][0:2] == ("fail", "tests.slow") and "Timed out" in settled[2][2][0]
+    assert settled[3][0:2] == ("fail", "tests.unknown")
+    assert worker._running == {}
+
+
+@pytest.mark.asyncio
+async def test_worker_cancellation_and_shutdown_release(settled):
+    started = asyncio.Event()
+
+    @job_task("tests.long")
+    async def long_running(job):
+        started.set()
+        await asyncio.sleep(10)
+
+    worker = _worker()
+
+    cancelled = _job("tests.long")
+    task = asyncio.create_task(worker._execute(cancelled))
+    worker._running[cancelled.id] = task
+    await started.wait()
+    worker._cancel_requested.add(cancelled.id)
+    task.cancel()
+    await task
+
+    started.clear()
+    interrupted = _job("tests.long")
+    worker._running[interrupted.id] = asyncio.create_task(worker._execute(interrupted))
+    await started.wait()
+    await worker._drain()
+
+    assert [kind for kind, _, _ in settled] == ["mark_cancelled", "release"]
+
+
+@pytest.mark.asyncio
+async def test_drain_loop_polls_without_jobs_and_finishes_run_on_stop(settled):
+    runs = []
+    release = asyncio.Event()
+
+    async def drain():
+        runs.append(len(runs))
+        if len(runs) == 2:
+            await release.wait()
+        return {"processed": 1}
+
+    worker = _worker()
+    stop = asyncio.Event()
+    loop = asyncio.create_task(
+        worker._drain_loop(job_worker.DrainLoop(name="tests.drain", interval_seconds=0.01, drain=drain), stop)
+    )
+    while len(runs) < 2:
+        await asyncio.sleep(0.005)
+
+    # Stopping does not cut the in-progress run short.
+    stop.set()
+    await asyncio.sleep(0.02)
+    assert not loop.done()
+    release.set()
+    await worker._drain(loop)
+
+    assert runs == [0, 1]
+    assert settled == []
@@ -0,0 +1,36 @@
+"""
+Tests for reading dashboard trends from the monthly financial rollup (no database required).
+
+Rollup maintenance, invoice deletion and verify/rebuild are tested against
+the database in app/tests/test_monthly_financials_v1.py.
+"""
+
+from datetime import date, datetime
+from uuid import uuid4
+
+import pytest
+
+from app.services.analytics import AnalyticsService
+from app.services.financial_rollup import financial_rollup_service
+
+
+@pytest.mark.asyncio
+async def test_trends_are_built_from_rollup_months(monkeypatch):
+    calls = []
+
+    async def fake_monthly_totals(db, *, organization_id, start_month, end_month):
+        calls.append((start_month, end_month))
+        return [
+            {"month": date(2026, 1, 1), "income_cents": 10_000, "expense_cents": 4_000},
+            {"month": date(2026, 2, 1), "income_cents": 8_000, "expense_cents": 9_000},
+        ]
+
+    monkeypatch.setattr(financial_rollup_service, "get_monthly_totals", fake_monthly_totals)
+
+    trends = await AnalyticsService(cache=None)._get_trends_data(
+        uuid4(), datetime(2025, 12, 20), datetime(2026, 2, 10), db=None
+    )
+
+    assert calls == [(date(2025, 12, 20), date(2026, 2, 10))]
+    assert [m["month"] for m in trends["monthly_financial_trends"]] == ["2026-01", "2026-02"]
+    assert trends["monthly_financial_trends"][1]["net_profit_cents"] == -1_000
@@ -0,0 +1,139 @@
+"""
+Tests for batched notification fan-out (no database required).
+"""
+
+import asyncio
+import json
+from datetime import datetime, timezone
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from sqlalchemy.dialects import postgresql
+from sqlalchemy.sql.dml import Insert
+
+from app.core import websocket_manager as ws_module
+from app.core.pubsub import InMemoryBroker, PayloadTooLarge
+from app.core.websocket_manager import NotificationConnectionManager
+from app.models.notifications import Notification
+from app.services.notification_triggers import notify_organization_admins
+from app.services.notifications import notification_service
+
+
+class FakeWebSocket:
+    def __init__(self):
+        self.sent = []
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        self.sent.append(json.loads(text))
+
+
+class FakeDB:
+    """Returns `admin_ids` for the recipient lookup and echoes inserted rows back as RETURNING."""
+
+    def __init__(self, admin_ids):
+        self.admin_ids = admin_ids
+        self.inserts = []
+
+    async def execute(self, stmt):
+        if not isinstance(stmt, Insert):
+            return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: list(self.admin_ids)))
+
+        self.inserts.append(stmt)
+        params = stmt.compile(dialect=postgresql.dialect()).params
+        rows = [
+            Notification(
+                id=params[f"id_m{i}"],
+                organization_id=params[f"organization_id_m{i}"],
+                profile_id=params[f"profile_id_m{i}"],
+                title=params[f"title_m{i}"],
+                message=params[f"message_m{i}"],
+                type=params[f"type_m{i}"],
+                is_read=False,
+                notification_metadata=params[f"notification_metadata_m{i}"],
+                created_at=datetime.now(timezone.utc),
+            )
+            for i in range(len(self.admin_ids))
+        ]
+        return SimpleNamespace(scalars=lambda: SimpleNamespace(all=lambda: rows))
+
+
+async def _drain():
+    for _ in range(5):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_admin_fan_out_is_one_insert_and_one_publish(monkeypatch):
+    broker = InMemoryBroker()
+    published = []
+    real_publish = broker.publish
+
+    async def counting_publish(topic, message):
+        published.append(message)
+        await real_publish(topic, message)
+
+    broker.publish = counting_publish
+    manager = NotificationConnectionManager(broker=broker)
+    monkeypatch.setattr(ws_module, "notification_ws_manager", manager)
+
+    org_id = uuid4()
+    admin_ids = [uuid4() for _ in range(25)]
+    sockets = {admin_id: FakeWebSocket() for admin_id in admin_ids[:3]}
+    for admin_id, socket in sockets.items():
+        await manager.connect(socket, org_id, admin_id)
+
+    db = FakeDB(admin_ids)
+    await notify_organization_admins(
+        db=db,
+        organization_id=org_id,
+        title="invoice_status_changed_title",
+        message="invoice_status_changed_message",
+        metadata={"invoice_number": "INV-1"},
+    )
+    await _drain()
+
+    assert len(db.inserts) == 1
+    compiled = str(db.inserts[0].compile(dialect=postgresql.dialect()))
+    assert "RETURNING" in compiled
+    assert len(published) == 1
+    assert len(published[0]["deliveries"]) == 25
+    for admin_id, socket in sockets.items():
+        assert len(socket.sent) == 1
+        assert socket.sent[0]["action"] == "new"
+        assert socket.sent[0]["data"]["metadata"] == {"invoice_number": "INV-1"}
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_oversized_batch_falls_back_to_per_recipient_messages():
+    class LimitedBroker(InMemoryBroker):
+        async def publish(self, topic, message):
+            if "deliveries" in message:
+                raise PayloadTooLarge("too big")
+            await super().publish(topic, message)
+
+    manager = NotificationConnectionManager(broker=LimitedBroker())
+    org_id, first, second = uuid4(), uuid4(), uuid4()
+    sockets = [FakeWebSocket(), FakeWebSocket()]
+    await manager.connect(sockets[0], org_id, first)
+    await manager.connect(sockets[1], org_id, second)
+
+    await manager.broadcast_notifications([
+        (org_id, first, {"id": "n1"}),
+        (org_id, second, {"id": "n2"}),
+    ])
+    await _drain()
+
+    assert [s.sent[0]["data"]["id"] for s in sockets] == ["n1", "n2"]
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_create_many_without_recipients_skips_the_insert():
+    db = FakeDB([])
+    assert await notification_service.create_many(db=db, recipients=[], title="t", message="m") == []
+    assert db.inserts == []
@@ -0,0 +1,95 @@
+"""
+Tests for the content-addressed PDF cache hashing (no database required).
+"""
+
+from datetime import date, datetime
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+
+from app.services.pdf_cache import PDFCacheService, PINNED_GENERATED_AT
+from app.services.proposal_pdf import ProposalPDFService, TEMPLATE_DIR
+
+
+@pytest.fixture
+def cache_service():
+    return PDFCacheService()
+
+
+def _proposal(**overrides):
+    values = dict(
+        id=uuid4(),
+        organization_id=uuid4(),
+        title="Campanha Verão",
+        description="Vídeo institucional",
+        status="draft",
+        currency="BRL",
+        total_amount_cents=150000,
+        base_amount_cents=150000,
+        discount_cents=0,
+        valid_until=date(2026, 12, 31),
+        start_date=None,
+        end_date=None,
+        terms_conditions="Pagamento em 30 dias",
+        proposal_metadata={"line_items": [{"description": "Diária", "value_cents": 50000}]},
+        created_at=datetime(2026, 1, 1),
+    )
+    values.update(overrides)
+    return SimpleNamespace(**values)
+
+
+def test_same_html_and_assets_hash_identically(cache_service, tmp_path):
+    css = tmp_path / "doc.css"
+    css.write_text("body { color: black; }")
+
+    first = cache_service.compute_content_hash("<p>a</p>", css_path=str(css))
+    second = cache_service.compute_content_hash("<p>a</p>", css_path=str(css))
+
+    assert first == second
+    assert len(first) == 64
+
+
+def test_html_css_and_logo_changes_change_the_hash(cache_service, tmp_path):
+    css = tmp_path / "doc.css"
+    css.write_text("body { color: black; }")
+    logo = tmp_path / "logo.png"
+    logo.write_bytes(b"logo-v1")
+
+    base = cache_service.compute_content_hash("<p>a</p>", css_path=str(css), logo_path=str(logo))
+
+    assert cache_service.compute_content_hash("<p>b</p>", css_path=str(css), logo_path=str(logo)) != base
+
+    logo.write_bytes(b"logo-v2-different-size")
+    assert cache_service.compute_content_hash("<p>a</p>", css_path=str(css), logo_path=str(logo)) != base
+
+    css.write_text("body { color: red; } /* changed */")
+    assert cache_service.compute_content_hash("<p>a</p>", css_path=str(css), logo_path=str(logo)) != base
+
+
+@pytest.mark.asyncio
+async def test_pinned_render_is_stable_and_tracks_line_items(cache_service):
+    service = ProposalPDFService()
+    organization = SimpleNamespace(name="Produtora", tax_id=None)
+    client = SimpleNamespace(name="Cliente", email=None, phone=None, document=None)
+    proposal = _proposal()
+
+    async def content_hash(p, locale="pt-BR"):
+        html = await service.render_html(
+            proposal=p,
+            organization=organization,
+            client=client,
+            services=[],
+            locale=locale,
+            generated_at=PINNED_GENERATED_AT,
+        )
+        return cache_service.compute_content_hash(html, css_path=str(TEMPLATE_DIR / "proposal.css"))
+
+    first = await content_hash(proposal)
+    assert await content_hash(proposal) == first
+
+    changed = _proposal(
+        id=proposal.id,
+        proposal_metadata={"line_items": [{"description": "Diária", "value_cents": 60000}]},
+    )
+    assert await content_hash(changed) != first
@@ -0,0 +1,155 @@
+"""
+Tests for the shared PDF render engine queueing (no WeasyPrint required).
+
+The engine runs with max_workers=0 (thread mode) and a fake renderer so the
+queue, fairness and backpressure logic can be exercised in isolation.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import pytest
+
+from app.services import pdf_renderer
+from app.services.pdf_renderer import (
+    PDFRenderEngine,
+    PDFRenderQueueFullError,
+    PDFRenderRateLimitedError,
+    PDFRenderTimeoutError,
+)
+
+
+@pytest.fixture
+def rendered(monkeypatch):
+    """Replace the WeasyPrint call with a fake that records render order."""
+    calls: list[str] = []
+    gate = threading.Event()
+    gate.set()
+
+    def fake_render(html_content, base_url, css_path):  # noqa: ARG001
+        gate.wait(timeout=5)
+        calls.append(html_content)
+        return f"%PDF-{html_content}".encode()
+
+    monkeypatch.setattr(pdf_renderer, "_render_pdf", fake_render)
+    return calls, gate
+
+
+@pytest.mark.asyncio
+async def test_render_returns_pdf_bytes(rendered):
+    engine = PDFRenderEngine(max_workers=0, queue_size=4, max_pending_per_org=2, timeout_seconds=5)
+
+    pdf_bytes = await engine.render("doc", base_url=".", organization_id="org-a")
+
+    assert pdf_bytes == b"%PDF-doc"
+    assert engine.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_queue_full_and_per_org_limits(rendered):
+    _, gate = rendered
+    gate.clear()
+    engine = PDFRenderEngine(max_workers=0, queue_size=3, max_pending_per_org=2, timeout_seconds=5)
+
+    tasks = [
+        asyncio.create_task(engine.render("a1", base_url=".", organization_id="org-a")),
+        asyncio.create_task(engine.render("a2", base_url=".", organization_id="org-a")),
+    ]
+    await asyncio.sleep(0)
+
+    with pytest.raises(PDFRenderRateLimitedError) as exc_info:
+        await engine.render("a3", base_url=".", organization_id="org-a")
+    assert exc_info.value.status_code == 429
+
+    tasks.append(asyncio.create_task(engine.render("b1", base_url=".", organization_id="org-b")))
+    await asyncio.sleep(0)
+
+    with pytest.raises(PDFRenderQueueFullError) as exc_info:
+        await engine.render("c1", base_url=".", organization_id="org-c")
+    assert exc_info.value.status_code == 503
+
+    gate.set()
+    await asyncio.gather(*tasks)
+    assert engine.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_orgs_are_served_round_robin(rendered):
+    calls, gate = rendered
+    gate.clear()
+    engine = PDFRenderEngine(max_workers=0, queue_size=10, max_pending_per_org=5, timeout_seconds=5)
+
+    tasks = [
+        asyncio.create_task(engine.render(name, base_url=".", organization_id=name[0]))
+        for name in ["a1", "a2", "a3", "b1", "b2"]
+    ]
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(*tasks)
+
+    # a1 was already running; the rest alternate between orgs.
+    assert calls == ["a1", "a2", "b1", "a3", "b2"]
+
+
+@pytest.mark.asyncio
+async def test_timeout_releases_queue_slot(monkeypatch):
+    def slow_render(html_content, base_url, css_path):  # noqa: ARG001
+        time.sleep(0.2)
+        return b"%PDF-slow"
+
+    monkeypatch.setattr(pdf_renderer, "_render_pdf", slow_render)
+    engine = PDFRenderEngine(max_workers=0, queue_size=2, max_pending_per_org=2, timeout_seconds=0.05)
+
+    with pytest.raises(PDFRenderTimeoutError):
+        await engine.render("slow", base_url=".", organization_id="org-a")
+
+    await asyncio.sleep(0.3)
+    assert engine.stats()["pending"] == 0
+
+
+@pytest.mark.asyncio
+async def test_crashes_on_a_recycled_pool_do_not_shut_down_its_replacement(monkeypatch):
+    crash_gate, ok_gate = threading.Event(), threading.Event()
+
+    def render(html_content, base_url, css_path):  # noqa: ARG001
+        if html_content.startswith("crash"):
+            crash_gate.wait(timeout=5)
+            raise BrokenProcessPool("worker died")
+        ok_gate.wait(timeout=5)
+        return b"%PDF-ok"
+
+    class TrackedPool(ThreadPoolExecutor):
+        shut_down = False
+
+        def shutdown(self, wait=True, *, cancel_futures=False):
+            self.shut_down = True
+            super().shutdown(wait=wait, cancel_futures=cancel_futures)
+
+    monkeypatch.setattr(pdf_renderer, "_render_pdf", render)
+    engine = PDFRenderEngine(max_workers=3, queue_size=10, max_pending_per_org=10, timeout_seconds=5)
+    pools = []
+
+    def get_executor():
+        if engine._executor is None:
+            engine._executor = TrackedPool(max_workers=3)
+            pools.append(engine._executor)
+        return engine._executor
+
+    monkeypatch.setattr(engine, "_get_executor", get_executor)
+
+    # Three jobs fill the first pool; the fourth waits and lands on its replacement.
+    crashes = [asyncio.create_task(engine.render(f"crash-{i}", base_url=".")) for i in range(3)]
+    survivor = asyncio.create_task(engine.render("ok", base_url="."))
+    await asyncio.sleep(0.05)
+    crash_gate.set()
+    results = await asyncio.gather(*crashes, return_exceptions=True)
+    ok_gate.set()
+
+    assert all(isinstance(result, BrokenProcessPool) for result in results)
+    assert await survivor == b"%PDF-ok"
+    assert len(pools) == 2
+    assert pools[0].shut_down and not pools[1].shut_down
+    engine.shutdown()
@@ -0,0 +1,34 @@
+"""
+Tests for the per-project counters that need no database (service wiring and
+request limits); the counters themselves are tested in app/tests/test_project_stats_v1.py.
+"""
+
+from types import SimpleNamespace
+from uuid import uuid4
+
+import pytest
+from fastapi import HTTPException
+
+from app.api.v1.endpoints import projects as projects_endpoints
+from app.services.base import BaseService
+from app.services.project_stats import ProjectCountedMixin
+
+
+def test_counted_service_without_counter_deltas_cannot_be_instantiated():
+    class UncountedService(ProjectCountedMixin, BaseService):
+        pass
+
+    with pytest.raises(TypeError, match="counter_deltas"):
+        UncountedService(model=None)
+
+
+@pytest.mark.asyncio
+async def test_batch_stats_rejects_too_many_projects():
+    with pytest.raises(HTTPException) as exc:
+        await projects_endpoints.get_projects_stats(
+            project_ids=[uuid4() for _ in range(projects_endpoints.MAX_STATS_BATCH + 1)],
+            organization_id=uuid4(),
+            profile=SimpleNamespace(is_master_owner=False, role_v2="admin"),
+            db=None,
+        )
+    assert exc.value.status_code == 400
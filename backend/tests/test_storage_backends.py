@@ -0,0 +1,214 @@
+"""
+Tests for the async storage backends and streamed uploads (no network required).
+"""
+
+import io
+import json
+
+import httpx
+import pytest
+from starlette.datastructures import UploadFile
+
+from app.services.storage import StorageService
+from app.services.storage_backends import (
+    LocalStorageBackend,
+    StorageBackendError,
+    SupabaseStorageBackend,
+)
+
+
+@pytest.fixture
+def local_service(tmp_path):
+    service = StorageService()
+    service._backend = LocalStorageBackend(tmp_path)
+    return service
+
+
+@pytest.mark.asyncio
+async def test_local_backend_round_trip(tmp_path):
+    backend = LocalStorageBackend(tmp_path)
+
+    await backend.upload("production-files", "org/scripts/a.pdf", b"%PDF-1", content_type="application/pdf")
+
+    entries = await backend.list("production-files", "org/scripts")
+    assert [e["name"] for e in entries] == ["a.pdf"]
+    assert entries[0]["metadata"]["size"] == 6
+    assert (await backend.list("production-files", "org"))[0] == {"name": "scripts", "id": None, "metadata": None}
+
+    url = await backend.create_signed_url("production-files", "org/scripts/a.pdf", 60)
+    assert url.startswith("file://") and "expires=" in url
+
+    with pytest.raises(StorageBackendError):
+        await backend.upload("production-files", "org/scripts/a.pdf", b"again", content_type="application/pdf")
+    with pytest.raises(StorageBackendError):
+        await backend.upload("production-files", "../escape.pdf", b"x", content_type="application/pdf")
+
+    removed = await backend.remove("production-files", ["org/scripts/a.pdf"])
+    assert len(removed) == 1
+    assert await backend.list("production-files", "org/scripts") == []
+
+
+@pytest.mark.asyncio
+async def test_upload_stream_writes_chunks(local_service, monkeypatch):
+    from app.services import storage
+
+    monkeypatch.setattr(storage.settings, "STORAGE_UPLOAD_CHUNK_SIZE", 4)
+    content = b"%PDF-" + b"x" * 37
+    upload = UploadFile(file=io.BytesIO(content), filename="script.pdf")
+
+    result = await local_service.upload_stream(
+        organization_id="org",
+        module="scripts",
+        upload=upload,
+    )
+
+    assert result["size_bytes"] == len(content)
+    assert result["access_url"] is None
+    assert await local_service.get_file_size("production-files", result["file_path"]) == len(content)
+
+
+@pytest.mark.asyncio
+async def test_upload_stream_enforces_bucket_limit_while_streaming(local_service, tmp_path):
+    local_service.buckets["production-files"]["max_size_mb"] = 0
+    upload = UploadFile(file=io.BytesIO(b"too big"), filename="script.pdf")
+
+    # Declared size passes (unknown), but the stream is cut off once it exceeds the limit.
+    with pytest.raises(ValueError, match="File too large"):
+        await local_service.upload_stream(
+            organization_id="org",
+            module="scripts",
+            upload=upload,
+            size_bytes=0,
+        )
+    assert await local_service.list_files("production-files", "org/scripts") == []
+
+
+@pytest.mark.asyncio
+async def test_supabase_backend_uses_storage_rest_api():
+    requests: list[httpx.Request] = []
+
+    def handler(request: httpx.Request) -> httpx.Response:
+        requests.append(request)
+        if request.url.path == "/storage/v1/object/sign/bucket":
+            return httpx.Response(200, json=[
+                {"path": "a.pdf", "signedURL": "/object/sign/bucket/a.pdf?token=a", "error": None},
+                {"path": "gone.pdf", "signedURL": None, "error": "Either the object does not exist or you do not have access to it"},
+            ])
+        if request.url.path.startswith("/storage/v1/object/sign/"):
+            return httpx.Response(200, json={"signedURL": "/object/sign/bucket/a%20b.pdf?token=t"})
+        if request.url.path == "/storage/v1/object/list/bucket":
+            return httpx.Response(200, json=[{"name": "a b.pdf", "metadata": {"size": 3}}])
+        if request.method == "DELETE":
+            return httpx.Response(200, json=[{"name": "a b.pdf"}])
+        if request.url.path == "/storage/v1/object/bucket/dup.pdf":
+            return httpx.Response(400, json={"error": "Duplicate", "message": "The resource already exists"})
+        return httpx.Response(200, json={"Key": "bucket/a b.pdf"})
+
+    backend = SupabaseStorageBackend(
+        "https://project.supabase.co/",
+        "service-key",
+        transport=httpx.MockTransport(handler),
+    )
+
+    async def chunks():
+        yield b"ab"
+        yield b"c"
+
+    await backend.upload("bucket", "a b.pdf", chunks(), content_type="application/pdf", size=3)
+    upload_request = requests[-1]
+    assert upload_request.url.path == "/storage/v1/object/bucket/a b.pdf"
+    assert upload_request.headers["Authorization"] == "Bearer service-key"
+    assert upload_request.headers["content-length"] == "3"
+
+    assert await backend.list("bucket", "") == [{"name": "a b.pdf", "metadata": {"size": 3}}]
+    assert json.loads(requests[-1].content)["prefix"] == ""
+
+    signed = await backend.create_signed_url("bucket", "a b.pdf", 60)
+    assert signed == "https://project.supabase.co/storage/v1/object/sign/bucket/a%20b.pdf?token=t"
+
+    batch = await backend.create_signed_urls("bucket", ["a.pdf", "gone.pdf"], 60)
+    assert batch == {"a.pdf": "https://project.supabase.co/storage/v1/object/sign/bucket/a.pdf?token=a"}
+    assert json.loads(requests[-1].content) == {"expiresIn": 60, "paths": ["a.pdf", "gone.pdf"]}
+
+    assert await backend.remove("bucket", ["a b.pdf"]) == [{"name": "a b.pdf"}]
+    assert json.loads(requests[-1].content) == {"prefixes": ["a b.pdf"]}
+
+    with pytest.raises(StorageBackendError, match="already exists"):
+        await backend.upload("bucket", "dup.pdf", b"x", content_type="application/pdf")
+
+    await backend.close()
+
+
+class _CountingBackend(LocalStorageBackend):
+    def __init__(self, root):
+        super().__init__(root)
+        self.batch_calls: list[list[str]] = []
+
+    async def create_signed_urls(self, bucket, paths, expires_in):
+        self.batch_calls.append(list(paths))
+        return await super().create_signed_urls(bucket, paths, expires_in)
+
+
+@pytest.mark.asyncio
+async def test_batch_signing_is_one_call_and_cached(tmp_path, monkeypatch):
+    from app.services import storage
+
+    service = StorageService()
+    backend = _CountingBackend(tmp_path)
+    service._backend = backend
+    paths = [f"org/scripts/{i}.pdf" for i in range(80)]
+    for path in paths:
+        await backend.upload("production-files", path, b"%PDF", content_type="application/pdf")
+
+    urls = await service.generate_signed_urls("production-files", paths + ["org/scripts/missing.pdf"])
+    assert len(urls) == 80
+    assert len(backend.batch_calls) == 1
+
+    # Second listing is served from the cache; a single-path call reuses it too.
+    assert await service.generate_signed_urls("production-files", paths) == urls
+    assert await service.generate_signed_url("production-files", paths[0]) == urls[paths[0]]
+    assert backend.batch_calls == [paths + ["org/scripts/missing.pdf"]]
+
+    # Deleting a file drops its cached URL.
+    await service.delete_file("production-files", paths[0])
+    await service.generate_signed_urls("production-files", paths[:2])
+    assert backend.batch_calls[-1] == [paths[0]]
+
+    # URLs that would be within the margin of expiry are not reused.
+    monkeypatch.setattr(storage.settings, "SIGNED_URL_CACHE_MARGIN_SECONDS", 60)
+    await service.generate_signed_urls("production-files", paths[1:3], expires_in=30)
+    await service.generate_signed_urls("production-files", paths[1:3], expires_in=30)
+    assert backend.batch_calls[-2:] == [paths[1:3], paths[1:3]]
+
+
+@pytest.mark.asyncio
+async def test_reused_signed_urls_report_their_remaining_lifetime(local_service):
+    paths = ["org/scripts/a.pdf", "org/scripts/b.pdf"]
+    for path in paths:
+        await local_service._backend.upload("production-files", path, b"%PDF", content_type="application/pdf")
+
+    url, expires_in = await local_service.generate_signed_url_with_expiry("production-files", paths[0])
+    assert expires_in == 3600
+
+    # Age the cached URL by ten minutes.
+    key = ("production-files", paths[0], 3600)
+    entry = local_service._signed_urls[key]
+    local_service._signed_urls[key] = entry._replace(expires_at=entry.expires_at - 600)
+
+    reused_url, expires_in = await local_service.generate_signed_url_with_expiry("production-files", paths[0])
+    assert reused_url == url and 2990 <= expires_in <= 3000
+    urls, batch_expires_in = await local_service.generate_signed_urls_with_expiry("production-files", paths)
+    assert urls[paths[0]] == url and batch_expires_in <= expires_in
+
+
+def test_signed_url_requests_reject_null_or_out_of_range_expiry():
+    from pydantic import ValidationError
+
+    from app.schemas.storage import SignedUrlBatchRequest, SignedUrlRequest
+
+    assert SignedUrlBatchRequest(bucket="b", file_paths=["p"]).expires_in == 3600
+    for expires_in in (None, 0, 10 ** 9):
+        with pytest.raises(ValidationError):
+            SignedUrlBatchRequest(bucket="b", file_paths=["p"], expires_in=expires_in)
+        with pytest.raises(ValidationError):
+            SignedUrlRequest(bucket="b", file_path="p", expires_in=expires_in)
@@ -0,0 +1,148 @@
+"""
+Tests for the async Stripe gateway: thread pool, timeouts, circuit breaker and status cache.
+"""
+
+import threading
+import time
+from types import SimpleNamespace
+
+import pytest
+import stripe
+
+from app.services import stripe_connect as connect_service
+from app.services.stripe_gateway import (
+    CIRCUIT_CLOSED,
+    CIRCUIT_HALF_OPEN,
+    CIRCUIT_OPEN,
+    StripeGateway,
+    StripeUnavailableError,
+)
+
+
+def _gateway(**overrides):
+    options = dict(
+        max_workers=2,
+        timeout_seconds=1.0,
+        failure_threshold=2,
+        reset_seconds=30,
+        cache_ttl=60,
+        cache_maxsize=100,
+    )
+    options.update(overrides)
+    gateway = StripeGateway(**options)
+    clock = SimpleNamespace(now=0.0)
+    gateway.breaker._clock = lambda: clock.now
+    return gateway, clock
+
+
+@pytest.mark.asyncio
+async def test_sdk_calls_run_in_the_gateway_thread_pool():
+    gateway, _ = _gateway()
+
+    name = await gateway.call(lambda: threading.current_thread().name)
+
+    assert name.startswith("stripe")
+    gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_timeouts_open_the_circuit_and_calls_fail_fast():
+    gateway, clock = _gateway(timeout_seconds=0.05)
+    calls = []
+
+    def slow():
+        calls.append(1)
+        time.sleep(0.2)
+
+    for _ in range(2):
+        with pytest.raises(StripeUnavailableError, match="timed out"):
+            await gateway.call(slow)
+    assert gateway.breaker.state == CIRCUIT_OPEN
+
+    with pytest.raises(stripe.error.StripeError, match="temporarily unavailable"):
+        await gateway.call(slow)
+    assert len(calls) == 2
+
+    clock.now = 31
+    gateway.timeout_seconds = 1.0  # the trial queues behind the timed-out calls still running
+    assert gateway.breaker.state == CIRCUIT_HALF_OPEN
+    assert await gateway.call(lambda: "ok") == "ok"
+    assert gateway.breaker.state == CIRCUIT_CLOSED
+    gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_rejected_requests_do_not_trip_the_breaker():
+    gateway, _ = _gateway(failure_threshold=1)
+
+    def rejected():
+        raise stripe.error.InvalidRequestError("No such customer", param="customer", http_status=404)
+
+    for _ in range(3):
+        with pytest.raises(stripe.error.InvalidRequestError):
+            await gateway.call(rejected)
+    assert gateway.breaker.state == CIRCUIT_CLOSED
+
+    def server_error():
+        raise stripe.error.APIError("boom", http_status=502)
+
+    with pytest.raises(stripe.error.APIError):
+        await gateway.call(server_error)
+    assert gateway.breaker.state == CIRCUIT_OPEN
+    gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_account_status_is_cached_until_account_updated(monkeypatch):
+    gateway, _ = _gateway()
+    monkeypatch.setattr(connect_service, "stripe_gateway", gateway)
+    retrieved = []
+
+    def retrieve(account_id):
+        retrieved.append(account_id)
+        return {"id": account_id, "charges_enabled": len(retrieved) > 1}
+
+    monkeypatch.setattr(stripe.Account, "retrieve", retrieve)
+    organization = SimpleNamespace(
+        id="org", stripe_connect_account_id="acct_1",
+        stripe_connect_onboarding_complete=False, stripe_connect_enabled_at=None,
+    )
+
+    first = await connect_service.get_connect_status(organization)
+    second = await connect_service.get_connect_status(organization)
+    assert retrieved == ["acct_1"]
+    assert first["charges_enabled"] is second["charges_enabled"] is False
+
+    class FakeDB:
+        async def execute(self, stmt):
+            return SimpleNamespace(scalar_one_or_none=lambda: None)
+
+    await connect_service.handle_connect_account_updated(FakeDB(), {"object": {"id": "acct_1"}})
+
+    refreshed = await connect_service.get_connect_status(organization)
+    assert retrieved == ["acct_1", "acct_1"]
+    assert refreshed["charges_enabled"] is True
+    gateway.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_checkout_webhook_events_invalidate_cached_sessions(monkeypatch):
+    gateway, _ = _gateway()
+    retrieved = []
+
+    def retrieve(session_id, stripe_account=None):
+        retrieved.append((session_id, stripe_account))
+        return {"id": session_id, "payment_status": "unpaid"}
+
+    monkeypatch.setattr(stripe.checkout.Session, "retrieve", retrieve)
+
+    await gateway.retrieve_checkout_session("cs_1", stripe_account="acct_1")
+    await gateway.retrieve_checkout_session("cs_1", stripe_account="acct_1")
+    gateway.invalidate_for_event({
+        "type": "checkout.session.async_payment_succeeded",
+        "data": {"object": {"id": "cs_1"}},
+    })
+    await gateway.retrieve_checkout_session("cs_1", stripe_account="acct_1")
+
+    assert retrieved == [("cs_1", "acct_1"), ("cs_1", "acct_1")]
+    gateway.shutdown()
@@ -0,0 +1,103 @@
+"""
+Tests for queued WebSocket delivery: concurrency, slow-consumer eviction and heartbeats.
+"""
+
+import asyncio
+import json
+from uuid import uuid4
+
+import pytest
+
+from app.core import websocket_manager as ws_module
+from app.core.pubsub import InMemoryBroker
+from app.core.websocket_manager import TRY_AGAIN_LATER, NotificationConnectionManager
+
+
+class FakeWebSocket:
+    def __init__(self, blocked: bool = False):
+        self.sent = []
+        self.closed_with = None
+        self._unblocked = asyncio.Event()
+        if not blocked:
+            self._unblocked.set()
+
+    async def accept(self):
+        pass
+
+    async def send_text(self, text):
+        await self._unblocked.wait()
+        self.sent.append(json.loads(text))
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+async def _drain():
+    for _ in range(10):
+        await asyncio.sleep(0)
+
+
+@pytest.mark.asyncio
+async def test_slow_consumer_is_evicted_without_delaying_other_tabs(monkeypatch):
+    monkeypatch.setattr(ws_module.settings, "WS_SEND_QUEUE_SIZE", 2)
+    manager = NotificationConnectionManager(broker=InMemoryBroker())
+    org_id, user_id = uuid4(), uuid4()
+    fast, slow = FakeWebSocket(), FakeWebSocket(blocked=True)
+    await manager.connect(fast, org_id, user_id)
+    await manager.connect(slow, org_id, user_id)
+
+    for n in range(5):
+        await manager.send_to_user(org_id, user_id, {"n": n})
+        await _drain()
+
+    assert [m["n"] for m in fast.sent] == [0, 1, 2, 3, 4]
+    assert slow.closed_with == TRY_AGAIN_LATER
+    assert manager.get_user_connection_count(org_id, user_id) == 1
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_message_is_serialized_once_for_all_sockets(monkeypatch):
+    manager = NotificationConnectionManager(broker=InMemoryBroker())
+    org_id, user_id, colleague = uuid4(), uuid4(), uuid4()
+    sockets = [FakeWebSocket() for _ in range(3)]
+    for socket in sockets[:2]:
+        await manager.connect(socket, org_id, user_id)
+    await manager.connect(sockets[2], org_id, colleague)
+
+    dumps_calls = []
+    real_dumps = json.dumps
+
+    def counting_dumps(*args, **kwargs):
+        dumps_calls.append(args)
+        return real_dumps(*args, **kwargs)
+
+    monkeypatch.setattr(ws_module.json, "dumps", counting_dumps)
+    sent = await manager.send_to_org(org_id, {"type": "announcement"})
+    await _drain()
+
+    assert sent == 3
+    assert len(dumps_calls) == 1
+    assert all(socket.sent == [{"type": "announcement"}] for socket in sockets)
+    await manager.close()
+
+
+@pytest.mark.asyncio
+async def test_heartbeat_reaps_silent_sockets(monkeypatch):
+    monkeypatch.setattr(ws_module.settings, "WS_HEARTBEAT_INTERVAL_SECONDS", 0.01)
+    monkeypatch.setattr(ws_module.settings, "WS_IDLE_TIMEOUT_SECONDS", 0.05)
+    manager = NotificationConnectionManager(broker=InMemoryBroker())
+    org_id, user_id = uuid4(), uuid4()
+    active, silent = FakeWebSocket(), FakeWebSocket()
+    await manager.connect(active, org_id, user_id)
+    await manager.connect(silent, org_id, user_id)
+
+    for _ in range(10):
+        await asyncio.sleep(0.01)
+        manager.touch(active, org_id, user_id)
+
+    assert silent.closed_with == TRY_AGAIN_LATER
+    assert active.closed_with is None
+    assert {"type": "heartbeat"} in active.sent
+    assert manager.get_connection_count() == 1
+    await manager.close()
@@ -3,6 +3,7 @@
 import { useEffect, useState } from 'react'
 import { useQueryClient } from '@tanstack/react-query'
 import { createClient } from '@/lib/supabase/client'
+import { apiClient } from '@/lib/api/client'
 
 const NOTIFICATIONS_KEY = 'notifications'
 const IS_DEV = process.env.NODE_ENV !== 'production'
@@ -21,6 +22,8 @@ interface NotificationMessage {
         is_read: boolean
         created_at: string
         metadata?: Record<string, unknown>
+        /** Metadata was too large for the broadcast; fetch the notification by id */
+        metadata_truncated?: boolean
     }
     message?: string
 }
@@ -240,17 +243,24 @@ export function useNotificationWebSocket(options: UseNotificationWebSocketOption
                     if (IS_DEV) {
                         console.log('[WS] Received notification:', message.action)
                     }
-                    // Invalidate now and shortly after to handle race conditions where
-                    // the websocket event can arrive before the DB transaction commit.
-                    const invalidate = () => {
-                        queryClient.invalidateQueries({ queryKey: [NOTIFICATIONS_KEY] })
-                    }
-                    invalidate()
-                    setTimeout(invalidate, 300)
-                    setTimeout(invalidate, 1200)
+                    // The server broadcasts after commit, so the list is already up to date.
+                    queryClient.invalidateQueries({ queryKey: [NOTIFICATIONS_KEY] })
 
                     if (message.action === 'new' && message.data && onNotification) {
-                        onNotification(message.data)
+                        const data = message.data
+                        if (!data.metadata_truncated) {
+                            onNotification(data)
+                            return
+                        }
+                        apiClient
+                            .get<NonNullable<NotificationMessage['data']>>(`/api/v1/notifications/${data.id}`)
+                            .then((full) => onNotification({ ...full, metadata: full.metadata ?? undefined }))
+                            .catch((e) => {
+                                if (IS_DEV) {
+                                    console.warn('[WS] Failed to fetch truncated notification:', e)
+                                }
+                                onNotification(data)
+                            })
                     }
                 }
             }